@@ -0,0 +1,186 @@
+"""
+Timing and memory measurement for the benchmark suite
+
+Kernels are timed with time.perf_counter, and their peak python memory allocation measured with
+tracemalloc in a separate call (tracing slows things down a lot, so we never time a traced call).
+System stages can only be run once per system, as the results are cached, so for those we report
+the growth in peak resident memory of the process instead.
+
+Results are collected in a benchmarkResults object which can be written to, and read
+from, a json file so runs from different commits can be compared.
+"""
+
+import datetime
+import json
+import platform
+import resource
+import sys
+import subprocess
+import time
+import tracemalloc
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+
+from syscore.objects import arg_not_supplied
+
+BYTES_IN_MB = 1024.0 * 1024.0
+
+benchmarkResult = namedtuple(
+    "benchmarkResult",
+    [
+        "name",
+        "group",
+        "universe_size",
+        "repeats",
+        "min_seconds",
+        "median_seconds",
+        "peak_memory_mb",
+    ],
+)
+
+
+def time_and_measure(func, *args, repeats: int = 3, **kwargs):
+    """
+    Call func(*args, **kwargs) repeats times, and once more with memory tracing on
+
+    :return: tuple: list of times in seconds, peak memory allocated in MB
+    """
+    list_of_times = []
+    for _not_used in range(repeats):
+        start_time = time.perf_counter()
+        func(*args, **kwargs)
+        list_of_times.append(time.perf_counter() - start_time)
+
+    tracemalloc.start()
+    func(*args, **kwargs)
+    _current, peak_memory = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return list_of_times, peak_memory / BYTES_IN_MB
+
+
+def measure_once(func, *args, **kwargs):
+    """
+    Call func once, eg for things which are cached after the first call
+
+    :return: tuple: time in seconds, growth in peak resident memory of the process in MB, result of func
+    """
+    peak_rss_before = get_peak_resident_memory_mb()
+    start_time = time.perf_counter()
+    result = func(*args, **kwargs)
+    time_taken = time.perf_counter() - start_time
+    peak_rss_growth = get_peak_resident_memory_mb() - peak_rss_before
+
+    return time_taken, peak_rss_growth, result
+
+
+def get_peak_resident_memory_mb() -> float:
+    peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if sys.platform == "darwin":
+        # bytes on a mac, kilobytes on linux
+        return peak_rss / BYTES_IN_MB
+
+    return peak_rss / 1024.0
+
+
+class benchmarkResults(list):
+    """
+    A list of benchmarkResult, with some metadata about the environment they were produced in
+    """
+
+    def __init__(self, list_of_results: list = arg_not_supplied,
+                 metadata: dict = arg_not_supplied):
+        if list_of_results is arg_not_supplied:
+            list_of_results = []
+        if metadata is arg_not_supplied:
+            metadata = get_environment_metadata()
+
+        super().__init__(list_of_results)
+        self.metadata = metadata
+
+    def add_timings(self, name: str, group: str, universe_size: int,
+                    list_of_times: list, peak_memory_mb: float):
+        result = benchmarkResult(
+            name=name,
+            group=group,
+            universe_size=universe_size,
+            repeats=len(list_of_times),
+            min_seconds=float(np.min(list_of_times)),
+            median_seconds=float(np.median(list_of_times)),
+            peak_memory_mb=float(peak_memory_mb),
+        )
+        self.append(result)
+
+        return result
+
+    def as_pd_df(self) -> pd.DataFrame:
+        return pd.DataFrame(self, columns=benchmarkResult._fields)
+
+    def write_to_json(self, filename: str):
+        output_dict = dict(
+            metadata=self.metadata,
+            results=[result._asdict() for result in self])
+        with open(filename, "w") as output_file:
+            json.dump(output_dict, output_file, indent=2)
+
+    @classmethod
+    def read_from_json(benchmarkResults, filename: str):
+        with open(filename, "r") as input_file:
+            input_dict = json.load(input_file)
+
+        list_of_results = [
+            benchmarkResult(**result_dict) for result_dict in input_dict["results"]
+        ]
+
+        return benchmarkResults(list_of_results, metadata=input_dict["metadata"])
+
+
+def compare_benchmark_results(
+    old_results: benchmarkResults, new_results: benchmarkResults
+) -> pd.DataFrame:
+    """
+    Ratio of new to old median times and peak memory, for benchmarks that are in both
+
+    :return: pd.DataFrame, ratios above 1 mean the new results are slower / use more memory
+    """
+    index_columns = ["group", "name", "universe_size"]
+    old_df = old_results.as_pd_df().set_index(index_columns)
+    new_df = new_results.as_pd_df().set_index(index_columns)
+    old_df, new_df = old_df.align(new_df, join="inner")
+
+    comparison = pd.DataFrame(
+        dict(
+            old_median_seconds=old_df.median_seconds,
+            new_median_seconds=new_df.median_seconds,
+            time_ratio=new_df.median_seconds / old_df.median_seconds,
+            old_peak_memory_mb=old_df.peak_memory_mb,
+            new_peak_memory_mb=new_df.peak_memory_mb,
+            memory_ratio=new_df.peak_memory_mb / old_df.peak_memory_mb,
+        )
+    )
+
+    return comparison
+
+
+def get_environment_metadata() -> dict:
+    return dict(
+        timestamp=str(datetime.datetime.now()),
+        git_commit=get_git_commit(),
+        python_version=platform.python_version(),
+        pandas_version=pd.__version__,
+        numpy_version=np.__version__,
+        machine=platform.machine(),
+        processor=platform.processor(),
+    )
+
+
+def get_git_commit() -> str:
+    try:
+        git_commit = subprocess.check_output(
+            ["git", "rev-parse", "HEAD"], stderr=subprocess.DEVNULL
+        )
+        return git_commit.decode().strip()
+    except Exception:
+        return "unknown"
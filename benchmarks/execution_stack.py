@@ -0,0 +1,266 @@
+"""
+Load test the execution stack against a simulated broker and exchange
+
+Puts lots of instrument orders on the stack, then runs the stack handler (spawning contract orders, creating
+broker orders with the real algos, processing fills and completions) against the simulated IB gateway in
+sysbrokers.IB.ib_simulated_broker until every order is finished or we run out of time. Reports order
+throughput and end to end latency, from putting an instrument order on the stack to the stack handler
+marking it complete.
+
+This writes orders and positions, and copies multiple prices from the repo csv files for instruments which
+don't have any, so it must use a scratch database and never production:
+
+    python -m benchmarks.execution_stack --database load_test --orders 1000 --output stack.json
+
+Results written with --output can be compared with benchmarks.run_benchmarks --compare
+"""
+
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.benchmark_tools import benchmarkResults
+from sysbrokers.IB.ib_connection import get_broker_account
+from sysbrokers.IB.ib_simulated_broker import connectionSimulatedIB, simulatedExchangeConfig
+from syscore.objects import missing_order, arg_not_supplied
+from sysdata.arctic.arctic_multiple_prices import arcticFuturesMultiplePricesData
+from sysdata.csv.csv_multiple_prices import csvFuturesMultiplePricesData
+from sysdata.data_blob import dataBlob
+from sysdata.mongodb.mongo_connection import mongoDb, mongo_defaults
+from sysexecution.instrument_orders import instrumentOrder
+from sysexecution.stack_handler.stack_handler import stackHandler
+from syslogdiag.log import logtoscreen
+
+DEFAULT_INSTRUMENTS = ["EDOLLAR", "US10", "SP500", "GOLD", "CRUDE_W", "EUROSTX", "CORN"]
+DEFAULT_NUMBER_OF_ORDERS = 100
+DEFAULT_MAX_SECONDS = 600
+LOAD_TEST_STRATEGY_PREFIX = "load_test"
+BENCHMARK_GROUP = "execution_stack"
+
+
+def run_execution_stack_load_test(
+    data: dataBlob,
+    number_of_orders: int = DEFAULT_NUMBER_OF_ORDERS,
+    list_of_instrument_codes: list = DEFAULT_INSTRUMENTS,
+    order_type: str = "best",
+    max_seconds: float = DEFAULT_MAX_SECONDS,
+    seed: int = 0,
+) -> dict:
+    """
+    :param data: dataBlob on a scratch database, whose ib_conn is a connectionSimulatedIB
+    :param order_type: instrument order type, 'best' uses algo_original_best, 'market' algo_market
+
+    :return: dict: timings in seconds, and counts of orders
+    """
+    copy_multiple_prices_from_csv_if_missing(data, list_of_instrument_codes)
+    stack_handler = stackHandler(data)
+
+    start_time = time.perf_counter()
+    injected_time_by_order_id = inject_instrument_orders(
+        stack_handler, number_of_orders, list_of_instrument_codes, order_type=order_type, seed=seed
+    )
+    injection_seconds = time.perf_counter() - start_time
+
+    latency_by_order_id = {}
+    cycles = 0
+    while len(latency_by_order_id) < len(injected_time_by_order_id):
+        if time.perf_counter() - start_time > max_seconds:
+            data.log.warn("Load test timed out with %d orders not completed" % (
+                len(injected_time_by_order_id) - len(latency_by_order_id)))
+            break
+
+        run_stack_handler_cycle(stack_handler)
+        cycles += 1
+        record_completed_orders(stack_handler, injected_time_by_order_id, latency_by_order_id)
+
+    elapsed_seconds = time.perf_counter() - start_time
+    list_of_latencies = list(latency_by_order_id.values())
+    broker_order_latencies = data.ib_conn.ib.order_latencies()
+
+    return dict(
+        orders=len(injected_time_by_order_id),
+        completed_orders=len(list_of_latencies),
+        broker_orders_filled=len(broker_order_latencies),
+        stack_handler_cycles=cycles,
+        injection_seconds=injection_seconds,
+        elapsed_seconds=elapsed_seconds,
+        orders_per_second=len(list_of_latencies) / elapsed_seconds,
+        end_to_end_latencies=list_of_latencies,
+        broker_order_latencies=broker_order_latencies,
+    )
+
+
+def copy_multiple_prices_from_csv_if_missing(data: dataBlob, list_of_instrument_codes: list):
+    # the stack handler needs the current contracts for each instrument
+    data.add_class_object(arcticFuturesMultiplePricesData)
+    db_multiple_prices = data.db_futures_multiple_prices
+    csv_multiple_prices = csvFuturesMultiplePricesData()
+    for instrument_code in list_of_instrument_codes:
+        if db_multiple_prices.is_code_in_data(instrument_code):
+            continue
+        data.log.msg("Copying multiple prices for %s from csv" % instrument_code)
+        db_multiple_prices.add_multiple_prices(
+            instrument_code, csv_multiple_prices.get_multiple_prices(instrument_code))
+
+
+def inject_instrument_orders(
+    stack_handler: stackHandler,
+    number_of_orders: int,
+    list_of_instrument_codes: list,
+    order_type: str = "best",
+    seed: int = 0,
+) -> dict:
+    """
+    Orders go round the instruments; there can only be one order for each strategy and instrument, so every
+    pass round the instruments is for a new strategy
+
+    :return: dict of order_id: time we put it on the stack
+    """
+    rng = np.random.default_rng(seed)
+    injected_time_by_order_id = {}
+    for order_number in range(number_of_orders):
+        instrument_code = list_of_instrument_codes[order_number % len(list_of_instrument_codes)]
+        strategy_name = "%s_%d" % (
+            LOAD_TEST_STRATEGY_PREFIX, order_number // len(list_of_instrument_codes))
+        trade = int(rng.choice([-3, -2, -1, 1, 2, 3]))
+        order = instrumentOrder(strategy_name, instrument_code, trade, order_type=order_type)
+
+        order_id = stack_handler.instrument_stack.put_order_on_stack(order)
+        if not isinstance(order_id, int):
+            stack_handler.log.warn("Couldn't put %s on the stack: %s" % (str(order), str(order_id)))
+            continue
+        injected_time_by_order_id[order_id] = time.perf_counter()
+
+    return injected_time_by_order_id
+
+
+def run_stack_handler_cycle(stack_handler: stackHandler):
+    # the same things, in the same order, as run_stack_handler
+    stack_handler.spawn_children_from_new_instrument_orders()
+    stack_handler.create_broker_orders_from_contract_orders()
+    stack_handler.process_fills_stack()
+    stack_handler.handle_completed_orders()
+
+
+def record_completed_orders(stack_handler: stackHandler, injected_time_by_order_id: dict,
+                            latency_by_order_id: dict):
+    now = time.perf_counter()
+    for order_id, injected_time in injected_time_by_order_id.items():
+        if order_id in latency_by_order_id:
+            continue
+        order = stack_handler.instrument_stack.get_order_with_id_from_stack(order_id)
+        # completed orders are deactivated, and eventually removed
+        if order is missing_order or not order.active:
+            latency_by_order_id[order_id] = now - injected_time
+
+
+def summarise_load_test(load_test_results: dict) -> pd.Series:
+    summary = dict(
+        [
+            (key, value)
+            for key, value in load_test_results.items()
+            if not isinstance(value, list)
+        ]
+    )
+    for name in ["end_to_end_latencies", "broker_order_latencies"]:
+        latencies = load_test_results[name]
+        if len(latencies) == 0:
+            continue
+        for percentile in [50, 90, 99, 100]:
+            summary["%s_p%d" % (name, percentile)] = np.percentile(latencies, percentile)
+
+    return pd.Series(summary)
+
+
+def add_load_test_to_benchmark_results(results: benchmarkResults, load_test_results: dict):
+    # universe size is the number of orders, so runs of different sizes aren't compared
+    number_of_orders = load_test_results["orders"]
+    for name in ["end_to_end_latencies", "broker_order_latencies"]:
+        latencies = load_test_results[name]
+        if len(latencies) == 0:
+            continue
+        results.add_timings(name, BENCHMARK_GROUP, number_of_orders, latencies, peak_memory_mb=np.nan)
+
+    results.add_timings(
+        "seconds_per_order", BENCHMARK_GROUP, number_of_orders,
+        [load_test_results["elapsed_seconds"] / max(1, load_test_results["completed_orders"])],
+        peak_memory_mb=np.nan,
+    )
+
+
+def data_blob_for_load_test(database_name: str, config: simulatedExchangeConfig = arg_not_supplied) -> dataBlob:
+    production_database_name, __, __ = mongo_defaults()
+    if database_name == production_database_name:
+        raise Exception(
+            "Load tests write orders and positions, so can't use the production database %s" % database_name)
+
+    # broker orders are stamped with the configured account, so the simulated broker must use it too
+    broker_account = get_broker_account()
+    if broker_account is arg_not_supplied:
+        raise Exception(
+            "Set broker_account in private_config.yaml; any value will do for the simulated broker")
+    if config is arg_not_supplied:
+        config = simulatedExchangeConfig()
+    config.account = broker_account
+
+    ib_conn = connectionSimulatedIB(client_id=1, config=config, log=logtoscreen("simulated-IB"))
+
+    return dataBlob(
+        log_name="execution_stack_load_test",
+        mongo_db=mongoDb(db=database_name),
+        ib_conn=ib_conn,
+        log=logtoscreen("execution_stack_load_test"),
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Load test the execution stack against a simulated broker")
+    parser.add_argument(
+        "--database", default="load_test", help="scratch mongo database, never production")
+    parser.add_argument("--orders", type=int, default=DEFAULT_NUMBER_OF_ORDERS)
+    parser.add_argument("--instruments", nargs="+", default=DEFAULT_INSTRUMENTS)
+    parser.add_argument(
+        "--order-type", default="best", choices=["best", "market"], help="instrument order type")
+    parser.add_argument("--max-seconds", type=float, default=DEFAULT_MAX_SECONDS)
+    parser.add_argument("--fill-latency", type=float, default=simulatedExchangeConfig.fill_latency)
+    parser.add_argument("--fill-fraction", type=float, default=simulatedExchangeConfig.fill_fraction)
+    parser.add_argument(
+        "--rejection-probability", type=float, default=simulatedExchangeConfig.rejection_probability)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default="", help="json file to write results to")
+    args = parser.parse_args()
+
+    config = simulatedExchangeConfig(
+        seed=args.seed,
+        fill_latency=args.fill_latency,
+        fill_fraction=args.fill_fraction,
+        rejection_probability=args.rejection_probability,
+    )
+    data = data_blob_for_load_test(args.database, config=config)
+    try:
+        load_test_results = run_execution_stack_load_test(
+            data,
+            number_of_orders=args.orders,
+            list_of_instrument_codes=args.instruments,
+            order_type=args.order_type,
+            max_seconds=args.max_seconds,
+            seed=args.seed,
+        )
+    finally:
+        data.close()
+
+    pd.set_option("display.width", 1000)
+    print(summarise_load_test(load_test_results))
+
+    if args.output:
+        results = benchmarkResults()
+        add_load_test_to_benchmark_results(results, load_test_results)
+        results.write_to_json(args.output)
+        print("Results written to %s" % args.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""
+Benchmark the syscore kernels that most of a backtest's time is spent in, using the .csv adjusted prices
+
+Kernels are called directly (not through a system) so there is no caching, and each timing is
+for one call per instrument in the universe
+"""
+
+import pandas as pd
+
+from syscore.algos import robust_vol_calc, forecast_scalar
+from syscore.correlations import correlation_calculator
+from syscore.accounting import accountCurve
+from sysdata.sim.csv_futures_sim_data import csvFuturesSimData
+from systems.provided.futures_chapter15.rules import ewmac
+
+from benchmarks.benchmark_tools import benchmarkResults, time_and_measure
+from benchmarks.system_stages import get_instrument_universe
+
+KERNEL_GROUP = "kernel"
+
+
+def get_price_data_for_universe(universe_size: int) -> pd.DataFrame:
+    data = csvFuturesSimData()
+    instrument_list = get_instrument_universe(data, universe_size)
+    all_prices = [
+        data.daily_prices(instrument_code) for instrument_code in instrument_list
+    ]
+    price_df = pd.concat(all_prices, axis=1)
+    price_df.columns = instrument_list
+
+    return price_df
+
+
+def _robust_vol_calc_each_instrument(returns_df):
+    for instrument_code in returns_df.columns:
+        robust_vol_calc(returns_df[instrument_code])
+
+
+def _ewmac_each_instrument(price_df, vol_df):
+    for instrument_code in price_df.columns:
+        ewmac(price_df[instrument_code], vol_df[instrument_code], 16, 64)
+
+
+def _forecast_scalar(forecast_df):
+    forecast_scalar(forecast_df)
+
+
+def _correlation_calculator(returns_df):
+    correlation_calculator(returns_df)
+
+
+def _account_curve_each_instrument(price_df, forecast_df):
+    for instrument_code in price_df.columns:
+        accountCurve(
+            price_df[instrument_code], forecast=forecast_df[instrument_code]
+        )
+
+
+def benchmark_kernels(
+    results: benchmarkResults, universe_size: int, repeats: int = 3
+) -> benchmarkResults:
+    price_df = get_price_data_for_universe(universe_size)
+    actual_universe_size = price_df.shape[1]
+
+    returns_df = price_df.diff()
+    vol_df = robust_vol_calc(returns_df)
+    forecast_df = pd.concat(
+        [ewmac(price_df[code], vol_df[code], 16, 64) for code in price_df.columns],
+        axis=1,
+    )
+    forecast_df.columns = price_df.columns
+
+    list_of_kernel_benchmarks = [
+        ("robust_vol_calc", _robust_vol_calc_each_instrument, (returns_df,)),
+        ("robust_vol_calc_panel", robust_vol_calc, (returns_df,)),
+        ("ewmac", _ewmac_each_instrument, (price_df, vol_df)),
+        ("forecast_scalar", _forecast_scalar, (forecast_df,)),
+        ("correlation_calculator", _correlation_calculator, (returns_df,)),
+        ("accountCurve", _account_curve_each_instrument, (price_df, forecast_df)),
+    ]
+
+    for kernel_name, kernel_function, kernel_args in list_of_kernel_benchmarks:
+        list_of_times, peak_memory = time_and_measure(
+            kernel_function, *kernel_args, repeats=repeats
+        )
+        results.add_timings(
+            kernel_name,
+            KERNEL_GROUP,
+            actual_universe_size,
+            list_of_times,
+            peak_memory)
+
+    return results
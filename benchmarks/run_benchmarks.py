@@ -0,0 +1,99 @@
+"""
+Run the benchmark suite and write machine readable results
+
+From the root of the repo:
+
+    python -m benchmarks.run_benchmarks --output benchmarks_$(git rev-parse --short HEAD).json
+
+And to compare two runs (ratios above 1 are slower or use more memory):
+
+    python -m benchmarks.run_benchmarks --compare old.json new.json
+
+Default universe sizes are 1, the six instruments in the chapter 15 config, and every instrument
+in data/futures. Timings are only comparable between runs on the same machine.
+"""
+
+import argparse
+
+import pandas as pd
+
+from benchmarks.benchmark_tools import benchmarkResults, compare_benchmark_results
+from benchmarks.kernels import benchmark_kernels
+from benchmarks.system_stages import benchmark_system_stages
+
+DEFAULT_UNIVERSE_SIZES = [1, 6, 1000]
+DEFAULT_KERNEL_REPEATS = 3
+DEFAULT_STAGE_REPEATS = 1
+
+
+def run_benchmarks(
+    universe_sizes: list = DEFAULT_UNIVERSE_SIZES,
+    kernel_repeats: int = DEFAULT_KERNEL_REPEATS,
+    stage_repeats: int = DEFAULT_STAGE_REPEATS,
+    include_kernels: bool = True,
+    include_stages: bool = True,
+) -> benchmarkResults:
+    results = benchmarkResults()
+    for universe_size in universe_sizes:
+        if include_kernels:
+            print("Benchmarking kernels, universe size %d" % universe_size)
+            benchmark_kernels(results, universe_size, repeats=kernel_repeats)
+        if include_stages:
+            print("Benchmarking system stages, universe size %d" % universe_size)
+            benchmark_system_stages(
+                results, universe_size, repeats=stage_repeats)
+
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Benchmark the backtest pipeline")
+    parser.add_argument(
+        "--output", default="", help="json file to write results to")
+    parser.add_argument(
+        "--sizes",
+        type=int,
+        nargs="+",
+        default=DEFAULT_UNIVERSE_SIZES,
+        help="universe sizes to run (capped at the number of instruments with data)",
+    )
+    parser.add_argument(
+        "--kernel-repeats", type=int, default=DEFAULT_KERNEL_REPEATS)
+    parser.add_argument(
+        "--stage-repeats", type=int, default=DEFAULT_STAGE_REPEATS)
+    parser.add_argument("--no-kernels", action="store_true")
+    parser.add_argument("--no-stages", action="store_true")
+    parser.add_argument(
+        "--compare",
+        nargs=2,
+        metavar=("OLD_JSON", "NEW_JSON"),
+        help="compare two previous runs rather than running anything",
+    )
+    args = parser.parse_args()
+
+    pd.set_option("display.width", 1000)
+    pd.set_option("display.max_rows", 1000)
+
+    if args.compare:
+        old_results = benchmarkResults.read_from_json(args.compare[0])
+        new_results = benchmarkResults.read_from_json(args.compare[1])
+        print(compare_benchmark_results(old_results, new_results))
+        return None
+
+    results = run_benchmarks(
+        universe_sizes=args.sizes,
+        kernel_repeats=args.kernel_repeats,
+        stage_repeats=args.stage_repeats,
+        include_kernels=not args.no_kernels,
+        include_stages=not args.no_stages,
+    )
+
+    print(results.as_pd_df())
+    if args.output:
+        results.write_to_json(args.output)
+        print("Results written to %s" % args.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,170 @@
+"""
+Benchmark each stage of the chapter 15 futures_system, built from the .csv data in data/futures
+
+Stages are run in pipeline order on a fresh system, so each timing is the marginal cost of that stage
+given that everything upstream of it is already cached.
+
+Actual portfolio positions need the capital multiplier, which comes from the accounts stage, so by the
+time the portfolio stage is done the accounts are already cached. The portfolio timing includes them,
+and the accounts items are removed from the cache (untimed) before the accounts stage, so it is timed
+on its own.
+
+Memory is the growth in peak resident memory during the stage, and for the total the peak resident
+memory of the whole process. Peak memory only grows when a stage uses more than anything before it
+did, so the stage figures are a lower bound and often zero.
+"""
+
+from sysdata.configdata import Config
+from sysdata.sim.csv_futures_sim_data import csvFuturesSimData
+from systems.provided.futures_chapter15.basesystem import futures_system
+
+from benchmarks.benchmark_tools import benchmarkResults, measure_once, get_peak_resident_memory_mb
+
+STAGE_GROUP = "system_stage"
+STAGE_MEMORY_NOTE = (
+    "system_stage peak_memory_mb is the growth in the peak resident memory of the process during the "
+    "stage: a lower bound on what the stage used, zero if it used no more than anything before it"
+)
+
+
+def get_instrument_universe(data: csvFuturesSimData, universe_size: int) -> list:
+    """
+    The default chapter 15 instruments first, then the rest of the .csv data in alphabetical order
+
+    :return: list of instrument codes, of length universe_size (or all the instruments if there aren't enough)
+    """
+    default_instruments = sorted(
+        Config("systems.provided.futures_chapter15.futuresconfig.yaml").instrument_weights.keys()
+    )
+    other_instruments = [
+        instrument_code
+        for instrument_code in sorted(data.get_instrument_list())
+        if instrument_code not in default_instruments
+    ]
+    all_instruments = default_instruments + other_instruments
+
+    return all_instruments[:universe_size]
+
+
+def futures_system_for_universe(data: csvFuturesSimData, universe_size: int):
+    instrument_list = get_instrument_universe(data, universe_size)
+    config = Config("systems.provided.futures_chapter15.futuresconfig.yaml")
+    config.instrument_weights = dict(
+        [(instrument_code, 1.0 / len(instrument_list))
+         for instrument_code in instrument_list]
+    )
+
+    system = futures_system(data=data, config=config, log_level="off")
+
+    return system
+
+
+def _raw_data(system):
+    for instrument_code in system.get_instrument_list():
+        system.rawdata.daily_returns_volatility(instrument_code)
+        system.rawdata.raw_carry(instrument_code)
+
+
+def _raw_forecasts(system):
+    for instrument_code in system.get_instrument_list():
+        for rule_variation_name in system.rules.trading_rules().keys():
+            system.rules.get_raw_forecast(instrument_code, rule_variation_name)
+
+
+def _capped_forecasts(system):
+    for instrument_code in system.get_instrument_list():
+        for rule_variation_name in system.combForecast.get_trading_rule_list(
+                instrument_code):
+            system.forecastScaleCap.get_capped_forecast(
+                instrument_code, rule_variation_name
+            )
+
+
+def _combined_forecasts(system):
+    for instrument_code in system.get_instrument_list():
+        system.combForecast.get_combined_forecast(instrument_code)
+
+
+def _subsystem_positions(system):
+    for instrument_code in system.get_instrument_list():
+        system.positionSize.get_subsystem_position(instrument_code)
+
+
+def _portfolio_positions(system):
+    for instrument_code in system.get_instrument_list():
+        system.portfolio.get_actual_position(instrument_code)
+
+
+def _accounts(system):
+    system.accounts.portfolio().sharpe()
+
+
+def _clear_accounts(system):
+    # the portfolio stage has already filled these via the capital multiplier
+    system.cache.delete_items_for_stage("accounts", delete_protected=True)
+
+
+# in pipeline order
+LIST_OF_STAGE_BENCHMARKS = [
+    ("rawdata", _raw_data),
+    ("rules", _raw_forecasts),
+    ("forecastScaleCap", _capped_forecasts),
+    ("combForecast", _combined_forecasts),
+    ("positionSize", _subsystem_positions),
+    ("portfolio", _portfolio_positions),
+    ("accounts", _accounts),
+]
+
+# run before the stage, untimed
+STAGE_PREPARATION = dict(accounts=_clear_accounts)
+
+
+def benchmark_system_stages(
+    results: benchmarkResults, universe_size: int, repeats: int = 1
+) -> benchmarkResults:
+    """
+    Time each stage in turn on a fresh system, repeats times
+
+    We can't time the same system twice, since everything would come from the cache
+    """
+    data = csvFuturesSimData()
+    stage_timings = dict(
+        [(stage_name, []) for stage_name, _not_used in LIST_OF_STAGE_BENCHMARKS])
+    stage_memory_growth = dict(
+        [(stage_name, 0.0) for stage_name, _not_used in LIST_OF_STAGE_BENCHMARKS])
+    total_timings = []
+
+    for _not_used in range(repeats):
+        system = futures_system_for_universe(data, universe_size)
+        total_time = 0.0
+        for stage_name, stage_function in LIST_OF_STAGE_BENCHMARKS:
+            if stage_name in STAGE_PREPARATION:
+                STAGE_PREPARATION[stage_name](system)
+            time_taken, memory_growth, _result = measure_once(
+                stage_function, system)
+            stage_timings[stage_name].append(time_taken)
+            stage_memory_growth[stage_name] = max(
+                stage_memory_growth[stage_name], memory_growth)
+            total_time += time_taken
+        total_timings.append(total_time)
+
+    actual_universe_size = len(system.get_instrument_list())
+    for stage_name, _not_used in LIST_OF_STAGE_BENCHMARKS:
+        results.add_timings(
+            stage_name,
+            STAGE_GROUP,
+            actual_universe_size,
+            stage_timings[stage_name],
+            stage_memory_growth[stage_name],
+        )
+
+    results.add_timings(
+        "total",
+        STAGE_GROUP,
+        actual_universe_size,
+        total_timings,
+        get_peak_resident_memory_mb(),
+    )
+    results.metadata["system_stage_memory_note"] = STAGE_MEMORY_NOTE
+
+    return results
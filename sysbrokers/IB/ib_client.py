@@ -3,15 +3,16 @@ import datetime
 import pandas as pd
 from copy import copy
 
-from ib_insync import Forex, util, ComboLeg
+from ib_insync import Forex, util, ComboLeg, Contract
 from ib_insync.order import MarketOrder, LimitOrder
 
 from sysobjects.spot_fx_prices import currencyValue
 
-from syscore.objects import missing_contract, arg_not_supplied, missing_order
+from syscore.objects import missing_contract, arg_not_supplied, missing_order, missing_data
 from syscore.genutils import list_of_ints_with_highest_common_factor_positive_first
 from syscore.dateutils import adjust_timestamp, strip_tz_info
 from syslogdiag.log import logtoscreen
+from sysdata.private_config import get_private_then_default_key_value
 
 from sysbrokers.IB.ib_trading_hours import get_trading_hours
 from sysbrokers.IB.ib_contracts import (
@@ -32,6 +33,13 @@ PACING_INTERVAL_SECONDS = 1 + (_PACING_PERIOD_SECONDS / _PACING_PERIOD_LIMIT)
 
 STALE_SECONDS_ALLOWED_ACCOUNT_SUMMARY = 600
 
+# names of the items we keep for each contract in the contract metadata cache
+RESOLVED_CONTRACT_ITEM = "resolved_contract"
+MIN_TICK_ITEM = "min_tick"
+TRADING_HOURS_ITEM = "trading_hours"
+
+SECONDS_PER_HOUR = 60 * 60
+
 
 class ibClient(object):
     """
@@ -41,9 +49,14 @@ class ibClient(object):
 
     """
 
-    def __init__(self, log=logtoscreen("ibClient")):
+    def __init__(self, log=logtoscreen("ibClient"), contract_metadata_cache=arg_not_supplied):
+        """
+        :param contract_metadata_cache: brokerContractMetadataCacheData shared with other processes, or
+           arg_not_supplied to always ask IB
+        """
 
         self.log = log
+        self._contract_metadata_cache = contract_metadata_cache
         # means our first call won't be throttled for pacing
         self.last_historic_price_calltime = (
             datetime.datetime.now() -
@@ -425,6 +438,16 @@ class ibClient(object):
         return tick_data
 
     def ib_get_trading_hours(self, contract_object_with_ib_data):
+        single_leg_contract = contract_object_with_ib_data.new_contract_with_first_contract_date()
+        trading_hours = self._get_from_contract_metadata_cache(
+            single_leg_contract.instrument_code,
+            single_leg_contract.date_str,
+            TRADING_HOURS_ITEM,
+            ttl_seconds=self.trading_hours_cache_ttl_seconds,
+        )
+        if trading_hours is not missing_data:
+            return [tuple(open_times) for open_times in trading_hours]
+
         ib_contract = self.ib_futures_contract(
             contract_object_with_ib_data, always_return_single_leg=True
         )
@@ -439,9 +462,26 @@ class ibClient(object):
             self.log.warn("%s when getting trading hours!" % e)
             return missing_contract
 
+        self._add_to_contract_metadata_cache(
+            single_leg_contract.instrument_code,
+            single_leg_contract.date_str,
+            TRADING_HOURS_ITEM,
+            trading_hours,
+        )
+
         return trading_hours
 
     def ib_get_min_tick_size(self, contract_object_with_ib_data):
+        single_leg_contract = contract_object_with_ib_data.new_contract_with_first_contract_date()
+        min_tick = self._get_from_contract_metadata_cache(
+            single_leg_contract.instrument_code,
+            single_leg_contract.date_str,
+            MIN_TICK_ITEM,
+            ttl_seconds=self.contract_metadata_cache_ttl_seconds,
+        )
+        if min_tick is not missing_data:
+            return min_tick
+
         ib_contract = self.ib_futures_contract(
             contract_object_with_ib_data, always_return_single_leg=True
         )
@@ -456,8 +496,61 @@ class ibClient(object):
             self.log.warn("%s when getting min tick size from %s!" % (e, ib_contract_details))
             return missing_contract
 
+        self._add_to_contract_metadata_cache(
+            single_leg_contract.instrument_code,
+            single_leg_contract.date_str,
+            MIN_TICK_ITEM,
+            min_tick,
+        )
+
         return min_tick
 
+    # Contract metadata cache, shared with other processes
+    @property
+    def contract_metadata_cache(self):
+        return self._contract_metadata_cache
+
+    @property
+    def contract_metadata_cache_ttl_seconds(self) -> float:
+        return SECONDS_PER_HOUR * get_private_then_default_key_value(
+            "broker_contract_metadata_cache_ttl_hours")
+
+    @property
+    def trading_hours_cache_ttl_seconds(self) -> float:
+        return SECONDS_PER_HOUR * get_private_then_default_key_value(
+            "broker_trading_hours_cache_ttl_hours")
+
+    def _get_from_contract_metadata_cache(
+            self, instrument_code: str, contract_date_str: str, item_name: str, ttl_seconds: float):
+        if self.contract_metadata_cache is arg_not_supplied:
+            return missing_data
+
+        return self.contract_metadata_cache.get_cached_item(
+            instrument_code, contract_date_str, item_name, ttl_seconds=ttl_seconds
+        )
+
+    def _add_to_contract_metadata_cache(
+            self, instrument_code: str, contract_date_str: str, item_name: str, value):
+        if self.contract_metadata_cache is arg_not_supplied:
+            return None
+
+        self.contract_metadata_cache.cache_item(
+            instrument_code, contract_date_str, item_name, value
+        )
+
+    def refresh_contract_metadata_cache(self, instrument_code: str = arg_not_supplied):
+        """
+        Forget what we know about contracts (for one instrument, or all), so we ask IB again
+        """
+        self._futures_contract_cache = {}
+        if self.contract_metadata_cache is arg_not_supplied:
+            return None
+
+        if instrument_code is arg_not_supplied:
+            self.contract_metadata_cache.clear_cache()
+        else:
+            self.contract_metadata_cache.clear_cache_for_instrument_code(instrument_code)
+
 
     def modify_limit_price_given_original_objects(
             self,
@@ -722,9 +815,43 @@ class ibClient(object):
         Return a complete and unique IB contract that matches contract_object_with_ib_data
         This is expensive so not called directly, only by ib_futures_contract which does caching
 
+        Resolved contracts are also kept in the contract metadata cache, so other processes needn't ask IB
+
         :param contract_object_with_ib_data: contract, containing instrument metadata suitable for IB
         :return: a single ib contract object
         """
+        instrument_code = futures_instrument_with_ib_data.instrument_code
+        # if the IB configuration has changed, what we cached may not be right
+        ib_config_str = str(futures_instrument_with_ib_data.ib_data)
+
+        cached_contract = self._get_from_contract_metadata_cache(
+            instrument_code,
+            contract_date.date_str,
+            RESOLVED_CONTRACT_ITEM,
+            ttl_seconds=self.contract_metadata_cache_ttl_seconds,
+        )
+        if cached_contract is not missing_data:
+            if cached_contract["ib_config"] == ib_config_str:
+                return Contract.create(**cached_contract["contract"])
+
+        resolved_contract = self._get_vanilla_ib_futures_contract_from_ib(
+            futures_instrument_with_ib_data, contract_date
+        )
+        if resolved_contract is missing_contract:
+            return missing_contract
+
+        self._add_to_contract_metadata_cache(
+            instrument_code,
+            contract_date.date_str,
+            RESOLVED_CONTRACT_ITEM,
+            dict(ib_config=ib_config_str, contract=util.dataclassNonDefaults(resolved_contract)),
+        )
+
+        return resolved_contract
+
+    def _get_vanilla_ib_futures_contract_from_ib(
+        self, futures_instrument_with_ib_data: futuresInstrumentWithIBConfigData, contract_date
+    ):
 
         # The contract date might be 'yyyymm' or 'yyyymmdd'
         ibcontract = ib_futures_instrument(futures_instrument_with_ib_data)
@@ -39,7 +39,8 @@ class connectionIB(ibClient, ibServer):
         client_id: int,
         ipaddress=None,
         port=None,
-        log=logtoscreen("connectionIB")
+        log=logtoscreen("connectionIB"),
+        contract_metadata_cache=arg_not_supplied,
     ):
         """
         :param client_id: client id
@@ -47,6 +48,8 @@ class connectionIB(ibClient, ibServer):
         :param port: Port listened to by IB Gateway or TWS
         :param log: logging object
         :param mongo_db: mongoDB connection
+        :param contract_metadata_cache: brokerContractMetadataCacheData, to share resolved contracts etc with
+           other processes
         """
 
         # resolve defaults
@@ -66,7 +69,7 @@ class connectionIB(ibClient, ibServer):
 
         # if you copy for another broker, don't forget the logs
         ibServer.__init__(self, log=log)
-        ibClient.__init__(self, log=log)
+        ibClient.__init__(self, log=log, contract_metadata_cache=contract_metadata_cache)
 
         ib = IB()
 
@@ -1,7 +1,7 @@
 
 from sysbrokers.IB.ib_instruments_data import ibFuturesInstrumentData
 
-from syscore.objects import missing_contract, missing_instrument
+from syscore.objects import missing_contract, missing_instrument, arg_not_supplied
 
 from sysdata.futures.contracts import futuresContractData
 from syscore.dateutils import manyTradingStartAndEnd
@@ -33,8 +33,20 @@ class ibFuturesContractData(futuresContractData):
         return self._ibconnection
 
     @property
-    def ib_futures_instrument_data(self):
-        return ibFuturesInstrumentData(self.ibconnection, log = self.log)
+    def ib_futures_instrument_data(self) -> ibFuturesInstrumentData:
+        ib_futures_instrument_data = getattr(self, "_ib_futures_instrument_data", None)
+        if ib_futures_instrument_data is None:
+            ib_futures_instrument_data = self._ib_futures_instrument_data = \
+                ibFuturesInstrumentData(self.ibconnection, log = self.log)
+
+        return ib_futures_instrument_data
+
+    def refresh_contract_metadata(self, instrument_code: str = arg_not_supplied):
+        """
+        Forget cached contract metadata (resolved contracts, tick sizes, trading hours) for one instrument or all,
+        so it is fetched from IB again
+        """
+        self.ibconnection.refresh_contract_metadata_cache(instrument_code=instrument_code)
 
     def get_list_of_contract_dates_for_instrument_code(self, instrument_code: str):
         raise NotImplementedError(
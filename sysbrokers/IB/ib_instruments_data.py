@@ -1,3 +1,5 @@
+import os
+
 import pandas as pd
 from syscore.fileutils import get_filename_for_package
 from syscore.genutils import value_or_npnan
@@ -15,9 +17,19 @@ IB_FUTURES_CONFIG_FILE = get_filename_for_package(
 class IBconfig(pd.DataFrame):
     pass
 
+# modification time of the file when we read it, config
+_IB_CONFIG_CACHE = {}
+
+
 def read_ib_config_from_file() -> pd.DataFrame:
-    df = pd.read_csv(IB_FUTURES_CONFIG_FILE)
-    return IBconfig(df)
+    # We only read the file again if it has changed
+    modified_time = os.path.getmtime(IB_FUTURES_CONFIG_FILE)
+    if _IB_CONFIG_CACHE.get("modified_time", None) != modified_time:
+        df = pd.read_csv(IB_FUTURES_CONFIG_FILE)
+        _IB_CONFIG_CACHE["config"] = IBconfig(df)
+        _IB_CONFIG_CACHE["modified_time"] = modified_time
+
+    return _IB_CONFIG_CACHE["config"]
 
 
 class ibFuturesInstrumentData(futuresInstrumentData):
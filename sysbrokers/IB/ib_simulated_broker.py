@@ -0,0 +1,750 @@
+"""
+A simulated IB gateway and exchange, to exercise the execution stack without a live connection
+
+simulatedIB implements the parts of the ib_insync IB object that ibClient uses, and returns real ib_insync
+objects (Trade, Fill, Ticker...), so everything from ibClient upwards - the sysbrokers/IB data classes, the
+algos and the stack handler - runs unchanged.
+
+Each contract has a random walk price. Orders are acknowledged, filled (possibly in pieces), modified and
+cancelled after configurable delays, and can be randomly rejected. Time is wall clock time, and the exchange
+only moves on when it is polled (which ibClient does through ib.sleep and ib.trades), so latencies measured
+through it are comparable with a real gateway.
+
+Use it by giving a dataBlob the connection:
+
+    data = dataBlob(ib_conn=connectionSimulatedIB(client_id=1))
+"""
+
+import datetime
+import math
+import time
+from copy import copy
+from dataclasses import dataclass
+
+import numpy as np
+from ib_insync import (
+    AccountValue,
+    BarData,
+    CommissionReport,
+    Contract,
+    ContractDetails,
+    Event,
+    Execution,
+    Fill,
+    HistoricalTickBidAsk,
+    OrderStatus,
+    Position,
+    Ticker,
+    TickAttribBidAsk,
+    Trade,
+    TradeLogEntry,
+)
+
+from sysbrokers.IB.ib_client import ibClient
+from sysbrokers.IB.ib_server import ibServer
+from syscore.objects import arg_not_supplied
+from syslogdiag.log import logtoscreen
+
+# IB error code for a rejected order
+ORDER_REJECTED_ERROR_CODE = 201
+
+# we make up conIds, starting here so they don't look like order ids
+FIRST_CON_ID = 100000
+
+SECONDS_IN_BAR_SIZE_UNIT = dict(secs=1, sec=1, min=60, mins=60, hour=60 * 60, hours=60 * 60, day=24 * 60 * 60)
+SECONDS_IN_DURATION_UNIT = dict(S=1, D=24 * 60 * 60, W=7 * 24 * 60 * 60, M=31 * 24 * 60 * 60, Y=365 * 24 * 60 * 60)
+MAX_HISTORICAL_BARS = 2000
+
+
+@dataclass
+class simulatedExchangeConfig:
+    """
+    Latencies are in seconds, and are from the time an order (or modification, or cancel) is placed
+    """
+
+    seed: int = 0
+    account: str = "SIMULATED"
+    currency: str = "USD"
+    starting_capital: float = 1000000.0
+
+    # prices
+    starting_price: float = 100.0
+    min_tick: float = 0.01
+    spread_in_ticks: int = 1
+    volatility_in_ticks_per_root_second: float = 1.0
+    average_size_at_touch: int = 20
+    # Contracts given as 'yyyymm' expire on this day of the month
+    expiry_day: int = 15
+
+    # orders
+    ack_latency: float = 0.01
+    fill_latency: float = 0.05
+    modify_latency: float = 0.01
+    cancel_latency: float = 0.01
+    # Each fill is for this fraction of what's left to fill (at least one contract), so < 1 gives partial fills
+    fill_fraction: float = 1.0
+    # A limit order at the touch (eg on the bid when buying) is filled on average this often
+    passive_fills_per_second: float = 0.5
+    rejection_probability: float = 0.0
+    commission_per_contract: float = 2.0
+
+
+class simulatedIB(object):
+    """
+    Stands in for ib_insync.IB
+    """
+
+    def __init__(self, client_id: int = 1, config: simulatedExchangeConfig = arg_not_supplied):
+        if config is arg_not_supplied:
+            config = simulatedExchangeConfig()
+
+        self.config = config
+        self.client = simulatedIBClient(client_id)
+        self.errorEvent = Event("errorEvent")
+
+        self._rng = np.random.default_rng(config.seed)
+        self._last_update_time = time.monotonic()
+        self._next_con_id = FIRST_CON_ID
+        self._next_order_id = 1
+        self._next_exec_id = 1
+
+        # keyed by conId
+        self._contracts = {}
+        self._markets = {}
+        self._positions = {}
+        # keyed by contract key, see _contract_key
+        self._tickers = {}
+        self._subscribed_contract_keys = set()
+        # keyed by orderId
+        self._orders = {}
+
+        self._commission_paid = 0.0
+        self._connected = True
+
+    def __repr__(self):
+        return "Simulated IB client %d" % self.client.clientId
+
+    ## Connection
+    def isConnected(self) -> bool:
+        return self._connected
+
+    def disconnect(self):
+        self._connected = False
+
+    def sleep(self, secs: float = 0.02) -> bool:
+        time.sleep(secs)
+        self._update()
+
+        return True
+
+    def reqCurrentTime(self) -> datetime.datetime:
+        return _utc_now()
+
+    ## Contracts
+    def reqContractDetails(self, contract: Contract) -> list:
+        if contract.secType == "CASH":
+            list_of_contracts = [self._get_or_create_fx_contract(contract)]
+        elif contract.lastTradeDateOrContractMonth == "":
+            list_of_contracts = self._existing_futures_contracts_matching(contract)
+        else:
+            list_of_contracts = [self._get_or_create_futures_contract(contract)]
+
+        return [self._contract_details(resolved_contract) for resolved_contract in list_of_contracts]
+
+    ## Market data
+    def reqMktData(self, contract: Contract, genericTickList: str = "", snapshot: bool = False,
+                   regulatorySnapshot: bool = False, mktDataOptions=None) -> Ticker:
+        self._update()
+        key = _contract_key(contract)
+        self._subscribed_contract_keys.add(key)
+        ticker = self._tickers.get(key, None)
+        if ticker is None:
+            ticker = Ticker(contract=contract)
+            self._tickers[key] = ticker
+        self._update_ticker(ticker)
+
+        return ticker
+
+    def ticker(self, contract: Contract):
+        return self._tickers.get(_contract_key(contract), None)
+
+    def cancelMktData(self, contract: Contract):
+        self._subscribed_contract_keys.discard(_contract_key(contract))
+
+    def reqHistoricalTicks(self, contract: Contract, startDateTime, endDateTime, numberOfTicks: int,
+                           whatToShow: str, useRth: bool, ignoreSize: bool = False, miscOptions=None) -> list:
+        self._update()
+        bid, ask, bid_size, ask_size = self._quote(contract)
+        tick = HistoricalTickBidAsk(
+            time=_utc_now(),
+            tickAttribBidAsk=TickAttribBidAsk(),
+            priceBid=bid,
+            priceAsk=ask,
+            sizeBid=bid_size,
+            sizeAsk=ask_size,
+        )
+
+        return [tick]
+
+    def reqHistoricalData(self, contract: Contract, endDateTime, durationStr: str, barSizeSetting: str,
+                          whatToShow: str, useRTH: bool, formatDate: int = 1, keepUpToDate: bool = False,
+                          chartOptions=None, timeout: float = 60) -> list:
+        """
+        Bars walking back from the current price
+        """
+        self._update()
+        bar_seconds = _seconds_from_ib_string(barSizeSetting, SECONDS_IN_BAR_SIZE_UNIT)
+        number_of_bars = int(_seconds_from_ib_string(durationStr, SECONDS_IN_DURATION_UNIT) / bar_seconds)
+        number_of_bars = max(1, min(number_of_bars, MAX_HISTORICAL_BARS))
+
+        bid, ask, __, __ = self._quote(contract)
+        closes = self._random_walk_back_from((bid + ask) / 2.0, number_of_bars, bar_seconds)
+
+        now = datetime.datetime.now()
+        daily = bar_seconds >= SECONDS_IN_BAR_SIZE_UNIT["day"]
+        bars = []
+        for bars_ago, close in zip(range(number_of_bars - 1, -1, -1), closes):
+            bar_time = now - datetime.timedelta(seconds=bars_ago * bar_seconds)
+            if daily:
+                bar_time = bar_time.date()
+            bars.append(BarData(date=bar_time, open=close, high=close, low=close, close=close,
+                                volume=int(self._random_size())))
+
+        return bars
+
+    ## Orders
+    def placeOrder(self, contract: Contract, order) -> Trade:
+        self._update()
+        existing_order = self._orders.get(order.orderId, None)
+        if existing_order is not None:
+            # like IB, placing an order we already have modifies it
+            existing_order.modify(order.lmtPrice, time.monotonic() + self.config.modify_latency)
+            return existing_order.trade
+
+        order.orderId = self._next_order_id
+        self._next_order_id += 1
+        order.clientId = self.client.clientId
+        order.permId = order.orderId + self.client.clientId * 1000000
+        if order.account == "":
+            order.account = self.config.account
+
+        trade = Trade(
+            contract=contract,
+            order=order,
+            orderStatus=OrderStatus(orderId=order.orderId, status="PendingSubmit",
+                                    remaining=order.totalQuantity, permId=order.permId,
+                                    clientId=order.clientId),
+            fills=[],
+            log=[TradeLogEntry(_utc_now(), "PendingSubmit", "")],
+        )
+        rejected = self._rng.random() < self.config.rejection_probability
+        now = time.monotonic()
+        self._orders[order.orderId] = simulatedOrder(
+            trade, submitted_time=now, ack_time=now + self.config.ack_latency, rejected=rejected
+        )
+
+        return trade
+
+    def cancelOrder(self, order) -> Trade:
+        self._update()
+        simulated_order = self._orders.get(order.orderId, None)
+        if simulated_order is None:
+            return None
+
+        simulated_order.cancel(time.monotonic() + self.config.cancel_latency)
+
+        return simulated_order.trade
+
+    def trades(self) -> list:
+        return [simulated_order.trade for simulated_order in self._orders.values()]
+
+    def openTrades(self) -> list:
+        return [trade for trade in self.trades() if trade.isActive()]
+
+    def order_latencies(self) -> list:
+        """
+        :return: list of float, seconds from placing each filled order to its final fill
+        """
+        return [
+            simulated_order.filled_time - simulated_order.submitted_time
+            for simulated_order in self._orders.values()
+            if simulated_order.filled_time is not None
+        ]
+
+    ## Account
+    def positions(self) -> list:
+        return [
+            Position(self.config.account, self._contracts[con_id], position, avg_cost)
+            for con_id, (position, avg_cost) in self._positions.items()
+            if position != 0
+        ]
+
+    def accountSummary(self, account: str = "") -> list:
+        net_liquidation = self.config.starting_capital - self._commission_paid
+        return [
+            AccountValue(self.config.account, tag, str(net_liquidation), self.config.currency, "")
+            for tag in ["NetLiquidation", "TotalCashBalance"]
+        ]
+
+    ## Contract creation
+    def _get_or_create_futures_contract(self, pattern: Contract) -> Contract:
+        expiry = pattern.lastTradeDateOrContractMonth
+        if len(expiry) == 6:
+            expiry = expiry + "%02d" % self.config.expiry_day
+
+        for contract in self._existing_futures_contracts_matching(pattern):
+            if contract.lastTradeDateOrContractMonth == expiry:
+                return contract
+
+        contract = Contract(
+            secType="FUT",
+            conId=self._new_con_id(),
+            symbol=pattern.symbol,
+            lastTradeDateOrContractMonth=expiry,
+            multiplier=str(pattern.multiplier) if pattern.multiplier != "" else "1",
+            exchange=pattern.exchange,
+            currency=pattern.currency if pattern.currency != "" else self.config.currency,
+            localSymbol="%s %s" % (pattern.symbol, expiry),
+            tradingClass=pattern.symbol,
+        )
+
+        return self._add_contract(contract)
+
+    def _get_or_create_fx_contract(self, pattern: Contract) -> Contract:
+        for contract in self._contracts.values():
+            if (
+                contract.secType == "CASH"
+                and contract.symbol == pattern.symbol
+                and contract.currency == pattern.currency
+            ):
+                return contract
+
+        contract = Contract(
+            secType="CASH",
+            conId=self._new_con_id(),
+            symbol=pattern.symbol,
+            currency=pattern.currency,
+            exchange=pattern.exchange if pattern.exchange != "" else "IDEALPRO",
+            localSymbol="%s.%s" % (pattern.symbol, pattern.currency),
+        )
+
+        return self._add_contract(contract)
+
+    def _existing_futures_contracts_matching(self, pattern: Contract) -> list:
+        return [
+            contract
+            for contract in self._contracts.values()
+            if contract.secType == "FUT"
+            and contract.symbol == pattern.symbol
+            and pattern.exchange in ["", contract.exchange]
+        ]
+
+    def _add_contract(self, contract: Contract) -> Contract:
+        self._contracts[contract.conId] = contract
+        self._markets[contract.conId] = simulatedMarket(self.config, self._rng)
+
+        return contract
+
+    def _new_con_id(self) -> int:
+        con_id = self._next_con_id
+        self._next_con_id += 1
+
+        return con_id
+
+    def _contract_details(self, contract: Contract) -> ContractDetails:
+        # open all of yesterday to the end of tomorrow, so we are always well inside the trading hours
+        today = datetime.date.today()
+        yesterday = today - datetime.timedelta(days=1)
+        tomorrow = today + datetime.timedelta(days=1)
+        trading_hours = "%s:0000-%s:2359" % (yesterday.strftime("%Y%m%d"), tomorrow.strftime("%Y%m%d"))
+
+        return ContractDetails(
+            contract=copy(contract),
+            marketName=contract.symbol,
+            minTick=self.config.min_tick,
+            contractMonth=contract.lastTradeDateOrContractMonth[:6],
+            timeZoneId="",
+            tradingHours=trading_hours,
+            liquidHours=trading_hours,
+        )
+
+    ## Prices
+    def _update(self):
+        now = time.monotonic()
+        elapsed_seconds = now - self._last_update_time
+        if elapsed_seconds <= 0:
+            return
+        self._last_update_time = now
+
+        for market in self._markets.values():
+            market.move(elapsed_seconds)
+
+        for simulated_order in list(self._orders.values()):
+            if simulated_order.is_finished():
+                continue
+            self._update_order(simulated_order, now, elapsed_seconds)
+
+        for key in self._subscribed_contract_keys:
+            ticker = self._tickers.get(key, None)
+            if ticker is not None:
+                self._update_ticker(ticker)
+
+    def _update_ticker(self, ticker: Ticker):
+        bid, ask, bid_size, ask_size = self._quote(ticker.contract)
+        ticker.prevBid, ticker.prevAsk = ticker.bid, ticker.ask
+        ticker.bid, ticker.ask, ticker.bidSize, ticker.askSize = bid, ask, bid_size, ask_size
+        ticker.time = _utc_now()
+
+    def _quote(self, contract: Contract) -> tuple:
+        """
+        :return: tuple: bid, ask, bid size, ask size
+        """
+        if contract.secType != "BAG":
+            market = self._markets[self._resolve_con_id(contract)]
+            return market.bid, market.ask, market.bid_size, market.ask_size
+
+        # A spread is bought by buying the legs we buy at their ask, and selling the others at their bid
+        bid = ask = 0.0
+        bid_size = ask_size = np.inf
+        for leg in contract.comboLegs:
+            market = self._markets[leg.conId]
+            if leg.action == "BUY":
+                bid += leg.ratio * market.bid
+                ask += leg.ratio * market.ask
+                bid_size = min(bid_size, market.bid_size // leg.ratio)
+                ask_size = min(ask_size, market.ask_size // leg.ratio)
+            else:
+                bid -= leg.ratio * market.ask
+                ask -= leg.ratio * market.bid
+                bid_size = min(bid_size, market.ask_size // leg.ratio)
+                ask_size = min(ask_size, market.bid_size // leg.ratio)
+
+        return bid, ask, bid_size, ask_size
+
+    def _resolve_con_id(self, contract: Contract) -> int:
+        if contract.conId in self._contracts:
+            return contract.conId
+
+        # eg a contract we were given that hasn't been through reqContractDetails
+        if contract.secType == "CASH":
+            return self._get_or_create_fx_contract(contract).conId
+
+        return self._get_or_create_futures_contract(contract).conId
+
+    def _random_walk_back_from(self, price: float, number_of_steps: int, seconds_per_step: float) -> list:
+        step_size = self.config.min_tick * self.config.volatility_in_ticks_per_root_second * math.sqrt(
+            seconds_per_step)
+        steps = self._rng.normal(0.0, step_size, number_of_steps - 1)
+        walk = price - np.concatenate([[0.0], np.cumsum(steps[::-1])])
+
+        return list(walk[::-1])
+
+    def _random_size(self) -> int:
+        return 1 + self._rng.poisson(self.config.average_size_at_touch)
+
+    ## Order handling
+    def _update_order(self, simulated_order: "simulatedOrder", now: float, elapsed_seconds: float):
+        trade = simulated_order.trade
+        status = trade.orderStatus.status
+
+        if status == "PendingSubmit":
+            if now < simulated_order.ack_time:
+                return
+            if simulated_order.rejected:
+                _set_status(trade, "Cancelled", "Order rejected - reason: simulated rejection")
+                self.errorEvent.emit(
+                    trade.order.orderId,
+                    ORDER_REJECTED_ERROR_CODE,
+                    "Order rejected - reason: simulated rejection",
+                    trade.contract,
+                )
+                return
+            _set_status(trade, "Submitted")
+            simulated_order.next_fill_time = now + self.config.fill_latency
+
+        if simulated_order.modification_due(now):
+            simulated_order.apply_modification()
+            trade.log.append(TradeLogEntry(_utc_now(), trade.orderStatus.status, "Modify"))
+
+        if simulated_order.cancellation_due(now):
+            _set_status(trade, "Cancelled")
+            return
+
+        if trade.orderStatus.status == "PendingCancel":
+            # too late to fill
+            return
+
+        if now < simulated_order.next_fill_time:
+            return
+
+        fill_price = self._fill_price(simulated_order, elapsed_seconds)
+        if fill_price is None:
+            return
+
+        remaining = trade.remaining()
+        qty = min(remaining, max(1, math.ceil(remaining * self.config.fill_fraction)))
+        self._fill_order(simulated_order, qty, fill_price)
+
+        if trade.remaining() <= 0:
+            _set_status(trade, "Filled")
+            simulated_order.filled_time = now
+        else:
+            simulated_order.next_fill_time = now + self.config.fill_latency
+
+    def _fill_price(self, simulated_order: "simulatedOrder", elapsed_seconds: float):
+        """
+        :return: float, or None if the order doesn't fill now
+        """
+        trade = simulated_order.trade
+        bid, ask, __, __ = self._quote(trade.contract)
+        buying = trade.order.action == "BUY"
+        aggressive_price = ask if buying else bid
+        if trade.order.orderType == "MKT":
+            return aggressive_price
+
+        limit_price = simulated_order.limit_price
+        if buying:
+            marketable = limit_price >= ask
+            at_touch = limit_price >= bid
+        else:
+            marketable = limit_price <= bid
+            at_touch = limit_price <= ask
+
+        if marketable:
+            return aggressive_price
+
+        if at_touch:
+            probability_of_fill = 1.0 - math.exp(-self.config.passive_fills_per_second * elapsed_seconds)
+            if self._rng.random() < probability_of_fill:
+                return limit_price
+
+        return None
+
+    def _fill_order(self, simulated_order: "simulatedOrder", qty: int, fill_price: float):
+        trade = simulated_order.trade
+        buying = trade.order.action == "BUY"
+        fill_time = _utc_now()
+
+        if trade.contract.secType == "BAG":
+            # IB reports a fill for the spread, and a fill for each leg
+            for leg in trade.contract.comboLegs:
+                leg_contract = self._contracts[leg.conId]
+                leg_buying = buying == (leg.action == "BUY")
+                market = self._markets[leg.conId]
+                leg_price = market.ask if leg_buying else market.bid
+                self._add_fill(simulated_order, leg_contract, qty * leg.ratio, leg_price, leg_buying, fill_time)
+            commission_qty = 0
+        else:
+            commission_qty = qty
+
+        self._add_fill(simulated_order, trade.contract, qty, fill_price, buying, fill_time,
+                       commission_qty=commission_qty)
+
+        order_status = trade.orderStatus
+        order_status.filled = trade.filled()
+        order_status.remaining = trade.remaining()
+        order_status.lastFillPrice = fill_price
+        order_status.avgFillPrice = simulated_order.average_price(trade.contract.conId)
+
+    def _add_fill(self, simulated_order: "simulatedOrder", contract: Contract, qty: int, price: float,
+                  buying: bool, fill_time: datetime.datetime, commission_qty: int = arg_not_supplied):
+        if commission_qty is arg_not_supplied:
+            commission_qty = qty
+
+        trade = simulated_order.trade
+        cum_qty, avg_price = simulated_order.add_fill(contract.conId, qty, price)
+
+        exec_id = "%08d.01" % self._next_exec_id
+        self._next_exec_id += 1
+        execution = Execution(
+            execId=exec_id,
+            time=fill_time,
+            acctNumber=trade.order.account,
+            exchange=contract.exchange,
+            side="BOT" if buying else "SLD",
+            shares=qty,
+            price=price,
+            permId=trade.order.permId,
+            clientId=trade.order.clientId,
+            orderId=trade.order.orderId,
+            cumQty=cum_qty,
+            avgPrice=avg_price,
+        )
+        commission = self.config.commission_per_contract * commission_qty
+        commission_report = CommissionReport(execId=exec_id, commission=commission, currency=self.config.currency)
+        trade.fills.append(Fill(contract, execution, commission_report, fill_time))
+        trade.log.append(TradeLogEntry(fill_time, trade.orderStatus.status, "Fill %d@%f" % (qty, price)))
+        self._commission_paid += commission
+
+        if contract.secType != "BAG":
+            signed_qty = qty if buying else -qty
+            self._update_position(contract.conId, signed_qty, price)
+
+    def _update_position(self, con_id: int, signed_qty: int, price: float):
+        position, avg_cost = self._positions.get(con_id, (0, 0.0))
+        new_position = position + signed_qty
+        if new_position == 0:
+            avg_cost = 0.0
+        elif position == 0 or np.sign(new_position) != np.sign(position):
+            avg_cost = price
+        elif np.sign(signed_qty) == np.sign(position):
+            avg_cost = (position * avg_cost + signed_qty * price) / new_position
+
+        self._positions[con_id] = (new_position, avg_cost)
+
+
+class simulatedIBClient(object):
+    # Just enough to look like ib_insync's IB.client
+    def __init__(self, clientId: int):
+        self.clientId = clientId
+
+
+class simulatedMarket(object):
+    """
+    Best bid and offer for a single contract, moving as a random walk in ticks
+    """
+
+    def __init__(self, config: simulatedExchangeConfig, rng: np.random.Generator):
+        self._config = config
+        self._rng = rng
+        self._bid_in_ticks = round(config.starting_price / config.min_tick)
+        self.bid_size = self._random_size()
+        self.ask_size = self._random_size()
+
+    @property
+    def bid(self) -> float:
+        return self._bid_in_ticks * self._config.min_tick
+
+    @property
+    def ask(self) -> float:
+        return (self._bid_in_ticks + self._config.spread_in_ticks) * self._config.min_tick
+
+    def move(self, elapsed_seconds: float):
+        ticks_moved = self._rng.normal(
+            0.0, self._config.volatility_in_ticks_per_root_second * math.sqrt(elapsed_seconds))
+        self._bid_in_ticks += int(round(ticks_moved))
+        self.bid_size = self._random_size()
+        self.ask_size = self._random_size()
+
+    def _random_size(self) -> int:
+        return 1 + self._rng.poisson(self._config.average_size_at_touch)
+
+
+class simulatedOrder(object):
+    """
+    An order at the simulated exchange, and the things that are due to happen to it
+    """
+
+    def __init__(self, trade: Trade, submitted_time: float, ack_time: float, rejected: bool = False):
+        self.trade = trade
+        self.submitted_time = submitted_time
+        self.ack_time = ack_time
+        self.rejected = rejected
+        self.next_fill_time = np.inf
+        self.filled_time = None
+        # the client can change the order object before the exchange sees a modification
+        self.limit_price = trade.order.lmtPrice
+
+        self._new_limit_price = None
+        self._modification_time = np.inf
+        self._cancellation_time = np.inf
+
+        # for each conId, tuple of filled quantity and average price
+        self._fills_by_con_id = {}
+
+    def is_finished(self) -> bool:
+        return self.trade.orderStatus.status in OrderStatus.DoneStates
+
+    def modify(self, new_limit_price: float, modification_time: float):
+        self._new_limit_price = new_limit_price
+        self._modification_time = modification_time
+
+    def modification_due(self, now: float) -> bool:
+        return now >= self._modification_time
+
+    def apply_modification(self):
+        self._modification_time = np.inf
+        self.limit_price = self._new_limit_price
+
+    def cancel(self, cancellation_time: float):
+        if self.is_finished():
+            return
+        _set_status(self.trade, "PendingCancel")
+        self._cancellation_time = cancellation_time
+
+    def cancellation_due(self, now: float) -> bool:
+        return now >= self._cancellation_time
+
+    def add_fill(self, con_id: int, qty: int, price: float) -> tuple:
+        """
+        :return: tuple: cumulative quantity and average price filled for this conId
+        """
+        cum_qty, avg_price = self._fills_by_con_id.get(con_id, (0, 0.0))
+        new_cum_qty = cum_qty + qty
+        new_avg_price = (cum_qty * avg_price + qty * price) / new_cum_qty
+        self._fills_by_con_id[con_id] = (new_cum_qty, new_avg_price)
+
+        return new_cum_qty, new_avg_price
+
+    def average_price(self, con_id: int) -> float:
+        return self._fills_by_con_id.get(con_id, (0, 0.0))[1]
+
+
+class connectionSimulatedIB(ibClient, ibServer):
+    """
+    Drop in replacement for connectionIB, talking to simulatedIB rather than a gateway
+    """
+
+    def __init__(
+        self,
+        client_id: int = 1,
+        config: simulatedExchangeConfig = arg_not_supplied,
+        log=logtoscreen("connectionSimulatedIB"),
+        contract_metadata_cache=arg_not_supplied,
+    ):
+        log.label(broker="IB", clientid=client_id)
+        self._ib_connection_config = dict(client=client_id, simulated=True)
+
+        ibServer.__init__(self, log=log)
+        ibClient.__init__(self, log=log, contract_metadata_cache=contract_metadata_cache)
+
+        ib = simulatedIB(client_id=client_id, config=config)
+        ib.errorEvent += self.error_handler
+
+        self.ib = ib
+
+    def __repr__(self):
+        return "Simulated IB broker connection" + str(self._ib_connection_config)
+
+    def client_id(self):
+        return self._ib_connection_config["client"]
+
+    def close_connection(self):
+        self.log.msg("Terminating %s" % str(self._ib_connection_config))
+        self.ib.disconnect()
+
+
+def _contract_key(contract: Contract):
+    if contract.secType == "BAG":
+        return tuple((leg.conId, leg.ratio, leg.action) for leg in contract.comboLegs)
+
+    if contract.conId != 0:
+        return contract.conId
+
+    return (contract.secType, contract.symbol, contract.lastTradeDateOrContractMonth, contract.currency)
+
+
+def _set_status(trade: Trade, status: str, message: str = ""):
+    trade.orderStatus.status = status
+    trade.log.append(TradeLogEntry(_utc_now(), status, message))
+
+
+def _seconds_from_ib_string(ib_string: str, seconds_in_unit: dict) -> float:
+    # eg '1 Y' or '5 mins'
+    number, unit = ib_string.split(" ")
+
+    return float(number) * seconds_in_unit[unit]
+
+
+def _utc_now() -> datetime.datetime:
+    return datetime.datetime.now(datetime.timezone.utc)
@@ -1,8 +1,9 @@
-from syscore.objects import resolve_function, missing_data
+from syscore.objects import resolve_function, missing_data, arg_not_supplied
 from sysdata.data_blob import dataBlob
 from sysproduction.data.control_process import get_strategy_class_object_config
 
-def get_strategy_method(data: dataBlob,  strategy_name: str, process_name: str, function_name: str):
+def get_strategy_method(data: dataBlob,  strategy_name: str, process_name: str, function_name: str,
+                        strategy_kwargs: dict = arg_not_supplied):
     config_this_process = get_strategy_class_object_config(data, process_name, strategy_name)
     strategy_class_object = resolve_function(config_this_process.pop("object"))
 
@@ -17,6 +18,8 @@ def get_strategy_method(data: dataBlob,  strategy_name: str, process_name: str,
         data.log.warn("Remove function from strategy run_systems configuration no longer uses!")
 
     other_args = config_this_process
+    if strategy_kwargs is not arg_not_supplied:
+        other_args.update(strategy_kwargs)
 
     strategy_data = dataBlob(log_name=process_name)
     strategy_data.log.label(strategy_name=strategy_name)
@@ -31,8 +34,13 @@ def get_strategy_method(data: dataBlob,  strategy_name: str, process_name: str,
 
 class strategyRunner():
     ## needs to have method per strategy
-    def __init__(self, data: dataBlob, strategy_name: str, process_name: str, function_name: str):
+    def __init__(self, data: dataBlob, strategy_name: str, process_name: str, function_name: str,
+                 strategy_kwargs: dict = arg_not_supplied):
+        """
+        :param strategy_kwargs: dict, passed to the strategy class as well as the arguments in its configuration
+        """
         self.data = data
+        self._strategy_kwargs = strategy_kwargs
         self._object_store = missing_data
         self._strategy_name = strategy_name
         self._function_name = function_name
@@ -66,7 +74,8 @@ class strategyRunner():
     def get_strategy_method(self):
         method = self._object_store
         if method is missing_data:
-            method = get_strategy_method(self.data, self.strategy_name, self.process_name, self.function_name)
+            method = get_strategy_method(self.data, self.strategy_name, self.process_name, self.function_name,
+                                         strategy_kwargs=self._strategy_kwargs)
             self.object_store = method
 
         return method
\ No newline at end of file
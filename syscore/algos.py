@@ -126,7 +126,7 @@ def robust_vol_calc(
     and a volfloor based on lowest vol over recent history
 
     :param x: data
-    :type x: Tx1 pd.Series
+    :type x: Tx1 pd.Series, or TxN pd.DataFrame to do each column at once
 
     :param days: Number of days in lookback (*default* 35)
     :type days: int
@@ -162,18 +162,19 @@ def robust_vol_calc(
 
     if vol_floor:
         # Find the rolling 5% quantile point to set as a minimum
-        vol_min = vol.rolling(
-            min_periods=floor_min_periods, window=floor_days
-        ).quantile(quantile=floor_min_quant)
+        vol_min = rolling_quantile(
+            vol, window=floor_days, min_periods=floor_min_periods, quantile=floor_min_quant
+        )
 
         # set this to zero for the first value then propagate forward, ensures
         # we always have a value
-        vol_min.at[vol_min.index[0]] = 0.0
+        vol_min.iloc[0] = 0.0
         vol_min = vol_min.ffill()
 
-        # apply the vol floor
-        vol_with_min = pd.concat([vol, vol_min], axis=1)
-        vol_floored = vol_with_min.max(axis=1, skipna=False)
+        # apply the vol floor; nan if either is nan
+        vol_floored = np.maximum(vol, vol_min)
+        if isinstance(vol_floored, pd.Series):
+            vol_floored.name = None
     else:
         vol_floored = vol
 
@@ -188,6 +189,109 @@ def robust_vol_calc(
     return vol_backfilled
 
 
+def rolling_quantile(x, window, min_periods, quantile):
+    """
+    The same as x.rolling(window, min_periods=min_periods).quantile(quantile), with linear interpolation
+
+    Where a window has no missing values (normally everywhere but the start) we get the order statistics
+    either side of the quantile from scipy's rank filter. From scipy 1.15 that keeps the window in order, so
+    moving it along one step is O(log window), and is several times quicker than pandas. Other windows, and
+    older versions of scipy, use pandas.
+
+    :param x: data
+    :type x: Tx1 pd.Series, or TxN pd.DataFrame to do each column
+
+    :returns: same type as x
+    """
+    if not _scipy_has_fast_rank_filter():
+        return x.rolling(window, min_periods=min_periods).quantile(quantile)
+
+    if isinstance(x, pd.DataFrame):
+        quantiles = pd.DataFrame(
+            dict(
+                [
+                    (column_number, _rolling_quantile_for_array(
+                        x.iloc[:, column_number].values.astype(float), window, min_periods, quantile))
+                    for column_number in range(x.shape[1])
+                ]
+            ),
+            index=x.index,
+        )
+        quantiles.columns = x.columns
+
+        return quantiles
+
+    return pd.Series(
+        _rolling_quantile_for_array(x.values.astype(float), window, min_periods, quantile),
+        index=x.index,
+        name=x.name,
+    )
+
+
+def _scipy_has_fast_rank_filter():
+    # scipy is imported here, not when the module is, as it's slow to import
+    # Before 1.15 rank_filter doesn't have a fast 1-d version, and is slower than pandas
+    import scipy
+
+    try:
+        version = tuple(int(part) for part in scipy.__version__.split(".")[:2])
+    except ValueError:
+        return False
+
+    return version >= (1, 15)
+
+
+def _rolling_quantile_for_array(values, window, min_periods, quantile):
+    from scipy.ndimage import rank_filter
+
+    # infs are treated as missing here, so windows with them in go to pandas (inf - inf would give nan)
+    is_missing = ~np.isfinite(values)
+    cumulative_observations = np.concatenate([[0], np.cumsum(~is_missing)])
+    window_end = np.arange(1, len(values) + 1)
+    window_start = np.maximum(window_end - window, 0)
+    observations = (
+        cumulative_observations[window_end] - cumulative_observations[window_start]
+    )
+    full_window = observations == window
+
+    result = np.full(len(values), np.nan)
+    if full_window.any():
+        # the same sums as pandas, so we get exactly the same answer
+        position = quantile * (window - 1)
+        lower_rank = int(position)
+
+        # missing values aren't in any full window, but would confuse the filter
+        values_to_filter = np.where(is_missing, np.inf, values)
+
+        # origin puts each window at the end of the data it covers
+        filter_kwargs = dict(size=window, origin=(window - 1) // 2, mode="nearest")
+        lower_value = rank_filter(values_to_filter, lower_rank, **filter_kwargs)
+        if position == lower_rank:
+            full_window_quantile = lower_value
+        else:
+            upper_value = rank_filter(values_to_filter, lower_rank + 1, **filter_kwargs)
+            full_window_quantile = lower_value + (upper_value - lower_value) * (
+                position - lower_rank
+            )
+
+        result[full_window] = full_window_quantile[full_window]
+
+    other_rows = np.where(~full_window)[0]
+    if len(other_rows) > 0:
+        # pandas, on just enough data to cover the windows we need
+        first_row = max(other_rows[0] - window + 1, 0)
+        last_row = other_rows[-1]
+        pandas_quantile = (
+            pd.Series(values[first_row: last_row + 1])
+            .rolling(window, min_periods=min_periods)
+            .quantile(quantile)
+            .values
+        )
+        result[other_rows] = pandas_quantile[other_rows - first_row]
+
+    return result
+
+
 def forecast_scalar(
         cs_forecasts,
         window=250000,
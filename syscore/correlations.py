@@ -235,15 +235,11 @@ class correlationSinglePeriod(object):
         :return: np.array of correlation matrix
         """
 
-        cleaning = self.cleaning
-
         corr_with_no_data = self.corr_with_no_data
-        corr_for_cleaning = self.corr_for_cleaning
 
         data_as_df = self.data_as_df
         kwargs = self.kwargs
         ew_lookback_corrected = self.ew_lookback_corrected
-        floor_at_zero = self.floor_at_zero
 
         if fit_period.no_data:
             # no data to fit with
@@ -256,12 +252,105 @@ class correlationSinglePeriod(object):
                 data_for_estimate, ew_lookback=ew_lookback_corrected, **kwargs
             )
 
+        corrmat = self._clean_correlation_for_period(corrmat, fit_period)
+
+        return corrmat
+
+    def calculate_for_list_of_periods(self, fit_dates, progress=None):
+        """
+        Work out the correlation for each of a list of periods
+
+        If we're exponentially weighting and every period starts at the beginning of the data (an
+        expanding or in sample window) then the estimate for a period is just the estimate for the
+        previous period carried forward, so we do a single pass through the data. Otherwise
+        (eg rolling windows) we calculate each period separately.
+
+        :param fit_dates: list of fit periods
+        :param progress: optional progressBar, iterated once per period
+
+        :return: list of np.array of correlation matrix
+        """
+
+        if not self._can_use_single_pass(fit_dates):
+            corr_list = []
+            for fit_period in fit_dates:
+                if progress is not None:
+                    progress.iterate()
+                corr_list.append(self.calculate(fit_period))
+
+            return corr_list
+
+        periods_with_data = [
+            fit_period for fit_period in fit_dates if not fit_period.no_data
+        ]
+        snapshot_list = ewm_correlation_snapshots(
+            self.data_as_df,
+            [fit_period.fit_end for fit_period in periods_with_data],
+            ew_lookback=self.ew_lookback_corrected,
+            min_periods=self.kwargs.get("min_periods", 20),
+        )
+        snapshot_dict = dict(
+            [
+                (id(fit_period), snapshot)
+                for fit_period, snapshot in zip(periods_with_data, snapshot_list)
+            ]
+        )
+
+        # every period starts with the data, so an item has data in a period if it starts before the end
+        first_valid_dates = [
+            self.data_as_df[column_name].first_valid_index()
+            for column_name in self.data_as_df.columns
+        ]
+
+        corr_list = []
+        for fit_period in fit_dates:
+            if progress is not None:
+                progress.iterate()
+            if fit_period.no_data:
+                corrmat = self.corr_with_no_data
+            else:
+                corrmat = snapshot_dict[id(fit_period)]
+            must_haves = [
+                first_valid_date is not None and first_valid_date <= fit_period.fit_end
+                for first_valid_date in first_valid_dates
+            ]
+            corr_list.append(
+                self._clean_correlation_for_period(
+                    corrmat, fit_period, must_haves=must_haves
+                )
+            )
+
+        return corr_list
+
+    def _can_use_single_pass(self, fit_dates):
+        using_exponent = str2Bool(self.kwargs.get("using_exponent", True))
+        if not using_exponent:
+            return False
+
+        data_start = self.data_as_df.index[0]
+        all_periods_start_with_data = all(
+            [
+                fit_period.fit_start <= data_start
+                for fit_period in fit_dates
+                if not fit_period.no_data
+            ]
+        )
+
+        return all_periods_start_with_data
+
+    def _clean_correlation_for_period(self, corrmat, fit_period, must_haves=None):
+        cleaning = self.cleaning
+        corr_for_cleaning = self.corr_for_cleaning
+        data_as_df = self.data_as_df
+        floor_at_zero = self.floor_at_zero
+
         if cleaning:
-            current_period_data = data_as_df[fit_period.fit_start: fit_period.fit_end]
+            if must_haves is None:
+                current_period_data = data_as_df[fit_period.fit_start: fit_period.fit_end]
 
-            # must_haves are items with data in this period, so we need some
-            # kind of correlation
-            must_haves = must_have_item(current_period_data)
+                # must_haves are items with data in this period, so we need some
+                # kind of correlation
+                must_haves = must_have_item(current_period_data)
 
             # means we can use earlier correlations with sensible values
             corrmat = clean_correlation(corrmat, corr_for_cleaning, must_haves)
@@ -323,6 +412,137 @@ def correlation_calculator(
     return corrmat
 
 
+class ewmCorrelationState(object):
+    """
+    Exponentially weighted correlation matrix, updated one row of data at a time
+
+    Gives the same answer as the last matrix of data.ewm(span, min_periods).corr(pairwise=True), but
+    we only keep the current state rather than a matrix for every row; walk the data once and take a
+    snapshot whenever you need one.
+
+    As with pandas (adjust=True, ignore_na=False) each pair of items only uses the rows where both
+    have data, and once a pair has started the weights decay on every row, even ones with missing data.
+    Everything is held as NxN arrays, one element per pair: mean[i,j] and var[i,j] are the mean and
+    variance of item i, calculated over the rows where i and j both have data.
+    """
+
+    def __init__(self, number_of_items: int, span: float, min_periods: int = 20):
+        alpha = 2.0 / (span + 1.0)
+        self.old_wt_factor = 1.0 - alpha
+        self.min_periods = max(int(min_periods), 1)
+
+        shape = (number_of_items, number_of_items)
+        self.mean = np.full(shape, np.nan)
+        self.var = np.zeros(shape)
+        self.cov = np.zeros(shape)
+        self.old_wt = np.ones(shape)
+        self.nobs = np.zeros(shape, dtype=int)
+
+    def update(self, data_row: np.array):
+        """
+        :param data_row: np.array, one value for each item, may include nans
+        """
+        item_has_data = ~np.isnan(data_row)
+        is_observation = item_has_data[:, np.newaxis] & item_has_data[np.newaxis, :]
+        self.nobs += is_observation
+
+        started = ~np.isnan(self.mean)
+        self.old_wt[started] *= self.old_wt_factor
+
+        to_update = started & is_observation
+        to_start = ~started & is_observation
+
+        # value of item i, for each pair (i,j)
+        current_value = np.broadcast_to(data_row[:, np.newaxis], self.mean.shape)
+
+        if to_update.any():
+            old_wt = self.old_wt
+            old_mean = self.mean
+            new_mean = np.where(
+                old_mean != current_value,
+                (old_wt * old_mean + current_value) / (old_wt + 1.0),
+                old_mean,
+            )
+            change_in_mean = old_mean - new_mean
+            deviation = current_value - new_mean
+
+            new_var = (
+                old_wt * (self.var + change_in_mean ** 2) + deviation ** 2
+            ) / (old_wt + 1.0)
+            new_cov = (
+                old_wt * (self.cov + change_in_mean * change_in_mean.T)
+                + deviation * deviation.T
+            ) / (old_wt + 1.0)
+
+            self.mean = np.where(to_update, new_mean, self.mean)
+            self.var = np.where(to_update, new_var, self.var)
+            self.cov = np.where(to_update, new_cov, self.cov)
+            self.old_wt = np.where(to_update, old_wt + 1.0, old_wt)
+
+        if to_start.any():
+            self.mean = np.where(to_start, current_value, self.mean)
+
+    def correlation_matrix(self) -> np.array:
+        """
+        :return: 2-dim square np.array, with nans where we don't have min_periods of data
+        """
+        with np.errstate(all="ignore"):
+            var_product = self.var * self.var.T
+            var_product[var_product < 0] = 0.0
+            corrmat = self.cov / np.sqrt(var_product)
+
+        corrmat[self.nobs < self.min_periods] = np.nan
+        corrmat[np.isnan(self.mean)] = np.nan
+
+        return corrmat
+
+
+def ewm_correlation_snapshots(
+    data_as_df, snapshot_dates, ew_lookback=250, min_periods=20
+):
+    """
+    Exponentially weighted correlation matrices at a series of dates, in a single pass through the data
+
+    For each date this is the same as correlation_calculator(data_as_df[:date], ...), but much cheaper
+    than doing that for each date in turn
+
+    :param data_as_df: pd.DataFrame, index must be sorted
+    :param snapshot_dates: list of datetimes, in any order
+
+    :returns: list of 2-dim square np.array, one per date
+    """
+    number_of_items = data_as_df.shape[1]
+    state = ewmCorrelationState(
+        number_of_items, span=ew_lookback, min_periods=min_periods
+    )
+
+    # row number of the last row on or before each date
+    last_row_for_each_snapshot = (
+        data_as_df.index.searchsorted(pd.DatetimeIndex(snapshot_dates), side="right") - 1
+    )
+    snapshots_by_row = {}
+    for snapshot_number, row_number in enumerate(last_row_for_each_snapshot):
+        snapshots_by_row.setdefault(row_number, []).append(snapshot_number)
+
+    snapshot_list = [None] * len(snapshot_dates)
+    for snapshot_number in snapshots_by_row.pop(-1, []):
+        # no data at all yet
+        snapshot_list[snapshot_number] = boring_corr_matrix(
+            number_of_items, offdiag=np.nan, diag=np.nan
+        )
+
+    if len(snapshots_by_row) == 0:
+        return snapshot_list
+
+    data_values = data_as_df.values.astype(float)
+    for row_number in range(max(snapshots_by_row.keys()) + 1):
+        state.update(data_values[row_number])
+        for snapshot_number in snapshots_by_row.get(row_number, []):
+            snapshot_list[snapshot_number] = state.correlation_matrix()
+
+    return snapshot_list
+
+
 def boring_corr_matrix(size, offdiag=0.99, diag=1.0):
     """
     Create a boring correlation matrix
@@ -442,17 +662,10 @@ class CorrelationEstimator(CorrelationList):
             data_as_df, length_of_data=length_of_data, **kwargs
         )
 
-        # create a list of correlation matrices
-        corr_list = []
-
+        # create a list of correlation matrices, one for each time period
         progress = progressBar(len(fit_dates), "Estimating correlations")
-        # Now for each time period, estimate correlation
-        for fit_period in fit_dates:
-
-            progress.iterate()
-            corrmat = correlation_estimator_for_one_period.calculate(
-                fit_period)
-            corr_list.append(corrmat)
+        corr_list = correlation_estimator_for_one_period.calculate_for_list_of_periods(
+            fit_dates, progress=progress)
 
         setattr(self, "corr_list", corr_list)
         setattr(self, "columns", column_names)
@@ -150,6 +150,48 @@ def expiry_diff(carry_row, floor_date_diff=20):
     return ans
 
 
+def expiry_diff_for_contract_columns(carry_data: pd.DataFrame, floor_date_diff=20) -> pd.Series:
+    """
+    expiry_diff for every row of carry_data, but only calculated once for each pair of contracts
+
+    Works on the contract codes, so handles categorical contract columns without expanding them
+
+    :param carry_data: pd.DataFrame with columns CARRY_CONTRACT and PRICE_CONTRACT
+    :param floor_date_diff: If date resolves to less than this, floor here (*default* 20)
+
+    :returns: pd.Series, annualised difference between the contract dates
+    """
+    price_contract_codes, price_contracts = pd.factorize(carry_data.PRICE_CONTRACT)
+    carry_contract_codes, carry_contracts = pd.factorize(carry_data.CARRY_CONTRACT)
+
+    # factorize gives missing values a code of -1; this puts them back
+    price_contracts = list(price_contracts) + [np.nan]
+    carry_contracts = list(carry_contracts) + [np.nan]
+
+    pair_codes, unique_pairs = pd.factorize(
+        pd.MultiIndex.from_arrays([price_contract_codes, carry_contract_codes])
+    )
+    diff_for_each_pair = np.array(
+        [
+            expiry_diff(
+                _carry_row(price_contracts[price_code], carry_contracts[carry_code]),
+                floor_date_diff=floor_date_diff,
+            )
+            for price_code, carry_code in unique_pairs
+        ],
+        dtype=float,
+    )
+
+    return pd.Series(diff_for_each_pair[pair_codes], index=carry_data.index)
+
+
+class _carry_row(object):
+    # quacks like a pandas row, for expiry_diff
+    def __init__(self, price_contract, carry_contract):
+        self.PRICE_CONTRACT = price_contract
+        self.CARRY_CONTRACT = carry_contract
+
+
 class fit_dates_object(object):
     def __init__(
             self,
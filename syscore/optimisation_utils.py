@@ -3,8 +3,6 @@ import numpy as np
 FLAG_BAD_RETURN = -9999999.9
 TARGET_ANN_SR = 0.5
 
-from scipy.optimize import minimize
-
 
 def clean_weights(weights, must_haves=None, fraction=0.5):
     """
@@ -217,6 +215,8 @@ def fix_sigma(sigma):
 
 
 def optimise(sigma, mean_list):
+    # scipy.optimize is slow to import, and most users of this module (eg the risk report) don't optimise
+    from scipy.optimize import minimize
 
     # will replace nans with big negatives
     mean_list = fix_mus(mean_list)
@@ -7,6 +7,7 @@ import datetime
 
 import numpy as np
 from copy import copy
+from dataclasses import dataclass
 
 from syscore.fileutils import get_filename_for_package
 from syscore.dateutils import (
@@ -17,7 +18,7 @@ from syscore.dateutils import (
     NOTIONAL_CLOSING_TIME_AS_PD_OFFSET
 
 )
-from syscore.objects import _named_object, data_error, arg_not_supplied
+from syscore.objects import _named_object, data_error, arg_not_supplied, missing_data
 from sysdata.private_config import get_private_then_default_key_value
 
 DEFAULT_DATE_FORMAT = "%Y-%m-%d %H:%M:%S"
@@ -438,14 +439,7 @@ def _first_spike_in_data(
     :return: date if spike, else None
     """
     max_spike = get_private_then_default_key_value("max_price_spike")
-    col_list = getattr(merged_data, "columns", None)
-    if col_list is None:
-        # already a series
-        data_to_check = merged_data
-    else:
-        if column_to_check is arg_not_supplied:
-            column_to_check = col_list[0]
-        data_to_check = merged_data[column_to_check]
+    data_to_check = _series_to_check_for_spikes(merged_data, column_to_check=column_to_check)
 
     # Calculate the average change per day
     change_pd = average_change_per_day(data_to_check)
@@ -454,7 +448,7 @@ def _first_spike_in_data(
     abs_change_pd = change_pd.abs()
     # hard to know what span to use here as could be daily, intraday or a
     # mixture
-    avg_abs_change = abs_change_pd.ewm(span=500).mean()
+    avg_abs_change = abs_change_pd.ewm(span=SPIKE_CHECK_EWM_SPAN).mean()
 
     change_in_avg_units = abs_change_pd / avg_abs_change
 
@@ -470,23 +464,169 @@ def _first_spike_in_data(
         return None
 
 
+SPIKE_CHECK_EWM_SPAN = 500
+
+
+def _series_to_check_for_spikes(data, column_to_check=arg_not_supplied) -> pd.Series:
+    col_list = getattr(data, "columns", None)
+    if col_list is None:
+        # already a series
+        return data
+
+    if column_to_check is arg_not_supplied:
+        column_to_check = col_list[0]
+
+    return data[column_to_check]
+
+
 def average_change_per_day(data_to_check):
-    data_diff = data_to_check.diff()[1:]
-    index_diff = data_to_check.index[1:] - data_to_check.index[:-1]
-    index_diff_days = [
-        diff.total_seconds() /
-        SECONDS_PER_DAY for diff in index_diff]
-
-    change_per_day = [
-        diff / (diff_days ** 0.5)
-        for diff, diff_days in zip(data_diff.values, index_diff_days)
-    ]
+    data_diff = np.diff(data_to_check.values.astype(float))
+    index_diff_days = (np.diff(data_to_check.index.asi8) / 1e9) / SECONDS_PER_DAY
+
+    change_per_day = data_diff / (index_diff_days ** 0.5)
 
     change_pd = pd.Series(change_per_day, index=data_to_check.index[1:])
 
     return change_pd
 
 
+@dataclass
+class spikeCheckState:
+    """
+    Where the spike check had got to at the end of some data, so we can check new data without the old data.
+
+    average_abs_change and weight are the running values of the pandas ewm calculation, so carrying on from
+    here gives exactly the same answer as recalculating over all the data.
+    """
+    last_timestamp: datetime.datetime = missing_data
+    last_value: float = np.nan
+    average_abs_change: float = np.nan
+    weight: float = 1.0
+    observations: int = 0
+
+    def as_dict(self) -> dict:
+        return dict(
+            last_timestamp=pd.Timestamp(self.last_timestamp).to_pydatetime(),
+            last_value=float(self.last_value),
+            average_abs_change=float(self.average_abs_change),
+            weight=float(self.weight),
+            observations=int(self.observations),
+        )
+
+    @classmethod
+    def from_dict(spikeCheckState, state_dict: dict):
+        return spikeCheckState(**state_dict)
+
+
+def spike_check_state_for_data(data, column_to_check=arg_not_supplied) -> spikeCheckState:
+    """
+    :param data: pd.Series or pd.DataFrame
+    :return: spikeCheckState at the end of data
+    """
+    _, spike_check_state = first_spike_in_new_data(
+        spikeCheckState(), data, column_to_check=column_to_check, max_spike=np.inf
+    )
+
+    return spike_check_state
+
+
+def spike_check_state_at_end_of_data(
+        data, stored_spike_check_state=missing_data, column_to_check=arg_not_supplied) -> spikeCheckState:
+    """
+    The stored state if it's for the end of data, otherwise we work it out from data. If data is only the end of
+    the full history that's close enough, since the ewm gives negligible weight to the older changes.
+
+    :param data: pd.Series or pd.DataFrame, the existing data (or the end of it)
+    :param stored_spike_check_state: spikeCheckState or missing_data
+    :return: spikeCheckState
+    """
+    if stored_spike_check_state is not missing_data:
+        if _spike_check_state_is_at_end_of_data(
+                stored_spike_check_state, data, column_to_check=column_to_check):
+            return stored_spike_check_state
+
+    return spike_check_state_for_data(data, column_to_check=column_to_check)
+
+
+def _spike_check_state_is_at_end_of_data(
+        spike_check_state: spikeCheckState, data, column_to_check=arg_not_supplied) -> bool:
+    data_to_check = _series_to_check_for_spikes(data, column_to_check=column_to_check)
+    if len(data_to_check) == 0 or spike_check_state.last_timestamp is missing_data:
+        return False
+
+    if pd.Timestamp(spike_check_state.last_timestamp) != pd.Timestamp(data_to_check.index[-1]):
+        return False
+
+    last_value = float(data_to_check.values[-1])
+    if np.isnan(last_value):
+        return np.isnan(spike_check_state.last_value)
+
+    return spike_check_state.last_value == last_value
+
+
+def first_spike_in_new_data(
+        spike_check_state: spikeCheckState, new_data, column_to_check=arg_not_supplied,
+        max_spike=arg_not_supplied) -> tuple:
+    """
+    Check only new_data for spikes, carrying on from spike_check_state. Same answer as _first_spike_in_data
+    on the old and new data merged together, but only looks at the new rows.
+
+    :param spike_check_state: spikeCheckState at the end of the existing data
+    :param new_data: pd.Series or pd.DataFrame, all after spike_check_state.last_timestamp
+    :return: tuple: date of first spike or None, spikeCheckState at the end of new_data
+    """
+    if max_spike is arg_not_supplied:
+        max_spike = get_private_then_default_key_value("max_price_spike")
+
+    new_data_to_check = _series_to_check_for_spikes(new_data, column_to_check=column_to_check)
+    if len(new_data_to_check) == 0:
+        return None, spike_check_state
+
+    if spike_check_state.last_timestamp is not missing_data:
+        # we need the last existing value, for the change to the first new value
+        new_data_to_check = pd.concat([
+            pd.Series([spike_check_state.last_value], index=[spike_check_state.last_timestamp]),
+            new_data_to_check,
+        ])
+
+    abs_change = np.abs(average_change_per_day(new_data_to_check).values)
+
+    # same steps as the pandas ewm calculation (adjust=True, ignore_na=False)
+    old_weight_factor = 1.0 - 1.0 / (1.0 + (SPIKE_CHECK_EWM_SPAN - 1) / 2.0)
+    average_abs_change = spike_check_state.average_abs_change
+    weight = spike_check_state.weight
+    observations = spike_check_state.observations
+    first_spike = None
+    for row_number, this_abs_change in enumerate(abs_change):
+        is_observation = this_abs_change == this_abs_change
+        observations += is_observation
+        if average_abs_change == average_abs_change:
+            weight *= old_weight_factor
+            if is_observation:
+                if average_abs_change != this_abs_change:
+                    average_abs_change = weight * average_abs_change + this_abs_change
+                    average_abs_change /= weight + 1.0
+                weight += 1.0
+        elif is_observation:
+            average_abs_change = this_abs_change
+
+        if first_spike is None and observations >= 1:
+            with np.errstate(divide="ignore", invalid="ignore"):
+                change_in_avg_units = this_abs_change / average_abs_change
+            if change_in_avg_units > max_spike:
+                first_spike = new_data_to_check.index[row_number + 1]
+
+    new_spike_check_state = spikeCheckState(
+        last_timestamp=new_data_to_check.index[-1],
+        last_value=new_data_to_check.values[-1],
+        average_abs_change=average_abs_change,
+        weight=weight,
+        observations=observations,
+    )
+
+    return first_spike, new_spike_check_state
+
+
 def full_merge_of_existing_data(old_data, new_data):
     """
     Merges old data with new data.
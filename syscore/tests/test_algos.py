@@ -6,9 +6,10 @@ Created on 27 Nov 2015
 import unittest as ut
 
 import numpy as np
+import pandas as pd
 
 from syscore.pdutils import pd_readcsv_frompackage
-from syscore.algos import robust_vol_calc
+from syscore.algos import robust_vol_calc, rolling_quantile, _rolling_quantile_for_array
 
 
 def get_data(path):
@@ -66,6 +67,44 @@ class Test(ut.TestCase):
         vol = robust_vol_calc(returns, floor_days=10, floor_min_periods=5)
         self.assertAlmostEqual(vol.iloc[-1], 0.42134038479240132)
 
+    def test_rolling_quantile_same_as_pandas(self):
+        np.random.seed(0)
+        data = pd.Series(np.random.rand(2000))
+        data[np.random.rand(2000) < 0.05] = np.nan
+        data[300:900] = np.nan
+
+        for window, min_periods, quantile in [(500, 100, 0.05), (250, 0, 0.5), (20, 20, 0.95), (1, 1, 0.3)]:
+            expected = data.rolling(window, min_periods=min_periods).quantile(quantile)
+            quantiles = rolling_quantile(data, window, min_periods, quantile)
+            np.testing.assert_array_equal(quantiles.values, expected.values)
+
+    def test_rank_filter_quantile_same_as_pandas(self):
+        # rolling_quantile only uses the rank filter with newer versions of scipy, so call it directly
+        np.random.seed(0)
+        data = pd.Series(np.random.rand(2000))
+        data[np.random.rand(2000) < 0.05] = np.nan
+        data[300:900] = np.nan
+        data[1000] = np.inf
+        data[1500] = -np.inf
+
+        for window, min_periods, quantile in [(500, 100, 0.05), (250, 0, 0.5), (20, 20, 0.95), (1, 1, 0.3)]:
+            expected = data.rolling(window, min_periods=min_periods).quantile(quantile)
+            quantiles = _rolling_quantile_for_array(data.values, window, min_periods, quantile)
+            np.testing.assert_array_equal(quantiles, expected.values)
+
+    def test_robust_vol_calc_for_each_column(self):
+        prices = get_data("syscore.tests.pricetestdata_vol_floor.csv")
+        returns = pd.concat([prices.diff(), prices.diff() * 2.0], axis=1)
+        returns.columns = ["a", "b"]
+        returns.iloc[:50, 1] = np.nan
+
+        vol = robust_vol_calc(returns)
+        self.assertEqual(list(vol.columns), ["a", "b"])
+        for column_name in returns.columns:
+            np.testing.assert_array_equal(
+                vol[column_name].values, robust_vol_calc(returns[column_name]).values
+            )
+
 
 """
     def test_calc_ewmac_forecast(self):
@@ -7,7 +7,7 @@ import unittest as ut
 import numpy as np
 import pandas as pd
 
-from syscore.dateutils import expiry_diff
+from syscore.dateutils import expiry_diff, expiry_diff_for_contract_columns
 
 
 class Test(ut.TestCase):
@@ -50,6 +50,17 @@ class Test(ut.TestCase):
         for (got, wanted) in zip(expiries[3:], expected):
             self.assertAlmostEqual(got, wanted)
 
+    def test_expiry_diff_for_contract_columns(self):
+        x = self.test_data()
+        # repeat rows, so pairs of contracts come up more than once
+        x = pd.concat([x, x.iloc[::-1]], ignore_index=True)
+        expected = x.apply(expiry_diff, 1)
+
+        for data in [x, x.astype("category")]:
+            expiries = expiry_diff_for_contract_columns(data)
+            np.testing.assert_array_equal(expiries.values, expected.values)
+            self.assertTrue(expiries.index.equals(x.index))
+
 
 if __name__ == "__main__":
     # import sys;sys.argv = ['', 'Test.test_robust_vol_calc']
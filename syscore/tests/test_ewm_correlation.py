@@ -0,0 +1,44 @@
+import unittest
+import pandas as pd
+import numpy as np
+from syscore.correlations import ewm_correlation_snapshots, correlation_calculator
+
+
+class Test(unittest.TestCase):
+    def setUp(self):
+        np.random.seed(0)
+        data = pd.DataFrame(
+            np.random.randn(300, 4),
+            pd.date_range(pd.Timestamp(2000, 1, 1), periods=300, freq="W"),
+        )
+        # late starter, gaps, and a flat patch
+        data.iloc[:120, 1] = np.nan
+        data.iloc[50:60, 0] = np.nan
+        data.iloc[::7, 2] = np.nan
+        data.iloc[:80, 3] = 1.0
+
+        self.data = data
+
+    def test_matches_pandas(self):
+        snapshot_dates = list(self.data.index[[10, 25, 100, 150, 299]])
+        snapshots = ewm_correlation_snapshots(
+            self.data, snapshot_dates, ew_lookback=50, min_periods=20
+        )
+
+        for snapshot_date, snapshot in zip(snapshot_dates, snapshots):
+            expected = correlation_calculator(
+                self.data[:snapshot_date], ew_lookback=50, min_periods=20
+            )
+            np.testing.assert_array_equal(np.isnan(snapshot), np.isnan(expected))
+            np.testing.assert_allclose(
+                snapshot[~np.isnan(snapshot)], expected[~np.isnan(expected)]
+            )
+
+    def test_before_data_starts(self):
+        snapshots = ewm_correlation_snapshots(
+            self.data, [pd.Timestamp(1999, 1, 1)])
+        self.assertTrue(np.all(np.isnan(snapshots[0])))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,118 @@
+"""
+Production entry points are launched from cron many times a day, so they should start quickly: slow optional
+dependencies must be imported where they are used, not when the entry point module is imported
+"""
+import os
+import subprocess
+import sys
+import unittest as ut
+
+import syscore
+
+PROJECT_DIRECTORY = os.path.dirname(os.path.dirname(os.path.abspath(syscore.__file__)))
+
+# generous, we only want to catch something slow creeping back in
+IMPORT_TIME_BUDGET_SECONDS = 5.0
+
+MODULES_NOT_IMPORTED_AT_STARTUP = ["matplotlib", "scipy", "arctic"]
+
+# we can't avoid what these import, which depends on their version (eg pandas 0.25 imports matplotlib)
+MODULES_NEEDED_AT_STARTUP = ["pandas"]
+
+
+def get_list_of_entry_point_modules() -> list:
+    """
+    The linux scripts look like '. $SCRIPT_PATH/p sysproduction.run_reports.run_reports'
+
+    :return: list of str, module names eg sysproduction.run_reports
+    """
+    scripts_directory = os.path.join(
+        PROJECT_DIRECTORY, "sysproduction", "linux", "scripts")
+    list_of_modules = []
+    for script_name in sorted(os.listdir(scripts_directory)):
+        script_filename = os.path.join(scripts_directory, script_name)
+        if not os.path.isfile(script_filename):
+            continue
+        with open(script_filename) as script_file:
+            for line in script_file:
+                words = line.split()
+                if len(words) == 3 and words[1] == "$SCRIPT_PATH/p":
+                    module_name = words[2].rsplit(".", 1)[0]
+                    if _module_exists(module_name):
+                        list_of_modules.append(module_name)
+
+    return sorted(set(list_of_modules))
+
+
+def _module_exists(module_name: str) -> bool:
+    # some scripts point at modules which have been removed
+    module_filename = os.path.join(
+        PROJECT_DIRECTORY, *module_name.split(".")) + ".py"
+
+    return os.path.isfile(module_filename)
+
+
+def import_time_and_modules_imported(module_name: str) -> tuple:
+    """
+    :return: tuple: cumulative import time in seconds, list of top level modules imported
+    """
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import %s" % module_name],
+        capture_output=True,
+        text=True,
+        cwd=PROJECT_DIRECTORY,
+    )
+    if completed.returncode != 0:
+        raise Exception(
+            "Couldn't import %s: %s" % (module_name, completed.stderr[-2000:])
+        )
+
+    # lines look like 'import time:       123 |      4567 | name'
+    import_time = 0.0
+    top_level_modules = set()
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        fields = line[len("import time:"):].split("|")
+        if len(fields) != 3 or not fields[1].strip().isdigit():
+            continue
+        imported_name = fields[2].strip()
+        top_level_modules.add(imported_name.split(".")[0])
+        if imported_name == module_name:
+            import_time = int(fields[1]) / 1e6
+
+    return import_time, sorted(top_level_modules)
+
+
+def slow_modules_we_can_avoid() -> list:
+    modules_imported_anyway = set()
+    for module_name in MODULES_NEEDED_AT_STARTUP:
+        _, modules_imported = import_time_and_modules_imported(module_name)
+        modules_imported_anyway.update(modules_imported)
+
+    return [
+        slow_module
+        for slow_module in MODULES_NOT_IMPORTED_AT_STARTUP
+        if slow_module not in modules_imported_anyway
+    ]
+
+
+class Test(ut.TestCase):
+    def test_entry_points_start_quickly(self):
+        list_of_modules = get_list_of_entry_point_modules()
+        self.assertTrue(len(list_of_modules) > 0)
+
+        slow_modules = slow_modules_we_can_avoid()
+
+        for module_name in list_of_modules:
+            with self.subTest(module_name=module_name):
+                import_time, modules_imported = import_time_and_modules_imported(
+                    module_name
+                )
+                for slow_module in slow_modules:
+                    self.assertNotIn(slow_module, modules_imported)
+                self.assertLess(import_time, IMPORT_TIME_BUDGET_SECONDS)
+
+
+if __name__ == "__main__":
+    ut.main()
@@ -0,0 +1,32 @@
+import unittest
+import pandas as pd
+import numpy as np
+from syscore.pdutils import (
+    _first_spike_in_data,
+    first_spike_in_new_data,
+    spike_check_state_for_data,
+)
+
+
+class Test(unittest.TestCase):
+    def test_first_spike_in_new_data(self):
+        np.random.seed(0)
+        prices = pd.Series(
+            100 + np.random.randn(1000).cumsum(),
+            pd.date_range(pd.datetime(2015, 1, 1), periods=1000, freq="H"),
+        )
+        prices.iloc[::17] = np.nan
+        prices.iloc[900] = prices.iloc[899] + 50.0
+
+        # checking just the new data should give the same answer as checking everything
+        for split in [1, 500, 899, 900, 950]:
+            spike_check_state = spike_check_state_for_data(prices.iloc[:split])
+            first_spike, _ = first_spike_in_new_data(
+                spike_check_state, prices.iloc[split:])
+            self.assertEqual(
+                first_spike,
+                _first_spike_in_data(prices, prices.index[split]))
+
+
+if __name__ == "__main__":
+    unittest.main()
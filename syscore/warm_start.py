@@ -0,0 +1,48 @@
+"""
+Slow optional dependencies (matplotlib, scipy, arctic, ib_insync) are imported where they are used rather
+than at the top of modules, so the short lived processes launched from cron don't pay for what they don't use.
+
+Interactive tools will probably need some of them eventually, so they can import them in a background thread
+while the user is reading the first menu. Switch this off with interactive_warm_start: False in private config.
+"""
+
+import importlib
+import threading
+
+from syscore.objects import arg_not_supplied
+from sysdata.private_config import get_private_then_default_key_value
+
+SLOW_OPTIONAL_MODULES = [
+    "matplotlib.pyplot",
+    "scipy.optimize",
+    "scipy.stats",
+    "arctic",
+]
+
+
+def warm_start_in_background(list_of_module_names: list = arg_not_supplied):
+    """
+    :param list_of_module_names: defaults to SLOW_OPTIONAL_MODULES
+    :return: threading.Thread doing the imports, or None if warm start is switched off
+    """
+    if not get_private_then_default_key_value("interactive_warm_start"):
+        return None
+
+    if list_of_module_names is arg_not_supplied:
+        list_of_module_names = SLOW_OPTIONAL_MODULES
+
+    warm_start_thread = threading.Thread(
+        target=_import_modules, args=(list_of_module_names,), daemon=True
+    )
+    warm_start_thread.start()
+
+    return warm_start_thread
+
+
+def _import_modules(list_of_module_names: list):
+    for module_name in list_of_module_names:
+        try:
+            importlib.import_module(module_name)
+        except ImportError:
+            # not installed; whoever needs it will find out soon enough
+            pass
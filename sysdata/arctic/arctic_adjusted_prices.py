@@ -2,6 +2,7 @@ from sysdata.futures.adjusted_prices import (
     futuresAdjustedPricesData,
 )
 from sysobjects.adjusted_prices import futuresAdjustedPrices
+from sysobjects.time_series_metadata import timeSeriesMetadata
 from sysdata.arctic.arctic_connection import articData
 from syslogdiag.log import logtoscreen
 import pandas as pd
@@ -44,6 +45,9 @@ class arcticFuturesAdjustedPricesData(futuresAdjustedPricesData):
 
         return instrpricedata
 
+    def _get_metadata_for_instrument_without_checking(self, instrument_code: str) -> timeSeriesMetadata:
+        return self.arctic.read_metadata(instrument_code)
+
     def _delete_adjusted_prices_without_any_warning_be_careful(
             self, instrument_code: str):
         self.arctic.delete(instrument_code)
@@ -57,7 +61,8 @@ class arcticFuturesAdjustedPricesData(futuresAdjustedPricesData):
         adjusted_price_data_aspd = pd.Series(adjusted_price_data)
         adjusted_price_data_aspd.columns = ['price']
         adjusted_price_data_aspd = adjusted_price_data_aspd.astype(float)
-        self.arctic.write(instrument_code, adjusted_price_data_aspd)
+        # appends if only new rows have been added
+        self.arctic.write_or_append(instrument_code, adjusted_price_data_aspd)
         self.log.msg(
             "Wrote %s lines of prices for %s to %s"
             % (len(adjusted_price_data), instrument_code, str(self)),
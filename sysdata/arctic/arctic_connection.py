@@ -1,6 +1,10 @@
+import threading
+
 import pandas as pd
-from arctic import Arctic
+from syscore.objects import missing_data, arg_not_supplied
+from syscore.pdutils import spikeCheckState
 from sysdata.mongodb.mongo_connection import mongoDb
+from sysobjects.time_series_metadata import timeSeriesMetadata, dictOfTimeSeriesMetadata, checksum_for_data
 
 """
 IMPORTANT NOTE: Make sure you have a mongodb running eg mongod --dbpath /home/yourusername/pysystemtrade/data/futures/arctic
@@ -10,6 +14,54 @@ This connection won't fail if mongo missing, but will hang
 """
 
 
+# read this many times the proportion of the dates we'd need if rows were evenly spaced
+TAIL_MARGIN = 2.0
+
+# key in the metadata for where the price spike check had got to, see syscore.pdutils.spikeCheckState
+SPIKE_CHECK_STATE_KEY = "spike_check_state"
+
+
+class ArcticStoreFactory(object):
+    """
+    Like the MongoClientFactory, only one Arctic store (and so one mongo client) is needed per Python process
+    and host. We also only need to initialise each library once.
+    """
+
+    def __init__(self):
+        self.stores = {}
+        self.initialised_library_keys = set()
+        self._lock = threading.Lock()
+
+    def get_store_and_library(self, host, library_name: str) -> tuple:
+        with self._lock:
+            store = self.stores.get(host, None)
+            if store is None:
+                # arctic is slow to import, so we wait until we need it
+                from arctic import Arctic
+
+                # Arctic doesn't accept a port
+                store = Arctic(host)
+                self.stores[host] = store
+
+            library_key = (host, library_name)
+            if library_key not in self.initialised_library_keys:
+                # will this fail if already exists??
+                store.initialize_library(library_name)
+                self.initialised_library_keys.add(library_key)
+
+        return store, store[library_name]
+
+    def reset(self):
+        # as MongoClientFactory.reset, for forked child processes
+        self.stores = {}
+        self.initialised_library_keys = set()
+        self._lock = threading.Lock()
+
+
+# Only need one of these
+arctic_store_factory = ArcticStoreFactory()
+
+
 class articData(object):
     """
     All of our ARCTIC mongo connections use this class (not static data which goes directly via mongo DB)
@@ -24,13 +76,8 @@ class articData(object):
         database_name = mongo_db.database_name
         host = mongo_db.host
 
-        # Arctic doesn't accept a port
-
-        store = Arctic(host)
         library_name = database_name + "." + collection_name
-        # will this fail if already exists??
-        store.initialize_library(library_name)
-        library = store[library_name]
+        store, library = arctic_store_factory.get_store_and_library(host, library_name)
 
         self.database_name = database_name
         self.collection_name = collection_name
@@ -51,11 +98,158 @@ class articData(object):
         item = self.library.read(ident)
         return pd.DataFrame(item.data)
 
-    def write(self, ident: str, data: pd.DataFrame):
-        self.library.write(ident, data)
+    def read_tail(self, ident: str, number_of_rows: int) -> pd.DataFrame:
+        """
+        At least the last number_of_rows rows (or everything, if there are fewer), without reading everything.
+
+        We can only ask arctic for a date range, so we guess the start from the metadata and read everything
+        if we guessed wrong.
+        """
+        metadata = self.read_metadata(ident)
+        if metadata.row_count <= number_of_rows:
+            return self.read(ident)
+
+        # guess assuming evenly spaced rows, with plenty of margin
+        proportion_of_rows = min(1.0, TAIL_MARGIN * number_of_rows / metadata.row_count)
+        start_date = metadata.last_timestamp - proportion_of_rows * (
+            metadata.last_timestamp - metadata.first_timestamp)
+
+        from arctic.date import DateRange
+
+        item = self.library.read(ident, date_range=DateRange(start=start_date))
+        data = pd.DataFrame(item.data)
+        if len(data) < number_of_rows:
+            return self.read(ident)
+
+        return data
+
+    def read_from_date(self, ident: str, start_date) -> pd.DataFrame:
+        """
+        Rows from start_date onwards, without reading everything before
+        """
+        from arctic.date import DateRange
+
+        item = self.library.read(ident, date_range=DateRange(start=start_date))
+        return pd.DataFrame(item.data)
+
+    def write(self, ident: str, data: pd.DataFrame, extra_metadata: dict = arg_not_supplied):
+        # arctic stores the metadata with the data, so it's always in step
+        metadata = timeSeriesMetadata.from_data(data)
+        self.library.write(ident, data, metadata=_metadata_dict_with_extras(metadata, extra_metadata))
+
+    def append(self, ident: str, new_data: pd.DataFrame, extra_metadata: dict = arg_not_supplied):
+        """
+        Add new_data to the end of what is stored, without rewriting it.
+
+        If new_data starts before the end of what is stored, we have to merge and rewrite everything
+
+        :param extra_metadata: dict, stored with the metadata until the next write or append (which drop it
+           unless they supply it again), so it can't get out of step with the data
+        """
+        if len(new_data) == 0:
+            return
+
+        if ident not in self.get_keynames():
+            self.write(ident, new_data, extra_metadata=extra_metadata)
+            return
+
+        metadata = self.read_metadata(ident)
+        if metadata.empty() or new_data.index[0] > metadata.last_timestamp:
+            new_metadata = metadata.after_append(new_data)
+            self.library.append(
+                ident, new_data, metadata=_metadata_dict_with_extras(new_metadata, extra_metadata))
+            return
+
+        # out of order, new data takes precedence
+        existing_data = self.read(ident)
+        merged_data = pd.concat([existing_data, new_data], axis=0)
+        merged_data = merged_data[~merged_data.index.duplicated(keep="last")]
+        merged_data = merged_data.sort_index()
+
+        self.write(ident, merged_data)
+
+    def write_or_append(self, ident: str, data: pd.DataFrame):
+        """
+        Store data, replacing whatever is there. If that is just the start of data, we append the rest
+        rather than rewriting everything
+        """
+        if ident not in self.get_keynames():
+            self.write(ident, data)
+            return
+
+        metadata = self.read_metadata(ident)
+        if _data_starts_with_stored_data(data, metadata):
+            new_data = data.iloc[metadata.row_count:]
+            self.library.append(ident, new_data, metadata=metadata.after_append(new_data).as_dict())
+        else:
+            self.write(ident, data)
+
+    def read_metadata(self, ident: str) -> timeSeriesMetadata:
+        """
+        Metadata for one symbol, without reading the data (unless it was written before we stored metadata; it
+        will be stored the next time the symbol is written)
+        """
+        metadata_dict = self.library.read_metadata(ident).metadata
+        if timeSeriesMetadata.is_valid_dict(metadata_dict):
+            return timeSeriesMetadata.from_dict(metadata_dict)
+
+        return timeSeriesMetadata.from_stored_data(self.read(ident))
+
+    def read_extra_metadata(self, ident: str, key: str):
+        """
+        :return: whatever was stored under key with extra_metadata, or missing_data
+        """
+        metadata_dict = self.library.read_metadata(ident).metadata
+        if metadata_dict is None:
+            return missing_data
+
+        return metadata_dict.get(key, missing_data)
+
+    def get_metadata_for_all_keys(self) -> dictOfTimeSeriesMetadata:
+        # arctic can't read the metadata for several symbols at once, so this is a small read per symbol
+        return dictOfTimeSeriesMetadata.from_keys(self.get_keynames(), self.read_metadata)
 
     def get_keynames(self) -> list:
         return self.library.list_symbols()
 
     def delete(self, ident: str):
-        self.library.delete(ident)
\ No newline at end of file
+        self.library.delete(ident)
+
+
+def spike_check_state_as_extra_metadata(spike_check_state: spikeCheckState) -> dict:
+    if spike_check_state is missing_data:
+        return {}
+
+    return {SPIKE_CHECK_STATE_KEY: spike_check_state.as_dict()}
+
+
+def spike_check_state_from_extra_metadata(spike_check_state_dict) -> spikeCheckState:
+    if spike_check_state_dict is missing_data:
+        return missing_data
+
+    return spikeCheckState.from_dict(spike_check_state_dict)
+
+
+def _metadata_dict_with_extras(metadata: timeSeriesMetadata, extra_metadata: dict = arg_not_supplied) -> dict:
+    metadata_dict = metadata.as_dict()
+    if extra_metadata is not arg_not_supplied:
+        metadata_dict.update(extra_metadata)
+
+    return metadata_dict
+
+
+def _data_starts_with_stored_data(data: pd.DataFrame, metadata: timeSeriesMetadata) -> bool:
+    if metadata.empty() or len(data) <= metadata.row_count:
+        return False
+
+    stored_rows = data.iloc[:metadata.row_count]
+    if _as_timestamp(stored_rows.index[0]) != _as_timestamp(metadata.first_timestamp):
+        return False
+    if _as_timestamp(stored_rows.index[-1]) != _as_timestamp(metadata.last_timestamp):
+        return False
+
+    return checksum_for_data(stored_rows) == metadata.checksum
+
+
+def _as_timestamp(index_value):
+    return pd.Timestamp(index_value)
@@ -3,9 +3,15 @@ Read and write data from mongodb for individual futures contracts
 
 """
 
-from sysdata.arctic.arctic_connection import articData
+import datetime
+
+from sysdata.arctic.arctic_connection import articData, SPIKE_CHECK_STATE_KEY, \
+    spike_check_state_as_extra_metadata, spike_check_state_from_extra_metadata
+from syscore.objects import missing_data
+from syscore.pdutils import spikeCheckState
 from sysdata.futures.futures_per_contract_prices import futuresContractPriceData, listOfFuturesContracts
 from sysobjects.futures_per_contract_prices import futuresContractPrices
+from sysobjects.time_series_metadata import timeSeriesMetadata
 from sysobjects.contracts import futuresContract, get_code_and_id_from_contract_key
 from syslogdiag.log import logtoscreen
 
@@ -52,6 +58,49 @@ class arcticFuturesContractPriceData(futuresContractPriceData):
 
         return futuresContractPrices(data)
 
+    def _get_tail_of_prices_for_contract_object_no_checking(self,
+                                                            futures_contract_object: futuresContract,
+                                                            number_of_rows: int) -> futuresContractPrices:
+        ident = from_contract_to_key(futures_contract_object)
+        data = self.arctic_connection.read_tail(ident, number_of_rows)
+
+        return futuresContractPrices(data.tail(number_of_rows))
+
+    def _get_prices_for_contract_object_from_date_no_checking(self,
+                                                              futures_contract_object: futuresContract,
+                                                              start_date: datetime.datetime) -> futuresContractPrices:
+        ident = from_contract_to_key(futures_contract_object)
+        data = self.arctic_connection.read_from_date(ident, start_date)
+
+        return futuresContractPrices(data)
+
+    def _append_prices_for_contract_object_no_checking(self,
+                                                       futures_contract_object: futuresContract,
+                                                       new_prices: futuresContractPrices,
+                                                       spike_check_state: spikeCheckState = missing_data):
+        log = futures_contract_object.log(self.log)
+        ident = from_contract_to_key(futures_contract_object)
+
+        self.arctic_connection.append(ident, pd.DataFrame(new_prices),
+                                      extra_metadata=spike_check_state_as_extra_metadata(spike_check_state))
+
+        log.msg("Appended %s lines of prices for %s to %s" %
+                     (len(new_prices),
+                      str(futures_contract_object.key), str(self)))
+
+    def _get_spike_check_state_for_contract_object_no_checking(self,
+                                                               futures_contract_object: futuresContract) -> spikeCheckState:
+        ident = from_contract_to_key(futures_contract_object)
+        spike_check_state_dict = self.arctic_connection.read_extra_metadata(ident, SPIKE_CHECK_STATE_KEY)
+
+        return spike_check_state_from_extra_metadata(spike_check_state_dict)
+
+    def _get_metadata_for_contract_object_no_checking(self,
+                                                      futures_contract_object: futuresContract) -> timeSeriesMetadata:
+        ident = from_contract_to_key(futures_contract_object)
+
+        return self.arctic_connection.read_metadata(ident)
+
     def _write_prices_for_contract_object_no_checking(self,
                                                       futures_contract_object: futuresContract,
                                                       futures_price_data: futuresContractPrices):
@@ -2,12 +2,15 @@
 Read and write data from mongodb for 'multiple prices'
 
 """
+import datetime
+
 import pandas as pd
 from sysdata.arctic.arctic_connection import articData
 from sysdata.futures.multiple_prices import (
     futuresMultiplePricesData,
 )
 from sysobjects.multiple_prices import futuresMultiplePrices
+from sysobjects.time_series_metadata import timeSeriesMetadata
 from sysobjects.dict_of_named_futures_per_contract_prices import list_of_price_column_names, \
      contract_name_from_column_name
 from syslogdiag.log import logtoscreen
@@ -48,6 +51,15 @@ class arcticFuturesMultiplePricesData(futuresMultiplePricesData):
 
         return futuresMultiplePrices(data)
 
+    def _get_multiple_prices_from_date_without_checking(
+            self, instrument_code: str, start_date: datetime.datetime) -> futuresMultiplePrices:
+        data = self.arctic.read_from_date(instrument_code, start_date)
+
+        return futuresMultiplePrices(data)
+
+    def _get_metadata_for_instrument_without_checking(self, instrument_code: str) -> timeSeriesMetadata:
+        return self.arctic.read_metadata(instrument_code)
+
     def _delete_multiple_prices_without_any_warning_be_careful(
             self, instrument_code: str):
 
@@ -63,7 +75,8 @@ class arcticFuturesMultiplePricesData(futuresMultiplePricesData):
         multiple_price_data_aspd = pd.DataFrame(multiple_price_data_object)
         multiple_price_data_aspd = _change_contracts_to_str(multiple_price_data_aspd)
 
-        self.arctic.write(instrument_code, multiple_price_data_aspd)
+        # appends if only new rows have been added
+        self.arctic.write_or_append(instrument_code, multiple_price_data_aspd)
         self.log.msg(
             "Wrote %s lines of prices for %s to %s"
             % (len(multiple_price_data_aspd), instrument_code, str(self)), instrument_code = instrument_code
@@ -0,0 +1,44 @@
+from sysdata.production.pandl import pandlData
+from sysdata.arctic.arctic_connection import articData
+from syslogdiag.log import logtoscreen
+import pandas as pd
+
+PANDL_COLLECTION = "materialised_pandl"
+
+
+class arcticPandlData(pandlData):
+    """
+    Class to read / write materialised p&l series to and from arctic
+    """
+
+    def __init__(self, mongo_db=None, log=logtoscreen("arcticPandlData")):
+
+        super().__init__(log=log)
+        self._arctic = articData(PANDL_COLLECTION, mongo_db=mongo_db)
+
+    @property
+    def arctic(self):
+        return self._arctic
+
+    def __repr__(self):
+        return "Arctic connection for materialised p&l, %s/%s @ %s " % (
+            self.arctic.database_name,
+            self.arctic.collection_name,
+            self.arctic.host,
+        )
+
+    def get_list_of_keys(self) -> list:
+        return self.arctic.get_keynames()
+
+    def _get_pandl_series_without_checking(self, key: str) -> pd.Series:
+        pandl_data = self.arctic.read(key)
+
+        return pandl_data[pandl_data.columns[0]]
+
+    def _write_pandl_series_without_checking(self, key: str, pandl_series: pd.Series):
+        pandl_series_aspd = pd.Series(pandl_series).astype(float)
+        self.arctic.write(key, pandl_series_aspd)
+
+    def _delete_pandl_series_without_any_warning_be_careful(self, key: str):
+        self.arctic.delete(key)
+        self.log.msg("Deleted p&l for %s from %s" % (key, str(self)))
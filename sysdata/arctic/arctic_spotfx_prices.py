@@ -1,6 +1,10 @@
 from sysdata.fx.spotfx import fxPricesData
 from sysobjects.spot_fx_prices import fxPrices
-from sysdata.arctic.arctic_connection import articData
+from sysobjects.time_series_metadata import timeSeriesMetadata
+from sysdata.arctic.arctic_connection import articData, SPIKE_CHECK_STATE_KEY, \
+    spike_check_state_as_extra_metadata, spike_check_state_from_extra_metadata
+from syscore.objects import missing_data
+from syscore.pdutils import spikeCheckState
 from syslogdiag.log import logtoscreen
 import pandas as pd
 
@@ -38,6 +42,33 @@ class arcticFxPricesData(fxPricesData):
 
         return fx_prices
 
+    def _get_tail_of_fx_prices_without_checking(self, currency_code: str, number_of_rows: int) -> fxPrices:
+        fx_data = self.arctic.read_tail(currency_code, number_of_rows)
+
+        fx_prices = fxPrices(fx_data[fx_data.columns[0]].tail(number_of_rows))
+
+        return fx_prices
+
+    def _append_fx_prices_without_checking(self, currency_code: str, new_fx_prices: fxPrices,
+                                           spike_check_state: spikeCheckState = missing_data):
+        self.log.label(currency_code=currency_code)
+        new_fx_prices_aspd = pd.Series(new_fx_prices).astype(float)
+
+        self.arctic.append(currency_code, new_fx_prices_aspd,
+                           extra_metadata=spike_check_state_as_extra_metadata(spike_check_state))
+        self.log.msg(
+            "Appended %s lines of prices for %s to %s"
+            % (len(new_fx_prices), currency_code, str(self)), fx_code = currency_code
+        )
+
+    def _get_spike_check_state_for_fx_code_without_checking(self, currency_code: str) -> spikeCheckState:
+        spike_check_state_dict = self.arctic.read_extra_metadata(currency_code, SPIKE_CHECK_STATE_KEY)
+
+        return spike_check_state_from_extra_metadata(spike_check_state_dict)
+
+    def _get_metadata_for_fx_code_without_checking(self, currency_code: str) -> timeSeriesMetadata:
+        return self.arctic.read_metadata(currency_code)
+
     def _delete_fx_prices_without_any_warning_be_careful(self, currency_code: str):
         self.log.label(currency_code=currency_code)
         self.arctic.delete(currency_code)
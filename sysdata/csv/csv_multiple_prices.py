@@ -1,3 +1,4 @@
+import numpy as np
 import pandas as pd
 from sysdata.futures.multiple_prices import (
     futuresMultiplePricesData,
@@ -45,8 +46,8 @@ class csvFuturesMultiplePricesData(futuresMultiplePricesData):
 
         instr_all_price_data = self._read_instrument_prices(instrument_code)
         for contract_col_name in list_of_contract_column_names:
-            instr_all_price_data[contract_col_name] = instr_all_price_data[contract_col_name].apply(
-            str_of_int)
+            instr_all_price_data[contract_col_name] = _str_of_int_for_column(
+                instr_all_price_data[contract_col_name])
 
         return futuresMultiplePrices(instr_all_price_data)
 
@@ -85,3 +86,14 @@ class csvFuturesMultiplePricesData(futuresMultiplePricesData):
 
         return filename
 
+
+def _str_of_int_for_column(contract_column: pd.Series) -> np.array:
+    # There are only a few different contracts, so only convert each of them once
+    codes, unique_contracts = pd.factorize(contract_column)
+
+    # factorize gives missing values a code of -1, which picks out the last item here
+    unique_contracts_as_str = np.array(
+        [str_of_int(contract) for contract in unique_contracts] + [str_of_int(np.nan)],
+        dtype=object)
+
+    return unique_contracts_as_str[codes]
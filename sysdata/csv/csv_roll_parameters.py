@@ -58,10 +58,11 @@ class csvRollParametersData(rollParametersData):
         ).loc[instrument_code]
         roll_parameters_object = rollParameters(
             hold_rollcycle=config_for_this_instrument.HoldRollCycle,
-            roll_offset_day=config_for_this_instrument.RollOffsetDays,
-            carry_offset=config_for_this_instrument.CarryOffset,
+            # numpy ints from pandas, which datetime.timedelta won't accept
+            roll_offset_day=int(config_for_this_instrument.RollOffsetDays),
+            carry_offset=int(config_for_this_instrument.CarryOffset),
             priced_rollcycle=config_for_this_instrument.PricedRollCycle,
-            approx_expiry_offset=config_for_this_instrument.ExpiryOffset,
+            approx_expiry_offset=int(config_for_this_instrument.ExpiryOffset),
         )
 
         return roll_parameters_object
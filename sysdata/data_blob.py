@@ -1,12 +1,14 @@
+import threading
 from copy import copy
 
-from sysbrokers.IB.ib_connection import connectionIB
 from syscore.objects import arg_not_supplied
 from sysdata.mongodb.mongo_connection import mongoDb
 from sysdata.mongodb.mongo_log import logToMongod
 from syslogdiag.log import logger
 
 from sysdata.mongodb.mongo_IB_client_id import mongoIbBrokerClientIdData
+from sysdata.mongodb.mongo_IB_contract_metadata_cache import mongoIbContractMetadataCacheData
+from sysdata.read_cache import readCache
 
 class dataBlob(object):
     def __init__(
@@ -14,10 +16,12 @@ class dataBlob(object):
         class_list: list=arg_not_supplied,
         log_name: str="",
         csv_data_paths: dict=arg_not_supplied,
-        ib_conn: connectionIB=arg_not_supplied,
+        ib_conn: "connectionIB"=arg_not_supplied,
         mongo_db: mongoDb=arg_not_supplied,
         log: logger=arg_not_supplied,
         keep_original_prefix: bool=False,
+        use_read_cache: bool=False,
+        lazy: bool=True,
     ):
         """
         Set up of a data pipeline with standard attribute names, logging, links to DB etc
@@ -51,18 +55,32 @@ class dataBlob(object):
             data.mongo_futures_contract = mongoFuturesContractData(mongo_db=mongo_db,
                                                    log = log.setup(component="mongoFuturesContractData"))
 
+        :param use_read_cache: bool. If True then reads through production data accessors (diagPrices and so on)
+           built on this blob are cached; see sysdata.read_cache
 
+        :param lazy: bool. If True (the default) adding a class just registers it, and the instance (with its
+           database collections, broker connection...) is only created when the attribute is first used.
+           Adding a class that is already there does nothing. If False instances are created straight away,
+           so errors (eg IB gateway not running) show up then.
 
         """
 
         self._mongo_db = mongo_db
         self._ib_conn = ib_conn
+        # only client ids we allocated are released on close; a passed connection's id belongs to the caller
+        self._allocated_ib_client_id = False
         self._log = log
         self._log_name = log_name
         self._csv_data_paths = csv_data_paths
         self._keep_original_prefix = keep_original_prefix
+        self._read_cache = readCache(active=use_read_cache)
+        self._lazy = lazy
+        self._parent = arg_not_supplied
 
         self._attr_list = []
+        # attribute name: class object, for lazy attributes
+        self._lazy_class_objects = {}
+        self._lazy_lock = threading.RLock()
 
         if class_list is arg_not_supplied:
             # can set up dynamically later
@@ -73,17 +91,101 @@ class dataBlob(object):
         self._original_data = copy(self)
 
     def __repr__(self):
-        return "dataBlob with elements: %s" % ",".join(self._attr_list)
+        uninitialised_attributes = self.uninitialised_attributes()
+        if len(uninitialised_attributes) == 0:
+            return "dataBlob with elements: %s" % ",".join(self._attr_list)
 
+        return "dataBlob with elements: %s (not yet initialised: %s)" % (
+            ",".join(self.initialised_attributes()), ",".join(uninitialised_attributes))
+
+    def __getattr__(self, attr_name: str):
+        # only called if attr_name isn't already an attribute, so lazy attributes are built on first use
+        lazy_class_objects = self.__dict__.get("_lazy_class_objects", {})
+        class_object = lazy_class_objects.get(attr_name, None)
+        if class_object is None:
+            raise AttributeError(
+                "'%s' object has no attribute '%s'" % (type(self).__name__, attr_name))
+
+        return self._build_lazy_attribute(attr_name, class_object)
+
+    def initialised_attributes(self) -> list:
+        """
+        For debugging: what we've actually created
+        """
+        return [attr_name for attr_name in self._attr_list if attr_name in self.__dict__]
+
+    def uninitialised_attributes(self) -> list:
+        """
+        For debugging: lazy attributes which have been added, but not used yet
+        """
+        return [attr_name for attr_name in self._attr_list if attr_name not in self.__dict__]
 
     def add_class_list(self, class_list: list):
         for class_object in class_list:
             self.add_class_object(class_object)
 
     def add_class_object(self, class_object):
-        resolved_instance = self._get_resolved_instance_of_class(class_object)
-        class_name = get_class_name(class_object)
-        self._resolve_names_and_add(resolved_instance, class_name)
+        if self._lazy:
+            self._register_lazy_class_object(class_object)
+        else:
+            resolved_instance = self._get_resolved_instance_of_class(class_object)
+            class_name = get_class_name(class_object)
+            self._resolve_names_and_add(resolved_instance, class_name)
+
+    def _register_lazy_class_object(self, class_object):
+        # check now that we know how to add it, rather than on first use
+        self._get_class_adding_method(class_object)
+        attr_name = self._get_new_name(get_class_name(class_object))
+
+        with self._lazy_lock:
+            if self._lazy_class_objects.get(attr_name, None) is class_object:
+                # already have it, possibly already built
+                return
+
+            # a different class for the same attribute replaces anything we already have
+            self.__dict__.pop(attr_name, None)
+            self._lazy_class_objects[attr_name] = class_object
+            if attr_name not in self._attr_list:
+                self._add_attr_to_list(attr_name)
+
+    def _build_lazy_attribute(self, attr_name: str, class_object):
+        # reports running in threads can share a dataBlob, so only one of them builds each attribute
+        with self._lazy_lock:
+            resolved_instance = self.__dict__.get(attr_name, None)
+            if resolved_instance is None:
+                resolved_instance = self._get_resolved_instance_of_class(class_object)
+                setattr(self, attr_name, resolved_instance)
+
+        return resolved_instance
+
+    def child_blob(self, log_name: str = "", class_list: list = arg_not_supplied,
+                   share_read_cache: bool = False) -> "dataBlob":
+        """
+        A new dataBlob, eg for one of the things a process does, which shares our mongo database, csv paths and
+        (when either first needs it) broker connection. The broker connection is ours, so closing the child
+        leaves it open.
+
+        :param log_name: str
+        :param class_list: list of classes to add
+        :param share_read_cache: bool. If True the child uses our read cache (so switching it on or off in the
+           child does the same for us), otherwise it has its own
+        :return: dataBlob
+        """
+        child_data = dataBlob(
+            class_list=arg_not_supplied,
+            log_name=log_name,
+            csv_data_paths=self.csv_data_paths,
+            mongo_db=self.mongo_db,
+            keep_original_prefix=self._keep_original_prefix,
+            lazy=self._lazy,
+        )
+        child_data._parent = self
+        if share_read_cache:
+            child_data._read_cache = self.read_cache
+        if class_list is not arg_not_supplied:
+            child_data.add_class_list(class_list)
+
+        return child_data
 
     def _get_resolved_instance_of_class(self, class_object):
         class_adding_method = self._get_class_adding_method(class_object)
@@ -229,24 +331,48 @@ class dataBlob(object):
     def close(self):
         if self._ib_conn is not arg_not_supplied:
             self.ib_conn.close_connection()
-            self.db_ib_broker_client_id.release_clientid(
-                self.ib_conn.client_id())
+            if self._allocated_ib_client_id:
+                self.db_ib_broker_client_id.release_clientid(
+                    self.ib_conn.client_id())
 
         # No need to explicitly close Mongo connections; handled by Python garbage collection
 
     @property
     def ib_conn(self):
         ib_conn = getattr(self, "_ib_conn", arg_not_supplied)
+        if ib_conn is arg_not_supplied and self._parent is not arg_not_supplied:
+            # shared, and closed by the parent
+            return self._parent.ib_conn
+
         if ib_conn is arg_not_supplied:
 
+            # ib_insync is slow to import, and most processes never talk to the broker
+            from sysbrokers.IB.ib_connection import connectionIB
+
             ## default to tracking ID through mongo change if required
             self.add_class_object(mongoIbBrokerClientIdData)
             client_id = self.db_ib_broker_client_id.return_valid_client_id()
-            ib_conn = connectionIB(client_id, log=self.log)
+
+            # resolved contracts, tick sizes etc are shared by all processes
+            self.add_class_object(mongoIbContractMetadataCacheData)
+            ib_conn = connectionIB(
+                client_id, log=self.log,
+                contract_metadata_cache=self.db_ib_contract_metadata_cache)
             self._ib_conn = ib_conn
+            self._allocated_ib_client_id = True
 
         return ib_conn
 
+    @property
+    def read_cache(self) -> readCache:
+        return self._read_cache
+
+    def enable_read_cache(self, default_ttl_seconds: float=arg_not_supplied):
+        self.read_cache.enable(default_ttl_seconds=default_ttl_seconds)
+
+    def disable_read_cache(self):
+        self.read_cache.disable()
+
     @property
     def mongo_db(self):
         mongo_db = getattr(self, "_mongo_db", arg_not_supplied)
@@ -263,6 +389,11 @@ class dataBlob(object):
     @property
     def log(self):
         log = getattr(self, "_log", arg_not_supplied)
+        if log is arg_not_supplied and self._parent is not arg_not_supplied:
+            # writes to the same place as our parent's log, but with our own label
+            log = self._parent.log.setup(type=self.log_name)
+            self._log = log
+
         if log is arg_not_supplied:
             log = logToMongod(self.log_name, mongo_db=self.mongo_db, data = self)
             log.set_logging_level("on")
@@ -272,7 +403,7 @@ class dataBlob(object):
 
     @property
     def log_name(self) -> str:
-        log_name = getattr(self, "_logname", "")
+        log_name = getattr(self, "_log_name", "")
         return log_name
 
 
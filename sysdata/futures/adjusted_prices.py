@@ -8,6 +8,7 @@ Adjusted prices:
 
 from sysdata.base_data import baseData
 from sysobjects.adjusted_prices import futuresAdjustedPrices
+from sysobjects.time_series_metadata import timeSeriesMetadata, dictOfTimeSeriesMetadata
 
 USE_CHILD_CLASS_ERROR = "You need to use a child class of futuresAdjustedPricesData"
 
@@ -57,6 +58,21 @@ class futuresAdjustedPricesData(baseData):
                 , instrument_code=instrument_code
             )
 
+    def get_metadata_for_instrument(self, instrument_code: str) -> timeSeriesMetadata:
+        if self.is_code_in_data(instrument_code):
+            return self._get_metadata_for_instrument_without_checking(instrument_code)
+        else:
+            return timeSeriesMetadata.create_empty()
+
+    def get_metadata_for_all_instruments(self) -> dictOfTimeSeriesMetadata:
+        return dictOfTimeSeriesMetadata.from_keys(
+            self.get_list_of_instruments(), self._get_metadata_for_instrument_without_checking)
+
+    def _get_metadata_for_instrument_without_checking(self, instrument_code: str) -> timeSeriesMetadata:
+        # override if the metadata is stored
+        return timeSeriesMetadata.from_stored_data(
+            self._get_adjusted_prices_without_checking(instrument_code))
+
     def is_code_in_data(self, instrument_code: str) -> bool:
         if instrument_code in self.get_list_of_instruments():
             return True
@@ -1,10 +1,16 @@
+import datetime
+import pandas as pd
+
 from sysdata.base_data import baseData
-from syscore.objects import data_error
+from sysdata.private_config import get_private_then_default_key_value
+from syscore.objects import data_error, missing_data
+from syscore.pdutils import spikeCheckState, first_spike_in_new_data, spike_check_state_at_end_of_data
 
 from sysobjects.contracts import futuresContract, listOfFuturesContracts
 from sysobjects.contract_dates_and_expiries import listOfContractDateStr
-from sysobjects.futures_per_contract_prices import futuresContractPrices
+from sysobjects.futures_per_contract_prices import futuresContractPrices, FINAL_COLUMN
 from sysobjects.dict_of_futures_per_contract_prices import dictFuturesContractPrices
+from sysobjects.time_series_metadata import timeSeriesMetadata, dictOfTimeSeriesMetadata
 
 from syslogdiag.log import logtoscreen
 
@@ -136,6 +142,96 @@ class futuresContractPriceData(baseData):
             return futuresContractPrices.create_empty()
 
 
+    def get_metadata_for_contract_object(self, contract_object: futuresContract) -> timeSeriesMetadata:
+        if self.has_data_for_contract(contract_object):
+            return self._get_metadata_for_contract_object_no_checking(
+                contract_object)
+        else:
+            return timeSeriesMetadata.create_empty()
+
+    def get_metadata_for_all_contracts_for_instrument(self, instrument_code: str) -> dictOfTimeSeriesMetadata:
+        """
+        :param instrument_code: str
+        :return: dictOfTimeSeriesMetadata, keys are contract date str
+        """
+        list_of_contracts = self.contracts_with_price_data_for_instrument_code(instrument_code)
+        dict_of_metadata = dictOfTimeSeriesMetadata(
+            [
+                (
+                    contract.date_str,
+                    self._get_metadata_for_contract_object_no_checking(contract),
+                )
+                for contract in list_of_contracts
+            ]
+        )
+
+        return dict_of_metadata
+
+    def _get_metadata_for_contract_object_no_checking(self, contract_object: futuresContract) -> timeSeriesMetadata:
+        # override if the metadata is stored
+        return timeSeriesMetadata.from_stored_data(
+            self._get_prices_for_contract_object_no_checking(contract_object))
+
+    def get_prices_for_contract_object_from_date(
+            self, contract_object: futuresContract, start_date: datetime.datetime) -> futuresContractPrices:
+        """
+        Prices from start_date onwards
+
+        :param contract_object:  futuresContract
+        :param start_date: datetime
+        :return: data
+        """
+        if self.has_data_for_contract(contract_object):
+            return self._get_prices_for_contract_object_from_date_no_checking(
+                contract_object, start_date=start_date)
+        else:
+            return futuresContractPrices.create_empty()
+
+    def _get_prices_for_contract_object_from_date_no_checking(
+            self, contract_object: futuresContract, start_date: datetime.datetime) -> futuresContractPrices:
+        # override if the data source can read just part of the data
+        prices = self._get_prices_for_contract_object_no_checking(contract_object)
+
+        return futuresContractPrices(prices[prices.index >= start_date])
+
+    def get_tail_of_prices_for_contract_object(
+            self, contract_object: futuresContract, number_of_rows: int) -> futuresContractPrices:
+        """
+        At least the last number_of_rows of prices, if there are that many
+
+        :param contract_object:  futuresContract
+        :param number_of_rows: int
+        :return: data
+        """
+        if self.has_data_for_contract(contract_object):
+            return self._get_tail_of_prices_for_contract_object_no_checking(
+                contract_object, number_of_rows=number_of_rows)
+        else:
+            return futuresContractPrices.create_empty()
+
+    def _get_tail_of_prices_for_contract_object_no_checking(
+            self, contract_object: futuresContract, number_of_rows: int) -> futuresContractPrices:
+        # override if the data source can read just the end of the data
+        prices = self._get_prices_for_contract_object_no_checking(contract_object)
+
+        return futuresContractPrices(prices.tail(number_of_rows))
+
+    def _append_prices_for_contract_object_no_checking(
+            self, contract_object: futuresContract, new_prices: futuresContractPrices,
+            spike_check_state: spikeCheckState = missing_data):
+        # override if the data source can append, and store spike_check_state; otherwise we rewrite everything
+        old_prices = self.get_prices_for_contract_object(contract_object)
+        merged_prices = futuresContractPrices(
+            pd.concat([pd.DataFrame(old_prices), pd.DataFrame(new_prices)], axis=0))
+
+        self._write_prices_for_contract_object_no_checking(
+            contract_object, merged_prices)
+
+    def _get_spike_check_state_for_contract_object_no_checking(
+            self, contract_object: futuresContract) -> spikeCheckState:
+        # override if the data source can store it; otherwise we work it out from the end of the prices
+        return missing_data
+
     def get_prices_at_frequency_for_contract_object(
             self, contract_object: futuresContract, freq: str="D"):
         """
@@ -190,24 +286,23 @@ class futuresContractPriceData(baseData):
         check_for_spike: bool=True,
     ) -> int:
         """
-        Reads existing data, merges with new_futures_prices, writes merged data
+        Reads the end of the existing data, merges with new_futures_prices, appends the new rows
+
+        Only the new rows are checked for spikes, carrying on from where the check got to at the end of the
+        existing data
 
         :param new_futures_prices:
         :return: int, number of rows
         """
         new_log = contract_object.log(self.log)
 
-        old_prices = self.get_prices_for_contract_object(
-            contract_object)
+        # we only need enough existing data to check for spikes
+        old_prices = self.get_tail_of_prices_for_contract_object(
+            contract_object, number_of_rows=get_private_then_default_key_value("price_update_tail_rows"))
         merged_prices = old_prices.add_rows_to_existing_data(
-            new_futures_per_contract_prices, check_for_spike=check_for_spike
+            new_futures_per_contract_prices, check_for_spike=False
         )
 
-        if merged_prices is data_error:
-            new_log.msg(
-                "Price has moved too much - will need to manually check - no price updated done")
-            return data_error
-
         rows_added = len(merged_prices) - len(old_prices)
 
         if rows_added == 0:
@@ -219,9 +314,24 @@ class futuresContractPriceData(baseData):
                         str(old_prices.index[-1]))
             return 0
 
-        # We have guaranteed no duplication
-        self.write_prices_for_contract_object(
-            contract_object, merged_prices, ignore_duplication=True
+        # We have guaranteed these are all after the existing data
+        new_prices = futuresContractPrices(merged_prices.iloc[len(old_prices):])
+
+        spike_check_state = spike_check_state_at_end_of_data(
+            old_prices,
+            stored_spike_check_state=self._get_spike_check_state_for_contract_object_no_checking(contract_object),
+            column_to_check=FINAL_COLUMN,
+        )
+        first_spike, new_spike_check_state = first_spike_in_new_data(
+            spike_check_state, new_prices, column_to_check=FINAL_COLUMN
+        )
+        if check_for_spike and first_spike is not None:
+            new_log.msg(
+                "Price has moved too much - will need to manually check - no price updated done")
+            return data_error
+
+        self._append_prices_for_contract_object_no_checking(
+            contract_object, new_prices, spike_check_state=new_spike_check_state
         )
 
         new_log.msg("Added %d additional rows of data" % rows_added)
@@ -9,12 +9,14 @@ We require these to calculate back adjusted prices and also to work out carry
 
 They can be stored, or worked out 'on the fly'
 """
+import datetime
 
 from sysdata.base_data import baseData
 from syscore.objects import success, failure, status
 
 # These are used when inferring prices in an incomplete series
 from sysobjects.multiple_prices import futuresMultiplePrices
+from sysobjects.time_series_metadata import timeSeriesMetadata, dictOfTimeSeriesMetadata
 
 USE_CHILD_CLASS_ERROR = "You need to use a child class of futuresMultiplePricesData"
 
@@ -42,6 +44,12 @@ class futuresMultiplePricesData(baseData):
         else:
             return futuresMultiplePrices.create_empty()
 
+    def get_multiple_prices_from_date(self, instrument_code: str, start_date: datetime.datetime) -> futuresMultiplePrices:
+        if self.is_code_in_data(instrument_code):
+            return self._get_multiple_prices_from_date_without_checking(instrument_code, start_date)
+        else:
+            return futuresMultiplePrices.create_empty()
+
     def delete_multiple_prices(self, instrument_code: str, are_you_sure=False) -> status:
         log = self.log.setup(instrument_code=instrument_code)
 
@@ -69,6 +77,27 @@ class futuresMultiplePricesData(baseData):
             )
             return failure
 
+    def get_metadata_for_instrument(self, instrument_code: str) -> timeSeriesMetadata:
+        if self.is_code_in_data(instrument_code):
+            return self._get_metadata_for_instrument_without_checking(instrument_code)
+        else:
+            return timeSeriesMetadata.create_empty()
+
+    def get_metadata_for_all_instruments(self) -> dictOfTimeSeriesMetadata:
+        return dictOfTimeSeriesMetadata.from_keys(
+            self.get_list_of_instruments(), self._get_metadata_for_instrument_without_checking)
+
+    def _get_metadata_for_instrument_without_checking(self, instrument_code: str) -> timeSeriesMetadata:
+        # override if the metadata is stored
+        return timeSeriesMetadata.from_stored_data(
+            self._get_multiple_prices_without_checking(instrument_code))
+
+    def _get_multiple_prices_from_date_without_checking(
+            self, instrument_code: str, start_date: datetime.datetime) -> futuresMultiplePrices:
+        # override if the data source can read just part of the data
+        multiple_prices = self._get_multiple_prices_without_checking(instrument_code)
+
+        return futuresMultiplePrices(multiple_prices[multiple_prices.index >= start_date])
 
     def is_code_in_data(self, instrument_code: str) -> bool:
         if instrument_code in self.get_list_of_instruments():
@@ -89,6 +118,15 @@ class futuresMultiplePricesData(baseData):
                     instrument_code)
                 return failure
 
+        if multiple_price_data.has_float32_prices():
+            log.error(
+                "Can't write float32 multiple prices for %s, as they have lost precision" %
+                instrument_code)
+            return failure
+
+        # compact contract columns are stored as ordinary strings
+        multiple_price_data = multiple_price_data.as_full()
+
         self._add_multiple_prices_without_checking_for_existing_entry(
             instrument_code, multiple_price_data
         )
@@ -4,20 +4,25 @@ Spot fx prices
 
 import pandas as pd
 import datetime
+from functools import lru_cache
 
 from sysdata.base_data import baseData
-from syscore.objects import data_error
+from syscore.objects import data_error, missing_data
+from syscore.pdutils import spikeCheckState, first_spike_in_new_data, spike_check_state_at_end_of_data
 
 from sysobjects.spot_fx_prices import fxPrices, get_fx_tuple_from_code, DEFAULT_CURRENCY
+from sysobjects.time_series_metadata import timeSeriesMetadata, dictOfTimeSeriesMetadata
 from sysdata.private_config import get_private_then_default_key_value
 
 
-DEFAULT_DATES = pd.date_range(
-    start=datetime.datetime(1970, 1, 1), freq="B", end=datetime.datetime.now()
-)
-DEFAULT_RATE_SERIES = pd.Series(
-    [1.0] * len(DEFAULT_DATES),
-    index=DEFAULT_DATES)
+@lru_cache(maxsize=1)
+def get_default_rate_series() -> pd.Series:
+    # Built the first time it's needed rather than on import, which costs every process that imports this
+    default_dates = pd.date_range(
+        start=datetime.datetime(1970, 1, 1), freq="B", end=datetime.datetime.now()
+    )
+
+    return pd.Series([1.0] * len(default_dates), index=default_dates)
 
 USE_CHILD_CLASS_ERROR = "You need to use a child class of fxPricesData"
 
@@ -51,7 +56,7 @@ class fxPricesData(baseData):
 
         if currency1 == currency2:
             # Trivial, just a bunch of 1's
-            fx_data = DEFAULT_RATE_SERIES
+            fx_data = get_default_rate_series()
 
         elif currency2 == DEFAULT_CURRENCY:
             # We ought to have data
@@ -157,6 +162,22 @@ class fxPricesData(baseData):
             self.log.warn(
                 "You need to call delete_fx_prices with a flag to be sure")
 
+    def get_metadata_for_fx_code(self, code: str) -> timeSeriesMetadata:
+        # only for codes we store, not crosses or inversions
+        if self.is_code_in_data(code):
+            return self._get_metadata_for_fx_code_without_checking(code)
+        else:
+            return timeSeriesMetadata.create_empty()
+
+    def get_metadata_for_all_fx_codes(self) -> dictOfTimeSeriesMetadata:
+        return dictOfTimeSeriesMetadata.from_keys(
+            self.get_list_of_fxcodes(), self._get_metadata_for_fx_code_without_checking)
+
+    def _get_metadata_for_fx_code_without_checking(self, code: str) -> timeSeriesMetadata:
+        # override if the metadata is stored
+        return timeSeriesMetadata.from_stored_data(
+            self._get_fx_prices_without_checking(code))
+
     def is_code_in_data(self, code: str) ->bool:
         if code in self.get_list_of_fxcodes():
             return True
@@ -183,20 +204,22 @@ class fxPricesData(baseData):
         """
         Checks existing data, adds any new data with a timestamp greater than the existing data
 
+        Only the new rows are checked for spikes, carrying on from where the check got to at the end of the
+        existing data
+
         :param code: FX code
         :param new_fx_prices: fxPrices object
         :return: int, number of rows added
         """
         new_log = self.log.setup(fx_code=code)
 
-        old_fx_prices = self.get_fx_prices(code)
+        # we only need enough existing data to check for spikes
+        old_fx_prices = self.get_tail_of_fx_prices(
+            code, number_of_rows=get_private_then_default_key_value("price_update_tail_rows"))
         merged_fx_prices = old_fx_prices.add_rows_to_existing_data(
-            new_fx_prices, check_for_spike=check_for_spike
+            new_fx_prices, check_for_spike=False
         )
 
-        if merged_fx_prices is data_error:
-            return data_error
-
         rows_added = len(merged_fx_prices) - len(old_fx_prices)
 
         if rows_added == 0:
@@ -213,12 +236,51 @@ class fxPricesData(baseData):
                 )
             return 0
 
-        self.add_fx_prices(code, merged_fx_prices, ignore_duplication=True)
+        # We have guaranteed these are all after the existing data
+        new_fx_prices = fxPrices(merged_fx_prices.iloc[len(old_fx_prices):])
+
+        spike_check_state = spike_check_state_at_end_of_data(
+            old_fx_prices,
+            stored_spike_check_state=self._get_spike_check_state_for_fx_code_without_checking(code))
+        first_spike, new_spike_check_state = first_spike_in_new_data(spike_check_state, new_fx_prices)
+        if check_for_spike and first_spike is not None:
+            return data_error
+
+        self._append_fx_prices_without_checking(
+            code, new_fx_prices, spike_check_state=new_spike_check_state)
 
         new_log.msg("Added %d additional rows for %s" % (rows_added, code))
 
         return rows_added
 
+    def get_tail_of_fx_prices(self, code: str, number_of_rows: int) -> fxPrices:
+        """
+        At least the last number_of_rows of prices, if there are that many. Only for codes we store.
+        """
+        if self.is_code_in_data(code):
+            return self._get_tail_of_fx_prices_without_checking(code, number_of_rows=number_of_rows)
+        else:
+            return fxPrices.create_empty()
+
+    def _get_tail_of_fx_prices_without_checking(self, code: str, number_of_rows: int) -> fxPrices:
+        # override if the data source can read just the end of the data
+        fx_prices = self._get_fx_prices_without_checking(code)
+
+        return fxPrices(fx_prices.tail(number_of_rows))
+
+    def _append_fx_prices_without_checking(self, code: str, new_fx_prices: fxPrices,
+                                           spike_check_state: spikeCheckState = missing_data):
+        # override if the data source can append, and store spike_check_state; otherwise we rewrite everything
+        if self.is_code_in_data(code):
+            old_fx_prices = self._get_fx_prices_without_checking(code)
+            new_fx_prices = fxPrices(pd.concat([old_fx_prices, new_fx_prices], axis=0))
+
+        self._add_fx_prices_without_checking_for_existing_entry(code, new_fx_prices)
+
+    def _get_spike_check_state_for_fx_code_without_checking(self, code: str) -> spikeCheckState:
+        # override if the data source can store it; otherwise we work it out from the end of the prices
+        return missing_data
+
     def get_base_currency(self):
         return get_private_then_default_key_value("base_currency")
 
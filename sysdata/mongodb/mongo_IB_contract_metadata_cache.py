@@ -0,0 +1,44 @@
+from syscore.objects import arg_not_supplied
+from sysdata.production.broker_contract_metadata_cache import brokerContractMetadataCacheData
+from sysdata.mongodb.mongo_generic import mongoDataWithSingleKey
+from syslogdiag.log import logtoscreen
+
+IB_CONTRACT_METADATA_COLLECTION = "IBContractMetadataCache"
+IB_CONTRACT_METADATA_REF = "contract_key"
+
+
+class mongoIbContractMetadataCacheData(brokerContractMetadataCacheData):
+    """
+    Read and write cached IB contract metadata, shared by all processes
+    """
+
+    def __init__(
+        self,
+        mongo_db=arg_not_supplied,
+        log=logtoscreen("mongoIbContractMetadataCache"),
+    ):
+
+        super().__init__(log=log)
+        self._mongo_data = mongoDataWithSingleKey(
+            IB_CONTRACT_METADATA_COLLECTION, IB_CONTRACT_METADATA_REF, mongo_db
+        )
+
+    @property
+    def mongo_data(self):
+        return self._mongo_data
+
+    def __repr__(self):
+        return "Cache of IB contract metadata, mongodb %s" % (str(self.mongo_data))
+
+    def _get_entry(self, key: str) -> dict:
+        return self.mongo_data.get_result_dict_for_key_without_key_value(key)
+
+    def _update_entry(self, key: str, dict_of_items: dict):
+        # items are dicts, so there are no ints to clean
+        self.mongo_data.add_data(key, dict_of_items, allow_overwrite=True, clean_ints=False)
+
+    def _delete_entry(self, key: str):
+        self.mongo_data.delete_data_without_any_warning(key)
+
+    def _get_list_of_keys(self) -> list:
+        return self.mongo_data.get_list_of_keys()
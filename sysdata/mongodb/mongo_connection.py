@@ -70,6 +70,10 @@ class MongoClientFactory(object):
             self.mongo_clients[key] = client
             return client
 
+    def reset(self):
+        # clients aren't fork safe, so a forked child process calls this to make its own
+        self.mongo_clients = {}
+
 
 # Only need one of these
 mongo_client_factory = MongoClientFactory()
@@ -159,11 +163,11 @@ class mongoConnection(object):
         else:
             return False
 
-    def create_index(self, indexname, order=ASCENDING):
+    def create_index(self, indexname, order=ASCENDING, unique=True):
         if self.check_for_index(indexname):
             pass
         else:
-            self.collection.create_index([(indexname, order)], unique=True)
+            self.collection.create_index([(indexname, order)], unique=unique)
 
     def create_multikey_index(
         self, indexname1, indexname2, order1=ASCENDING, order2=ASCENDING
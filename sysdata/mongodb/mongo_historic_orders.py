@@ -1,4 +1,5 @@
 import datetime
+import re
 
 from syscore.objects import success, missing_order, resolve_function, arg_not_supplied
 from sysdata.mongodb.mongo_connection import mongoConnection, MONGO_ID_KEY
@@ -7,12 +8,30 @@ from sysdata.production.historic_orders import (
     genericOrdersData,
     strategyHistoricOrdersData,
     contractHistoricOrdersData,
+    strategy_and_instrument_from_key,
+    fills_df_from_list_of_records,
 )
 from sysexecution.contract_orders import contractTradeableObject
 from sysexecution.instrument_orders import instrumentTradeableObject
 
 ORDER_ID_STORE_KEY = "_ORDER_ID_STORE_KEY"
 
+# These are derived from the key, and stored alongside each order so we can
+# index and filter on them server side. They are removed again on reading.
+STRATEGY_NAME_FIELD = "strategy_name"
+INSTRUMENT_CODE_FIELD = "instrument_code"
+DENORMALISED_FIELDS = [STRATEGY_NAME_FIELD, INSTRUMENT_CODE_FIELD]
+
+# order_id is unique, the others are not. The last is created once older
+# records have been backfilled, so must be INSTRUMENT_CODE_FIELD
+NON_UNIQUE_INDEX_FIELDS = [
+    "fill_datetime",
+    "key",
+    STRATEGY_NAME_FIELD,
+    INSTRUMENT_CODE_FIELD]
+
+ORDER_ID_ONLY_PROJECTION = {"order_id": 1, MONGO_ID_KEY: 0}
+
 
 class mongoGenericHistoricOrdersData(genericOrdersData):
     """
@@ -41,9 +60,33 @@ class mongoGenericHistoricOrdersData(genericOrdersData):
         self._mongo = mongoConnection(
             self._collection_name(), mongo_db=mongo_db)
 
+        self._create_indices()
+        super().__init__(log = log)
+
+    def _create_indices(self):
         # this won't create the index if it already exists
         self._mongo.create_index("order_id")
-        super().__init__(log = log)
+
+        if not self._mongo.check_for_index(INSTRUMENT_CODE_FIELD):
+            # first time we've seen this collection with the new indices, or
+            # we stopped part way through last time; older records won't have
+            # the denormalised fields yet
+            self._backfill_denormalised_fields()
+
+        # the instrument code index goes last, so it's only there once the
+        # backfill has finished
+        for indexname in NON_UNIQUE_INDEX_FIELDS:
+            self._mongo.create_index(indexname, unique=False)
+
+    def _backfill_denormalised_fields(self):
+        cursor = self._mongo.collection.find(
+            {INSTRUMENT_CODE_FIELD: {"$exists": False}},
+            {"key": 1})
+        for db_entry in cursor:
+            self._mongo.collection.update_one(
+                {MONGO_ID_KEY: db_entry[MONGO_ID_KEY]},
+                {"$set": _denormalised_fields_from_key(db_entry["key"])},
+            )
 
     @property
     def _name(self):
@@ -73,7 +116,7 @@ class mongoGenericHistoricOrdersData(genericOrdersData):
 
     def _add_order_to_data_no_checking(self, order):
         # Duplicates will be overriden, so be careful
-        mongo_record = order.as_dict()
+        mongo_record = _mongo_record_from_order(order)
         self._mongo.collection.insert_one(mongo_record)
         return success
 
@@ -81,7 +124,21 @@ class mongoGenericHistoricOrdersData(genericOrdersData):
         result_dict = self._mongo.collection.find_one(dict(order_id=order_id))
         if result_dict is None:
             return missing_order
+
+        return self._order_from_mongo_record(result_dict)
+
+    def get_dict_of_orders_with_orderids(self, list_of_order_ids: list) -> dict:
+        # one query
+        cursor = self._mongo.collection.find(
+            dict(order_id={"$in": list(list_of_order_ids)}))
+        list_of_orders = [self._order_from_mongo_record(result_dict) for result_dict in cursor]
+
+        return dict([(order.order_id, order) for order in list_of_orders])
+
+    def _order_from_mongo_record(self, result_dict):
         result_dict.pop(MONGO_ID_KEY)
+        for field_name in DENORMALISED_FIELDS:
+            result_dict.pop(field_name, None)
 
         order_class = self._order_class()
         order = order_class.from_dict(result_dict)
@@ -93,14 +150,11 @@ class mongoGenericHistoricOrdersData(genericOrdersData):
 
     def update_order_with_orderid(self, order_id, order):
         self._mongo.collection.update_one(
-            dict(order_id=order_id), {"$set": order.as_dict()}
+            dict(order_id=order_id), {"$set": _mongo_record_from_order(order)}
         )
 
     def get_list_of_order_ids(self):
-        cursor = self._mongo.collection.find()
-        order_ids = [db_entry["order_id"] for db_entry in cursor]
-
-        return order_ids
+        return self._get_order_ids_matching_query({})
 
     def get_orders_in_date_range(
             self,
@@ -108,14 +162,71 @@ class mongoGenericHistoricOrdersData(genericOrdersData):
             period_end=arg_not_supplied):
         if period_end is arg_not_supplied:
             period_end = datetime.datetime.now()
-        cursor = self._mongo.collection.find(
+
+        return self._get_order_ids_matching_query(
             dict(fill_datetime={"$gte": period_start, "$lt": period_end})
         )
 
+    def _get_order_ids_matching_query(self, query_dict):
+        # only pull back the order_id field, not the whole document
+        cursor = self._mongo.collection.find(
+            query_dict, ORDER_ID_ONLY_PROJECTION)
         order_ids = [db_entry["order_id"] for db_entry in cursor]
 
         return order_ids
 
+    def get_fills_as_df(
+        self,
+        period_start=arg_not_supplied,
+        period_end=arg_not_supplied,
+        strategy_name=arg_not_supplied,
+        instrument_code=arg_not_supplied,
+    ):
+        """
+        All fills matching the (optional) filters as a single DataFrame,
+        done in one aggregation query
+
+        Spread orders and unfilled orders are excluded, as in fill_from_order
+
+        :return: pd.DataFrame with columns FILLS_DF_COLUMNS
+        """
+        fill_datetime_query = {"$ne": None}
+        if period_start is not arg_not_supplied:
+            fill_datetime_query["$gte"] = period_start
+        if period_end is not arg_not_supplied:
+            fill_datetime_query["$lt"] = period_end
+
+        match_dict = dict(
+            fill_datetime=fill_datetime_query,
+            fill={"$size": 1},
+            filled_price={"$size": 1},
+        )
+        if strategy_name is not arg_not_supplied:
+            match_dict[STRATEGY_NAME_FIELD] = strategy_name
+        if instrument_code is not arg_not_supplied:
+            match_dict[INSTRUMENT_CODE_FIELD] = instrument_code
+
+        pipeline = [
+            {"$match": match_dict},
+            {
+                "$project": {
+                    MONGO_ID_KEY: 0,
+                    "order_id": 1,
+                    "key": 1,
+                    STRATEGY_NAME_FIELD: 1,
+                    INSTRUMENT_CODE_FIELD: 1,
+                    "fill_datetime": 1,
+                    "qty": {"$arrayElemAt": ["$fill", 0]},
+                    "price": {"$arrayElemAt": ["$filled_price", 0]},
+                }
+            },
+            {"$match": {"qty": {"$ne": 0}, "price": {"$ne": None}}},
+        ]
+
+        list_of_records = list(self._mongo.collection.aggregate(pipeline))
+
+        return fills_df_from_list_of_records(list_of_records)
+
 
 class mongoStrategyHistoricOrdersData(
     mongoGenericHistoricOrdersData, strategyHistoricOrdersData
@@ -132,9 +243,8 @@ class mongoStrategyHistoricOrdersData(
         tradeable_object = instrumentTradeableObject(
             strategy_name, instrument_code)
         object_key = tradeable_object.key
-        result_dict = self._mongo.collection.find(dict(key=object_key))
-        list_of_order_id = [result["order_id"] for result in result_dict]
-        return list_of_order_id
+
+        return self._get_order_ids_matching_query(dict(key=object_key))
 
 
 class mongoContractHistoricOrdersData(
@@ -156,22 +266,42 @@ class mongoContractHistoricOrdersData(
             strategy_name, instrument_code, contract_id
         )
         object_key = tradeable_object.key
-        result_dict = self._mongo.collection.find(dict(key=object_key))
-        list_oforder_id = [result["order_id"] for result in result_dict]
-
         alt_key = tradeable_object.alt_key
-        result_dict = self._mongo.collection.find(dict(key=alt_key))
-        alt_list_oforder_id = [result["order_id"] for result in result_dict]
 
-        list_oforder_id = list_oforder_id + alt_list_oforder_id
+        return self._get_order_ids_matching_query(
+            dict(key={"$in": [object_key, alt_key]}))
 
-        return list_oforder_id
+    def get_list_of_order_ids_for_contract(self, contract_object):
+        # one indexed query rather than one per strategy
+        instrument_code = contract_object.instrument_code
+        contract_id = contract_object.date_str
 
-    def get_list_of_all_keys(self):
-        result_dict = self._mongo.collection.find()
-        key_list = [result["key"] for result in result_dict]
+        # strategy name is irrelevant here, we only want the contract keys
+        tradeable_object = contractTradeableObject(
+            "", instrument_code, contract_id)
+        contract_id_keys = [
+            contract_key
+            for contract_key in [
+                tradeable_object.contract_id_key,
+                tradeable_object.alt_contract_id_key,
+            ]
+            if contract_key is not None
+        ]
+        key_regex = "/%s/(%s)$" % (
+            re.escape(instrument_code),
+            "|".join([re.escape(contract_key) for contract_key in contract_id_keys]),
+        )
 
-        return key_list
+        return self._get_order_ids_matching_query(
+            {INSTRUMENT_CODE_FIELD: instrument_code,
+             "key": {"$regex": key_regex}}
+        )
+
+    def get_list_of_strategies(self):
+        return self._mongo.collection.distinct(STRATEGY_NAME_FIELD)
+
+    def get_list_of_all_keys(self):
+        return self._mongo.collection.distinct("key")
 
 
 class mongoBrokerHistoricOrdersData(
@@ -182,3 +312,31 @@ class mongoBrokerHistoricOrdersData(
 
     def _order_class_str(self):
         return "sysexecution.broker_orders.brokerOrder"
+
+    def get_orders_in_date_range_excluding_split_orders(
+            self,
+            period_start,
+            period_end=arg_not_supplied):
+        if period_end is arg_not_supplied:
+            period_end = datetime.datetime.now()
+
+        # older orders may not have a split_order field at all
+        return self._get_order_ids_matching_query(
+            dict(fill_datetime={"$gte": period_start, "$lt": period_end},
+                 split_order={"$ne": True})
+        )
+
+
+def _denormalised_fields_from_key(key):
+    strategy_name, instrument_code = strategy_and_instrument_from_key(key)
+
+    return {
+        STRATEGY_NAME_FIELD: strategy_name,
+        INSTRUMENT_CODE_FIELD: instrument_code}
+
+
+def _mongo_record_from_order(order):
+    mongo_record = order.as_dict()
+    mongo_record.update(_denormalised_fields_from_key(order.key))
+
+    return mongo_record
@@ -0,0 +1,91 @@
+import datetime
+
+from syscore.objects import missing_data
+from sysdata.base_data import baseData
+from syslogdiag.log import logtoscreen
+
+ITEM_VALUE = "value"
+ITEM_CACHED_TIME = "cached_time"
+
+
+class brokerContractMetadataCacheData(baseData):
+    """
+    Cache shared by all processes of things we look up from the broker about contracts which rarely change, but
+    are slow to get: eg resolved contracts (conIds, expiries, multipliers), tick sizes, trading hours
+
+    Each entry is for an instrument and contract date, and holds named items. Items remember when they were
+    cached, and are ignored once they are older than the time to live given when they are read.
+    """
+
+    def __init__(self, log=logtoscreen("brokerContractMetadataCache")):
+        super().__init__(log=log)
+
+    def __repr__(self):
+        return "Cache of broker contract metadata"
+
+    def get_cached_item(
+        self, instrument_code: str, contract_date_str: str, item_name: str, ttl_seconds: float
+    ):
+        """
+        :return: the cached value, or missing_data if not cached or too old
+        """
+        entry = self._get_entry(_key_for_contract(instrument_code, contract_date_str))
+        if entry is missing_data:
+            return missing_data
+
+        item = entry.get(item_name, missing_data)
+        if item is missing_data:
+            return missing_data
+
+        age = datetime.datetime.now() - item[ITEM_CACHED_TIME]
+        if age.total_seconds() > ttl_seconds:
+            return missing_data
+
+        return item[ITEM_VALUE]
+
+    def cache_item(self, instrument_code: str, contract_date_str: str, item_name: str, value):
+        item = {ITEM_VALUE: value, ITEM_CACHED_TIME: datetime.datetime.now()}
+        self._update_entry(
+            _key_for_contract(instrument_code, contract_date_str), {item_name: item}
+        )
+
+    def clear_cache_for_instrument_code(self, instrument_code: str):
+        list_of_keys = [
+            key
+            for key in self._get_list_of_keys()
+            if _instrument_code_from_key(key) == instrument_code
+        ]
+        for key in list_of_keys:
+            self._delete_entry(key)
+
+        self.log.msg(
+            "Cleared %d cached contracts for %s" % (len(list_of_keys), instrument_code)
+        )
+
+    def clear_cache(self):
+        list_of_keys = self._get_list_of_keys()
+        for key in list_of_keys:
+            self._delete_entry(key)
+
+        self.log.msg("Cleared %d cached contracts" % len(list_of_keys))
+
+    def _get_entry(self, key: str) -> dict:
+        raise NotImplementedError("Need to implement in child class")
+
+    def _update_entry(self, key: str, dict_of_items: dict):
+        # add or replace these items, leaving any others in the entry alone
+        raise NotImplementedError("Need to implement in child class")
+
+    def _delete_entry(self, key: str):
+        raise NotImplementedError("Need to implement in child class")
+
+    def _get_list_of_keys(self) -> list:
+        raise NotImplementedError("Need to implement in child class")
+
+
+def _key_for_contract(instrument_code: str, contract_date_str: str) -> str:
+    return instrument_code + "/" + contract_date_str
+
+
+def _instrument_code_from_key(key: str) -> str:
+    return key.split("/")[0]
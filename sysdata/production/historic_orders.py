@@ -73,6 +73,43 @@ class listOfFills(list):
         return df
 
 
+FILLS_DF_COLUMNS = [
+    "order_id",
+    "key",
+    "strategy_name",
+    "instrument_code",
+    "fill_datetime",
+    "qty",
+    "price"]
+
+
+def strategy_and_instrument_from_key(key):
+    """
+    Keys are 'strategy/instrument' or 'strategy/instrument/contract_id'
+
+    :param key: str
+    :return: tuple str, str
+    """
+    split_key = key.split("/")
+
+    return split_key[0], split_key[1]
+
+
+def fills_df_from_list_of_records(list_of_records):
+    """
+    :param list_of_records: list of dicts, each with FILLS_DF_COLUMNS as keys
+    :return: pd.DataFrame, one row per fill, sorted by fill_datetime
+    """
+    if len(list_of_records) == 0:
+        return pd.DataFrame(columns=FILLS_DF_COLUMNS)
+
+    fills_df = pd.DataFrame(list_of_records, columns=FILLS_DF_COLUMNS)
+    fills_df = fills_df.sort_values("fill_datetime")
+    fills_df = fills_df.reset_index(drop=True)
+
+    return fills_df
+
+
 class genericOrdersData(baseData):
     def __init__(self, log=logtoscreen("")):
         super().__init__(log=log)
@@ -94,6 +131,20 @@ class genericOrdersData(baseData):
         order = self._dict.get(order_id, missing_order)
         return order
 
+    def get_dict_of_orders_with_orderids(self, list_of_order_ids: list) -> dict:
+        """
+        Several orders at once; override where this can be done in one query
+
+        :return: dict, order_id: order. Orders that don't exist are left out
+        """
+        dict_of_orders = {}
+        for order_id in list_of_order_ids:
+            order = self.get_order_with_orderid(order_id)
+            if order is not missing_order:
+                dict_of_orders[order_id] = order
+
+        return dict_of_orders
+
     def delete_order_with_orderid(self, order_id):
         order = self.get_order_with_orderid(order_id)
         if order is missing_order:
@@ -110,6 +161,53 @@ class genericOrdersData(baseData):
             period_end=arg_not_supplied):
         raise NotImplementedError
 
+    def get_fills_as_df(
+        self,
+        period_start=arg_not_supplied,
+        period_end=arg_not_supplied,
+        strategy_name=arg_not_supplied,
+        instrument_code=arg_not_supplied,
+    ):
+        """
+        All fills matching the (optional) filters as a single DataFrame
+
+        This is the slow generic version which reads every order; data
+        sources which can do the filtering server side should override
+
+        :return: pd.DataFrame with columns FILLS_DF_COLUMNS
+        """
+        list_of_records = []
+        for order_id in self.get_list_of_order_ids():
+            order = self.get_order_with_orderid(order_id)
+            fill = fill_from_order(order)
+            if fill is missing_order:
+                continue
+            if period_start is not arg_not_supplied and fill.date < period_start:
+                continue
+            if period_end is not arg_not_supplied and fill.date >= period_end:
+                continue
+
+            order_strategy, order_instrument = strategy_and_instrument_from_key(
+                order.key)
+            if strategy_name is not arg_not_supplied and order_strategy != strategy_name:
+                continue
+            if instrument_code is not arg_not_supplied and order_instrument != instrument_code:
+                continue
+
+            list_of_records.append(
+                dict(
+                    order_id=order_id,
+                    key=order.key,
+                    strategy_name=order_strategy,
+                    instrument_code=order_instrument,
+                    fill_datetime=fill.date,
+                    qty=fill.qty,
+                    price=fill.price,
+                )
+            )
+
+        return fills_df_from_list_of_records(list_of_records)
+
 
 BASE_CLASS_ERROR = "Need to inherit and override this method"
 
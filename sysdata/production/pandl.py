@@ -0,0 +1,171 @@
+"""
+Materialised p&l series, expressed as a proportion of total capital
+
+We store one series per contract (across all strategies) and one per strategy and instrument.
+These are derived data: they are updated incrementally, and can be deleted at any time and will be
+rebuilt from prices, positions and fills.
+
+Prices can be revised and fills can arrive late, so each update recalculates from a stored date some
+days before the last one (the revision lookback), replacing the stored rows after it. Changes older
+than the lookback are only picked up by deleting the stored series.
+
+"""
+import datetime
+import numpy as np
+import pandas as pd
+
+from syscore.objects import missing_data
+from sysdata.base_data import baseData
+
+USE_CHILD_CLASS_ERROR = "You need to use a child class of pandlData"
+
+CONTRACT_KEY_PREFIX = "_CONTRACT"
+STRATEGY_KEY_PREFIX = "_STRATEGY"
+KEY_SEPARATOR = "/"
+
+
+def key_for_contract(instrument_code: str, contract_id: str) -> str:
+    return KEY_SEPARATOR.join([CONTRACT_KEY_PREFIX, instrument_code, contract_id])
+
+
+def key_for_strategy_and_instrument(strategy_name: str, instrument_code: str) -> str:
+    return KEY_SEPARATOR.join([STRATEGY_KEY_PREFIX, strategy_name, instrument_code])
+
+
+class pandlData(baseData):
+    """
+    Read and write data class to get materialised p&l series
+
+    We'd inherit from this class for a specific implementation
+
+    """
+
+    def __repr__(self):
+        return USE_CHILD_CLASS_ERROR
+
+    def keys(self):
+        return self.get_list_of_keys()
+
+    def get_pandl_series_for_contract(
+            self, instrument_code: str, contract_id: str) -> pd.Series:
+        key = key_for_contract(instrument_code, contract_id)
+        return self._get_pandl_series_for_key(key)
+
+    def get_pandl_series_for_strategy_and_instrument(
+            self, strategy_name: str, instrument_code: str) -> pd.Series:
+        key = key_for_strategy_and_instrument(strategy_name, instrument_code)
+        return self._get_pandl_series_for_key(key)
+
+    def get_recalculation_date_for_contract(
+            self, instrument_code: str, contract_id: str, lookback_days: int) -> datetime.datetime:
+        key = key_for_contract(instrument_code, contract_id)
+        return self._get_recalculation_date_for_key(key, lookback_days)
+
+    def get_recalculation_date_for_strategy_and_instrument(
+            self, strategy_name: str, instrument_code: str, lookback_days: int) -> datetime.datetime:
+        key = key_for_strategy_and_instrument(strategy_name, instrument_code)
+        return self._get_recalculation_date_for_key(key, lookback_days)
+
+    def update_pandl_series_for_contract(
+            self, instrument_code: str, contract_id: str, new_pandl: pd.Series,
+            from_date: datetime.datetime = missing_data) -> int:
+        key = key_for_contract(instrument_code, contract_id)
+        return self._update_pandl_series_for_key(key, new_pandl, from_date=from_date)
+
+    def update_pandl_series_for_strategy_and_instrument(
+            self, strategy_name: str, instrument_code: str, new_pandl: pd.Series,
+            from_date: datetime.datetime = missing_data) -> int:
+        key = key_for_strategy_and_instrument(strategy_name, instrument_code)
+        return self._update_pandl_series_for_key(key, new_pandl, from_date=from_date)
+
+    def delete_all_pandl_series(self, are_you_sure: bool = False):
+        if not are_you_sure:
+            self.log.warn(
+                "You need to call delete_all_pandl_series with a flag to be sure")
+            return None
+
+        for key in self.get_list_of_keys():
+            self._delete_pandl_series_without_any_warning_be_careful(key)
+
+        self.log.terse("Deleted all stored p&l series; will be rebuilt on next update")
+
+    def is_key_in_data(self, key: str) -> bool:
+        if key in self.get_list_of_keys():
+            return True
+        else:
+            return False
+
+    def _get_pandl_series_for_key(self, key: str) -> pd.Series:
+        if self.is_key_in_data(key):
+            return self._get_pandl_series_without_checking(key)
+        else:
+            return pd.Series(dtype=float)
+
+    def _get_recalculation_date_for_key(self, key: str, lookback_days: int) -> datetime.datetime:
+        """
+        The last stored date at least lookback_days before the last stored date
+
+        We start from a stored date, so the price and position there are in the data read to recalculate
+
+        :return: datetime, or missing_data if everything should be recalculated
+        """
+        pandl_series = self._get_pandl_series_for_key(key)
+        if len(pandl_series) == 0:
+            return missing_data
+
+        latest_date = pandl_series.index[-1] - datetime.timedelta(days=lookback_days)
+        dates_to_start_from = pandl_series.index[pandl_series.index <= latest_date]
+        if len(dates_to_start_from) == 0:
+            return missing_data
+
+        return dates_to_start_from[-1]
+
+    def _update_pandl_series_for_key(
+            self, key: str, new_pandl: pd.Series, from_date: datetime.datetime = missing_data) -> int:
+        """
+        Replaces any stored rows after from_date with new_pandl, which should only have rows after from_date
+
+        :param from_date: datetime, or missing_data to replace everything
+        :return: int, number of rows added or changed
+        """
+        existing_pandl = self._get_pandl_series_for_key(key)
+        if from_date is missing_data:
+            from_date = pd.Timestamp.min
+
+        kept_pandl = existing_pandl[existing_pandl.index <= from_date]
+        replaced_pandl = existing_pandl[existing_pandl.index > from_date]
+
+        rows_changed = _number_of_rows_changed(replaced_pandl, new_pandl)
+        if rows_changed == 0:
+            return 0
+
+        merged_pandl = pd.concat([kept_pandl, new_pandl], axis=0)
+        self._write_pandl_series_without_checking(key, merged_pandl)
+
+        self.log.msg("Added or changed %d rows of p&l for %s" % (rows_changed, key))
+
+        return rows_changed
+
+    def get_list_of_keys(self) -> list:
+        raise NotImplementedError(USE_CHILD_CLASS_ERROR)
+
+    def _get_pandl_series_without_checking(self, key: str) -> pd.Series:
+        raise NotImplementedError(USE_CHILD_CLASS_ERROR)
+
+    def _write_pandl_series_without_checking(self, key: str, pandl_series: pd.Series):
+        raise NotImplementedError(USE_CHILD_CLASS_ERROR)
+
+    def _delete_pandl_series_without_any_warning_be_careful(self, key: str):
+        raise NotImplementedError(USE_CHILD_CLASS_ERROR)
+
+
+def _number_of_rows_changed(old_pandl: pd.Series, new_pandl: pd.Series) -> int:
+    all_dates = old_pandl.index.union(new_pandl.index)
+    in_both = all_dates.isin(old_pandl.index) & all_dates.isin(new_pandl.index)
+    same_value = np.isclose(
+        old_pandl.reindex(all_dates).values.astype(float),
+        new_pandl.reindex(all_dates).values.astype(float),
+        equal_nan=True,
+    )
+
+    return int((~(in_both & same_value)).sum())
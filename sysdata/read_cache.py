@@ -0,0 +1,226 @@
+"""
+Opt in read-through cache for the production data accessors (diagPrices, diagInstruments, dataCapital...)
+
+The cache lives on a dataBlob, so anything sharing the same dataBlob shares the cache. It is off by default;
+switch it on with dataBlob(..., use_read_cache=True) or data.enable_read_cache()
+
+Read methods are decorated with @cached_read(group) and write methods with @invalidates_cache(group, ...).
+Every write to a group throws away everything cached for that group, so a process that reads, writes and
+reads again will see its own writes. Other processes writing to the database won't invalidate our cache,
+which is what the time to live (ttl) is for.
+
+The cache may be shared by several reports, so lists, dicts, sets, DataFrames and Series are copied before
+they are returned, and whoever reads them can modify their copy. Other objects are returned as is.
+
+The cache can be shared by threads (eg reports running concurrently). Two threads missing on the same
+read at the same time will both do it, which is harmless.
+"""
+
+import copy
+import datetime
+import threading
+from functools import wraps
+
+import pandas as pd
+
+from syscore.objects import arg_not_supplied
+from sysdata.private_config import get_private_then_default_key_value
+
+MISSING_FROM_READ_CACHE = object()
+
+
+class readCacheEntry(object):
+    def __init__(self, value, ttl_seconds: float):
+        self.value = value
+        self.expiry_time = datetime.datetime.now() + datetime.timedelta(
+            seconds=ttl_seconds
+        )
+
+    def has_expired(self) -> bool:
+        return datetime.datetime.now() > self.expiry_time
+
+
+class readCache(object):
+    def __init__(self, active: bool = False,
+                 default_ttl_seconds: float = arg_not_supplied):
+        self._active = active
+        self._default_ttl_seconds = default_ttl_seconds
+        self._cache = {}
+        self._stats = {}
+        self._lock = threading.RLock()
+
+    def __repr__(self):
+        return "readCache (%s) with %d elements" % (
+            "active" if self.active else "inactive",
+            len(self._cache),
+        )
+
+    @property
+    def active(self) -> bool:
+        return self._active
+
+    def enable(self, default_ttl_seconds: float = arg_not_supplied):
+        if default_ttl_seconds is not arg_not_supplied:
+            self._default_ttl_seconds = default_ttl_seconds
+        self._active = True
+
+    def disable(self):
+        self._active = False
+        self.invalidate_all()
+
+    @property
+    def default_ttl_seconds(self) -> float:
+        if self._default_ttl_seconds is arg_not_supplied:
+            self._default_ttl_seconds = get_private_then_default_key_value(
+                "production_read_cache_ttl_seconds"
+            )
+
+        return self._default_ttl_seconds
+
+    def calc_or_cache(
+        self,
+        group: str,
+        func,
+        accessor,
+        *args,
+        ttl_seconds: float = arg_not_supplied,
+        **kwargs
+    ):
+        if not self.active:
+            return func(accessor, *args, **kwargs)
+
+        method_name = func.__qualname__
+        cache_ref = _cache_ref(group, method_name, args, kwargs)
+
+        value = self._get_unexpired_value(cache_ref)
+        if value is not MISSING_FROM_READ_CACHE:
+            self._add_to_stats(group, method_name, "hits")
+            return _copy_if_mutable(value)
+
+        self._add_to_stats(group, method_name, "misses")
+        value = func(accessor, *args, **kwargs)
+
+        if ttl_seconds is arg_not_supplied:
+            ttl_seconds = self.default_ttl_seconds
+        with self._lock:
+            self._cache[cache_ref] = readCacheEntry(value, ttl_seconds)
+
+        return _copy_if_mutable(value)
+
+    def _get_unexpired_value(self, cache_ref: tuple):
+        with self._lock:
+            entry = self._cache.get(cache_ref, MISSING_FROM_READ_CACHE)
+            if entry is MISSING_FROM_READ_CACHE:
+                return MISSING_FROM_READ_CACHE
+
+            if entry.has_expired():
+                del self._cache[cache_ref]
+                return MISSING_FROM_READ_CACHE
+
+            return entry.value
+
+    def invalidate_group(self, group: str):
+        with self._lock:
+            refs_to_delete = [
+                cache_ref for cache_ref in self._cache.keys() if cache_ref[0] == group
+            ]
+            for cache_ref in refs_to_delete:
+                del self._cache[cache_ref]
+
+            if len(refs_to_delete) > 0:
+                self._add_to_stats(group, "", "invalidations", len(refs_to_delete))
+
+    def invalidate_all(self):
+        with self._lock:
+            self._cache = {}
+
+    def _add_to_stats(self, group: str, method_name: str,
+                      stat_name: str, count: int = 1):
+        with self._lock:
+            stats_for_method = self._stats.setdefault(
+                (group, method_name), dict(hits=0, misses=0, invalidations=0)
+            )
+            stats_for_method[stat_name] += count
+
+    def stats(self) -> pd.DataFrame:
+        """
+        Hits, misses and invalidations for each group and method (invalidations are per group)
+
+        :return: pd.DataFrame indexed by group and method
+        """
+        with self._lock:
+            stats = copy.deepcopy(self._stats)
+
+        if len(stats) == 0:
+            return pd.DataFrame(columns=["hits", "misses", "invalidations"])
+
+        stats_df = pd.DataFrame.from_dict(stats, orient="index")
+        stats_df.index.names = ["group", "method"]
+
+        return stats_df
+
+
+def _copy_if_mutable(value):
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        copied_value = value.copy()
+        if type(copied_value) is not type(value):
+            # our subclasses (futuresMultiplePrices, fxPrices...) aren't kept by copy()
+            copied_value = type(value)(copied_value)
+        return copied_value
+
+    if isinstance(value, (list, dict, set)):
+        # keeps subclasses like listOfInstrumentStrategies
+        return copy.copy(value)
+
+    return value
+
+
+def _cache_ref(group: str, method_name: str, args: tuple, kwargs: dict) -> tuple:
+    # objects like futuresContract are turned into their string keys
+    args_as_str = tuple([str(arg) for arg in args])
+    kwargs_as_str = tuple(
+        [(key, str(kwargs[key])) for key in sorted(kwargs.keys())])
+
+    return (group, method_name, args_as_str, kwargs_as_str)
+
+
+def cached_read(group: str, ttl_seconds: float = arg_not_supplied):
+    """
+    Decorator for read methods of production data accessors, which must have a .data attribute (a dataBlob)
+
+    :param group: str, writes to this group will invalidate the cached value
+    :param ttl_seconds: override the default time to live
+    """
+
+    def decorator(func):
+        @wraps(func)
+        def wrapper(accessor, *args, **kwargs):
+            read_cache = accessor.data.read_cache
+            return read_cache.calc_or_cache(
+                group, func, accessor, *args, ttl_seconds=ttl_seconds, **kwargs
+            )
+
+        return wrapper
+
+    return decorator
+
+
+def invalidates_cache(*groups):
+    """
+    Decorator for write methods of production data accessors; invalidates the groups once the write is done
+    """
+
+    def decorator(func):
+        @wraps(func)
+        def wrapper(accessor, *args, **kwargs):
+            try:
+                return func(accessor, *args, **kwargs)
+            finally:
+                # even if the write failed it may have partly happened
+                read_cache = accessor.data.read_cache
+                for group in groups:
+                    read_cache.invalidate_group(group)
+
+        return wrapper
+
+    return decorator
@@ -15,6 +15,20 @@ class futuresSimData(simData):
         return "futuresSimData object with %d instruments" % len(
             self.get_instrument_list())
 
+    def _system_init(self, base_system):
+        super()._system_init(base_system)
+
+        # opt in, to save memory when backtesting lots of instruments
+        self._compact_multiple_prices = base_system.config.compact_multiple_prices
+        self._float32_multiple_prices = base_system.config.float32_multiple_prices
+
+    def _multiple_prices_compacted_if_required(self, multiple_prices: futuresMultiplePrices) -> futuresMultiplePrices:
+        if not getattr(self, "_compact_multiple_prices", False):
+            return multiple_prices
+
+        return multiple_prices.as_compact(
+            float32_prices=getattr(self, "_float32_multiple_prices", False))
+
     def all_asset_classes(self) -> list:
         asset_class_data = self.get_instrument_asset_classes()
 
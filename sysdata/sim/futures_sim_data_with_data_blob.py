@@ -42,6 +42,7 @@ class genericBlobUsingFuturesSimData(futuresSimData):
 
     def get_multiple_prices(self, instrument_code: str) -> futuresMultiplePrices:
         data = self.data.db_futures_multiple_prices.get_multiple_prices(instrument_code)
+        data = self._multiple_prices_compacted_if_required(data)
 
         return data
 
@@ -0,0 +1,121 @@
+"""
+A read only, in memory copy of everything a futures backtest reads from some other futuresSimData
+
+Built once, then shared by several backtests: eg run_systems builds one before starting worker processes, which
+(when forked) see it without copying it or touching the database.
+"""
+
+from syscore.objects import arg_not_supplied
+from sysdata.sim.futures_sim_data import futuresSimData
+
+from syslogdiag.log import logtoscreen
+
+from sysobjects.instruments import assetClassesAndInstruments, futuresInstrumentWithMetaData
+from sysobjects.spot_fx_prices import fxPrices
+from sysobjects.adjusted_prices import futuresAdjustedPrices
+from sysobjects.multiple_prices import futuresMultiplePrices
+
+
+class snapshotFuturesSimData(futuresSimData):
+    def __init__(
+        self,
+        adjusted_prices: dict,
+        multiple_prices: dict,
+        instrument_objects: dict,
+        fx_prices: dict,
+        asset_classes: assetClassesAndInstruments,
+        log=logtoscreen("snapshotFuturesSimData"),
+    ):
+        """
+        :param adjusted_prices: dict, instrument code: futuresAdjustedPrices
+        :param multiple_prices: dict, instrument code: futuresMultiplePrices
+        :param instrument_objects: dict, instrument code: futuresInstrumentWithMetaData
+        :param fx_prices: dict, (currency1, currency2): fxPrices
+        """
+        super().__init__(log=log)
+        self._adjusted_prices = adjusted_prices
+        self._multiple_prices = multiple_prices
+        self._instrument_objects = instrument_objects
+        self._fx_prices = fx_prices
+        self._asset_classes = asset_classes
+
+    def __repr__(self):
+        return "snapshotFuturesSimData object with %d instruments" % len(
+            self.get_instrument_list())
+
+    @classmethod
+    def from_sim_data(
+        snapshotFuturesSimData,
+        sim_data: futuresSimData,
+        base_currency: str,
+        list_of_instrument_codes: list = arg_not_supplied,
+    ):
+        """
+        Read everything now. The snapshot gets its own log, as sim_data's may hold database connections which
+        can't be shared with other processes
+
+        :param sim_data: where to read from, eg dbFuturesSimData
+        :param base_currency: we get fx rates from the currency of each instrument to this
+        :param list_of_instrument_codes: defaults to every instrument in sim_data
+        """
+        if list_of_instrument_codes is arg_not_supplied:
+            list_of_instrument_codes = sim_data.get_instrument_list()
+
+        adjusted_prices = {}
+        multiple_prices = {}
+        instrument_objects = {}
+        fx_prices = {}
+        for instrument_code in list_of_instrument_codes:
+            adjusted_prices[instrument_code] = sim_data.get_backadjusted_futures_price(
+                instrument_code)
+            multiple_prices[instrument_code] = sim_data.get_multiple_prices(
+                instrument_code)
+            instrument_objects[instrument_code] = sim_data._get_instrument_object_with_meta_data(
+                instrument_code)
+
+            currency = sim_data.get_instrument_currency(instrument_code)
+            fx_key = (currency, base_currency)
+            if fx_key not in fx_prices:
+                fx_prices[fx_key] = sim_data._get_fx_data(currency, base_currency)
+
+        asset_classes = sim_data.get_instrument_asset_classes()
+
+        return snapshotFuturesSimData(
+            adjusted_prices,
+            multiple_prices,
+            instrument_objects,
+            fx_prices,
+            asset_classes,
+        )
+
+    def get_instrument_list(self):
+        return list(self._adjusted_prices.keys())
+
+    def _get_fx_data(self, currency1: str, currency2: str) -> fxPrices:
+        return self._get_from_snapshot(self._fx_prices, (currency1, currency2))
+
+    def get_instrument_asset_classes(self) -> assetClassesAndInstruments:
+        return self._asset_classes
+
+    def get_backadjusted_futures_price(self, instrument_code: str) -> futuresAdjustedPrices:
+        return self._get_from_snapshot(self._adjusted_prices, instrument_code)
+
+    def get_multiple_prices(self, instrument_code: str) -> futuresMultiplePrices:
+        data = self._get_from_snapshot(self._multiple_prices, instrument_code)
+        data = self._multiple_prices_compacted_if_required(data)
+
+        return data
+
+    def _get_instrument_object_with_cost_data(self, instrument_code: str) -> futuresInstrumentWithMetaData:
+        ## cost and other meta data stored in the same place
+        return self._get_instrument_object_with_meta_data(instrument_code)
+
+    def _get_instrument_object_with_meta_data(self, instrument_code: str) -> futuresInstrumentWithMetaData:
+        return self._get_from_snapshot(self._instrument_objects, instrument_code)
+
+    def _get_from_snapshot(self, snapshot_dict: dict, key):
+        value = snapshot_dict.get(key, None)
+        if value is None:
+            raise Exception("%s isn't in the snapshot of simulation data" % str(key))
+
+        return value
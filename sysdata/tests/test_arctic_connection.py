@@ -0,0 +1,250 @@
+import unittest as ut
+
+import numpy as np
+import pandas as pd
+
+from sysdata.arctic.arctic_connection import articData, arctic_store_factory, _data_starts_with_stored_data
+from syscore.objects import missing_data
+from sysobjects.time_series_metadata import timeSeriesMetadata
+
+TEST_HOST = "in_memory_test_host"
+
+
+class inMemoryArcticItem(object):
+    def __init__(self, data, metadata):
+        self.data = data
+        self.metadata = metadata
+
+
+class inMemoryArcticLibrary(object):
+    """
+    The bits of an arctic VersionStore library that articData uses, recording the calls made
+    """
+
+    def __init__(self):
+        self.data = {}
+        self.metadata = {}
+        self.calls = []
+
+    def list_symbols(self):
+        return list(self.data.keys())
+
+    def read(self, symbol, date_range=None):
+        self.calls.append("read" if date_range is None else "read_range")
+        data = self.data[symbol]
+        if date_range is not None:
+            data = data[data.index >= pd.Timestamp(date_range.start)]
+
+        return inMemoryArcticItem(data.copy(), self.metadata[symbol])
+
+    def read_metadata(self, symbol):
+        return inMemoryArcticItem(None, self.metadata[symbol])
+
+    def write(self, symbol, data, metadata=None):
+        self.calls.append("write")
+        self.data[symbol] = data.copy()
+        self.metadata[symbol] = metadata
+
+    def write_metadata(self, symbol, metadata):
+        self.calls.append("write_metadata")
+        self.metadata[symbol] = metadata
+
+    def append(self, symbol, data, metadata=None):
+        self.calls.append("append")
+        self.data[symbol] = pd.concat([self.data[symbol], data], axis=0)
+        self.metadata[symbol] = metadata
+
+
+class inMemoryArcticStore(object):
+    def __init__(self):
+        self.libraries = {}
+
+    def initialize_library(self, library_name):
+        self.libraries.setdefault(library_name, inMemoryArcticLibrary())
+
+    def __getitem__(self, library_name):
+        return self.libraries[library_name]
+
+
+class inMemoryMongoDb(object):
+    database_name = "test"
+    host = TEST_HOST
+
+
+def _prices(number_of_rows, start="2000-01-03"):
+    np.random.seed(number_of_rows)
+    return pd.DataFrame(
+        dict(FINAL=np.random.randn(number_of_rows).cumsum(), VOLUME=1.0),
+        index=pd.date_range(start, periods=number_of_rows, freq="B"),
+    )
+
+
+def assert_same_data(data, expected_data):
+    # index freq isn't kept by arctic, and pandas 0.25 can't be told to ignore it
+    assert data.index.equals(expected_data.index)
+    assert list(data.columns) == list(expected_data.columns)
+    np.testing.assert_array_equal(data.values, expected_data.values)
+
+
+class Test(ut.TestCase):
+    def setUp(self):
+        arctic_store_factory.stores[TEST_HOST] = inMemoryArcticStore()
+        self.arctic = articData("prices", mongo_db=inMemoryMongoDb())
+        self.library = self.arctic.library
+
+    def tearDown(self):
+        arctic_store_factory.reset()
+
+    def assert_stored(self, expected_data):
+        assert_same_data(self.arctic.read("X"), expected_data)
+
+        metadata = self.arctic.read_metadata("X")
+        expected_metadata = timeSeriesMetadata.from_data(expected_data)
+        self.assertEqual(metadata.row_count, expected_metadata.row_count)
+        self.assertEqual(metadata.first_timestamp, expected_metadata.first_timestamp)
+        self.assertEqual(metadata.last_timestamp, expected_metadata.last_timestamp)
+        self.assertEqual(metadata.checksum, expected_metadata.checksum)
+
+    def test_after_append_same_as_from_data(self):
+        data = _prices(100)
+        metadata = timeSeriesMetadata.from_data(data.iloc[:60]).after_append(data.iloc[60:])
+        expected_metadata = timeSeriesMetadata.from_data(data)
+
+        self.assertEqual(metadata.row_count, expected_metadata.row_count)
+        self.assertEqual(metadata.first_timestamp, expected_metadata.first_timestamp)
+        self.assertEqual(metadata.last_timestamp, expected_metadata.last_timestamp)
+        self.assertEqual(metadata.checksum, expected_metadata.checksum)
+
+        empty_metadata = timeSeriesMetadata.create_empty().after_append(data)
+        self.assertEqual(empty_metadata.checksum, expected_metadata.checksum)
+
+        # old md5 checksums can't be combined
+        old_metadata = timeSeriesMetadata.from_data(data.iloc[:60])
+        old_metadata.checksum = "d41d8cd98f00b204e9800998ecf8427e"
+        self.assertEqual(old_metadata.after_append(data.iloc[60:]).checksum, "")
+
+    def test_append_after_end(self):
+        data = _prices(100)
+        self.arctic.write("X", data.iloc[:60])
+        self.library.calls = []
+
+        self.arctic.append("X", data.iloc[60:])
+
+        self.assertEqual(self.library.calls, ["append"])
+        self.assert_stored(data)
+
+    def test_append_overlapping(self):
+        data = _prices(100)
+        self.arctic.write("X", data.iloc[:60])
+        self.library.calls = []
+
+        # new data takes precedence
+        new_data = data.iloc[50:] * 2.0
+        self.arctic.append("X", new_data)
+
+        self.assertEqual(self.library.calls, ["read", "write"])
+        self.assert_stored(pd.concat([data.iloc[:50], new_data], axis=0))
+
+    def test_append_new_symbol(self):
+        data = _prices(100)
+        self.arctic.append("X", data)
+
+        self.assertEqual(self.library.calls, ["write"])
+        self.assert_stored(data)
+
+    def test_write_or_append(self):
+        data = _prices(100)
+        self.arctic.write("X", data.iloc[:60])
+        self.library.calls = []
+
+        # stored data is unchanged at the start, so only the rest is written
+        self.arctic.write_or_append("X", data)
+        self.assertEqual(self.library.calls, ["append"])
+        self.assert_stored(data)
+
+        # earlier values have changed, so everything is rewritten
+        changed_data = data.copy()
+        changed_data.iloc[10, 0] = 0.0
+        changed_data = pd.concat([changed_data, _prices(10, start="2000-06-01")], axis=0)
+        self.library.calls = []
+        self.arctic.write_or_append("X", changed_data)
+        self.assertEqual(self.library.calls, ["write"])
+        self.assert_stored(changed_data)
+
+    def test_data_starts_with_stored_data(self):
+        data = _prices(100)
+        metadata = timeSeriesMetadata.from_data(data.iloc[:60])
+
+        self.assertTrue(_data_starts_with_stored_data(data, metadata))
+        # nothing to append
+        self.assertFalse(_data_starts_with_stored_data(data.iloc[:60], metadata))
+        # starts somewhere else
+        self.assertFalse(_data_starts_with_stored_data(data.iloc[1:], metadata))
+
+        changed_data = data.copy()
+        changed_data.iloc[30, 0] = 0.0
+        self.assertFalse(_data_starts_with_stored_data(changed_data, metadata))
+        self.assertFalse(_data_starts_with_stored_data(data, timeSeriesMetadata.create_empty()))
+
+    def test_read_metadata(self):
+        data = _prices(100)
+        self.arctic.write("X", data)
+        self.arctic.write("Y", data.iloc[:50])
+        self.library.calls = []
+
+        all_metadata = self.arctic.get_metadata_for_all_keys()
+        self.assertEqual(sorted(all_metadata.keys()), ["X", "Y"])
+        self.assertEqual(all_metadata["Y"].row_count, 50)
+        self.assertEqual(all_metadata["X"].last_timestamp, data.index[-1])
+        self.assertIsNot(all_metadata["X"].last_write_time, missing_data)
+        # no data read
+        self.assertEqual(self.library.calls, [])
+
+    def test_read_metadata_written_before_metadata_stored(self):
+        data = _prices(100)
+        self.library.write("X", data, metadata=None)
+        self.library.calls = []
+
+        metadata = self.arctic.read_metadata("X")
+        self.assertEqual(metadata.row_count, 100)
+        self.assertIs(metadata.last_write_time, missing_data)
+        # reading doesn't write
+        self.assertEqual(self.library.calls, ["read"])
+
+    def test_read_tail(self):
+        data = _prices(1000)
+        self.arctic.write("X", data)
+        self.library.calls = []
+
+        tail = self.arctic.read_tail("X", 50)
+        self.assertEqual(self.library.calls, ["read_range"])
+        self.assertGreaterEqual(len(tail), 50)
+        assert_same_data(tail, data.iloc[-len(tail):])
+
+        # fewer rows than asked for, so read everything
+        self.library.calls = []
+        self.assertEqual(len(self.arctic.read_tail("X", 2000)), 1000)
+        self.assertEqual(self.library.calls, ["read"])
+
+        # rows bunched up at the start, so the guess is wrong and we read everything
+        monthly_data = _prices(10, start="2000-01-03")
+        monthly_data.index = pd.date_range("2000-01-03", periods=10, freq="BMS")
+        bunched_data = pd.concat([_prices(990, start="1990-01-01"), monthly_data], axis=0)
+        self.arctic.write("X", bunched_data)
+        self.library.calls = []
+        tail = self.arctic.read_tail("X", 100)
+        self.assertEqual(self.library.calls, ["read_range", "read"])
+        self.assertEqual(len(tail), 1000)
+
+    def test_read_from_date(self):
+        data = _prices(100)
+        self.arctic.write("X", data)
+        self.library.calls = []
+
+        from_date = data.index[80]
+        assert_same_data(self.arctic.read_from_date("X", from_date), data.iloc[80:])
+        self.assertEqual(self.library.calls, ["read_range"])
+
+
+if __name__ == "__main__":
+    ut.main()
@@ -0,0 +1,173 @@
+import datetime
+import unittest as ut
+from copy import deepcopy
+
+from ib_insync import Future
+
+from syscore.objects import missing_data, arg_not_supplied
+from sysbrokers.IB.ib_client import ibClient, RESOLVED_CONTRACT_ITEM
+from sysbrokers.IB.ib_instruments import futuresInstrumentWithIBConfigData, ibInstrumentConfigData
+from sysdata.production.broker_contract_metadata_cache import brokerContractMetadataCacheData, ITEM_CACHED_TIME
+from sysobjects.contract_dates_and_expiries import contractDate
+from sysobjects.instruments import futuresInstrument
+
+HOUR = 60 * 60
+
+
+class inMemoryContractMetadataCacheData(brokerContractMetadataCacheData):
+    def __init__(self):
+        super().__init__()
+        self._entries = {}
+
+    def _get_entry(self, key: str) -> dict:
+        if key not in self._entries:
+            return missing_data
+
+        # a copy, as we'd get from a database
+        return deepcopy(self._entries[key])
+
+    def _update_entry(self, key: str, dict_of_items: dict):
+        entry = self._entries.get(key, {})
+        entry.update(deepcopy(dict_of_items))
+        self._entries[key] = entry
+
+    def _delete_entry(self, key: str):
+        self._entries.pop(key)
+
+    def _get_list_of_keys(self) -> list:
+        return list(self._entries.keys())
+
+    def age_item(self, instrument_code: str, contract_date_str: str, item_name: str, hours: float):
+        item = self._entries[instrument_code + "/" + contract_date_str][item_name]
+        item[ITEM_CACHED_TIME] = item[ITEM_CACHED_TIME] - datetime.timedelta(hours=hours)
+
+
+class Test(ut.TestCase):
+    def setUp(self):
+        self.cache = inMemoryContractMetadataCacheData()
+        self.cache.cache_item("GOLD", "20201200", "min_tick", 0.1)
+        self.cache.cache_item("GOLD", "20201200", "trading_hours", [["a", "b"]])
+        self.cache.cache_item("GOLD", "20210200", "min_tick", 0.1)
+        self.cache.cache_item("US10", "20201200", "min_tick", 0.015625)
+
+    def test_get_cached_item(self):
+        self.assertEqual(self.cache.get_cached_item("GOLD", "20201200", "min_tick", ttl_seconds=HOUR), 0.1)
+        self.assertEqual(
+            self.cache.get_cached_item("GOLD", "20201200", "trading_hours", ttl_seconds=HOUR), [["a", "b"]])
+
+        # another item for the same contract is added, not replacing what was there
+        self.assertEqual(self.cache.get_cached_item("US10", "20201200", "min_tick", ttl_seconds=HOUR), 0.015625)
+
+        self.assertIs(self.cache.get_cached_item("GOLD", "20201200", "not_an_item", ttl_seconds=HOUR),
+                      missing_data)
+        self.assertIs(self.cache.get_cached_item("GOLD", "20200600", "min_tick", ttl_seconds=HOUR),
+                      missing_data)
+        self.assertIs(self.cache.get_cached_item("CORN", "20201200", "min_tick", ttl_seconds=HOUR),
+                      missing_data)
+
+    def test_items_too_old_are_ignored(self):
+        self.cache.age_item("GOLD", "20201200", "min_tick", hours=2)
+
+        self.assertIs(self.cache.get_cached_item("GOLD", "20201200", "min_tick", ttl_seconds=HOUR),
+                      missing_data)
+        self.assertEqual(self.cache.get_cached_item("GOLD", "20201200", "min_tick", ttl_seconds=3 * HOUR), 0.1)
+
+        # other items keep their own age
+        self.assertEqual(
+            self.cache.get_cached_item("GOLD", "20201200", "trading_hours", ttl_seconds=HOUR), [["a", "b"]])
+
+        # caching again makes it fresh
+        self.cache.cache_item("GOLD", "20201200", "min_tick", 0.2)
+        self.assertEqual(self.cache.get_cached_item("GOLD", "20201200", "min_tick", ttl_seconds=HOUR), 0.2)
+
+    def test_clear_cache_for_instrument_code(self):
+        self.cache.clear_cache_for_instrument_code("GOLD")
+
+        for contract_date_str in ["20201200", "20210200"]:
+            self.assertIs(self.cache.get_cached_item("GOLD", contract_date_str, "min_tick", ttl_seconds=HOUR),
+                          missing_data)
+        self.assertEqual(self.cache.get_cached_item("US10", "20201200", "min_tick", ttl_seconds=HOUR), 0.015625)
+
+        # nothing to clear is fine
+        self.cache.clear_cache_for_instrument_code("CORN")
+
+    def test_clear_cache(self):
+        self.cache.clear_cache()
+
+        self.assertEqual(self.cache._get_list_of_keys(), [])
+        self.assertIs(self.cache.get_cached_item("US10", "20201200", "min_tick", ttl_seconds=HOUR),
+                      missing_data)
+
+
+class ibClientWithoutIB(ibClient):
+    def __init__(self, contract_metadata_cache):
+        super().__init__(contract_metadata_cache=contract_metadata_cache)
+        self.number_of_calls_to_ib = 0
+
+    def _get_vanilla_ib_futures_contract_from_ib(self, futures_instrument_with_ib_data, contract_date):
+        self.number_of_calls_to_ib += 1
+        ib_data = futures_instrument_with_ib_data.ib_data
+
+        return Future(ib_data.symbol, exchange=ib_data.exchange, conId=1000 + self.number_of_calls_to_ib,
+                      lastTradeDateOrContractMonth="20201229")
+
+
+def _gold_with_ib_data(exchange="NYMEX"):
+    return futuresInstrumentWithIBConfigData(
+        futuresInstrument("GOLD"), ibInstrumentConfigData("GC", exchange, currency="USD"))
+
+
+class TestResolvedContracts(ut.TestCase):
+    def setUp(self):
+        self.cache = inMemoryContractMetadataCacheData()
+        self.contract_date = contractDate("20201200")
+
+    def resolve(self, client, exchange="NYMEX"):
+        return client._get_vanilla_ib_futures_contract(_gold_with_ib_data(exchange), self.contract_date)
+
+    def test_resolved_contract_shared_between_clients(self):
+        first_client = ibClientWithoutIB(self.cache)
+        resolved_contract = self.resolve(first_client)
+        self.assertEqual(first_client.number_of_calls_to_ib, 1)
+
+        another_client = ibClientWithoutIB(self.cache)
+        self.assertEqual(self.resolve(another_client), resolved_contract)
+        self.assertEqual(another_client.number_of_calls_to_ib, 0)
+
+    def test_resolved_contract_too_old(self):
+        self.resolve(ibClientWithoutIB(self.cache))
+        client = ibClientWithoutIB(self.cache)
+        self.cache.age_item("GOLD", "20201200", RESOLVED_CONTRACT_ITEM,
+                            hours=client.contract_metadata_cache_ttl_seconds / HOUR + 1)
+
+        self.assertEqual(self.resolve(client).conId, 1001)
+        self.assertEqual(client.number_of_calls_to_ib, 1)
+
+    def test_ib_config_changed(self):
+        self.resolve(ibClientWithoutIB(self.cache))
+
+        client = ibClientWithoutIB(self.cache)
+        resolved_contract = self.resolve(client, exchange="COMEX")
+        self.assertEqual(client.number_of_calls_to_ib, 1)
+        self.assertEqual(resolved_contract.exchange, "COMEX")
+
+        # and what we cached is for the new config
+        self.assertEqual(self.resolve(ibClientWithoutIB(self.cache), exchange="COMEX"), resolved_contract)
+
+    def test_refresh(self):
+        client = ibClientWithoutIB(self.cache)
+        self.resolve(client)
+        client.refresh_contract_metadata_cache("GOLD")
+
+        self.resolve(client)
+        self.assertEqual(client.number_of_calls_to_ib, 2)
+
+    def test_without_a_cache(self):
+        client = ibClientWithoutIB(arg_not_supplied)
+        self.resolve(client)
+        self.resolve(client)
+        self.assertEqual(client.number_of_calls_to_ib, 2)
+
+
+if __name__ == "__main__":
+    ut.main()
@@ -0,0 +1,150 @@
+import threading
+import unittest as ut
+
+from sysdata.csv.csv_adjusted_prices import csvFuturesAdjustedPricesData
+from sysdata.csv.csv_instrument_data import csvFuturesInstrumentData
+from sysdata.csv.csv_multiple_prices import csvFuturesMultiplePricesData
+from sysdata.data_blob import dataBlob
+from syslogdiag.log import logtoscreen
+
+
+class csvCountedAdjustedPricesData(csvFuturesAdjustedPricesData):
+    number_created = 0
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        csvCountedAdjustedPricesData.number_created += 1
+
+
+class fakeIbConnection(object):
+    def __init__(self):
+        self.number_of_closes = 0
+
+    def close_connection(self):
+        self.number_of_closes += 1
+
+
+class ibFakeData(object):
+    def __init__(self, ib_conn, log):
+        self.ib_conn = ib_conn
+        self.log = log
+
+
+class Test(ut.TestCase):
+    def setUp(self):
+        csvCountedAdjustedPricesData.number_created = 0
+        # no mongo needed: a log, and a mongo_db we only check is passed on
+        self.mongo_db = object()
+        self.data = dataBlob(log=logtoscreen("test"), mongo_db=self.mongo_db, csv_data_paths=dict())
+
+    def test_lazy_attributes_built_on_first_use(self):
+        self.data.add_class_list([csvCountedAdjustedPricesData, csvFuturesInstrumentData])
+
+        self.assertEqual(csvCountedAdjustedPricesData.number_created, 0)
+        self.assertEqual(self.data.initialised_attributes(), [])
+        self.assertEqual(self.data.uninitialised_attributes(),
+                         ["db_counted_adjusted_prices", "db_futures_instrument"])
+
+        adjusted_prices_data = self.data.db_counted_adjusted_prices
+        self.assertIsInstance(adjusted_prices_data, csvCountedAdjustedPricesData)
+        self.assertEqual(csvCountedAdjustedPricesData.number_created, 1)
+        self.assertEqual(self.data.initialised_attributes(), ["db_counted_adjusted_prices"])
+        self.assertEqual(self.data.uninitialised_attributes(), ["db_futures_instrument"])
+
+        # built once
+        self.assertIs(self.data.db_counted_adjusted_prices, adjusted_prices_data)
+        self.assertEqual(csvCountedAdjustedPricesData.number_created, 1)
+
+        # adding it again does nothing
+        self.data.add_class_object(csvCountedAdjustedPricesData)
+        self.assertIs(self.data.db_counted_adjusted_prices, adjusted_prices_data)
+        self.assertEqual(self.data._attr_list, ["db_counted_adjusted_prices", "db_futures_instrument"])
+
+        with self.assertRaises(AttributeError):
+            self.data.db_futures_multiple_prices
+
+    def test_different_class_for_same_attribute(self):
+        self.data.add_class_object(csvCountedAdjustedPricesData)
+        self.data.db_counted_adjusted_prices
+
+        # eg a module reloaded
+        replacement_class = type("csvCountedAdjustedPricesData", (csvCountedAdjustedPricesData,), {})
+        self.data.add_class_object(replacement_class)
+
+        self.assertEqual(self.data.uninitialised_attributes(), ["db_counted_adjusted_prices"])
+        self.assertIsInstance(self.data.db_counted_adjusted_prices, replacement_class)
+        self.assertEqual(csvCountedAdjustedPricesData.number_created, 2)
+
+    def test_keep_original_prefix(self):
+        data = dataBlob(log=logtoscreen("test"), csv_data_paths=dict(), keep_original_prefix=True)
+        data.add_class_object(csvFuturesMultiplePricesData)
+        self.assertIsInstance(data.csv_futures_multiple_prices, csvFuturesMultiplePricesData)
+
+    def test_not_lazy(self):
+        data = dataBlob(log=logtoscreen("test"), csv_data_paths=dict(), lazy=False)
+        data.add_class_object(csvCountedAdjustedPricesData)
+
+        self.assertEqual(csvCountedAdjustedPricesData.number_created, 1)
+        self.assertEqual(data.uninitialised_attributes(), [])
+
+    def test_unknown_class_fails_when_added(self):
+        with self.assertRaises(Exception):
+            self.data.add_class_object(fakeIbConnection)
+
+    def test_built_once_across_threads(self):
+        self.data.add_class_object(csvCountedAdjustedPricesData)
+        results = []
+        threads = [
+            threading.Thread(target=lambda: results.append(self.data.db_counted_adjusted_prices))
+            for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(csvCountedAdjustedPricesData.number_created, 1)
+        self.assertEqual(len(set(id(result) for result in results)), 1)
+
+    def test_child_blob(self):
+        ib_conn = fakeIbConnection()
+        data = dataBlob(log=logtoscreen("test"), mongo_db=self.mongo_db,
+                        csv_data_paths=dict(csvFuturesInstrumentData="sysdata.tests"), ib_conn=ib_conn)
+
+        child_data = data.child_blob("child", [csvCountedAdjustedPricesData, csvFuturesInstrumentData, ibFakeData])
+
+        self.assertIs(child_data.mongo_db, self.mongo_db)
+        self.assertEqual(child_data.csv_data_paths, data.csv_data_paths)
+        self.assertEqual(child_data.db_futures_instrument.config_file,
+                         csvFuturesInstrumentData(datapath="sysdata.tests").config_file)
+        self.assertIs(child_data.broker_fake.ib_conn, ib_conn)
+
+        # our own label, on the parent's log
+        self.assertEqual(child_data.log.attributes["type"], "child")
+        self.assertEqual(child_data.broker_fake.log.attributes["component"], "ibFakeData")
+
+        # attributes aren't shared
+        self.assertEqual(csvCountedAdjustedPricesData.number_created, 0)
+        child_data.db_counted_adjusted_prices
+        self.assertEqual(csvCountedAdjustedPricesData.number_created, 1)
+        self.assertEqual(data.uninitialised_attributes(), [])
+        with self.assertRaises(AttributeError):
+            data.db_counted_adjusted_prices
+
+        # the connection is the parent's to close
+        child_data.close()
+        self.assertEqual(ib_conn.number_of_closes, 0)
+        data.close()
+        self.assertEqual(ib_conn.number_of_closes, 1)
+
+    def test_child_read_cache(self):
+        child_data = self.data.child_blob("child")
+        child_data.enable_read_cache()
+        self.assertFalse(self.data.read_cache.active)
+
+        shared_child_data = self.data.child_blob("child", share_read_cache=True)
+        shared_child_data.enable_read_cache()
+        self.assertTrue(self.data.read_cache.active)
+
+
+if __name__ == "__main__":
+    ut.main()
@@ -0,0 +1,108 @@
+import unittest as ut
+
+from sysdata.mongodb.mongo_connection import MONGO_ID_KEY
+from sysdata.mongodb.mongo_historic_orders import mongoContractHistoricOrdersData, INSTRUMENT_CODE_FIELD, \
+    STRATEGY_NAME_FIELD
+
+
+class fakeCollection(object):
+    """
+    Just enough of a mongo collection for the backfill, which can stop part way through
+    """
+
+    def __init__(self, list_of_records, fail_after_updates=None):
+        self.records = [dict(record, **{MONGO_ID_KEY: record_id}) for record_id, record in enumerate(list_of_records)]
+        self.fail_after_updates = fail_after_updates
+        self.number_of_updates = 0
+
+    def find(self, query_dict, projection):
+        # only the query the backfill uses
+        [(field_name, condition)] = query_dict.items()
+        assert condition == {"$exists": False}
+
+        return [
+            dict(
+                [(MONGO_ID_KEY, record[MONGO_ID_KEY])] +
+                [(projected_name, record[projected_name]) for projected_name in projection]
+            )
+            for record in self.records
+            if field_name not in record
+        ]
+
+    def update_one(self, filter_dict, update_dict):
+        if self.number_of_updates == self.fail_after_updates:
+            raise Exception("Lost connection")
+
+        self.number_of_updates += 1
+        [record] = [record for record in self.records if record[MONGO_ID_KEY] == filter_dict[MONGO_ID_KEY]]
+        record.update(update_dict["$set"])
+
+
+class fakeMongoConnection(object):
+    def __init__(self, collection):
+        self.collection = collection
+        self.indexes = []
+
+    def check_for_index(self, indexname):
+        return indexname in self.indexes
+
+    def create_index(self, indexname, unique=True):
+        if not self.check_for_index(indexname):
+            self.indexes.append(indexname)
+
+
+def _orders_data_with_fake_mongo(mongo):
+    # skip __init__, which would connect to a real database
+    orders_data = mongoContractHistoricOrdersData.__new__(mongoContractHistoricOrdersData)
+    orders_data._mongo = mongo
+
+    return orders_data
+
+
+def _old_records():
+    return [
+        dict(order_id=order_id, key="%s/%s/20201200" % (strategy_name, instrument_code))
+        for order_id, (strategy_name, instrument_code) in enumerate(
+            [("strategy", "GOLD"), ("strategy", "US10"), ("another", "GOLD"), ("another", "CORN")])
+    ]
+
+
+class Test(ut.TestCase):
+    def assert_backfilled(self, collection):
+        for record in collection.records:
+            strategy_name, instrument_code, _ = record["key"].split("/")
+            self.assertEqual(record[STRATEGY_NAME_FIELD], strategy_name)
+            self.assertEqual(record[INSTRUMENT_CODE_FIELD], instrument_code)
+
+    def test_backfill(self):
+        collection = fakeCollection(_old_records())
+        mongo = fakeMongoConnection(collection)
+        _orders_data_with_fake_mongo(mongo)._create_indices()
+
+        self.assert_backfilled(collection)
+        self.assertIn(INSTRUMENT_CODE_FIELD, mongo.indexes)
+
+        # nothing to do the next time
+        _orders_data_with_fake_mongo(mongo)._create_indices()
+        self.assertEqual(collection.number_of_updates, 4)
+
+    def test_backfill_resumes_after_failure(self):
+        collection = fakeCollection(_old_records(), fail_after_updates=2)
+        mongo = fakeMongoConnection(collection)
+        with self.assertRaises(Exception):
+            _orders_data_with_fake_mongo(mongo)._create_indices()
+
+        # not marked as done
+        self.assertNotIn(INSTRUMENT_CODE_FIELD, mongo.indexes)
+
+        collection.fail_after_updates = None
+        _orders_data_with_fake_mongo(mongo)._create_indices()
+
+        self.assert_backfilled(collection)
+        self.assertIn(INSTRUMENT_CODE_FIELD, mongo.indexes)
+        # only the records we hadn't done
+        self.assertEqual(collection.number_of_updates, 4)
+
+
+if __name__ == "__main__":
+    ut.main()
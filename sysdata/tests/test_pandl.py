@@ -0,0 +1,142 @@
+import unittest as ut
+
+import numpy as np
+import pandas as pd
+
+from syscore.objects import missing_data
+from sysdata.production.pandl import pandlData
+from sysdata.production.historic_orders import fills_df_from_list_of_records
+from sysproduction.diagnostic.profits import pandl_points, pandl_points_from_date, pandl_after_date, \
+    fills_df_for_contract_id, trade_df_from_fills_df
+
+LOOKBACK_DAYS = 5
+
+
+class inMemoryPandlData(pandlData):
+    def __init__(self):
+        super().__init__()
+        self._pandl = {}
+        self.number_of_writes = 0
+
+    def get_list_of_keys(self) -> list:
+        return list(self._pandl.keys())
+
+    def _get_pandl_series_without_checking(self, key: str) -> pd.Series:
+        return self._pandl[key]
+
+    def _write_pandl_series_without_checking(self, key: str, pandl_series: pd.Series):
+        self.number_of_writes += 1
+        self._pandl[key] = pandl_series
+
+    def _delete_pandl_series_without_any_warning_be_careful(self, key: str):
+        self._pandl.pop(key)
+
+
+def _prices():
+    np.random.seed(1)
+    dates = pd.date_range("2020-01-01", periods=40, freq="B") + pd.Timedelta(hours=18)
+    return pd.Series(100 + np.random.randn(40).cumsum(), index=dates)
+
+
+def _trades(list_of_trades):
+    return pd.DataFrame(
+        dict(qty=[float(qty) for _, qty, _ in list_of_trades],
+             price=[price for _, _, price in list_of_trades]),
+        index=pd.DatetimeIndex([date for date, _, _ in list_of_trades]),
+    )
+
+
+def _positions(trade_df):
+    return trade_df.qty.cumsum()
+
+
+class Test(ut.TestCase):
+    def setUp(self):
+        self.store = inMemoryPandlData()
+        self.prices = _prices()
+        self.trades = _trades([
+            (pd.Timestamp("2020-01-03 10:00"), 2, 101.0),
+            (pd.Timestamp("2020-01-15 10:00"), -1, 99.5),
+        ])
+
+    def update_store(self, prices, trade_df):
+        from_date = self.store.get_recalculation_date_for_contract(
+            "X", "202003", lookback_days=LOOKBACK_DAYS)
+        pos_series = _positions(trade_df)
+        if from_date is not missing_data:
+            # only what would be read
+            prices = prices[prices.index >= from_date]
+            trade_df = trade_df[trade_df.index >= from_date]
+
+        new_pandl = pandl_after_date(
+            pandl_points_from_date(prices, trade_df, pos_series, from_date=from_date), from_date)
+
+        return self.store.update_pandl_series_for_contract("X", "202003", new_pandl, from_date=from_date)
+
+    def assert_stored_same_as_full_calculation(self, prices, trade_df):
+        stored_pandl = self.store.get_pandl_series_for_contract("X", "202003")
+        expected_pandl = pandl_points(prices, trade_df, _positions(trade_df))
+
+        self.assertTrue(stored_pandl.index.equals(expected_pandl.index))
+        np.testing.assert_array_almost_equal(stored_pandl.values, expected_pandl.values)
+
+    def test_recalculation_date(self):
+        self.assertIs(
+            self.store.get_recalculation_date_for_contract("X", "202003", lookback_days=LOOKBACK_DAYS),
+            missing_data)
+
+        self.update_store(self.prices[:20], self.trades)
+        last_date = self.prices.index[19]
+        recalculation_date = self.store.get_recalculation_date_for_contract(
+            "X", "202003", lookback_days=LOOKBACK_DAYS)
+        # a stored date, at least the lookback before the last
+        self.assertIn(recalculation_date, self.prices.index)
+        self.assertLessEqual(recalculation_date, last_date - pd.Timedelta(days=LOOKBACK_DAYS))
+        self.assertGreater(recalculation_date, last_date - pd.Timedelta(days=LOOKBACK_DAYS + 4))
+
+    def test_incremental_updates_same_as_full_calculation(self):
+        for number_of_prices in [10, 20, 21, 40]:
+            self.update_store(self.prices[:number_of_prices], self.trades)
+            self.assert_stored_same_as_full_calculation(self.prices[:number_of_prices], self.trades)
+
+        # nothing new, so nothing written
+        number_of_writes = self.store.number_of_writes
+        self.assertEqual(self.update_store(self.prices, self.trades), 0)
+        self.assertEqual(self.store.number_of_writes, number_of_writes)
+
+    def test_revised_prices_and_late_fills(self):
+        self.update_store(self.prices[:30], self.trades)
+
+        # a price inside the lookback is revised, and a fill inside it arrives late
+        revised_prices = self.prices.copy()
+        revised_prices.iloc[27] = revised_prices.iloc[27] + 1.0
+        trades_with_late_fill = pd.concat([self.trades, _trades([
+            (pd.Timestamp("2020-02-07 11:00"), 3, revised_prices.iloc[26] + 0.25)])], axis=0)
+
+        rows_changed = self.update_store(revised_prices[:35], trades_with_late_fill)
+
+        self.assert_stored_same_as_full_calculation(revised_prices[:35], trades_with_late_fill)
+        # the late fill adds a row as well as changing the p&l after it
+        self.assertGreater(rows_changed, 5)
+
+    def test_trade_df_for_contract_from_fills_df(self):
+        fills_df = fills_df_from_list_of_records([
+            dict(order_id=1, key="strategy/X/20200300", strategy_name="strategy", instrument_code="X",
+                 fill_datetime=pd.Timestamp("2020-01-15 10:00"), qty=-1, price=99.5),
+            dict(order_id=2, key="strategy/X/202006", strategy_name="strategy", instrument_code="X",
+                 fill_datetime=pd.Timestamp("2020-01-10 10:00"), qty=1, price=90.0),
+            dict(order_id=3, key="another/X/202003", strategy_name="another", instrument_code="X",
+                 fill_datetime=pd.Timestamp("2020-01-03 10:00"), qty=2, price=101.0),
+        ])
+
+        trade_df = trade_df_from_fills_df(fills_df_for_contract_id(fills_df, "202003"))
+        self.assertTrue(trade_df.index.equals(self.trades.index))
+        np.testing.assert_array_equal(trade_df.values, self.trades[["qty", "price"]].values)
+
+        empty_trade_df = trade_df_from_fills_df(fills_df_for_contract_id(
+            fills_df_from_list_of_records([]), "202003"))
+        self.assertEqual(len(empty_trade_df), 0)
+
+
+if __name__ == "__main__":
+    ut.main()
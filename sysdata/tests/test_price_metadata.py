@@ -0,0 +1,32 @@
+import unittest as ut
+
+from syscore.objects import missing_data
+from sysdata.csv.csv_adjusted_prices import csvFuturesAdjustedPricesData
+from sysdata.csv.csv_spot_fx import csvFxPricesData
+from sysobjects.time_series_metadata import timeSeriesMetadata
+
+
+class Test(ut.TestCase):
+    def test_metadata_calculated_from_data(self):
+        # csv files don't store metadata, so it comes from the data
+        adjusted_prices_data = csvFuturesAdjustedPricesData()
+        prices = adjusted_prices_data.get_adjusted_prices("EDOLLAR")
+        metadata = adjusted_prices_data.get_metadata_for_instrument("EDOLLAR")
+        expected_metadata = timeSeriesMetadata.from_data(prices)
+
+        self.assertEqual(metadata.row_count, expected_metadata.row_count)
+        self.assertEqual(metadata.last_timestamp, expected_metadata.last_timestamp)
+        self.assertEqual(metadata.checksum, expected_metadata.checksum)
+        self.assertIs(metadata.last_write_time, missing_data)
+
+        self.assertTrue(adjusted_prices_data.get_metadata_for_instrument("NOT_AN_INSTRUMENT").empty())
+
+        fx_prices_data = csvFxPricesData()
+        all_metadata = fx_prices_data.get_metadata_for_all_fx_codes()
+        self.assertEqual(sorted(all_metadata.keys()), sorted(fx_prices_data.get_list_of_fxcodes()))
+        self.assertEqual(
+            all_metadata["GBPUSD"].last_timestamp, fx_prices_data.get_fx_prices("GBPUSD").index[-1])
+
+
+if __name__ == "__main__":
+    ut.main()
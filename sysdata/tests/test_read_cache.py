@@ -0,0 +1,147 @@
+import datetime
+import unittest as ut
+
+import pandas as pd
+
+from sysdata.csv.csv_adjusted_prices import csvFuturesAdjustedPricesData
+from sysdata.csv.csv_multiple_prices import csvFuturesMultiplePricesData
+from sysdata.data_blob import dataBlob
+from sysobjects.contracts import futuresContract
+from sysobjects.multiple_prices import futuresMultiplePrices
+from sysproduction.data.prices import diagPrices, updatePrices
+from syslogdiag.log import logtoscreen
+
+
+class countingPriceData(object):
+    """
+    Stands in for the multiple, adjusted and contract price data, counting reads and writes
+    """
+
+    def __init__(self):
+        self.number_of_reads = 0
+        self.contracts_read = []
+        self.multiple_prices = csvFuturesMultiplePricesData().get_multiple_prices("GOLD")
+        self.adjusted_prices = csvFuturesAdjustedPricesData().get_adjusted_prices("GOLD")
+
+    def get_multiple_prices(self, instrument_code):
+        self.number_of_reads += 1
+        return self.multiple_prices
+
+    def add_multiple_prices(self, instrument_code, multiple_prices, ignore_duplication=True):
+        self.multiple_prices = multiple_prices
+
+    def get_adjusted_prices(self, instrument_code):
+        self.number_of_reads += 1
+        return self.adjusted_prices
+
+    def add_adjusted_prices(self, instrument_code, adjusted_prices, ignore_duplication=True):
+        self.adjusted_prices = adjusted_prices
+
+    def get_prices_for_contract_object(self, contract_object):
+        self.number_of_reads += 1
+        self.contracts_read.append(contract_object.key)
+        return pd.DataFrame(dict(FINAL=[1.0, 2.0]))
+
+    def update_prices_for_contract(self, contract_object, new_prices, check_for_spike=True):
+        return len(new_prices)
+
+    def get_list_of_instruments(self):
+        self.number_of_reads += 1
+        return ["GOLD"]
+
+
+class Test(ut.TestCase):
+    def setUp(self):
+        self.data = dataBlob(log=logtoscreen("test"), mongo_db=object(), use_read_cache=True)
+        self.diag_prices = diagPrices(self.data)
+        self.update_prices = updatePrices(self.data)
+
+        self.price_data = countingPriceData()
+        for attr_name in ["db_futures_multiple_prices", "db_futures_adjusted_prices", "db_futures_contract_price"]:
+            setattr(self.data, attr_name, self.price_data)
+
+    def test_cached_until_expired(self):
+        self.data.enable_read_cache(default_ttl_seconds=60)
+        self.diag_prices.get_multiple_prices("GOLD")
+        self.diag_prices.get_multiple_prices("GOLD")
+        self.assertEqual(self.price_data.number_of_reads, 1)
+
+        for entry in self.data.read_cache._cache.values():
+            entry.expiry_time = datetime.datetime.now() - datetime.timedelta(seconds=1)
+
+        self.diag_prices.get_multiple_prices("GOLD")
+        self.assertEqual(self.price_data.number_of_reads, 2)
+
+    def test_write_invalidates_its_own_group_only(self):
+        multiple_prices = self.diag_prices.get_multiple_prices("GOLD")
+        self.diag_prices.get_adjusted_prices("GOLD")
+        self.assertEqual(self.price_data.number_of_reads, 2)
+
+        updated_multiple_prices = futuresMultiplePrices(multiple_prices.iloc[:-1])
+        self.update_prices.add_multiple_prices("GOLD", updated_multiple_prices)
+
+        # we see our own write
+        self.assertEqual(len(self.diag_prices.get_multiple_prices("GOLD")), len(multiple_prices) - 1)
+        self.assertEqual(self.price_data.number_of_reads, 3)
+
+        # adjusted prices are still cached
+        self.diag_prices.get_adjusted_prices("GOLD")
+        self.assertEqual(self.price_data.number_of_reads, 3)
+
+    def test_separate_keys_for_different_arguments(self):
+        for contract_date in ["20201200", "20210200", "20201200", "20210200"]:
+            self.diag_prices.get_prices_for_contract_object(futuresContract("GOLD", contract_date))
+        self.diag_prices.get_prices_for_contract_object(futuresContract("CORN", "20201200"))
+
+        self.assertEqual(self.price_data.contracts_read, ["GOLD/20201200", "GOLD/20210200", "CORN/20201200"])
+
+    def test_copies_returned(self):
+        multiple_prices = self.diag_prices.get_multiple_prices("GOLD")
+        self.assertIsInstance(multiple_prices, futuresMultiplePrices)
+        multiple_prices.iloc[-1, 0] = -999.0
+
+        instrument_list = self.diag_prices.get_list_of_instruments_in_multiple_prices()
+        instrument_list.append("CORN")
+
+        cached_multiple_prices = self.diag_prices.get_multiple_prices("GOLD")
+        self.assertIsInstance(cached_multiple_prices, futuresMultiplePrices)
+        self.assertNotEqual(cached_multiple_prices.iloc[-1, 0], -999.0)
+        self.assertEqual(self.diag_prices.get_list_of_instruments_in_multiple_prices(), ["GOLD"])
+        self.assertEqual(self.price_data.number_of_reads, 2)
+
+    def test_stats(self):
+        self.diag_prices.get_multiple_prices("GOLD")
+        self.diag_prices.get_multiple_prices("GOLD")
+        self.diag_prices.get_multiple_prices("GOLD")
+        self.diag_prices.get_adjusted_prices("GOLD")
+        self.update_prices.add_adjusted_prices("GOLD", self.price_data.adjusted_prices)
+        # nothing cached, so nothing invalidated
+        self.update_prices.update_prices_for_contract(
+            futuresContract("GOLD", "20201200"), pd.DataFrame(dict(FINAL=[3.0])))
+
+        stats = self.data.read_cache.stats()
+
+        self.assertEqual(list(stats.columns), ["hits", "misses", "invalidations"])
+        self.assertEqual(list(stats.index.names), ["group", "method"])
+        self.assertEqual(
+            stats.loc[("multiple_prices", "diagPrices.get_multiple_prices")].to_dict(),
+            dict(hits=2, misses=1, invalidations=0))
+        self.assertEqual(
+            stats.loc[("adjusted_prices", "diagPrices.get_adjusted_prices")].to_dict(),
+            dict(hits=0, misses=1, invalidations=0))
+        self.assertEqual(
+            stats.loc[("adjusted_prices", "")].to_dict(),
+            dict(hits=0, misses=0, invalidations=1))
+        self.assertEqual(len(stats), 3)
+
+    def test_inactive(self):
+        self.data.disable_read_cache()
+        self.diag_prices.get_multiple_prices("GOLD")
+        self.diag_prices.get_multiple_prices("GOLD")
+
+        self.assertEqual(self.price_data.number_of_reads, 2)
+        self.assertEqual(len(self.data.read_cache.stats()), 0)
+
+
+if __name__ == "__main__":
+    ut.main()
@@ -0,0 +1,48 @@
+import pickle
+import unittest as ut
+
+import numpy as np
+
+from sysdata.sim.csv_futures_sim_data import csvFuturesSimData
+from sysdata.sim.snapshot_futures_sim_data import snapshotFuturesSimData
+
+
+class Test(ut.TestCase):
+    def test_snapshot_same_as_source(self):
+        source_data = csvFuturesSimData()
+        list_of_instrument_codes = ["EDOLLAR", "US10", "CORN", "BUND"]
+        snapshot = snapshotFuturesSimData.from_sim_data(
+            source_data, base_currency="USD", list_of_instrument_codes=list_of_instrument_codes)
+
+        # so it can be sent to worker processes
+        snapshot = pickle.loads(pickle.dumps(snapshot))
+
+        self.assertEqual(sorted(snapshot.get_instrument_list()), sorted(list_of_instrument_codes))
+        for instrument_code in list_of_instrument_codes:
+            adjusted_prices = snapshot.get_backadjusted_futures_price(instrument_code)
+            expected_adjusted_prices = source_data.get_backadjusted_futures_price(instrument_code)
+            self.assertTrue(adjusted_prices.index.equals(expected_adjusted_prices.index))
+            np.testing.assert_array_equal(adjusted_prices.values, expected_adjusted_prices.values)
+
+            multiple_prices = snapshot.get_multiple_prices(instrument_code)
+            expected_multiple_prices = source_data.get_multiple_prices(instrument_code)
+            self.assertTrue(multiple_prices.index.equals(expected_multiple_prices.index))
+            self.assertTrue(multiple_prices.equals(expected_multiple_prices))
+
+            fx = snapshot.get_fx_for_instrument(instrument_code, "USD")
+            expected_fx = source_data.get_fx_for_instrument(instrument_code, "USD")
+            self.assertTrue(fx.index.equals(expected_fx.index))
+            np.testing.assert_array_equal(fx.values, expected_fx.values)
+
+            self.assertEqual(snapshot.get_value_of_block_price_move(instrument_code),
+                             source_data.get_value_of_block_price_move(instrument_code))
+
+        self.assertEqual(snapshot.get_instrument_currency("BUND"), "EUR")
+        self.assertEqual(snapshot.asset_class_for_instrument("CORN"), source_data.asset_class_for_instrument("CORN"))
+
+        with self.assertRaises(Exception):
+            snapshot.get_backadjusted_futures_price("GOLD")
+
+
+if __name__ == "__main__":
+    ut.main()
@@ -0,0 +1,63 @@
+import unittest as ut
+
+from sysbrokers.IB.ib_orders_data import ibOrdersData
+from sysbrokers.IB.ib_simulated_broker import connectionSimulatedIB, simulatedExchangeConfig
+from sysdata.data_blob import dataBlob
+from sysexecution.broker_orders import brokerOrder
+
+
+def _wait_until(condition, connection, max_polls=1000):
+    for __ in range(max_polls):
+        if condition():
+            return True
+        connection.ib.sleep(0.01)
+
+    return False
+
+
+class Test(ut.TestCase):
+    def test_market_order_fills_in_pieces(self):
+        connection = connectionSimulatedIB(
+            config=simulatedExchangeConfig(fill_fraction=0.5, fill_latency=0.0))
+        orders = ibOrdersData(connection)
+        placed = orders.put_order_on_stack(
+            brokerOrder("strategy", "EDOLLAR", "20230600", 4, order_type="market"))
+
+        self.assertTrue(_wait_until(placed.completed, connection))
+        self.assertEqual(list(placed.order.fill), [4])
+        self.assertEqual(len(placed.control_object.trade.fills), 3)
+
+    def test_limit_order_modify_and_cancel(self):
+        connection = connectionSimulatedIB(config=simulatedExchangeConfig(passive_fills_per_second=0.0))
+        orders = ibOrdersData(connection)
+        placed = orders.put_order_on_stack(
+            brokerOrder("strategy", "EDOLLAR", "20230600", 1, order_type="limit", limit_price=50.0))
+        self.assertTrue(_wait_until(
+            lambda: orders.check_order_can_be_modified_given_control_object(placed), connection))
+
+        orders.modify_limit_price_given_control_object(placed, 60.0)
+        self.assertEqual(placed.broker_limit_price(), 60.0)
+
+        orders.cancel_order_given_control_object(placed)
+        self.assertTrue(_wait_until(
+            lambda: orders.check_order_is_cancelled_given_control_object(placed), connection))
+        self.assertFalse(placed.completed())
+
+    def test_rejected_order_is_cancelled(self):
+        connection = connectionSimulatedIB(config=simulatedExchangeConfig(rejection_probability=1.0))
+        orders = ibOrdersData(connection)
+        placed = orders.put_order_on_stack(
+            brokerOrder("strategy", "EDOLLAR", "20230600", -1, order_type="market"))
+
+        self.assertTrue(_wait_until(
+            lambda: orders.check_order_is_cancelled_given_control_object(placed), connection))
+        self.assertTrue(placed.order.fill.equals_zero())
+
+    def test_data_blob_closes_passed_connection(self):
+        # the client id wasn't allocated by the blob, so there's nothing to release
+        data = dataBlob(ib_conn=connectionSimulatedIB(client_id=1))
+        data.close()
+
+
+if __name__ == "__main__":
+    ut.main()
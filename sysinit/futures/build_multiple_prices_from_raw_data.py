@@ -1,39 +1,15 @@
-from collections import namedtuple
-
 import numpy as np
 import pandas as pd
-from dataclasses import dataclass
 
 from sysobjects.dict_of_futures_per_contract_prices import dictFuturesContractFinalPrices
 from sysobjects.dict_of_named_futures_per_contract_prices import price_name, forward_name, carry_name, \
     contract_name_from_column_name
 
-missing_row = object()
-
-@dataclass
-class rollCalendarWithRollIndex:
-    roll_calendar: None
-    rolling_row_index: int = 1
-    already_added_data: bool = False
-
-    def iterate_roll(self):
-        self.rolling_row_index = self.rolling_row_index + 1
-
-    def not_end_of_calendar(self):
-        return self.rolling_row_index < len(self.roll_calendar.index)
-
-    def data_now_added(self):
-        self.already_added_data = True
+# A roll period runs from just after the previous roll date, to avoid overlaps, up to and including the next roll date
+START_OF_ROLL_PERIOD_OFFSET = pd.Timedelta(seconds=1)
 
-
-rollDateInfo = namedtuple("rollDateInfo", [
-                            "last_roll_date", "next_roll_date",
-                          "start_of_roll_period", "end_of_roll_period","roll_calendar_with_roll_index"
-])
-contractAndPriceInfo = namedtuple("ccontractAndPriceInfo",
-                                  ['current_contract', 'next_contract', 'carry_contract',
-                               'current_contract_str', 'next_contract_str', 'carry_contract_str',
-                                   "dict_of_futures_contract_closing_prices"])
+# Position of the extra all nan / not present column we add to the price panel, for contracts we don't have
+NO_CONTRACT_COLUMN = -1
 
 
 def create_multiple_price_stack_from_raw_data(
@@ -42,235 +18,190 @@ def create_multiple_price_stack_from_raw_data(
     """
     # NO TYPE CHECK FOR ROLL_CALENDAR AS WOULD CAUSE CIRCULAR IMPORT
 
+    Rather than slicing each contract roll period by roll period, we line up all the contracts in the roll
+    calendar into one date x contract panel, find the roll period for each date with searchsorted, and
+    then pick out the current, forward and carry price for each date in one go.
+
+    Each roll period includes every date on which any of its current, next or carry contract has a price.
+
     :param roll_calendar: rollCalendar
     :param dict_of_futures_closing_contract_prices: dictFuturesContractPrices with only one column, keys are date_str
 
     :return: pd.DataFrame with the 6 columns PRICE, CARRY, FORWARD, PRICE_CONTRACT, CARRY_CONTRACT, FORWARD_CONTRACT
     """
 
+    first_roll_period = _first_roll_period_with_data_and_check_contracts(
+        roll_calendar, dict_of_futures_contract_closing_prices
+    )
 
-    all_price_data_stack = []
-    roll_calendar_with_roll_index = rollCalendarWithRollIndex(roll_calendar)
-    while roll_calendar_with_roll_index.not_end_of_calendar():
-        all_price_data = _get_price_data_between_rolls(roll_calendar_with_roll_index,
-                                                       dict_of_futures_contract_closing_prices)
-        if all_price_data is missing_row:
-            pass
-        else:
-            all_price_data_stack.append(all_price_data)
-            roll_calendar_with_roll_index.data_now_added()
-
-        roll_calendar_with_roll_index.iterate_roll()
-
-    # end of loop
-    all_price_data_stack = pd.concat(all_price_data_stack, axis=0)
-
-    return all_price_data_stack
-
-
-def _get_price_data_between_rolls(roll_calendar_with_roll_index: rollCalendarWithRollIndex,
-                                  dict_of_futures_contract_closing_prices: dictFuturesContractFinalPrices):
-
-    # consider consolidating input args
-
-    roll_date_info = _calc_roll_date_info(roll_calendar_with_roll_index)
-    contract_date_info = _calc_contract_date_info(roll_date_info, dict_of_futures_contract_closing_prices)
-
-    invalid = _invalid_current_contract(contract_date_info)
-
-    if invalid:
-        # missing, this is okay if we haven't started properly yet
-        if not roll_calendar_with_roll_index.already_added_data:
-            print(
-                "Missing contracts at start of roll calendar not in price data, ignoring"
-            )
-            return missing_row
-        else:
-            raise Exception(
-                "Missing contracts in middle of roll calendar %s, not in price data!" %
-                str(roll_date_info.next_roll_date))
-
-    all_price_data = _calculate_price_data_from_current_next_carry_data(
-                                                                        roll_date_info,
-                                                                        contract_date_info)
-
-
-    return all_price_data
-
-
-def _calc_roll_date_info(roll_calendar_with_roll_index: rollCalendarWithRollIndex) ->rollDateInfo:
-    # Between these dates is where we are populating prices
-    roll_calendar = roll_calendar_with_roll_index.roll_calendar
-    rolling_row_index = roll_calendar_with_roll_index.rolling_row_index
-
-    last_roll_date = roll_calendar.index[rolling_row_index - 1]
-    next_roll_date = roll_calendar.index[rolling_row_index]
-
-    end_of_roll_period = next_roll_date
-    start_of_roll_period = last_roll_date + pd.DateOffset(
-        seconds=1
-    )  # to avoid overlaps
-
-    roll_date_info = rollDateInfo(last_roll_date, next_roll_date,
-                                  start_of_roll_period, end_of_roll_period,
-                                  roll_calendar_with_roll_index)
-
-    return roll_date_info
-
-
-
-def _calc_contract_date_info(
-                             roll_date_info: rollDateInfo,
-                            dict_of_futures_contract_closing_prices: dictFuturesContractFinalPrices)\
-                            -> contractAndPriceInfo:
-
-    roll_calendar = roll_date_info.roll_calendar_with_roll_index.roll_calendar
-
-    contracts_now = roll_calendar.loc[roll_date_info.next_roll_date, :]
-    current_contract = contracts_now.current_contract
-    next_contract = contracts_now.next_contract
-    carry_contract = contracts_now.carry_contract
-
-    current_contract_str = str(current_contract)
-    next_contract_str = str(next_contract)
-    carry_contract_str = str(carry_contract)
-
-    contract_date_info = contractAndPriceInfo(current_contract, next_contract, carry_contract,
-                                              current_contract_str, next_contract_str, carry_contract_str,
-                                              dict_of_futures_contract_closing_prices)
-
-    return contract_date_info
-
-
-def _invalid_current_contract(contract_date_info: contractAndPriceInfo
-                              ) -> bool:
-    dict_of_futures_contract_closing_prices = contract_date_info.dict_of_futures_contract_closing_prices
-    contract_keys = dict_of_futures_contract_closing_prices.keys()
-
-    if (contract_date_info.current_contract_str not in contract_keys):
-        return True
-    else:
-        return False
-
-
-def  _calculate_price_data_from_current_next_carry_data(
-                                                        roll_date_info: rollDateInfo,
-                                                        contract_date_info: contractAndPriceInfo):
-
-
-    set_of_price_data = _get_current_next_carry_data(
-                                                     roll_date_info,
-                                                     contract_date_info)
-
-    all_price_data = _build_all_price_data(set_of_price_data, contract_date_info)
+    list_of_contract_str = _contract_str_in_roll_calendar_with_prices(
+        roll_calendar, dict_of_futures_contract_closing_prices, first_roll_period=first_roll_period
+    )
+    price_panel, present_panel = _price_panel_for_contracts(
+        list_of_contract_str, dict_of_futures_contract_closing_prices
+    )
 
-    return all_price_data
+    timestamps = price_panel.index
+    roll_period_for_each_timestamp = _roll_period_for_each_timestamp(
+        roll_calendar, timestamps, first_roll_period=first_roll_period
+    )
 
+    contract_column_positions = dict(
+        [(contract_str, position) for position, contract_str in enumerate(list_of_contract_str)]
+    )
+    current_column, next_column, carry_column = [
+        _column_position_for_each_roll_period(
+            roll_calendar[contract_column_name], contract_column_positions
+        )
+        for contract_column_name in ["current_contract", "next_contract", "carry_contract"]
+    ]
 
-def _get_current_next_carry_data(
+    rows_in_a_roll_period = np.where(roll_period_for_each_timestamp >= 0)[0]
+    roll_periods = roll_period_for_each_timestamp[rows_in_a_roll_period]
 
-                                roll_date_info: rollDateInfo,
-                                 contract_date_info: contractAndPriceInfo
-                                 ):
-    dict_of_futures_contract_closing_prices = contract_date_info.dict_of_futures_contract_closing_prices
-    current_price_data = dict_of_futures_contract_closing_prices[
-                             contract_date_info.current_contract_str
-                         ][roll_date_info.start_of_roll_period:roll_date_info.end_of_roll_period]
+    # only keep dates where at least one of the three contracts has a price
+    present = (
+        present_panel[rows_in_a_roll_period, current_column[roll_periods]]
+        | present_panel[rows_in_a_roll_period, next_column[roll_periods]]
+        | present_panel[rows_in_a_roll_period, carry_column[roll_periods]]
+    )
+    rows = rows_in_a_roll_period[present]
+    roll_periods = roll_periods[present]
+
+    price_values = price_panel.values
+    all_price_data_stack = pd.DataFrame(
+        {
+            price_name: price_values[rows, current_column[roll_periods]],
+            forward_name: price_values[rows, next_column[roll_periods]],
+            carry_name: price_values[rows, carry_column[roll_periods]],
+            contract_name_from_column_name(price_name): roll_calendar.current_contract.values[roll_periods],
+            contract_name_from_column_name(forward_name): roll_calendar.next_contract.values[roll_periods],
+            contract_name_from_column_name(carry_name): roll_calendar.carry_contract.values[roll_periods],
+        },
+        index=timestamps[rows],
+    )
 
-    carry_price_data = _get_carry_price_data(contract_date_info,
-                                             current_price_data,
-                                             roll_date_info)
+    return all_price_data_stack
 
-    next_price_data = _get_next_price_data(contract_date_info,
-                         current_price_data,
-                        roll_date_info
-                         )
 
-    return current_price_data, next_price_data, carry_price_data
+def _first_roll_period_with_data_and_check_contracts(
+        roll_calendar, dict_of_futures_contract_closing_prices: dictFuturesContractFinalPrices) -> int:
+    """
+    Roll periods are labelled by the row in the roll calendar at their end, so run from 1 to len(roll_calendar)-1
 
+    It's okay to be missing current contracts at the start of the roll calendar; after that we must have
+    all the contracts, except next and carry contracts in the final roll period
 
-def _get_next_price_data(contract_date_info: contractAndPriceInfo,
-                         current_price_data: pd.Series,
-                         roll_date_info: rollDateInfo
-                         ):
-    dict_of_futures_contract_closing_prices = contract_date_info.dict_of_futures_contract_closing_prices
+    :return: int, first roll period we have a current contract for
+    """
     contract_keys = dict_of_futures_contract_closing_prices.keys()
-    next_contract_str = contract_date_info.next_contract_str
-
-    if next_contract_str not in contract_keys:
-
-        if _last_row_in_roll_calendar(roll_date_info):
-            # Last entry, this is fine
-            print(
-                "Next contract %s missing in last row of roll calendar - this is okay" %
-                next_contract_str)
-            next_price_data = pd.Series(np.nan, current_price_data.index)
-            next_price_data.iloc[:] = np.nan
-        else:
-            raise Exception(
-                "Missing contract %s in middle of roll calendar on %s"
-                % (next_contract_str, str(roll_date_info.next_roll_date))
-            )
-    else:
-        next_price_data = dict_of_futures_contract_closing_prices[
-                              next_contract_str
-                          ][roll_date_info.start_of_roll_period:roll_date_info.end_of_roll_period]
-
-    return  next_price_data
-
-def _get_carry_price_data(contract_date_info: contractAndPriceInfo,
-                         current_price_data: pd.Series,
-                         roll_date_info: rollDateInfo
-                         ):
-    dict_of_futures_contract_closing_prices = contract_date_info.dict_of_futures_contract_closing_prices
+    number_of_rows = len(roll_calendar.index)
+    if not roll_calendar.index.is_monotonic_increasing:
+        raise Exception("Roll calendar dates must be increasing")
+
+    first_roll_period = None
+    for roll_period in range(1, number_of_rows):
+        next_roll_date = roll_calendar.index[roll_period]
+        contracts_now = roll_calendar.iloc[roll_period]
+
+        if str(contracts_now.current_contract) not in contract_keys:
+            # missing, this is okay if we haven't started properly yet
+            if first_roll_period is None:
+                print(
+                    "Missing contracts at start of roll calendar not in price data, ignoring"
+                )
+                continue
+            else:
+                raise Exception(
+                    "Missing contracts in middle of roll calendar %s, not in price data!" %
+                    str(next_roll_date))
+
+        if first_roll_period is None:
+            first_roll_period = roll_period
+
+        last_row_in_roll_calendar = roll_period == number_of_rows - 1
+        for contract_str, description in [(str(contracts_now.carry_contract), "Carry"),
+                                          (str(contracts_now.next_contract), "Next")]:
+            if contract_str in contract_keys:
+                continue
+            if last_row_in_roll_calendar:
+                # Last entry, this is fine
+                print(
+                    "%s contract %s missing in last row of roll calendar - this is okay" %
+                    (description, contract_str))
+            else:
+                raise Exception(
+                    "Missing contract %s in middle of roll calendar on %s"
+                    % (contract_str, str(next_roll_date))
+                )
+
+    if first_roll_period is None:
+        raise Exception("None of the current contracts in the roll calendar have price data")
+
+    return first_roll_period
+
+
+def _contract_str_in_roll_calendar_with_prices(roll_calendar,
+                                               dict_of_futures_contract_closing_prices: dictFuturesContractFinalPrices,
+                                               first_roll_period: int) -> list:
     contract_keys = dict_of_futures_contract_closing_prices.keys()
-    carry_contract_str = contract_date_info.carry_contract_str
-
-    if carry_contract_str not in contract_keys:
-
-        if _last_row_in_roll_calendar(roll_date_info):
-            # Last entry, this is fine
-            print(
-                "Carry contract %s missing in last row of roll calendar - this is okay" %
-                carry_contract_str)
-            carry_price_data = pd.Series(np.nan, current_price_data.index)
-            carry_price_data.iloc[:] = np.nan
-        else:
-            raise Exception(
-                "Missing contract %s in middle of roll calendar on %s"
-                % (carry_contract_str, str(roll_date_info.next_roll_date))
-            )
-    else:
-        carry_price_data =    dict_of_futures_contract_closing_prices[
-        carry_contract_str][roll_date_info.start_of_roll_period:roll_date_info.end_of_roll_period]
-
+    roll_calendar_we_use = roll_calendar.iloc[first_roll_period:]
+    all_contract_str = set(
+        [str(contract) for contract in roll_calendar_we_use.current_contract]
+        + [str(contract) for contract in roll_calendar_we_use.next_contract]
+        + [str(contract) for contract in roll_calendar_we_use.carry_contract]
+    )
 
-    return  carry_price_data
+    return sorted([contract_str for contract_str in all_contract_str if contract_str in contract_keys])
 
 
-def _last_row_in_roll_calendar(roll_date_info: rollDateInfo):
-    roll_calendar_with_roll_index = roll_date_info.roll_calendar_with_roll_index
-    if \
-    roll_calendar_with_roll_index.rolling_row_index == len(roll_calendar_with_roll_index.roll_calendar.index) - 1:
-        return True
-    else:
-        return False
+def _price_panel_for_contracts(list_of_contract_str: list,
+                               dict_of_futures_contract_closing_prices: dictFuturesContractFinalPrices):
+    """
+    :return: tuple: pd.DataFrame of prices, dates x contracts; np.array of bool, True where the contract has a price
+      on that date (even if the price is nan). Both have an extra column at the end for missing contracts
+    """
+    list_of_prices = [dict_of_futures_contract_closing_prices[contract_str]
+                      for contract_str in list_of_contract_str]
+    # np.unique sorts; much quicker than repeatedly doing index.union
+    timestamps = pd.Index(
+        np.unique(np.concatenate([prices.index.values for prices in list_of_prices])))
+    index_names = set([prices.index.name for prices in list_of_prices])
+    if len(index_names) == 1:
+        timestamps.name = index_names.pop()
+
+    number_of_columns = len(list_of_contract_str) + 1
+    price_values = np.full((len(timestamps), number_of_columns), np.nan)
+    present_panel = np.zeros((len(timestamps), number_of_columns), dtype=bool)
+    for column_position, prices in enumerate(list_of_prices):
+        row_positions = timestamps.get_indexer(prices.index)
+        price_values[row_positions, column_position] = prices.values
+        present_panel[row_positions, column_position] = True
+
+    price_panel = pd.DataFrame(price_values, index=timestamps,
+                               columns=list_of_contract_str + [NO_CONTRACT_COLUMN])
+
+    return price_panel, present_panel
+
+
+def _roll_period_for_each_timestamp(roll_calendar, timestamps: pd.DatetimeIndex,
+                                    first_roll_period: int) -> np.array:
+    """
+    :return: np.array of int, roll period for each timestamp, or -1 if it isn't in a roll period we're using
+    """
+    roll_dates = pd.DatetimeIndex(roll_calendar.index)
 
+    # first roll date on or after each timestamp, which is the end of its roll period
+    roll_period = roll_dates.searchsorted(timestamps, side="left")
 
-def _build_all_price_data(set_of_price_data, contract_date_info):
+    in_a_roll_period = (roll_period >= first_roll_period) & (roll_period < len(roll_dates))
+    start_of_roll_period = (roll_dates + START_OF_ROLL_PERIOD_OFFSET)[
+        np.clip(roll_period - 1, 0, len(roll_dates) - 1)]
+    in_a_roll_period = in_a_roll_period & (timestamps >= start_of_roll_period)
 
-    current_price_data, next_price_data, carry_price_data = set_of_price_data
-    all_price_data = pd.concat(
-        [current_price_data, next_price_data, carry_price_data], axis=1
-    )
-    all_price_data.columns = [
-        price_name,
-        forward_name,
-        carry_name,
-    ]
+    return np.where(in_a_roll_period, roll_period, -1)
 
-    all_price_data[contract_name_from_column_name(price_name)] = contract_date_info.current_contract
-    all_price_data[contract_name_from_column_name(forward_name)] = contract_date_info.next_contract
-    all_price_data[contract_name_from_column_name(carry_name)] = contract_date_info.carry_contract
 
-    return all_price_data
\ No newline at end of file
+def _column_position_for_each_roll_period(contracts: pd.Series, contract_column_positions: dict) -> np.array:
+    return np.array([contract_column_positions.get(str(contract), NO_CONTRACT_COLUMN)
+                     for contract in contracts])
@@ -0,0 +1,463 @@
+"""
+Rebuild roll calendars, multiple prices and adjusted prices for a whole universe of instruments in one go
+
+This does the same job as running, for each instrument in turn:
+
+- rollcalendars_from_arcticprices_to_csv (build_and_write_roll_calendar)
+- multipleprices_from_arcticprices_and_csv_calendars_to_arctic (process_multiple_prices_single_instrument)
+- adjustedprices_from_mongo_multiple_to_mongo (process_adjusted_prices_single_instrument)
+
+but without any interaction, with instruments spread across a pool of processes.
+
+Each completed instrument is written to a checkpoint file along with the time each stage took. If the
+rebuild falls over, run it again with the same checkpoint file and it will carry on from where it
+stopped. An instrument that fails is reported, but doesn't stop the others.
+
+Where the data is read from and written to is decided by a data factory: a function (which has to be
+picklable, so a module level function or a functools.partial of one) returning a rebuildData object.
+The default reads from arctic / mongo, and writes roll calendars to .csv and prices to arctic, as
+the single instrument scripts do. Use get_csv_rebuild_data to run the whole thing from .csv files:
+
+    from functools import partial
+    rebuild_futures_data(
+        data_factory=partial(get_csv_rebuild_data, contract_prices_datapath="/home/me/contract_prices/",
+                             roll_calendars_datapath="/home/me/roll_calendars/", ...),
+        checkpoint_filename="/home/me/rebuild_checkpoint.csv", max_workers=8)
+"""
+
+import datetime
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import pandas as pd
+
+from syscore.objects import arg_not_supplied
+
+from sysdata.arctic.arctic_futures_per_contract_prices import (
+    arcticFuturesContractPriceData,
+)
+from sysdata.arctic.arctic_multiple_prices import arcticFuturesMultiplePricesData
+from sysdata.arctic.arctic_adjusted_prices import arcticFuturesAdjustedPricesData
+from sysdata.mongodb.mongo_roll_data import mongoRollParametersData
+from sysdata.csv.csv_futures_contract_prices import csvFuturesContractPriceData
+from sysdata.csv.csv_roll_parameters import csvRollParametersData
+from sysdata.csv.csv_roll_calendars import csvRollCalendarData
+from sysdata.csv.csv_multiple_prices import csvFuturesMultiplePricesData
+from sysdata.csv.csv_adjusted_prices import csvFuturesAdjustedPricesData
+
+from sysdata.futures.futures_per_contract_prices import futuresContractPriceData
+from sysdata.futures.rolls_parameters import rollParametersData
+from sysdata.futures.roll_calendars import rollCalendarData
+from sysdata.futures.multiple_prices import futuresMultiplePricesData
+from sysdata.futures.adjusted_prices import futuresAdjustedPricesData
+
+from sysinit.futures.build_roll_calendars import adjust_to_price_series
+from sysinit.futures.multipleprices_from_arcticprices_and_csv_calendars_to_arctic import (
+    add_phantom_row,
+)
+from sysobjects.adjusted_prices import futuresAdjustedPrices
+from sysobjects.dict_of_futures_per_contract_prices import dictFuturesContractFinalPrices
+from sysobjects.multiple_prices import futuresMultiplePrices
+from sysobjects.roll_calendars import rollCalendar
+
+ROLL_CALENDAR_STAGE = "roll_calendar"
+MULTIPLE_PRICES_STAGE = "multiple_prices"
+ADJUSTED_PRICES_STAGE = "adjusted_prices"
+
+# in the order they are run
+REBUILD_STAGES = [ROLL_CALENDAR_STAGE, MULTIPLE_PRICES_STAGE, ADJUSTED_PRICES_STAGE]
+
+INSTRUMENT_COLUMN = "instrument_code"
+TOTAL_COLUMN = "total"
+COMPLETED_COLUMN = "completed"
+ERROR_COLUMN = "error"
+
+CHECKPOINT_COLUMNS = [INSTRUMENT_COLUMN] + REBUILD_STAGES + [COMPLETED_COLUMN]
+
+
+class rebuildData(object):
+    """
+    Everything we read from and write to when rebuilding
+    """
+
+    def __init__(
+        self,
+        contract_prices: futuresContractPriceData,
+        roll_parameters: rollParametersData,
+        roll_calendars: rollCalendarData,
+        multiple_prices: futuresMultiplePricesData,
+        adjusted_prices: futuresAdjustedPricesData,
+    ):
+        self.contract_prices = contract_prices
+        self.roll_parameters = roll_parameters
+        self.roll_calendars = roll_calendars
+        self.multiple_prices = multiple_prices
+        self.adjusted_prices = adjusted_prices
+
+    def __repr__(self):
+        return "rebuildData: contract prices %s, roll parameters %s, roll calendars %s, multiple prices %s, adjusted prices %s" % (
+            str(self.contract_prices),
+            str(self.roll_parameters),
+            str(self.roll_calendars),
+            str(self.multiple_prices),
+            str(self.adjusted_prices),
+        )
+
+
+def get_production_rebuild_data(
+    roll_calendars_datapath=arg_not_supplied,
+) -> rebuildData:
+    return rebuildData(
+        contract_prices=arcticFuturesContractPriceData(),
+        roll_parameters=mongoRollParametersData(),
+        roll_calendars=csvRollCalendarData(roll_calendars_datapath),
+        multiple_prices=arcticFuturesMultiplePricesData(),
+        adjusted_prices=arcticFuturesAdjustedPricesData(),
+    )
+
+
+def get_csv_rebuild_data(
+    contract_prices_datapath,
+    roll_parameters_datapath=arg_not_supplied,
+    roll_calendars_datapath=arg_not_supplied,
+    multiple_prices_datapath=arg_not_supplied,
+    adjusted_prices_datapath=arg_not_supplied,
+) -> rebuildData:
+    """
+    Only the contract prices datapath is required. The others default to the provided data, which
+    will be overwritten, so you probably want to pass them as well.
+    """
+    return rebuildData(
+        contract_prices=csvFuturesContractPriceData(contract_prices_datapath),
+        roll_parameters=csvRollParametersData(datapath=roll_parameters_datapath),
+        roll_calendars=csvRollCalendarData(roll_calendars_datapath),
+        multiple_prices=csvFuturesMultiplePricesData(multiple_prices_datapath),
+        adjusted_prices=csvFuturesAdjustedPricesData(adjusted_prices_datapath),
+    )
+
+
+class instrumentRebuildResult(object):
+    def __init__(self, instrument_code: str):
+        self.instrument_code = instrument_code
+        self.stage_seconds = {}
+        self.error = ""
+
+    def __repr__(self):
+        if self.failed:
+            return "%s failed: %s" % (self.instrument_code, self.error)
+
+        return "%s rebuilt in %.1f seconds" % (
+            self.instrument_code,
+            self.total_seconds,
+        )
+
+    @property
+    def failed(self) -> bool:
+        return len(self.error) > 0
+
+    @property
+    def total_seconds(self) -> float:
+        return sum(self.stage_seconds.values())
+
+
+class rebuildCheckpoint(object):
+    """
+    A .csv file with one row per completed instrument, and how long each stage took
+    """
+
+    def __init__(self, filename: str):
+        self._filename = filename
+
+    def __repr__(self):
+        return "rebuildCheckpoint in %s" % self.filename
+
+    @property
+    def filename(self) -> str:
+        return self._filename
+
+    def completed_instruments(self) -> list:
+        return list(self.read().index)
+
+    def read(self) -> pd.DataFrame:
+        if not os.path.exists(self.filename):
+            return pd.DataFrame(columns=CHECKPOINT_COLUMNS).set_index(
+                INSTRUMENT_COLUMN
+            )
+
+        # a crash half way through writing a row leaves a partial row, which we ignore
+        checkpoint_df = pd.read_csv(self.filename).dropna()
+
+        return checkpoint_df.set_index(INSTRUMENT_COLUMN)
+
+    def add_completed_instrument(self, result: instrumentRebuildResult):
+        write_header = not os.path.exists(self.filename)
+        row = (
+            [result.instrument_code]
+            + ["%f" % result.stage_seconds[stage_name] for stage_name in REBUILD_STAGES]
+            + [str(datetime.datetime.now())]
+        )
+
+        with open(self.filename, "a") as checkpoint_file:
+            if write_header:
+                checkpoint_file.write(",".join(CHECKPOINT_COLUMNS) + "\n")
+            checkpoint_file.write(",".join(row) + "\n")
+
+    def clear(self):
+        if os.path.exists(self.filename):
+            os.remove(self.filename)
+
+
+def rebuild_futures_data(
+    data_factory=get_production_rebuild_data,
+    instrument_list: list = arg_not_supplied,
+    checkpoint_filename: str = arg_not_supplied,
+    max_workers: int = arg_not_supplied,
+    restart: bool = False,
+) -> pd.DataFrame:
+    """
+    Rebuild roll calendars, multiple prices and adjusted prices for a list of instruments
+
+    :param data_factory: picklable function returning a rebuildData; called once for each instrument
+    :param instrument_list: defaults to every instrument with contract price data
+    :param checkpoint_filename: completed instruments are recorded here and skipped if we run again
+    :param max_workers: number of processes; defaults to one per cpu. With 1 everything runs in this process
+    :param restart: if True, ignore the checkpoint file and start from scratch
+
+    :return: pd.DataFrame, one row per instrument rebuilt in this run, seconds for each stage, total, and error
+    """
+    if instrument_list is arg_not_supplied:
+        instrument_list = (
+            data_factory().contract_prices.get_list_of_instrument_codes_with_price_data()
+        )
+
+    instrument_list = _remove_completed_instruments(
+        instrument_list, checkpoint_filename=checkpoint_filename, restart=restart
+    )
+
+    if max_workers is arg_not_supplied:
+        max_workers = os.cpu_count()
+
+    print(
+        "Rebuilding %d instruments with %d workers"
+        % (len(instrument_list), max_workers)
+    )
+
+    list_of_results = []
+    for result in _rebuild_list_of_instruments(
+        data_factory, instrument_list, max_workers=max_workers
+    ):
+        print(result)
+        if not result.failed and checkpoint_filename is not arg_not_supplied:
+            rebuildCheckpoint(checkpoint_filename).add_completed_instrument(result)
+        list_of_results.append(result)
+
+    timings = rebuild_timings_as_pd_df(list_of_results)
+    print_rebuild_summary(timings)
+
+    return timings
+
+
+def _remove_completed_instruments(
+    instrument_list: list, checkpoint_filename: str, restart: bool = False
+) -> list:
+    if checkpoint_filename is arg_not_supplied:
+        return instrument_list
+
+    checkpoint = rebuildCheckpoint(checkpoint_filename)
+    if restart:
+        checkpoint.clear()
+        return instrument_list
+
+    completed_instruments = checkpoint.completed_instruments()
+    if len(completed_instruments) > 0:
+        print(
+            "Skipping %d instruments already completed in %s"
+            % (len(completed_instruments), checkpoint_filename)
+        )
+
+    return [
+        instrument_code
+        for instrument_code in instrument_list
+        if instrument_code not in completed_instruments
+    ]
+
+
+def _rebuild_list_of_instruments(data_factory, instrument_list: list,
+                                 max_workers: int):
+    """
+    Generator of instrumentRebuildResult, in the order they finish
+    """
+    if max_workers == 1:
+        for instrument_code in instrument_list:
+            yield rebuild_instrument(data_factory, instrument_code)
+        return
+
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        list_of_futures = [
+            executor.submit(rebuild_instrument, data_factory, instrument_code)
+            for instrument_code in instrument_list
+        ]
+        for future in as_completed(list_of_futures):
+            yield future.result()
+
+
+def rebuild_instrument(data_factory, instrument_code: str) -> instrumentRebuildResult:
+    """
+    Run all the stages for one instrument. Runs inside a worker process, so never raises: errors
+    are returned in the result.
+    """
+    result = instrumentRebuildResult(instrument_code)
+    stage_name = ROLL_CALENDAR_STAGE
+    try:
+        data = data_factory()
+
+        start_time = time.perf_counter()
+        dict_of_futures_contract_prices = (
+            data.contract_prices.get_all_prices_for_instrument(instrument_code)
+        )
+        dict_of_futures_contract_closing_prices = (
+            dict_of_futures_contract_prices.final_prices()
+        )
+        roll_parameters = data.roll_parameters.get_roll_parameters(instrument_code)
+        roll_calendar = build_and_write_roll_calendar_for_instrument(
+            data,
+            instrument_code,
+            dict_of_futures_contract_closing_prices=dict_of_futures_contract_closing_prices,
+            roll_parameters=roll_parameters,
+        )
+        result.stage_seconds[stage_name] = time.perf_counter() - start_time
+
+        stage_name = MULTIPLE_PRICES_STAGE
+        start_time = time.perf_counter()
+        multiple_prices = build_and_write_multiple_prices_for_instrument(
+            data,
+            instrument_code,
+            roll_calendar=roll_calendar,
+            dict_of_futures_contract_closing_prices=dict_of_futures_contract_closing_prices,
+            roll_parameters=roll_parameters,
+        )
+        result.stage_seconds[stage_name] = time.perf_counter() - start_time
+
+        stage_name = ADJUSTED_PRICES_STAGE
+        start_time = time.perf_counter()
+        build_and_write_adjusted_prices_for_instrument(
+            data, instrument_code, multiple_prices=multiple_prices
+        )
+        result.stage_seconds[stage_name] = time.perf_counter() - start_time
+
+    except Exception as e:
+        result.error = "%s stage: %s" % (stage_name, str(e))
+
+    return result
+
+
+def build_and_write_roll_calendar_for_instrument(
+    data: rebuildData,
+    instrument_code: str,
+    dict_of_futures_contract_closing_prices: dictFuturesContractFinalPrices,
+    roll_parameters,
+) -> rollCalendar:
+
+    roll_calendar = rollCalendar.create_from_prices(
+        dict_of_futures_contract_closing_prices, roll_parameters
+    )
+
+    # Interactively we'd eyeball a bad calendar and perhaps write it anyway; here we stop
+    if not roll_calendar.check_if_date_index_monotonic():
+        raise Exception("Roll calendar dates are not monotonic")
+
+    if not roll_calendar.check_dates_are_valid_for_prices(
+        dict_of_futures_contract_closing_prices
+    ):
+        raise Exception("Roll calendar dates are not valid for prices")
+
+    data.roll_calendars.add_roll_calendar(
+        instrument_code, roll_calendar, ignore_duplication=True
+    )
+
+    return roll_calendar
+
+
+def build_and_write_multiple_prices_for_instrument(
+    data: rebuildData,
+    instrument_code: str,
+    roll_calendar: rollCalendar,
+    dict_of_futures_contract_closing_prices: dictFuturesContractFinalPrices,
+    roll_parameters,
+) -> futuresMultiplePrices:
+
+    roll_calendar = adjust_to_price_series(
+        roll_calendar, dict_of_futures_contract_closing_prices
+    )
+    roll_calendar = add_phantom_row(
+        roll_calendar, dict_of_futures_contract_closing_prices, roll_parameters
+    )
+
+    multiple_prices = futuresMultiplePrices.create_from_raw_data(
+        roll_calendar, dict_of_futures_contract_closing_prices
+    )
+
+    data.multiple_prices.add_multiple_prices(
+        instrument_code, multiple_prices, ignore_duplication=True
+    )
+
+    return multiple_prices
+
+
+def build_and_write_adjusted_prices_for_instrument(
+    data: rebuildData,
+    instrument_code: str,
+    multiple_prices: futuresMultiplePrices,
+) -> futuresAdjustedPrices:
+
+    adjusted_prices = futuresAdjustedPrices.stich_multiple_prices(
+        multiple_prices, forward_fill=True
+    )
+
+    data.adjusted_prices.add_adjusted_prices(
+        instrument_code, adjusted_prices, ignore_duplication=True
+    )
+
+    return adjusted_prices
+
+
+def rebuild_timings_as_pd_df(list_of_results: list) -> pd.DataFrame:
+    timings = pd.DataFrame(
+        [
+            [result.stage_seconds.get(stage_name, float("nan"))
+             for stage_name in REBUILD_STAGES]
+            + [result.total_seconds, result.error]
+            for result in list_of_results
+        ],
+        index=[result.instrument_code for result in list_of_results],
+        columns=REBUILD_STAGES + [TOTAL_COLUMN, ERROR_COLUMN],
+    )
+    timings.index.name = INSTRUMENT_COLUMN
+
+    return timings
+
+
+def print_rebuild_summary(timings: pd.DataFrame):
+    failed = timings[timings[ERROR_COLUMN] != ""]
+    succeeded = timings[timings[ERROR_COLUMN] == ""]
+
+    print("Rebuilt %d instruments, %d failed" % (len(succeeded), len(failed)))
+    if len(succeeded) > 0:
+        print("Seconds per stage:")
+        print(
+            succeeded[REBUILD_STAGES + [TOTAL_COLUMN]]
+            .astype(float)
+            .agg(["sum", "mean", "max"])
+        )
+    for instrument_code, error in failed[ERROR_COLUMN].items():
+        print("%s failed in %s" % (instrument_code, error))
+
+
+if __name__ == "__main__":
+    input("Will overwrite existing roll calendars and prices are you sure?! CTL-C to abort")
+    # modify as required
+    rebuild_futures_data(
+        data_factory=get_production_rebuild_data,
+        checkpoint_filename=os.path.expanduser("~/rebuild_futures_data_checkpoint.csv"),
+    )
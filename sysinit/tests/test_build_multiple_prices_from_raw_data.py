@@ -0,0 +1,137 @@
+import unittest as ut
+
+import numpy as np
+import pandas as pd
+
+from sysdata.csv.csv_multiple_prices import csvFuturesMultiplePricesData
+from sysdata.csv.csv_roll_calendars import csvRollCalendarData
+from sysinit.futures.build_multiple_prices_from_raw_data import create_multiple_price_stack_from_raw_data
+from sysobjects.dict_of_futures_per_contract_prices import dictFuturesContractFinalPrices
+from sysobjects.dict_of_named_futures_per_contract_prices import list_of_price_column_names, \
+    contract_name_from_column_name
+
+nan = np.nan
+
+
+def _prices(list_of_dates_and_prices):
+    return pd.Series(
+        [price for _, price in list_of_dates_and_prices],
+        index=pd.DatetimeIndex([date for date, _ in list_of_dates_and_prices]),
+    )
+
+
+def roll_calendar_for_test():
+    return pd.DataFrame(
+        dict(
+            current_contract=["20191100", "20191200", "20200100", "20200200", "20200300", "20200400"],
+            next_contract=["20191200", "20200100", "20200200", "20200300", "20200400", "20200500"],
+            carry_contract=["20200100", "20200200", "20200300", "20200100", "20200200", "20200300"],
+        ),
+        index=pd.DatetimeIndex(["2019-12-10", "2020-01-10", "2020-02-10", "2020-03-10 12:00",
+                                "2020-04-10", "2020-05-11"]),
+    )
+
+
+def contract_prices_for_test():
+    # nothing for 20191200, so the first roll period is ignored; nothing for 20200500, which is fine in the last
+    return dictFuturesContractFinalPrices(dict(
+        [
+            ("20200100", _prices([("2020-02-03", 99.0), ("2020-02-10", 99.5), ("2020-02-12", 100.0),
+                                  ("2020-02-20 15:30", nan), ("2020-03-02", 101.0)])),
+            ("20200200", _prices([("2020-02-10", 100.0), ("2020-02-11", 101.0), ("2020-02-20 15:30", 102.0),
+                                  ("2020-03-10 12:00", 103.0), ("2020-03-10 12:00:00.5", 103.5),
+                                  ("2020-03-11", 104.0), ("2020-04-01", 105.0)])),
+            ("20200300", _prices([("2020-02-11", 110.0), ("2020-02-25", nan), ("2020-03-10 12:00", 111.0),
+                                  ("2020-03-12", 112.0), ("2020-04-10", 113.0), ("2020-04-20", 114.0)])),
+            ("20200400", _prices([("2020-03-12", 120.0), ("2020-04-09", 121.0), ("2020-04-10", 122.0),
+                                  ("2020-04-10 00:00:01", 123.0), ("2020-05-11", 124.0), ("2020-05-12", 125.0)])),
+        ]
+    ))
+
+
+# What building multiple prices roll period by roll period gave for the test data
+EXPECTED_COLUMNS = ["PRICE", "FORWARD", "CARRY", "PRICE_CONTRACT", "FORWARD_CONTRACT", "CARRY_CONTRACT"]
+EXPECTED_ROWS = [
+    ("2020-02-03 00:00:00", 99.0, nan, nan, "20200100", "20200200", "20200300"),
+    ("2020-02-10 00:00:00", 99.5, 100.0, nan, "20200100", "20200200", "20200300"),
+    ("2020-02-11 00:00:00", 101.0, 110.0, nan, "20200200", "20200300", "20200100"),
+    ("2020-02-12 00:00:00", nan, nan, 100.0, "20200200", "20200300", "20200100"),
+    ("2020-02-20 15:30:00", 102.0, nan, nan, "20200200", "20200300", "20200100"),
+    ("2020-02-25 00:00:00", nan, nan, nan, "20200200", "20200300", "20200100"),
+    ("2020-03-02 00:00:00", nan, nan, 101.0, "20200200", "20200300", "20200100"),
+    ("2020-03-10 12:00:00", 103.0, 111.0, nan, "20200200", "20200300", "20200100"),
+    ("2020-03-11 00:00:00", nan, nan, 104.0, "20200300", "20200400", "20200200"),
+    ("2020-03-12 00:00:00", 112.0, 120.0, nan, "20200300", "20200400", "20200200"),
+    ("2020-04-01 00:00:00", nan, nan, 105.0, "20200300", "20200400", "20200200"),
+    ("2020-04-09 00:00:00", nan, 121.0, nan, "20200300", "20200400", "20200200"),
+    ("2020-04-10 00:00:00", 113.0, 122.0, nan, "20200300", "20200400", "20200200"),
+    ("2020-04-10 00:00:01", 123.0, nan, nan, "20200400", "20200500", "20200300"),
+    ("2020-04-20 00:00:00", nan, nan, 114.0, "20200400", "20200500", "20200300"),
+    ("2020-05-11 00:00:00", 124.0, nan, nan, "20200400", "20200500", "20200300"),
+]
+
+# Length, count of non nan values in each column, and sum of PRICE, FORWARD and CARRY that building roll period
+# by roll period gave for the provided data from 2015
+EXPECTED_FOR_PROVIDED_DATA = dict(
+    US10=(33392, [31837, 9688, 9688, 33392, 33392, 33392], [3984129.1953, 1212847.3906, 1212847.3906]),
+    CORN=(20651, [12436, 4319, 9734, 20651, 20651, 20651], [4842897.25, 1719636.25, 3568854.25]),
+    V2X=(23040, [14839, 9546, 19422, 23040, 23040, 23040], [291707.425, 187539.7, 377421.4]),
+)
+START_DATE = "2015-01-01"
+
+
+def contract_prices_from_provided_multiple_prices(instrument_code):
+    multiple_prices = csvFuturesMultiplePricesData().get_multiple_prices(instrument_code)
+    multiple_prices = multiple_prices[multiple_prices.index >= START_DATE]
+
+    all_prices = pd.concat(
+        [
+            pd.DataFrame(dict(price=multiple_prices[price_column],
+                              contract=multiple_prices[contract_name_from_column_name(price_column)]))
+            for price_column in list_of_price_column_names
+        ],
+        axis=0,
+    ).dropna(subset=["contract"])
+
+    contract_prices = dict(
+        [
+            (contract_id, prices_for_contract.price[~prices_for_contract.index.duplicated()].sort_index())
+            for contract_id, prices_for_contract in all_prices.groupby("contract")
+        ]
+    )
+
+    return dictFuturesContractFinalPrices(contract_prices)
+
+
+class Test(ut.TestCase):
+    def test_same_as_building_roll_period_by_roll_period(self):
+        multiple_prices = create_multiple_price_stack_from_raw_data(
+            roll_calendar_for_test(), contract_prices_for_test())
+
+        expected = pd.DataFrame([row[1:] for row in EXPECTED_ROWS], columns=EXPECTED_COLUMNS,
+                                index=pd.DatetimeIndex([row[0] for row in EXPECTED_ROWS]))
+        pd.testing.assert_frame_equal(multiple_prices, expected)
+
+    def test_missing_contract_in_middle(self):
+        contract_prices = contract_prices_for_test()
+        del contract_prices["20200300"]
+
+        with self.assertRaisesRegex(Exception, "Missing contract 20200300 in middle of roll calendar on 2020-02-10"):
+            create_multiple_price_stack_from_raw_data(roll_calendar_for_test(), contract_prices)
+
+    def test_provided_data(self):
+        for instrument_code, (length, counts, sums) in EXPECTED_FOR_PROVIDED_DATA.items():
+            roll_calendar = csvRollCalendarData().get_roll_calendar(instrument_code)
+            roll_calendar = roll_calendar[roll_calendar.index >= START_DATE]
+
+            multiple_prices = create_multiple_price_stack_from_raw_data(
+                roll_calendar, contract_prices_from_provided_multiple_prices(instrument_code))
+
+            self.assertEqual(len(multiple_prices), length)
+            self.assertEqual(list(multiple_prices.count()), counts)
+            np.testing.assert_array_almost_equal(
+                multiple_prices[["PRICE", "FORWARD", "CARRY"]].sum().values, sums, decimal=3)
+
+
+if __name__ == "__main__":
+    ut.main()
@@ -0,0 +1,133 @@
+import os
+import shutil
+import tempfile
+import unittest as ut
+from functools import partial
+
+import numpy as np
+import pandas as pd
+
+from sysdata.csv.csv_adjusted_prices import csvFuturesAdjustedPricesData
+from sysdata.csv.csv_futures_contract_prices import csvFuturesContractPriceData
+from sysdata.csv.csv_multiple_prices import csvFuturesMultiplePricesData
+from sysdata.csv.csv_roll_calendars import csvRollCalendarData
+from sysinit.futures.rebuild_futures_data_pipeline import (
+    rebuild_futures_data,
+    get_csv_rebuild_data,
+    rebuildCheckpoint,
+    ERROR_COLUMN,
+)
+from sysobjects.adjusted_prices import futuresAdjustedPrices
+from sysobjects.contracts import futuresContract
+from sysobjects.futures_per_contract_prices import futuresContractPrices, FINAL_COLUMN
+from sysobjects.dict_of_named_futures_per_contract_prices import list_of_price_column_names, \
+    contract_name_from_column_name
+
+INSTRUMENTS = ["US10", "GOLD"]
+START_DATE = "2019-01-01"
+
+
+def write_contract_prices_from_provided_multiple_prices(instrument_code, contract_prices_data):
+    """
+    There are no per contract prices in the repo, so we get them back out of the provided multiple prices
+    """
+    multiple_prices = csvFuturesMultiplePricesData().get_multiple_prices(instrument_code)
+    multiple_prices = multiple_prices[multiple_prices.index >= START_DATE]
+
+    all_prices = pd.concat(
+        [
+            pd.DataFrame(dict(price=multiple_prices[price_column],
+                              contract=multiple_prices[contract_name_from_column_name(price_column)]))
+            for price_column in list_of_price_column_names
+        ],
+        axis=0,
+    ).dropna()
+
+    for contract_id, prices_for_contract in all_prices.groupby("contract"):
+        final_prices = prices_for_contract.price
+        final_prices = final_prices[~final_prices.index.duplicated()].sort_index()
+        contract_prices_data.write_prices_for_contract_object(
+            futuresContract(instrument_code, str(int(contract_id))),
+            futuresContractPrices.create_from_final_prices_only(final_prices.rename(FINAL_COLUMN)),
+        )
+
+
+class Test(ut.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.tempdir = tempfile.mkdtemp()
+        cls.datapaths = {}
+        for data_name in ["contract_prices", "roll_calendars", "multiple_prices", "adjusted_prices"]:
+            cls.datapaths[data_name] = os.path.join(cls.tempdir, data_name)
+            os.mkdir(cls.datapaths[data_name])
+
+        cls.contract_prices = csvFuturesContractPriceData(cls.datapaths["contract_prices"])
+        for instrument_code in INSTRUMENTS:
+            write_contract_prices_from_provided_multiple_prices(instrument_code, cls.contract_prices)
+
+        cls.data_factory = partial(
+            get_csv_rebuild_data,
+            contract_prices_datapath=cls.datapaths["contract_prices"],
+            roll_calendars_datapath=cls.datapaths["roll_calendars"],
+            multiple_prices_datapath=cls.datapaths["multiple_prices"],
+            adjusted_prices_datapath=cls.datapaths["adjusted_prices"],
+        )
+        cls.checkpoint_filename = os.path.join(cls.tempdir, "checkpoint.csv")
+
+        # no prices for the last one, so it fails without stopping the others
+        cls.timings = rebuild_futures_data(
+            data_factory=cls.data_factory,
+            instrument_list=INSTRUMENTS + ["NOT_AN_INSTRUMENT"],
+            checkpoint_filename=cls.checkpoint_filename,
+            max_workers=2,
+        )
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(cls.tempdir)
+
+    def test_failures_reported(self):
+        self.assertEqual(sorted(self.timings.index), sorted(INSTRUMENTS + ["NOT_AN_INSTRUMENT"]))
+        self.assertEqual(list(self.timings[ERROR_COLUMN][INSTRUMENTS]), ["", ""])
+        self.assertNotEqual(self.timings[ERROR_COLUMN]["NOT_AN_INSTRUMENT"], "")
+
+    def test_csv_data_written(self):
+        roll_calendars = csvRollCalendarData(self.datapaths["roll_calendars"])
+        multiple_prices_data = csvFuturesMultiplePricesData(self.datapaths["multiple_prices"])
+        adjusted_prices_data = csvFuturesAdjustedPricesData(self.datapaths["adjusted_prices"])
+
+        for instrument_code in INSTRUMENTS:
+            self.assertGreater(len(roll_calendars.get_roll_calendar(instrument_code)), 0)
+
+            multiple_prices = multiple_prices_data.get_multiple_prices(instrument_code)
+            self.assertGreater(len(multiple_prices), 0)
+
+            # each price is the price of the contract it says it is
+            some_rows = multiple_prices.dropna(subset=["PRICE"]).iloc[::50]
+            for date, row in some_rows.iterrows():
+                contract_prices = self.contract_prices.get_prices_for_contract_object(
+                    futuresContract(instrument_code, str(row.PRICE_CONTRACT)))
+                self.assertAlmostEqual(contract_prices.return_final_prices()[date], row.PRICE)
+
+            adjusted_prices = adjusted_prices_data.get_adjusted_prices(instrument_code)
+            expected_adjusted_prices = futuresAdjustedPrices.stich_multiple_prices(
+                multiple_prices, forward_fill=True)
+            self.assertEqual(len(adjusted_prices), len(expected_adjusted_prices))
+            np.testing.assert_array_almost_equal(adjusted_prices.values, expected_adjusted_prices.values)
+
+    def test_run_again_picks_up_where_it_stopped(self):
+        self.assertEqual(
+            sorted(rebuildCheckpoint(self.checkpoint_filename).completed_instruments()), sorted(INSTRUMENTS))
+
+        timings = rebuild_futures_data(
+            data_factory=self.data_factory,
+            instrument_list=INSTRUMENTS + ["NOT_AN_INSTRUMENT"],
+            checkpoint_filename=self.checkpoint_filename,
+            max_workers=1,
+        )
+        # only the failure is tried again
+        self.assertEqual(list(timings.index), ["NOT_AN_INSTRUMENT"])
+
+
+if __name__ == "__main__":
+    ut.main()
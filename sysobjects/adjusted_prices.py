@@ -67,6 +67,8 @@ def _panama_stitch(multiple_prices_input: futuresMultiplePrices, forward_fill: b
     """
     Do a panama stitch for adjusted prices
 
+    Works on the contract codes, so is the same for compact multiple prices with categorical contract columns
+
     :param multiple_prices:  futuresMultiplePrices
     :return: pd.Series of adjusted prices
     """
@@ -75,21 +77,16 @@ def _panama_stitch(multiple_prices_input: futuresMultiplePrices, forward_fill: b
     if multiple_prices.empty:
         raise Exception("Can't stitch an empty multiple prices object")
 
-    previous_row = multiple_prices.iloc[0, :]
-    adjusted_prices_values = [previous_row.PRICE]
-
-    for dateindex in multiple_prices.index[1:]:
-        current_row = multiple_prices.loc[dateindex, :]
-
-        if current_row.PRICE_CONTRACT == previous_row.PRICE_CONTRACT:
-            # no roll has occured
-            # we just append the price
-            adjusted_prices_values.append(current_row.PRICE)
-        else:
-            # A roll has occured
-            adjusted_prices_values = _roll_in_panama(adjusted_prices_values, previous_row, current_row)
+    # missing contracts are -1, and never count as the same contract
+    price_contract_codes = pd.factorize(multiple_prices.PRICE_CONTRACT)[0]
+    roll_rows = np.where(
+        (price_contract_codes[1:] != price_contract_codes[:-1])
+        | (price_contract_codes[1:] == -1)
+    )[0] + 1
 
-        previous_row = current_row
+    adjusted_prices_values = multiple_prices.PRICE.values.copy()
+    for roll_row in roll_rows:
+        _roll_in_panama(adjusted_prices_values, multiple_prices, roll_row)
 
     # it's ok to return a DataFrame since the calling object will change the
     # type
@@ -100,25 +97,22 @@ def _panama_stitch(multiple_prices_input: futuresMultiplePrices, forward_fill: b
     return adjusted_prices
 
 
-def _roll_in_panama(adjusted_prices_values, previous_row, current_row):
+def _roll_in_panama(adjusted_prices_values: np.array, multiple_prices: futuresMultiplePrices, roll_row: int):
     # This is the sort of code you will need to change to adjust the roll logic
     # The roll differential is from the previous_row
-    roll_differential = previous_row.FORWARD - previous_row.PRICE
+    previous_row = roll_row - 1
+    roll_differential = multiple_prices.FORWARD.values[previous_row] - multiple_prices.PRICE.values[previous_row]
     if np.isnan(roll_differential):
         raise Exception(
             "On this day %s which should be a roll date we don't have prices for both %s and %s contracts" %
-            (str(current_row.name), previous_row.PRICE_CONTRACT, previous_row.FORWARD_CONTRACT,))
-
-    # We add the roll differential to all previous prices
-    adjusted_prices_values = [
-        adj_price + roll_differential for adj_price in adjusted_prices_values]
+            (str(multiple_prices.index[roll_row]),
+             multiple_prices.PRICE_CONTRACT.iloc[previous_row],
+             multiple_prices.FORWARD_CONTRACT.iloc[previous_row]))
 
+    # We add the roll differential to all previous prices, in place
     # note this includes the price for the previous row, which will now be equal to the forward price
-    # We now add todays price. This will be for the new contract
-
-    adjusted_prices_values.append(current_row.PRICE)
-
-    return adjusted_prices_values
+    # Prices from the roll row onwards are for the new contract
+    adjusted_prices_values[:roll_row] += roll_differential
 
 
 no_update_roll_has_occured = futuresAdjustedPrices.create_empty()
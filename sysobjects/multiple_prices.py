@@ -2,6 +2,7 @@ from syscore.objects import missing_data
 from dataclasses import  dataclass
 import datetime as datetime
 from copy import copy
+import numpy as np
 import pandas as pd
 
 from sysinit.futures.build_multiple_prices_from_raw_data import create_multiple_price_stack_from_raw_data
@@ -93,6 +94,43 @@ class futuresMultiplePrices(pd.DataFrame):
         return multiple_prices
 
 
+    def as_compact(self, float32_prices: bool = False):
+        """
+        Use less memory, eg for backtesting with lots of instruments.
+
+        Contract columns become categorical; that is exact, since the categories are the original strings.
+        Price columns can also be float32, which loses precision, so those can't be written back to storage.
+
+        :return: new futuresMultiplePrices
+        """
+        compact_data = pd.DataFrame(self).copy()
+        for contract_column_name in list_of_contract_column_names:
+            compact_data[contract_column_name] = compact_data[contract_column_name].astype("category")
+
+        if float32_prices:
+            compact_data[list_of_price_column_names] = compact_data[list_of_price_column_names].astype("float32")
+
+        return futuresMultiplePrices(compact_data)
+
+    def as_full(self):
+        """
+        Undo as_compact: contract columns as strings and prices as float64
+
+        :return: new futuresMultiplePrices
+        """
+        full_data = pd.DataFrame(self).copy()
+        for contract_column_name in list_of_contract_column_names:
+            if isinstance(full_data[contract_column_name].dtype, pd.CategoricalDtype):
+                full_data[contract_column_name] = full_data[contract_column_name].astype(object)
+
+        full_data[list_of_price_column_names] = full_data[list_of_price_column_names].astype("float64")
+
+        return futuresMultiplePrices(full_data)
+
+    def has_float32_prices(self) -> bool:
+        return any([self[price_column_name].dtype == np.float32
+                    for price_column_name in list_of_price_column_names])
+
     def current_contract_dict(self) -> setOfNamedContracts:
         if len(self)==0:
             return missing_data
@@ -0,0 +1,77 @@
+import unittest as ut
+
+import numpy as np
+import pandas as pd
+
+from sysdata.csv.csv_multiple_prices import csvFuturesMultiplePricesData
+from sysobjects.adjusted_prices import _panama_stitch
+from sysobjects.dict_of_named_futures_per_contract_prices import list_of_price_column_names, \
+    list_of_contract_column_names
+
+INSTRUMENTS = ["EDOLLAR", "US10", "CORN", "GOLD", "V2X"]
+
+
+def panama_stitch_row_by_row(multiple_prices):
+    # as _panama_stitch was before it was vectorised
+    previous_row = None
+    adjusted_prices_values = []
+    for current_row in multiple_prices.itertuples():
+        if previous_row is None or current_row.PRICE_CONTRACT == previous_row.PRICE_CONTRACT:
+            adjusted_prices_values.append(current_row.PRICE)
+        else:
+            roll_differential = previous_row.FORWARD - previous_row.PRICE
+            adjusted_prices_values = [
+                adj_price + roll_differential for adj_price in adjusted_prices_values]
+            adjusted_prices_values.append(current_row.PRICE)
+
+        previous_row = current_row
+
+    return pd.Series(adjusted_prices_values, index=multiple_prices.index)
+
+
+class Test(ut.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        multiple_prices_data = csvFuturesMultiplePricesData()
+        cls.multiple_prices = dict([
+            (instrument_code, multiple_prices_data.get_multiple_prices(instrument_code))
+            for instrument_code in INSTRUMENTS])
+
+    def test_compact_round_trip(self):
+        for instrument_code, multiple_prices in self.multiple_prices.items():
+            compact_prices = multiple_prices.as_compact()
+            for contract_column_name in list_of_contract_column_names:
+                self.assertIsInstance(compact_prices[contract_column_name].dtype, pd.CategoricalDtype)
+            self.assertLess(compact_prices.memory_usage(deep=True).sum(),
+                            multiple_prices.memory_usage(deep=True).sum())
+
+            full_prices = compact_prices.as_full()
+            pd.testing.assert_frame_equal(pd.DataFrame(full_prices), pd.DataFrame(multiple_prices))
+
+    def test_float32_round_trip(self):
+        for instrument_code, multiple_prices in self.multiple_prices.items():
+            compact_prices = multiple_prices.as_compact(float32_prices=True)
+            self.assertTrue(compact_prices.has_float32_prices())
+
+            full_prices = compact_prices.as_full()
+            self.assertFalse(full_prices.has_float32_prices())
+            # contracts are exact, prices only to float32 precision
+            pd.testing.assert_frame_equal(
+                pd.DataFrame(full_prices[list_of_contract_column_names]),
+                pd.DataFrame(multiple_prices[list_of_contract_column_names]))
+            np.testing.assert_allclose(
+                full_prices[list_of_price_column_names].values,
+                multiple_prices[list_of_price_column_names].values, rtol=1e-6)
+
+    def test_panama_stitch_same_as_row_by_row(self):
+        for instrument_code, multiple_prices in self.multiple_prices.items():
+            expected_adjusted_prices = panama_stitch_row_by_row(multiple_prices)
+
+            for prices_to_stitch in [multiple_prices, multiple_prices.as_compact()]:
+                adjusted_prices = _panama_stitch(prices_to_stitch)
+                self.assertTrue(adjusted_prices.index.equals(expected_adjusted_prices.index))
+                np.testing.assert_array_equal(adjusted_prices.values, expected_adjusted_prices.values)
+
+
+if __name__ == "__main__":
+    ut.main()
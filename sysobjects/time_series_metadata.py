@@ -0,0 +1,231 @@
+"""
+A small summary of a stored time series (prices, fx...), so we can answer questions like 'when did this
+last update' without reading the whole series
+
+Backends that can store it alongside the data (eg arctic) write it on every write; otherwise it's
+calculated from the data when asked for.
+"""
+
+import datetime
+
+import numpy as np
+import pandas as pd
+
+from syscore.objects import missing_data, arg_not_supplied
+
+METADATA_FIELDS = [
+    "first_timestamp",
+    "last_timestamp",
+    "row_count",
+    "last_write_time",
+    "checksum",
+]
+
+
+class timeSeriesMetadata(object):
+    def __init__(
+        self,
+        first_timestamp=missing_data,
+        last_timestamp=missing_data,
+        row_count: int = 0,
+        last_write_time=missing_data,
+        checksum: str = "",
+    ):
+        self.first_timestamp = first_timestamp
+        self.last_timestamp = last_timestamp
+        self.row_count = row_count
+        self.last_write_time = last_write_time
+        self.checksum = checksum
+
+    def __repr__(self):
+        return "%d rows from %s to %s, written %s, checksum %s" % (
+            self.row_count,
+            str(self.first_timestamp),
+            str(self.last_timestamp),
+            str(self.last_write_time),
+            self.checksum,
+        )
+
+    def empty(self) -> bool:
+        return self.row_count == 0
+
+    @classmethod
+    def create_empty(timeSeriesMetadata):
+        return timeSeriesMetadata()
+
+    @classmethod
+    def from_data(timeSeriesMetadata, data,
+                  last_write_time=arg_not_supplied):
+        """
+        :param data: pd.Series or pd.DataFrame with a datetime index
+        :param last_write_time: defaults to now, ie we're about to write data
+        """
+        if last_write_time is arg_not_supplied:
+            last_write_time = datetime.datetime.now()
+
+        row_count = len(data)
+        if row_count == 0:
+            return timeSeriesMetadata(
+                row_count=0,
+                last_write_time=last_write_time,
+                checksum=checksum_for_data(data),
+            )
+
+        return timeSeriesMetadata(
+            first_timestamp=_as_datetime(data.index[0]),
+            last_timestamp=_as_datetime(data.index[-1]),
+            row_count=row_count,
+            last_write_time=last_write_time,
+            checksum=checksum_for_data(data),
+        )
+
+    @classmethod
+    def from_stored_data(timeSeriesMetadata, data):
+        """
+        For data sources which don't store metadata, or series written before they did: we have to read all
+        the data, and don't know when it was written
+        """
+        return timeSeriesMetadata.from_data(data, last_write_time=missing_data)
+
+    def after_append(self, appended_data, last_write_time=arg_not_supplied):
+        """
+        Metadata for the series with appended_data added to the end, without needing the whole series
+
+        :param appended_data: pd.Series or pd.DataFrame, all after our last_timestamp
+        :return: new timeSeriesMetadata
+        """
+        if self.empty():
+            return timeSeriesMetadata.from_data(appended_data, last_write_time=last_write_time)
+
+        if last_write_time is arg_not_supplied:
+            last_write_time = datetime.datetime.now()
+
+        if len(appended_data) == 0:
+            last_timestamp = self.last_timestamp
+        else:
+            last_timestamp = _as_datetime(appended_data.index[-1])
+
+        return timeSeriesMetadata(
+            first_timestamp=self.first_timestamp,
+            last_timestamp=last_timestamp,
+            row_count=self.row_count + len(appended_data),
+            last_write_time=last_write_time,
+            checksum=combined_checksum(self.checksum, checksum_for_data(appended_data)),
+        )
+
+    def as_dict(self) -> dict:
+        # missing_data can't be stored in a database, so becomes None
+        return dict(
+            [
+                (field_name, _missing_to_none(getattr(self, field_name)))
+                for field_name in METADATA_FIELDS
+            ]
+        )
+
+    @classmethod
+    def from_dict(timeSeriesMetadata, metadata_dict: dict):
+        args = dict(
+            [
+                (field_name, _none_to_missing(metadata_dict[field_name]))
+                for field_name in METADATA_FIELDS
+            ]
+        )
+
+        return timeSeriesMetadata(**args)
+
+    @classmethod
+    def is_valid_dict(timeSeriesMetadata, metadata_dict) -> bool:
+        # things written before we stored metadata won't have it
+        if metadata_dict is None:
+            return False
+
+        return all([field_name in metadata_dict for field_name in METADATA_FIELDS])
+
+
+class dictOfTimeSeriesMetadata(dict):
+    """
+    Keys are whatever the series are stored under (instrument code, fx code, contract key...)
+    """
+
+    @classmethod
+    def from_keys(dictOfTimeSeriesMetadata, list_of_keys: list, get_metadata_for_key):
+        """
+        :param get_metadata_for_key: function, key -> timeSeriesMetadata
+        """
+        return dictOfTimeSeriesMetadata(
+            [(key, get_metadata_for_key(key)) for key in list_of_keys]
+        )
+
+    def as_pd_df(self) -> pd.DataFrame:
+        metadata_df = pd.DataFrame(
+            [
+                [
+                    _missing_to_none(getattr(metadata, field_name))
+                    for field_name in METADATA_FIELDS
+                ]
+                for metadata in self.values()
+            ],
+            index=list(self.keys()),
+            columns=METADATA_FIELDS,
+        )
+
+        return metadata_df
+
+    def last_timestamps(self) -> dict:
+        return dict(
+            [(key, metadata.last_timestamp) for key, metadata in self.items()]
+        )
+
+
+def checksum_for_data(data) -> str:
+    # The sum of the row hashes, so the checksum of appended data can be combined with the existing checksum
+    hashed_rows = pd.util.hash_pandas_object(data, index=True)
+    checksum = int(hashed_rows.values.sum(dtype=np.uint64))
+
+    return _checksum_as_str(checksum)
+
+
+def combined_checksum(checksum: str, other_checksum: str) -> str:
+    """
+    Checksum of two pieces of data joined together, from the checksum of each
+
+    Checksums written before we could combine them are md5 digests, which can't be combined, so give ""
+    """
+    if not (_is_combinable_checksum(checksum) and _is_combinable_checksum(other_checksum)):
+        return ""
+
+    return _checksum_as_str(
+        (int(checksum, 16) + int(other_checksum, 16)) % CHECKSUM_MODULUS)
+
+
+CHECKSUM_MODULUS = 2 ** 64
+CHECKSUM_LENGTH = 16
+
+
+def _checksum_as_str(checksum: int) -> str:
+    return "%016x" % checksum
+
+
+def _is_combinable_checksum(checksum: str) -> bool:
+    return len(checksum) == CHECKSUM_LENGTH
+
+
+def _as_datetime(index_value):
+    if isinstance(index_value, pd.Timestamp):
+        return index_value.to_pydatetime()
+
+    return index_value
+
+
+def _missing_to_none(value):
+    if value is missing_data:
+        return None
+
+    return value
+
+
+def _none_to_missing(value):
+    if value is None:
+        return missing_data
+
+    return value
@@ -1,9 +1,3 @@
-import matplotlib
-import matplotlib.pyplot as pyplot
-
-# Uncomment this line if working inside IDE
-# matplotlib.use("TkAgg")
-
 import pandas as pd
 
 from syscore.fileutils import file_in_home_dir
@@ -151,6 +145,13 @@ class dataBacktest(object):
         data = self.interactively_get_data_for_stage_and_method()
         if data is user_exit or data is missing_data:
             return data
+        # matplotlib is slow to import, and we rarely plot, so we only import it here
+        import matplotlib
+        import matplotlib.pyplot as pyplot
+
+        # Uncomment this line if working inside IDE
+        # matplotlib.use("TkAgg")
+
         data.plot()
         pyplot.show()
 
@@ -8,6 +8,7 @@ from sysdata.mongodb.mongo_capital import mongoCapitalData
 from sysdata.private_config import get_private_then_default_key_value
 
 from sysdata.data_blob import dataBlob
+from sysdata.read_cache import cached_read, invalidates_cache
 
 
 class dataCapital(object):
@@ -38,6 +39,7 @@ class dataCapital(object):
 
         return self._total_capital_calculator
 
+    @invalidates_cache("capital")
     def update_and_return_total_capital_with_new_broker_account_value(
         self, total_account_value_in_base_currency: float, check_limit: float=0.1
     ) -> float:
@@ -46,33 +48,40 @@ class dataCapital(object):
             total_account_value_in_base_currency, check_limit = check_limit)
         return result
 
+    @cached_read("capital")
     def get_series_of_all_global_capital(self) -> pd.DataFrame:
         all_capital_data = self.total_capital_calculator.get_all_capital_calcs()
 
         return all_capital_data
 
+    @cached_read("capital")
     def get_series_of_maximum_capital(self) -> pd.DataFrame:
         return  self.total_capital_calculator.get_maximum_account()
 
 
+    @cached_read("capital")
     def get_series_of_accumulated_capital(self) -> pd.DataFrame:
         return  self.total_capital_calculator.get_profit_and_loss_account()
 
 
+    @cached_read("capital")
     def get_series_of_broker_capital(self) -> pd.DataFrame:
         return self.total_capital_calculator.get_broker_account()
 
     ## STRATEGY CAPITAL
+    @cached_read("capital")
     def get_capital_pd_series_for_strategy(self, strategy_name: str) -> pd.DataFrame:
         capital_series = self.capital_data.get_capital_pd_df_for_strategy(
             strategy_name
         )
         return capital_series
 
+    @cached_read("capital")
     def get_list_of_strategies_with_capital(self) -> list:
         strat_list = self.capital_data.get_list_of_strategies_with_capital()
         return strat_list
 
+    @cached_read("capital")
     def get_capital_for_strategy(self, strategy_name: str) -> float:
 
         capital_value = self.capital_data.get_current_capital_for_strategy(
@@ -86,6 +95,7 @@ class dataCapital(object):
 
         return capital_value
 
+    @invalidates_cache("capital")
     def update_capital_value_for_strategy(
         self, strategy_name: str,
             new_capital_value: float,
@@ -97,5 +107,6 @@ class dataCapital(object):
         )
 
 
+    @cached_read("capital")
     def get_current_total_capital(self) -> float:
         return self.total_capital_calculator.get_current_total_capital()
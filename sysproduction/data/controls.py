@@ -7,6 +7,7 @@ from sysdata.mongodb.mongo_position_limits import mongoPositionLimitData
 from sysdata.mongodb.mongo_trade_limits import mongoTradeLimitData
 from sysdata.mongodb.mongo_override import mongoOverrideData
 from sysdata.mongodb.mongo_IB_client_id import mongoIbBrokerClientIdData
+from sysdata.mongodb.mongo_IB_contract_metadata_cache import mongoIbContractMetadataCacheData
 
 from sysdata.data_blob import dataBlob
 from sysproduction.data.positions import diagPositions
@@ -25,6 +26,22 @@ class dataBrokerClientIDs(object):
         self.data.db_ib_broker_client_id.clear_all_clientids()
 
 
+class dataBrokerContractMetadataCache(object):
+    def __init__(self, data=arg_not_supplied):
+        # Check data has the right elements to do this
+        if data is arg_not_supplied:
+            data = dataBlob()
+
+        data.add_class_object(mongoIbContractMetadataCacheData)
+        self.data = data
+
+    def clear_cache(self):
+        self.data.db_ib_contract_metadata_cache.clear_cache()
+
+    def clear_cache_for_instrument_code(self, instrument_code: str):
+        self.data.db_ib_contract_metadata_cache.clear_cache_for_instrument_code(instrument_code)
+
+
 class dataLocks(object):
     def __init__(self, data=arg_not_supplied):
         # Check data has the right elements to do this
@@ -3,8 +3,10 @@ from syscore.genutils import print_menu_of_values_and_get_response
 
 from sysdata.arctic.arctic_spotfx_prices import arcticFxPricesData
 from sysobjects.spot_fx_prices import currencyValue, fxPrices
+from sysobjects.time_series_metadata import dictOfTimeSeriesMetadata
 
 from sysdata.data_blob import dataBlob
+from sysdata.read_cache import cached_read, invalidates_cache
 
 
 class dataCurrency(object):
@@ -20,6 +22,7 @@ class dataCurrency(object):
         data.add_class_object(arcticFxPricesData)
         self.data = data
 
+    @invalidates_cache("fx_prices")
     def update_fx_prices(self, fx_code: str, new_fx_prices: fxPrices, check_for_spike: bool=True):
         return self.data.db_fx_prices.update_fx_prices(
             fx_code, new_fx_prices, check_for_spike=check_for_spike
@@ -52,6 +55,7 @@ class dataCurrency(object):
 
         return self.get_last_fx_rate_for_pair(currency_pair)
 
+    @cached_read("fx_prices")
     def get_base_currency(self) -> str:
         """
 
@@ -80,9 +84,15 @@ class dataCurrency(object):
 
         return self.get_fx_prices(currency_pair)
 
+    @cached_read("fx_prices")
     def get_fx_prices(self, fx_code: str) -> fxPrices:
         return self.data.db_fx_prices.get_fx_prices(fx_code)
 
+    @cached_read("fx_prices")
+    def get_metadata_for_all_fx_prices(self) -> dictOfTimeSeriesMetadata:
+        return self.data.db_fx_prices.get_metadata_for_all_fx_codes()
+
+    @cached_read("fx_prices")
     def get_list_of_fxcodes(self) -> list:
         return self.data.db_fx_prices.get_list_of_fxcodes()
 
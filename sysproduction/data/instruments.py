@@ -5,6 +5,7 @@ from syscore.objects import arg_not_supplied
 from sysdata.mongodb.mongo_futures_instruments import mongoFuturesInstrumentData
 
 from sysdata.data_blob import dataBlob
+from sysdata.read_cache import cached_read
 from sysproduction.data.currency_data import dataCurrency
 from sysobjects.spot_fx_prices import currencyValue
 
@@ -42,11 +43,13 @@ class diagInstruments(object):
     def get_description(self, instrument_code):
         return self.get_meta_data(instrument_code).Description
 
+    @cached_read("instruments")
     def get_meta_data(self, instrument_code):
         return self.data.db_futures_instrument.get_instrument_data(
             instrument_code
         ).meta_data
 
+    @cached_read("instruments")
     def get_list_of_instruments(self):
         return self.data.db_futures_instrument.get_list_of_instruments()
 
@@ -58,13 +58,9 @@ class dataOrders(object):
         self, period_start, period_end=arg_not_supplied
     ):
         # remove split orders
-        order_id_list = self.data.db_broker_historic_orders.get_orders_in_date_range(
+        order_id_list = self.data.db_broker_historic_orders.get_orders_in_date_range_excluding_split_orders(
             period_start, period_end=period_end)
-        order_id_list = [
-            order_id
-            for order_id in order_id_list
-            if not self.get_historic_broker_order_from_order_id(order_id).is_split_order
-        ]
+
         return order_id_list
 
     def get_historic_contract_orders_in_date_range(
@@ -79,6 +75,48 @@ class dataOrders(object):
             period_start, period_end
         )
 
+    def get_historic_instrument_fills_as_df(
+        self,
+        period_start=arg_not_supplied,
+        period_end=arg_not_supplied,
+        strategy_name=arg_not_supplied,
+        instrument_code=arg_not_supplied,
+    ):
+        return self.data.db_strategy_historic_orders.get_fills_as_df(
+            period_start=period_start,
+            period_end=period_end,
+            strategy_name=strategy_name,
+            instrument_code=instrument_code,
+        )
+
+    def get_historic_contract_fills_as_df(
+        self,
+        period_start=arg_not_supplied,
+        period_end=arg_not_supplied,
+        strategy_name=arg_not_supplied,
+        instrument_code=arg_not_supplied,
+    ):
+        return self.data.db_contract_historic_orders.get_fills_as_df(
+            period_start=period_start,
+            period_end=period_end,
+            strategy_name=strategy_name,
+            instrument_code=instrument_code,
+        )
+
+    def get_historic_broker_fills_as_df(
+        self,
+        period_start=arg_not_supplied,
+        period_end=arg_not_supplied,
+        strategy_name=arg_not_supplied,
+        instrument_code=arg_not_supplied,
+    ):
+        return self.data.db_broker_historic_orders.get_fills_as_df(
+            period_start=period_start,
+            period_end=period_end,
+            strategy_name=strategy_name,
+            instrument_code=instrument_code,
+        )
+
     def get_historic_instrument_order_from_order_id(self, order_id):
         return self.data.db_strategy_historic_orders.get_order_with_orderid(
             order_id)
@@ -113,28 +151,45 @@ class dataOrders(object):
         parent_limit = self.get_parent_limit_for_historic_broker_order_id(
             order_id)
 
-        order.parent_reference_price = reference_price
-        order.parent_generated_datetime = generated_datetime
-        order.parent_limit_price = parent_limit
-
-        if order.is_split_order:
-            # We won't use these, and it may cause bugs for orders saved with
-            # legacy data
-            calc_mid = None
-            calc_side = None
-            calc_fill = None
-        else:
-            calc_mid = order.trade.get_spread_price(order.mid_price)
-            calc_side = order.trade.get_spread_price(order.side_price)
-            calc_fill = order.trade.get_spread_price(order.filled_price)
-
-        order.calculated_filled_price = calc_fill
-        order.calculated_mid_price = calc_mid
-        order.calculated_side_price = calc_side
+        return _add_execution_data_to_broker_order(
+            order,
+            reference_price=reference_price,
+            generated_datetime=generated_datetime,
+            parent_limit=parent_limit)
+
+    def get_list_of_historic_broker_orders_with_execution_data(
+            self, list_of_order_ids: list) -> list:
+        """
+        As get_historic_broker_order_from_order_id_with_execution_data, for many orders; the broker orders, their
+        parent contract orders and their parent instrument orders are each read in one go
+
+        :return: list of broker orders, in the same order as list_of_order_ids
+        """
+        dict_of_broker_orders = self.data.db_broker_historic_orders.get_dict_of_orders_with_orderids(
+            list_of_order_ids)
+        list_of_broker_orders = [dict_of_broker_orders[order_id] for order_id in list_of_order_ids]
+
+        dict_of_contract_orders = self.data.db_contract_historic_orders.get_dict_of_orders_with_orderids(
+            _unique_parents(list_of_broker_orders))
+        dict_of_instrument_orders = self.data.db_strategy_historic_orders.get_dict_of_orders_with_orderids(
+            _unique_parents(dict_of_contract_orders.values()))
+
+        list_of_orders_with_execution_data = []
+        for broker_order in list_of_broker_orders:
+            contract_order = dict_of_contract_orders.get(broker_order.parent, missing_order)
+            if contract_order is missing_order:
+                instrument_order = missing_order
+            else:
+                instrument_order = dict_of_instrument_orders.get(contract_order.parent, missing_order)
 
-        order.buy_or_sell = order.trade.buy_or_sell()
+            list_of_orders_with_execution_data.append(_add_execution_data_to_broker_order(
+                broker_order,
+                reference_price=None if contract_order is missing_order else contract_order.reference_price,
+                generated_datetime=None if instrument_order is missing_order else instrument_order.generated_datetime,
+                parent_limit=None if instrument_order is missing_order else instrument_order.limit_price,
+            ))
 
-        return order
+        return list_of_orders_with_execution_data
 
     def get_reference_price_for_historic_broker_order_id(self, order_id):
         contract_order = self.get_parent_contract_order_for_historic_broker_order_id(
@@ -178,7 +233,7 @@ class dataOrders(object):
             self, order_id):
         contract_order = self.get_parent_contract_order_for_historic_broker_order_id(
             order_id)
-        if contract_order is missing_data:
+        if contract_order is missing_order:
             return missing_order
 
         instrument_order_id = contract_order.parent
@@ -190,3 +245,32 @@ class dataOrders(object):
         )
 
         return instrument_order
+
+
+def _unique_parents(list_of_orders) -> list:
+    return list(set([order.parent for order in list_of_orders if order.parent is not no_parent]))
+
+
+def _add_execution_data_to_broker_order(order, reference_price, generated_datetime, parent_limit):
+    order.parent_reference_price = reference_price
+    order.parent_generated_datetime = generated_datetime
+    order.parent_limit_price = parent_limit
+
+    if order.is_split_order:
+        # We won't use these, and it may cause bugs for orders saved with
+        # legacy data
+        calc_mid = None
+        calc_side = None
+        calc_fill = None
+    else:
+        calc_mid = order.trade.get_spread_price(order.mid_price)
+        calc_side = order.trade.get_spread_price(order.side_price)
+        calc_fill = order.trade.get_spread_price(order.filled_price)
+
+    order.calculated_filled_price = calc_fill
+    order.calculated_mid_price = calc_mid
+    order.calculated_side_price = calc_side
+
+    order.buy_or_sell = order.trade.buy_or_sell()
+
+    return order
@@ -0,0 +1,66 @@
+import datetime
+import pandas as pd
+
+from syscore.objects import arg_not_supplied, missing_data
+
+from sysdata.private_config import get_private_then_default_key_value
+from sysdata.arctic.arctic_pandl import arcticPandlData
+from sysdata.data_blob import dataBlob
+
+
+class dataPandl(object):
+    """
+    Materialised p&l series, as a proportion of total capital
+    """
+
+    def __init__(self, data: dataBlob = arg_not_supplied):
+        # Check data has the right elements to do this
+        if data is arg_not_supplied:
+            data = dataBlob()
+
+        data.add_class_object(arcticPandlData)
+        self.data = data
+
+    @property
+    def db_pandl_data(self):
+        return self.data.db_pandl
+
+    def get_pandl_series_for_contract(
+            self, instrument_code: str, contract_id: str) -> pd.Series:
+        return self.db_pandl_data.get_pandl_series_for_contract(
+            instrument_code, contract_id)
+
+    def get_pandl_series_for_strategy_and_instrument(
+            self, strategy_name: str, instrument_code: str) -> pd.Series:
+        return self.db_pandl_data.get_pandl_series_for_strategy_and_instrument(
+            strategy_name, instrument_code)
+
+    def get_recalculation_date_for_contract(
+            self, instrument_code: str, contract_id: str) -> datetime.datetime:
+        return self.db_pandl_data.get_recalculation_date_for_contract(
+            instrument_code, contract_id, lookback_days=self.revision_lookback_days)
+
+    def get_recalculation_date_for_strategy_and_instrument(
+            self, strategy_name: str, instrument_code: str) -> datetime.datetime:
+        return self.db_pandl_data.get_recalculation_date_for_strategy_and_instrument(
+            strategy_name, instrument_code, lookback_days=self.revision_lookback_days)
+
+    @property
+    def revision_lookback_days(self) -> int:
+        return get_private_then_default_key_value(
+            "production_pandl_revision_lookback_days")
+
+    def update_pandl_series_for_contract(
+            self, instrument_code: str, contract_id: str, new_pandl: pd.Series,
+            from_date: datetime.datetime = missing_data) -> int:
+        return self.db_pandl_data.update_pandl_series_for_contract(
+            instrument_code, contract_id, new_pandl, from_date=from_date)
+
+    def update_pandl_series_for_strategy_and_instrument(
+            self, strategy_name: str, instrument_code: str, new_pandl: pd.Series,
+            from_date: datetime.datetime = missing_data) -> int:
+        return self.db_pandl_data.update_pandl_series_for_strategy_and_instrument(
+            strategy_name, instrument_code, new_pandl, from_date=from_date)
+
+    def delete_all_pandl_series(self, are_you_sure: bool = False):
+        return self.db_pandl_data.delete_all_pandl_series(are_you_sure=are_you_sure)
@@ -14,6 +14,7 @@ from sysdata.mongodb.mongo_position_by_contract import mongoContractPositionData
 from sysdata.mongodb.mongo_positions_by_strategy import mongoStrategyPositionData
 from sysdata.mongodb.mongo_optimal_position import mongoOptimalPositionData
 from sysdata.data_blob import dataBlob
+from sysdata.read_cache import cached_read, invalidates_cache
 from sysdata.production.historic_positions import listOfInstrumentStrategyPositions
 
 from sysobjects.production.strategy import instrumentStrategy, listOfInstrumentStrategies
@@ -60,9 +61,11 @@ class diagPositions(object):
         roll_state = self.get_roll_state(instrument_code)
         return is_type_of_active_rolling_roll_state(roll_state)
 
+    @cached_read("roll_state")
     def get_name_of_roll_state(self, instrument_code: str) -> RollState:
         return self.data.db_roll_state.get_name_of_roll_state(instrument_code)
 
+    @cached_read("roll_state")
     def get_roll_state(self, instrument_code: str) -> RollState:
         return self.data.db_roll_state.get_roll_state(instrument_code)
 
@@ -75,6 +78,7 @@ class diagPositions(object):
         contract = futuresContract(instrument_code, contract_id)
         return self.get_position_df_for_contract(contract)
 
+    @cached_read("positions")
     def get_position_df_for_contract(
         self, contract: futuresContract
     ) -> pd.DataFrame:
@@ -90,6 +94,7 @@ class diagPositions(object):
 
         return position_df
 
+    @cached_read("positions")
     def get_position_df_for_instrument_strategy_object(
         self, instrument_strategy: instrumentStrategy
     ):
@@ -121,6 +126,7 @@ class diagPositions(object):
 
         return position
 
+    @cached_read("positions")
     def get_position_for_contract(
         self, contract: futuresContract
     ) -> float:
@@ -137,6 +143,7 @@ class diagPositions(object):
         position = self.get_current_position_for_instrument_strategy(instrument_strategy)
         return position
 
+    @cached_read("positions")
     def get_current_position_for_instrument_strategy(
             self, instrument_strategy: instrumentStrategy) -> int:
         position = self.data.db_strategy_position.get_current_position_for_instrument_strategy_object(
@@ -145,35 +152,42 @@ class diagPositions(object):
         return position
 
 
+    @cached_read("positions")
     def get_list_of_instruments_for_strategy_with_position(
             self, strategy_name, ignore_zero_positions=True):
         instrument_list = self.data.db_strategy_position.get_list_of_instruments_for_strategy_with_position(
             strategy_name, ignore_zero_positions=ignore_zero_positions)
         return instrument_list
 
+    @cached_read("positions")
     def get_list_of_instruments_with_any_position(self):
         return (
             self.data.db_contract_position.get_list_of_instruments_with_any_position())
 
+    @cached_read("positions")
     def get_list_of_instruments_with_current_positions(self):
         return (
             self.data.db_contract_position.get_list_of_instruments_with_any_position()
         )
 
 
+    @cached_read("positions")
     def get_list_of_strategies_with_positions(self) -> list:
         list_of_strategies = self.data.db_strategy_position.get_list_of_strategies_with_positions()
 
         return list_of_strategies
 
+    @cached_read("positions")
     def get_list_of_strategies_and_instruments_with_positions(self) -> listOfInstrumentStrategies:
         return self.data.db_strategy_position.get_list_of_strategies_and_instruments_with_positions()
 
+    @cached_read("positions")
     def get_all_current_contract_positions(self):
         return (
             self.data.db_contract_position.get_all_current_positions_as_list_with_contract_objects()
         )
 
+    @cached_read("positions")
     def get_all_current_strategy_instrument_positions(self) -> listOfInstrumentStrategyPositions:
         return (
             self.data.db_strategy_position.get_all_current_positions_as_list_with_instrument_objects()
@@ -200,12 +214,14 @@ class diagPositions(object):
             instrument_positions_from_strategies
         )
 
+    @cached_read("positions")
     def get_list_of_contracts_with_any_contract_position_for_instrument(
         self, instrument_code
     ):
         return self.data.db_contract_position.get_list_of_contract_date_str_with_any_position_for_instrument(
             instrument_code)
 
+    @cached_read("positions")
     def get_list_of_contracts_with_any_contract_position_for_instrument_in_date_range(
             self, instrument_code, start_date, end_date=arg_not_supplied):
         if end_date is arg_not_supplied:
@@ -315,11 +331,13 @@ class updatePositions(object):
     def diag_positions(self):
         return diagPositions(self.data)
 
+    @invalidates_cache("roll_state")
     def set_roll_state(self, instrument_code: str, roll_state_required: RollState):
         return self.data.db_roll_state.set_roll_state(
             instrument_code, roll_state_required
         )
 
+    @invalidates_cache("positions")
     def update_strategy_position_table_with_instrument_order(
         self, instrument_order, new_fill
     ):
@@ -360,6 +378,7 @@ class updatePositions(object):
 
         return success
 
+    @invalidates_cache("positions")
     def update_contract_position_table_with_contract_order(
         self, contract_order, fill_list
     ):
@@ -390,6 +409,7 @@ class updatePositions(object):
                     str(fill_list),
                  ))
 
+    @invalidates_cache("positions")
     def update_positions_for_individual_contract_leg(
         self, instrument_code, contract_id, trade_done, time_date=None
     ):
@@ -11,8 +11,10 @@ from sysdata.arctic.arctic_adjusted_prices import arcticFuturesAdjustedPricesDat
 from sysdata.mongodb.mongo_futures_contracts import mongoFuturesContractData
 
 from sysdata.data_blob import dataBlob
+from sysdata.read_cache import cached_read, invalidates_cache
 
 from sysobjects.multiple_prices import price_name
+from sysobjects.time_series_metadata import timeSeriesMetadata, dictOfTimeSeriesMetadata
 
 
 
@@ -34,17 +36,39 @@ class diagPrices(object):
             "intraday_frequency")
         return intraday_frequency
 
+    @cached_read("adjusted_prices")
     def get_adjusted_prices(self, instrument_code: str) -> futuresAdjustedPrices:
         return self.data.db_futures_adjusted_prices.get_adjusted_prices(
             instrument_code)
 
+    @cached_read("adjusted_prices")
+    def get_metadata_for_adjusted_prices(self, instrument_code: str) -> timeSeriesMetadata:
+        return self.data.db_futures_adjusted_prices.get_metadata_for_instrument(
+            instrument_code)
+
+    @cached_read("adjusted_prices")
+    def get_metadata_for_all_adjusted_prices(self) -> dictOfTimeSeriesMetadata:
+        return self.data.db_futures_adjusted_prices.get_metadata_for_all_instruments()
+
+    @cached_read("multiple_prices")
+    def get_metadata_for_all_multiple_prices(self) -> dictOfTimeSeriesMetadata:
+        return self.data.db_futures_multiple_prices.get_metadata_for_all_instruments()
+
+    @cached_read("contract_prices")
+    def get_metadata_for_contract_prices_for_instrument(self, instrument_code: str) -> dictOfTimeSeriesMetadata:
+        return self.data.db_futures_contract_price.get_metadata_for_all_contracts_for_instrument(
+            instrument_code)
+
+    @cached_read("multiple_prices")
     def get_list_of_instruments_in_multiple_prices(self) -> list:
         return self.data.db_futures_multiple_prices.get_list_of_instruments()
 
+    @cached_read("multiple_prices")
     def get_multiple_prices(self, instrument_code: str) -> futuresMultiplePrices:
         return self.data.db_futures_multiple_prices.get_multiple_prices(
             instrument_code)
 
+    @cached_read("contract_prices")
     def get_prices_for_contract_object(self, contract_object: futuresContract):
         return self.data.db_futures_contract_price.get_prices_for_contract_object(
             contract_object)
@@ -53,9 +77,20 @@ class diagPrices(object):
         multiple_prices = self.get_multiple_prices(instrument_code)
         return multiple_prices[price_name]
 
+    def get_prices_for_contract_object_from_date(self, contract_object: futuresContract, start_date):
+        return self.data.db_futures_contract_price.get_prices_for_contract_object_from_date(
+            contract_object, start_date)
+
+    def get_current_contract_prices_for_instrument_from_date(self, instrument_code, start_date):
+        multiple_prices = self.data.db_futures_multiple_prices.get_multiple_prices_from_date(
+            instrument_code, start_date)
+        return multiple_prices[price_name]
+
+    @cached_read("contract_prices")
     def get_list_of_instruments_with_contract_prices(self) -> list:
         return self.data.db_futures_contract_price.get_list_of_instrument_codes_with_price_data()
 
+    @cached_read("contract_prices")
     def contract_dates_with_price_data_for_instrument_code(self, instrument_code: str) -> list:
         return self.data.db_futures_contract_price.contract_dates_with_price_data_for_instrument_code(instrument_code)
 
@@ -132,6 +167,7 @@ class updatePrices(object):
         )
         self.data = data
 
+    @invalidates_cache("contract_prices")
     def update_prices_for_contract(
         self, contract_object: futuresContract, new_prices: futuresContractPrices, check_for_spike=True
     ):
@@ -140,6 +176,7 @@ class updatePrices(object):
             contract_object, new_prices, check_for_spike=check_for_spike
         )
 
+    @invalidates_cache("multiple_prices")
     def add_multiple_prices(
         self, instrument_code: str, updated_multiple_prices: futuresMultiplePrices, ignore_duplication=True
     ):
@@ -147,6 +184,7 @@ class updatePrices(object):
             instrument_code, updated_multiple_prices, ignore_duplication=True
         )
 
+    @invalidates_cache("adjusted_prices")
     def add_adjusted_prices(
         self, instrument_code: str, updated_adjusted_prices: futuresAdjustedPrices, ignore_duplication=True
     ):
@@ -1,12 +1,15 @@
 from syscore.objects import arg_not_supplied
 
 from sysdata.sim.db_futures_sim_data import dbFuturesSimData
+from sysdata.sim.snapshot_futures_sim_data import snapshotFuturesSimData
 from sysdata.data_blob import dataBlob
 from sysdata.arctic.arctic_adjusted_prices import arcticFuturesAdjustedPricesData
 from sysdata.arctic.arctic_multiple_prices import arcticFuturesMultiplePricesData
 from sysdata.arctic.arctic_spotfx_prices import arcticFxPricesData
 from sysdata.mongodb.mongo_futures_instruments import mongoFuturesInstrumentData
 
+from sysproduction.data.currency_data import dataCurrency
+
 
 def dataSimData(data=arg_not_supplied):
     # Check data has the right elements to do this
@@ -18,3 +21,19 @@ def dataSimData(data=arg_not_supplied):
 
 
     return dbFuturesSimData(data)
+
+
+def dataSimDataSnapshot(data=arg_not_supplied) -> snapshotFuturesSimData:
+    """
+    Read everything production backtests need for every instrument, once, so it can be shared; pass it to
+    runSystemClassic as sim_data
+    """
+    if data is arg_not_supplied:
+        data = dataBlob()
+
+    sim_data = dataSimData(data)
+    base_currency = dataCurrency(data).get_base_currency()
+    data.log.msg("Taking a snapshot of simulation data for %d instruments" %
+                 len(sim_data.get_instrument_list()))
+
+    return snapshotFuturesSimData.from_sim_data(sim_data, base_currency=base_currency)
@@ -1,19 +1,20 @@
 import datetime
 import pandas as pd
 import numpy as np
-import types
 
 from collections import namedtuple
 
 from syscore.objects import header, table, body_text, arg_not_supplied, missing_data
 
 from sysobjects.contracts import futuresContract
+from sysexecution.contract_orders import contractTradeableObject
 
 from sysproduction.data.capital import dataCapital
 
 from sysproduction.data.currency_data import dataCurrency
 from sysproduction.data.prices import diagPrices
 from sysproduction.data.orders import dataOrders
+from sysproduction.data.pandl import dataPandl
 from sysproduction.data.positions import diagPositions
 from sysproduction.data.instruments import diagInstruments
 from sysproduction.data.strategies import diagStrategiesConfig
@@ -77,9 +78,8 @@ def get_pandl_report_data(data, start_date, end_date):
     :param calendar_days_back:
     :return: named tuple object containing p&l data
     """
-    # to save double calculation
-    data.temp_pandl_read = types.MethodType(temp_pandl_read, data)
-    data.temp_pandl_write = types.MethodType(temp_pandl_write, data)
+    # everything below reads from the materialised p&l, so bring it up to date first
+    update_materialised_pandl(data, start_date, end_date)
 
     total_capital_pandl = (
         get_total_capital_pandl(data, start_date, end_date=end_date) * 100
@@ -111,19 +111,71 @@ def get_pandl_report_data(data, start_date, end_date):
     return results_object
 
 
-def temp_pandl_write(self, instrument_code, pandl_data):
-    meta_data = getattr(self, "meta_data", None)
-    if meta_data is None:
-        self.meta_data = {}
-    self.meta_data[instrument_code] = pandl_data
+def update_materialised_pandl(data, start_date, end_date):
+    """
+    Bring the stored p&l series up to date for everything the report reads
 
+    Each series is recalculated from a few days before its last stored date (see
+    sysdata.production.pandl), reading only the prices and fills from then on
 
-def temp_pandl_read(self, instrument_code):
-    meta_data = getattr(self, "meta_data", None)
-    if meta_data is None:
-        return None
-    data = meta_data.get(instrument_code, None)
-    return data
+    :param data: data Blob
+    """
+    instrument_list = get_list_of_instruments_for_pandl_report(data)
+    for instrument_code in instrument_list:
+        contract_list = get_list_of_contracts_held_for_an_instrument_in_date_range(
+            data, instrument_code, start_date, end_date
+        )
+        for contract_id in contract_list:
+            update_materialised_pandl_for_contract(
+                data, instrument_code, contract_id)
+
+    strategy_list = get_list_of_strategies(data)
+    for strategy_name in strategy_list:
+        instrument_list = get_list_of_instruments_held_for_a_strategy(
+            data, strategy_name)
+        for instrument_code in instrument_list:
+            update_materialised_pandl_for_strategy_instrument(
+                data, strategy_name, instrument_code
+            )
+
+
+def get_list_of_instruments_for_pandl_report(data):
+    diag_positions = diagPositions(data)
+    instrument_list = diag_positions.get_list_of_instruments_with_any_position()
+
+    # sector p&l covers every instrument in every asset class
+    diag_instruments = diagInstruments(data)
+    for asset_class in diag_instruments.get_all_asset_classes():
+        instrument_list = instrument_list + \
+            diag_instruments.get_all_instruments_in_asset_class(asset_class)
+
+    return sorted(set(instrument_list))
+
+
+def update_materialised_pandl_for_contract(data, instrument_code, contract_id):
+    data_pandl = dataPandl(data)
+    from_date = data_pandl.get_recalculation_date_for_contract(
+        instrument_code, contract_id)
+    new_pandl = calculate_perc_pandl_series_for_contract(
+        data, instrument_code, contract_id, from_date=from_date
+    )
+    data_pandl.update_pandl_series_for_contract(
+        instrument_code, contract_id, new_pandl, from_date=from_date)
+
+
+def update_materialised_pandl_for_strategy_instrument(
+    data, strategy_name, instrument_code
+):
+    data_pandl = dataPandl(data)
+    from_date = data_pandl.get_recalculation_date_for_strategy_and_instrument(
+        strategy_name, instrument_code
+    )
+    new_pandl = calculate_perc_pandl_series_for_strategy_vs_total_capital(
+        data, strategy_name, instrument_code, from_date=from_date
+    )
+    data_pandl.update_pandl_series_for_strategy_and_instrument(
+        strategy_name, instrument_code, new_pandl, from_date=from_date
+    )
 
 
 def get_total_capital_series(data):
@@ -307,18 +359,14 @@ def get_period_perc_pandl_for_instrument_all_strategies_in_date_range(
 ):
     print("Getting p&l for %s" % instrument_code)
 
-    pandl_series = data.temp_pandl_read(instrument_code)
-    if pandl_series is None:
-        pandl_df = get_df_of_perc_pandl_series_for_instrument_all_strategies_across_contracts_in_date_range(
-            data, instrument_code, start_date, end_date)
-
-        if pandl_df is missing_data:
-            return 0.0
+    pandl_df = get_df_of_perc_pandl_series_for_instrument_all_strategies_across_contracts_in_date_range(
+        data, instrument_code, start_date, end_date)
 
-        pandl_series = pandl_df.sum(axis=1)
-        pandl_series = pandl_series[start_date:end_date]
+    if pandl_df is missing_data:
+        return 0.0
 
-        data.temp_pandl_write(instrument_code, pandl_series)
+    pandl_series = pandl_df.sum(axis=1)
+    pandl_series = pandl_series[start_date:end_date]
 
     return pandl_series.sum()
 
@@ -430,36 +478,70 @@ def get_list_of_instruments_held_for_a_strategy(data, strategy_name):
 
 
 def get_perc_pandl_series_for_contract(data, instrument_code, contract_id):
+    data_pandl = dataPandl(data)
+
+    return data_pandl.get_pandl_series_for_contract(
+        instrument_code, contract_id)
+
+
+def get_perc_pandl_series_for_strategy_vs_total_capital(
+    data, strategy_name, instrument_code
+):
+    data_pandl = dataPandl(data)
+
+    return data_pandl.get_pandl_series_for_strategy_and_instrument(
+        strategy_name, instrument_code
+    )
+
+
+def calculate_perc_pandl_series_for_contract(
+    data, instrument_code, contract_id, from_date=missing_data
+):
+    """
+    :param from_date: only return p&l after this date; if missing_data return everything
+    """
     pandl_in_base = get_pandl_series_in_base_ccy_for_contract(
-        data, instrument_code, contract_id
+        data, instrument_code, contract_id, from_date=from_date
     )
     capital = get_total_capital_series(data)
     capital = capital.reindex(pandl_in_base.index, method="ffill")
 
     perc_pandl = pandl_in_base / capital
+    perc_pandl = pandl_after_date(perc_pandl, from_date)
 
     return perc_pandl
 
 
-def get_perc_pandl_series_for_strategy_vs_total_capital(
-    data, strategy_name, instrument_code
+def calculate_perc_pandl_series_for_strategy_vs_total_capital(
+    data, strategy_name, instrument_code, from_date=missing_data
 ):
+    """
+    :param from_date: only return p&l after this date; if missing_data return everything
+    """
     print("Data for %s %s" % (strategy_name, instrument_code))
     pandl_in_base = get_pandl_series_in_base_ccy_for_strategy_instrument(
-        data, strategy_name, instrument_code
+        data, strategy_name, instrument_code, from_date=from_date
     )
     capital = get_total_capital_series(data).ffill()
     capital = capital.reindex(pandl_in_base.index, method="ffill")
 
     perc_pandl = pandl_in_base / capital
+    perc_pandl = pandl_after_date(perc_pandl, from_date)
 
     return perc_pandl
 
 
+def pandl_after_date(pandl_series, from_date=missing_data):
+    if from_date is missing_data:
+        return pandl_series
+
+    return pandl_series[pandl_series.index > from_date]
+
+
 def get_pandl_series_in_base_ccy_for_contract(
-        data, instrument_code, contract_id):
+        data, instrument_code, contract_id, from_date=missing_data):
     pandl_in_local = get_pandl_series_in_local_ccy_for_contract(
-        data, instrument_code, contract_id
+        data, instrument_code, contract_id, from_date=from_date
     )
     fx_series = get_fx_series_for_instrument(data, instrument_code)
     fx_series = fx_series.reindex(pandl_in_local.index).ffill()
@@ -470,10 +552,10 @@ def get_pandl_series_in_base_ccy_for_contract(
 
 
 def get_pandl_series_in_base_ccy_for_strategy_instrument(
-    data, strategy_name, instrument_code
+    data, strategy_name, instrument_code, from_date=missing_data
 ):
     pandl_in_local = get_pandl_series_in_local_ccy_for_strategy_instrument(
-        data, strategy_name, instrument_code
+        data, strategy_name, instrument_code, from_date=from_date
     )
     fx_series = get_fx_series_for_instrument(data, instrument_code)
     fx_series = fx_series.reindex(pandl_in_local.index).ffill()
@@ -493,11 +575,11 @@ def get_fx_series_for_instrument(data, instrument_code):
 
 
 def get_pandl_series_in_local_ccy_for_contract(
-        data, instrument_code, contract_id):
+        data, instrument_code, contract_id, from_date=missing_data):
     diag_instruments = diagInstruments(data)
 
     pandl_in_points = get_pandl_series_in_points_for_contract(
-        data, instrument_code, contract_id
+        data, instrument_code, contract_id, from_date=from_date
     )
     point_size = diag_instruments.get_point_size(instrument_code)
     pandl_in_local = point_size * pandl_in_points
@@ -506,12 +588,12 @@ def get_pandl_series_in_local_ccy_for_contract(
 
 
 def get_pandl_series_in_local_ccy_for_strategy_instrument(
-    data, strategy_name, instrument_code
+    data, strategy_name, instrument_code, from_date=missing_data
 ):
     diag_instruments = diagInstruments(data)
 
     pandl_in_points = get_pandl_series_in_points_for_instrument_strategy(
-        data, instrument_code, strategy_name
+        data, instrument_code, strategy_name, from_date=from_date
     )
     point_size = diag_instruments.get_point_size(instrument_code)
     pandl_in_local = point_size * pandl_in_points
@@ -520,33 +602,39 @@ def get_pandl_series_in_local_ccy_for_strategy_instrument(
 
 
 def get_pandl_series_in_points_for_contract(
-        data, instrument_code, contract_id):
+        data, instrument_code, contract_id, from_date=missing_data):
     pos_series = get_position_series_for_contract(
         data, instrument_code, contract_id)
     price_series = get_price_series_for_contract(
-        data, instrument_code, contract_id)
-    trade_df = get_trade_df_for_contract(data, instrument_code, contract_id)
+        data, instrument_code, contract_id, from_date=from_date)
+    trade_df = get_trade_df_for_contract(
+        data, instrument_code, contract_id, from_date=from_date)
 
     trade_df = unique_trades_df(trade_df)
 
-    returns = pandl_points(price_series, trade_df, pos_series)
+    returns = pandl_points_from_date(
+        price_series, trade_df, pos_series, from_date=from_date
+    )
 
     return returns
 
 
 def get_pandl_series_in_points_for_instrument_strategy(
-    data, instrument_code, strategy_name
+    data, instrument_code, strategy_name, from_date=missing_data
 ):
     pos_series = get_position_series_for_instrument_strategy(
         data, instrument_code, strategy_name
     )
-    price_series = get_current_contract_price_series_for_instrument(data, instrument_code)
+    price_series = get_current_contract_price_series_for_instrument(
+        data, instrument_code, from_date=from_date)
     trade_df = get_trade_df_for_instrument(
-        data, instrument_code, strategy_name)
+        data, instrument_code, strategy_name, from_date=from_date)
 
     trade_df = unique_trades_df(trade_df)
 
-    returns = pandl_points(price_series, trade_df, pos_series)
+    returns = pandl_points_from_date(
+        price_series, trade_df, pos_series, from_date=from_date
+    )
 
     return returns
 
@@ -563,6 +651,32 @@ def unique_trades_df(trade_df):
     return new_df
 
 
+def pandl_points_from_date(
+        price_series, trade_df, pos_series, from_date=missing_data):
+    """
+    As pandl_points, but only using the data needed for p&l from from_date onwards
+
+    Prices and trades only need to be read from from_date, which should be a date in the price or
+    trade data. The first row returned is from_date itself, which won't have a valid p&l; callers
+    should drop it once they've finished aligning other data
+
+    :param from_date: datetime, or missing_data to use all the data
+    :returns: pd.Series
+    """
+    if from_date is missing_data:
+        return pandl_points(price_series, trade_df, pos_series)
+
+    price_series = price_series[price_series.index >= from_date]
+    trade_df = trade_df[trade_df.index >= from_date]
+
+    # we need the position held coming into from_date
+    earlier_positions = pos_series[pos_series.index <= from_date]
+    later_positions = pos_series[pos_series.index > from_date]
+    pos_series = pd.concat([earlier_positions[-1:], later_positions], axis=0)
+
+    return pandl_points(price_series, trade_df, pos_series)
+
+
 def pandl_points(price_series, trade_df, pos_series):
     """
     Calculate pandl for an individual position
@@ -602,18 +716,29 @@ def pandl_points(price_series, trade_df, pos_series):
     return returns
 
 
-def get_price_series_for_contract(data, instrument_code, contract_id):
+def get_price_series_for_contract(
+        data, instrument_code, contract_id, from_date=missing_data):
     diag_prices = diagPrices(data)
     contract = futuresContract(instrument_code, contract_id)
-    all_prices = diag_prices.get_prices_for_contract_object(contract)
-    price_series = all_prices.return_final_prices()
+    if from_date is missing_data:
+        prices = diag_prices.get_prices_for_contract_object(contract)
+    else:
+        prices = diag_prices.get_prices_for_contract_object_from_date(
+            contract, from_date)
+    price_series = prices.return_final_prices()
 
     return price_series
 
 
-def get_current_contract_price_series_for_instrument(data, instrument_code):
+def get_current_contract_price_series_for_instrument(
+        data, instrument_code, from_date=missing_data):
     diag_prices = diagPrices(data)
-    price_series = diag_prices.get_current_contract_prices_for_instrument(instrument_code)
+    if from_date is missing_data:
+        price_series = diag_prices.get_current_contract_prices_for_instrument(
+            instrument_code)
+    else:
+        price_series = diag_prices.get_current_contract_prices_for_instrument_from_date(
+            instrument_code, from_date)
 
     return price_series
 
@@ -630,23 +755,59 @@ def get_position_series_for_instrument_strategy(
     return pd.Series(pos_series.position)
 
 
-def get_trade_df_for_contract(data, instrument_code, contract_id):
+def get_trade_df_for_contract(
+        data, instrument_code, contract_id, from_date=missing_data):
     data_orders = dataOrders(data)
-    list_of_trades = data_orders.get_fills_history_for_instrument_and_contract_id(
-        instrument_code, contract_id)
-    list_of_trades_as_pd_df = list_of_trades.as_pd_df()
+    fills_df = data_orders.get_historic_contract_fills_as_df(
+        period_start=period_start_for_fills(from_date),
+        instrument_code=instrument_code)
+    fills_df = fills_df_for_contract_id(fills_df, contract_id)
 
-    return list_of_trades_as_pd_df
+    return trade_df_from_fills_df(fills_df)
 
 
-def get_trade_df_for_instrument(data, instrument_code, strategy_name):
+def get_trade_df_for_instrument(
+        data, instrument_code, strategy_name, from_date=missing_data):
     data_orders = dataOrders(data)
-    list_of_trades = data_orders.get_fills_history_for_strategy_and_instrument(
-        strategy_name, instrument_code
+    fills_df = data_orders.get_historic_instrument_fills_as_df(
+        period_start=period_start_for_fills(from_date),
+        strategy_name=strategy_name,
+        instrument_code=instrument_code)
+
+    return trade_df_from_fills_df(fills_df)
+
+
+def period_start_for_fills(from_date):
+    if from_date is missing_data:
+        return arg_not_supplied
+
+    return from_date
+
+
+def fills_df_for_contract_id(fills_df, contract_id):
+    # contract order keys are strategy/instrument/contract_id, which may be stored with or without the day
+    tradeable_object = contractTradeableObject("", "", contract_id)
+    contract_id_keys = [
+        tradeable_object.contract_id_key,
+        tradeable_object.alt_contract_id_key]
+    contract_id_for_each_fill = fills_df.key.apply(lambda key: key.split("/")[-1])
+
+    return fills_df[contract_id_for_each_fill.isin(contract_id_keys)]
+
+
+def trade_df_from_fills_df(fills_df):
+    """
+    :param fills_df: pd.DataFrame with columns FILLS_DF_COLUMNS
+    :return: pd.DataFrame with columns qty, price indexed by fill datetime, as listOfFills.as_pd_df
+    """
+    trade_df = pd.DataFrame(
+        dict(qty=fills_df.qty.values.astype(float),
+             price=fills_df.price.values.astype(float)),
+        index=pd.DatetimeIndex(fills_df.fill_datetime.values),
     )
-    list_of_trades_as_pd_df = list_of_trades.as_pd_df()
+    trade_df = trade_df.sort_index()
 
-    return list_of_trades_as_pd_df
+    return trade_df
 
 
 def get_position_series_for_contract(data, instrument_code, contract_id):
@@ -3,11 +3,17 @@ from copy import copy
 from sysproduction.diagnostic.rolls import ALL_ROLL_INSTRUMENTS
 
 class reportConfig(object):
-    def __init__(self, title, function, output="console", **kwargs):
+    def __init__(self, title, function, output="console",
+                 can_run_concurrently=True, **kwargs):
+        """
+        :param can_run_concurrently: False if the report has to run in the main thread, eg it uses the broker
+        :param kwargs: passed to function
+        """
         assert output in ["console", "email"]
         self.title = title
         self.function = function
         self.output = output
+        self.can_run_concurrently = can_run_concurrently
         self.kwargs = kwargs
 
     def __repr__(self):
@@ -57,6 +63,7 @@ daily_pandl_report_config = reportConfig(
 reconcile_report_config = reportConfig(
     title="Reconcile report",
     function="sysproduction.diagnostic.reconcile.reconcile_info",
+    can_run_concurrently=False,
 )
 
 trade_report_config = reportConfig(
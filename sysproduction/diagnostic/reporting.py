@@ -1,9 +1,13 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+
 import pandas as pd
 
 from syscore.objects import resolve_function, success, failure, arg_not_supplied
 from syscore.objects import header, table, body_text
 
 from sysdata.data_blob import dataBlob
+from sysdata.private_config import get_private_then_default_key_value
 from syslogdiag.email_via_db_interface import send_production_mail_msg
 
 pd.set_option("display.width", 1000)
@@ -32,7 +36,87 @@ def run_report_with_data_blob(report_config, data):
     :return:
     """
 
+    if data.read_cache.active:
+        # someone else (eg run_reports) looks after the cache, and may be sharing it with other reports
+        return _run_and_output_report(report_config, data)
+
+    # reports are read only, and read the same data many times over
+    data.enable_read_cache()
+    try:
+        report_result = _run_and_output_report(report_config, data)
+    finally:
+        data.log.msg("Read cache statistics for report %s:\n%s" % (
+            report_config.title, str(data.read_cache.stats())))
+        data.disable_read_cache()
+
+    return report_result
+
+
+def run_list_of_reports(list_of_report_configs: list, data=arg_not_supplied,
+                        max_workers: int = arg_not_supplied) -> dict:
+    """
+    Run several reports in one session, sharing a dataBlob and so its read cache: prices, positions, capital
+    and so on are only read once however many reports use them.
+
+    Reports run concurrently on a pool of threads, except those with can_run_concurrently=False (eg
+    anything that talks to the broker, whose connection has to stay in this thread) which run here while
+    the others are going. Each report gets its own child of data, so it has its own log, but they all
+    share the read cache.
+
+    :param list_of_report_configs: list of reportConfig
+    :param max_workers: size of the thread pool; defaults to production_report_max_workers in config
+    :return: dict, report title: success or failure
+    """
+    if data is arg_not_supplied:
+        data = dataBlob(log_name="Reporting")
+
+    if max_workers is arg_not_supplied:
+        max_workers = get_private_then_default_key_value(
+            "production_report_max_workers")
+
+    concurrent_report_configs = [report_config for report_config in list_of_report_configs
+                                 if report_config.can_run_concurrently]
+    main_thread_report_configs = [report_config for report_config in list_of_report_configs
+                                  if not report_config.can_run_concurrently]
+
+    data.log.msg("Running %d reports, %d of them concurrently with %d workers" % (
+        len(list_of_report_configs), len(concurrent_report_configs), max_workers))
+    start_time = time.perf_counter()
+
+    data.enable_read_cache()
+    try:
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures_by_title = dict(
+                [(report_config.title,
+                  executor.submit(_run_and_output_report, report_config,
+                                  _data_for_report(data, report_config)))
+                 for report_config in concurrent_report_configs])
+            results_by_title = dict(
+                [(report_config.title,
+                  _run_and_output_report(report_config, _data_for_report(data, report_config)))
+                 for report_config in main_thread_report_configs])
+            for title, future in futures_by_title.items():
+                results_by_title[title] = future.result()
+    finally:
+        data.log.msg("Read cache statistics for all reports:\n%s" % str(data.read_cache.stats()))
+        data.disable_read_cache()
+
+    data.log.msg("Ran %d reports in %.1f seconds" % (
+        len(list_of_report_configs), time.perf_counter() - start_time))
+
+    # in the order we were given them
+    return dict([(report_config.title, results_by_title[report_config.title])
+                 for report_config in list_of_report_configs])
+
+
+def _data_for_report(data, report_config):
+    return data.child_blob(log_name=report_config.title, share_read_cache=True)
+
+
+def _run_and_output_report(report_config, data):
     data.log.msg("Running report %s" % str(report_config))
+    start_time = time.perf_counter()
+
     report_function = resolve_function(report_config.function)
     report_kwargs = report_config.kwargs
 
@@ -45,6 +129,7 @@ def run_report_with_data_blob(report_config, data):
                 "Report %s failed to process with error %s" %
                 (report_config.title, e))]
         report_result = failure
+
     try:
         parsed_report = parse_report_results(report_results)
     except Exception as e:
@@ -62,6 +147,9 @@ def run_report_with_data_blob(report_config, data):
             data, parsed_report, subject=report_config.title, email_is_report=True
         )
 
+    data.log.msg("Report %s took %.1f seconds" % (
+        report_config.title, time.perf_counter() - start_time))
+
     return report_result
 
 
@@ -14,9 +14,9 @@ from sysproduction.data.prices import diagPrices
 
 
 
-# FIX ME A VERY INEFFICIENT REPORT THAT COULD REALLY DO WITH SOME CACHING...
-# BUT THEN MAYBE CACHING SHOULD BE INTRODUCED MORE GENERALLY AT SYSPRODUCTION_DATA LEVEL?
-# ALSO, WHY DO WE GET POSITIONS FOR WHICH THE CURRENT POSITION IS ZERO?
+# Repeated reads of prices, point sizes and positions are cached at the sysproduction data level,
+#   see sysdata.read_cache; run_report switches this on
+# FIX ME WHY DO WE GET POSITIONS FOR WHICH THE CURRENT POSITION IS ZERO?
 
 def risk_report(data):
     """
@@ -24,7 +24,7 @@ from sysproduction.data.controls import (
 from sysproduction.data.control_process import dataControlProcess, diagControlProcess
 from sysproduction.data.strategies import get_list_of_strategies
 from sysproduction.data.prices import get_list_of_instruments
-from sysproduction.data.currency_data import get_list_of_fxcodes, dataCurrency
+from sysproduction.data.currency_data import dataCurrency
 from sysproduction.data.prices import diagPrices
 from sysproduction.data.positions import  dataOptimalPositions
 
@@ -275,38 +275,34 @@ def get_list_of_last_price_updates(data):
 
 
 def get_list_of_last_futures_price_updates(data):
+    # uses the stored metadata, so we don't read any prices
     list_of_instruments = get_list_of_instruments(data)
+    diag_prices = diagPrices(data)
+    all_metadata = diag_prices.get_metadata_for_all_adjusted_prices()
     updates = [
-        get_last_futures_price_update_for_instrument(data, instrument_code)
+        genericUpdate(instrument_code, all_metadata[instrument_code].last_timestamp)
         for instrument_code in list_of_instruments
+        if instrument_code in all_metadata
     ]
     return updates
 
 
 def get_last_futures_price_update_for_instrument(data, instrument_code):
     diag_prices = diagPrices(data)
-    px = diag_prices.get_adjusted_prices(instrument_code)
-    last_timestamp = px.index[-1]
-    update = genericUpdate(instrument_code, last_timestamp)
+    metadata = diag_prices.get_metadata_for_adjusted_prices(instrument_code)
+    update = genericUpdate(instrument_code, metadata.last_timestamp)
 
     return update
 
 
 def get_list_of_last_fx_price_updates(data):
-    list_of_codes = get_list_of_fxcodes(data)
-    updates = [get_last_fx_price_update_for_code(
-        data, fx_code) for fx_code in list_of_codes]
-    return updates
-
-
-def get_last_fx_price_update_for_code(data, fx_code):
     data_fx = dataCurrency(data)
-    px = data_fx.get_fx_prices(fx_code)
-    last_timestamp = px.index[-1]
-
-    update = genericUpdate(fx_code, last_timestamp)
-
-    return update
+    all_metadata = data_fx.get_metadata_for_all_fx_prices()
+    updates = [
+        genericUpdate(fx_code, metadata.last_timestamp)
+        for fx_code, metadata in all_metadata.items()
+    ]
+    return updates
 
 
 def get_list_of_last_position_updates(data):
@@ -1,4 +1,3 @@
-from copy import copy
 from collections import namedtuple
 
 import datetime
@@ -205,8 +204,11 @@ def get_recent_broker_orders(data, start_date, end_date):
     order_id_list = data_orders.get_historic_broker_orders_in_date_range(
         start_date, end_date
     )
-    orders_as_list = [get_tuple_object_from_order_id(
-        data, order_id) for order_id in order_id_list]
+    # all the orders, and their parents, in a few queries rather than several per order
+    list_of_orders = data_orders.get_list_of_historic_broker_orders_with_execution_data(
+        order_id_list)
+    orders_as_list = [transfer_object_attributes(tradesData, order)
+                      for order in list_of_orders]
     pdf = make_df_from_list_of_named_tuple(tradesData, orders_as_list)
 
     return pdf
@@ -221,23 +223,19 @@ def get_tuple_object_from_order_id(data, order_id):
     return tuple_object
 
 
-def create_delay_df(broker_orders):
-    delay_data_as_list = [
-        delay_row(
-            broker_orders.iloc[irow]) for irow in range(
-            len(broker_orders))]
-    delay_data_df = pd.concat(delay_data_as_list, axis=1)
-    delay_data_df = delay_data_df.transpose()
-    delay_data_df.index = broker_orders.index
-
-    return delay_data_df
+# Slippage items, in the order they appear in each table
+SLIPPAGE_ITEMS = [
+    "delay",
+    "bid_ask",
+    "execution",
+    "versus_limit",
+    "versus_parent_limit",
+    "total_trading",
+]
 
 
-def delay_row(order_row):
-    submit_minus_generated, filled_minus_submit = delay_calculations_for_order_row(
-        order_row)
-    new_order_row = copy(order_row)
-    new_order_row = new_order_row[
+def create_delay_df(broker_orders):
+    delay_data_df = broker_orders[
         [
             "instrument_code",
             "strategy_name",
@@ -245,66 +243,33 @@ def delay_row(order_row):
             "submit_datetime",
             "fill_datetime",
         ]
-    ]
-    new_order_row = new_order_row.append(
-        pd.Series(
-            [submit_minus_generated, filled_minus_submit],
-            index=["submit_minus_generated", "filled_minus_submit"],
-        )
-    )
-
-    return new_order_row
-
-
-def delay_calculations_for_order_row(order_row):
+    ].copy()
 
-    submit_minus_generated = delay_calc(
-        order_row.parent_generated_datetime, order_row.submit_datetime
+    delay_data_df["submit_minus_generated"] = delay_calc(
+        broker_orders.parent_generated_datetime, broker_orders.submit_datetime
+    )
+    delay_data_df["filled_minus_submit"] = delay_calc(
+        broker_orders.submit_datetime, broker_orders.fill_datetime
     )
 
-    filled_minus_submit = delay_calc(
-        order_row.submit_datetime,
-        order_row.fill_datetime)
-
-    return submit_minus_generated, filled_minus_submit
+    return delay_data_df
 
 
 def delay_calc(first_time, second_time):
-    if first_time is None or second_time is None:
-        return np.nan
-
-    time_diff = second_time - first_time
-    time_diff_seconds = time_diff.total_seconds()
-
-    if time_diff_seconds < 0:
-        return np.nan
+    """
+    :param first_time: pd.Series of datetimes, can contain None
+    :param second_time: pd.Series of datetimes, can contain None
+    :return: pd.Series of seconds, nan if either time is missing or the difference is negative
+    """
+    time_diff = pd.to_datetime(second_time) - pd.to_datetime(first_time)
+    time_diff_seconds = time_diff.dt.total_seconds()
+    time_diff_seconds = time_diff_seconds.where(~(time_diff_seconds < 0), np.nan)
 
     return time_diff_seconds
 
 
 def create_raw_slippage_df(broker_orders):
-    raw_slippage_data_as_list = [
-        raw_slippage_row(
-            broker_orders.iloc[irow]) for irow in range(
-            len(broker_orders))]
-    raw_slippage_df = pd.concat(raw_slippage_data_as_list, axis=1)
-    raw_slippage_df = raw_slippage_df.transpose()
-    raw_slippage_df.index = broker_orders.index
-
-    return raw_slippage_df
-
-
-def raw_slippage_row(order_row):
-    (
-        delay,
-        bid_ask,
-        execution,
-        versus_limit,
-        versus_parent_limit,
-        total_trading,
-    ) = price_calculations_for_order_row(order_row)
-    new_order_row = copy(order_row)
-    new_order_row = new_order_row[
+    raw_slippage_df = broker_orders[
         [
             "instrument_code",
             "strategy_name",
@@ -316,248 +281,160 @@ def raw_slippage_row(order_row):
             "limit_price",
             "calculated_filled_price",
         ]
-    ]
-    new_order_row = new_order_row.append(
-        pd.Series(
-            [
-                delay,
-                bid_ask,
-                execution,
-                versus_limit,
-                versus_parent_limit,
-                total_trading,
-            ],
-            index=[
-                "delay",
-                "bid_ask",
-                "execution",
-                "versus_limit",
-                "versus_parent_limit",
-                "total_trading",
-            ],
-        )
-    )
-
-    return new_order_row
+    ].copy()
 
+    buying_multiplier = broker_orders.buy_or_sell.astype(float)
 
-def price_calculations_for_order_row(order_row):
-    buying_multiplier = order_row.buy_or_sell
-
-    # Following are always floats: parent_reference_price, limit_price,
-    # calculated_mid_price, calculated_side_price, fill_price
-    delay = price_slippage(
+    raw_slippage_df["delay"] = price_slippage(
         buying_multiplier,
-        order_row.parent_reference_price,
-        order_row.calculated_mid_price,
+        broker_orders.parent_reference_price,
+        broker_orders.calculated_mid_price,
     )
 
-    bid_ask = price_slippage(
+    raw_slippage_df["bid_ask"] = price_slippage(
         buying_multiplier,
-        order_row.calculated_mid_price,
-        order_row.calculated_side_price,
+        broker_orders.calculated_mid_price,
+        broker_orders.calculated_side_price,
     )
 
-    execution = price_slippage(
+    raw_slippage_df["execution"] = price_slippage(
         buying_multiplier,
-        order_row.calculated_side_price,
-        order_row.calculated_filled_price,
+        broker_orders.calculated_side_price,
+        broker_orders.calculated_filled_price,
     )
 
-    total_trading = bid_ask + execution
-
-    versus_limit = price_slippage(
+    raw_slippage_df["versus_limit"] = price_slippage(
         buying_multiplier,
-        order_row.limit_price,
-        order_row.calculated_filled_price)
+        broker_orders.limit_price,
+        broker_orders.calculated_filled_price,
+    )
 
-    versus_parent_limit = price_slippage(
+    raw_slippage_df["versus_parent_limit"] = price_slippage(
         buying_multiplier,
-        order_row.parent_limit_price,
-        order_row.calculated_filled_price,
+        broker_orders.parent_limit_price,
+        broker_orders.calculated_filled_price,
+    )
+
+    raw_slippage_df["total_trading"] = (
+        raw_slippage_df["bid_ask"] + raw_slippage_df["execution"]
     )
 
-    return delay, bid_ask, execution, versus_limit, versus_parent_limit, total_trading
+    return raw_slippage_df
 
 
 def price_slippage(buying_multiplier, first_price, second_price):
     # Slippage is always negative (bad) positive (good)
     # This will return a negative number if second price is adverse versus
     # first price
-    if first_price is None or second_price is None:
-        return np.nan
+    # Missing prices come through as None, which become nan
 
     # 1 if buying, -1 if selling
     # if buying, want second price to be lower than first
     # if selling, want second price to be higher than first
-    slippage = buying_multiplier * (first_price - second_price)
+    slippage = buying_multiplier * (
+        first_price.astype(float) - second_price.astype(float)
+    )
     return slippage
 
 
 def create_cash_slippage_df(raw_slippage, data):
     # What does this slippage mean in money terms
-
-    cash_slippage_data_as_list = [
-        cash_slippage_row(raw_slippage.iloc[irow], data)
-        for irow in range(len(raw_slippage))
-    ]
-    cash_slippage_df = pd.concat(cash_slippage_data_as_list, axis=1)
-    cash_slippage_df = cash_slippage_df.transpose()
-    cash_slippage_df.index = raw_slippage.index
-
-    return cash_slippage_df
-
-
-def cash_slippage_row(slippage_row, data):
-    # rewrite
-    (
-        delay_cash,
-        bid_ask_cash,
-        execution_cash,
-        versus_limit_cash,
-        versus_parent_limit_cash,
-        total_trading_cash,
-        value_of_price_point,
-    ) = cash_calculations_for_slippage_row(slippage_row, data)
-    new_slippage_row = copy(slippage_row)
-    new_slippage_row = new_slippage_row[
-        [
-            "instrument_code",
-            "strategy_name",
-            "trade",
-        ]
-    ]
-    new_slippage_row = new_slippage_row.append(
-        pd.Series(
-            [
-                value_of_price_point,
-                delay_cash,
-                bid_ask_cash,
-                execution_cash,
-                versus_limit_cash,
-                versus_parent_limit_cash,
-                total_trading_cash,
-            ],
-            index=[
-                "value_of_price_point",
-                "delay_cash",
-                "bid_ask_cash",
-                "execution_cash",
-                "versus_limit_cash",
-                "versus_parent_limit_cash",
-                "total_trading_cash",
-            ],
-        )
+    value_of_price_point_by_instrument = get_value_of_price_point_for_instruments(
+        data, raw_slippage.instrument_code.unique()
+    )
+    value_of_price_point = raw_slippage.instrument_code.map(
+        value_of_price_point_by_instrument
+    ).astype(float)
+
+    return _slippage_df_scaled_by_instrument(
+        raw_slippage,
+        multiplier=value_of_price_point,
+        multiplier_name="value_of_price_point",
+        suffix="_cash",
     )
-
-    return new_slippage_row
 
 
-def cash_calculations_for_slippage_row(slippage_row, data):
-    # What's a tick worth in base currency?
+def get_value_of_price_point_for_instruments(data, instrument_code_list):
+    # What's a tick worth in base currency? Once per instrument, not per order
     diag_instruments = diagInstruments(data)
-    value_of_price_point = diag_instruments.get_point_size_base_currency(
-        slippage_row.instrument_code
+    value_of_price_point_by_instrument = dict(
+        [
+            (
+                instrument_code,
+                diag_instruments.get_point_size_base_currency(instrument_code),
+            )
+            for instrument_code in instrument_code_list
+        ]
     )
-    input_items = [
-        "delay",
-        "bid_ask",
-        "execution",
-        "versus_limit",
-        "versus_parent_limit",
-        "total_trading",
-    ]
-    output = [value_of_price_point * slippage_row[input_name]
-              for input_name in input_items]
 
-    return tuple(output + [value_of_price_point])
+    return value_of_price_point_by_instrument
 
 
 def create_vol_norm_slippage_df(raw_slippage, data):
     # What does this slippage mean in vol normalised terms
-    for irow in range(len(raw_slippage)):
-        vol_slippage_row(raw_slippage.iloc[irow], data)
+    last_annual_vol_by_instrument = get_last_annual_vol_for_instruments(
+        data, raw_slippage.instrument_code.unique()
+    )
+    last_annual_vol = raw_slippage.instrument_code.map(
+        last_annual_vol_by_instrument
+    ).astype(float)
+
+    return _slippage_df_scaled_by_instrument(
+        raw_slippage,
+        multiplier=10000.0 / last_annual_vol,
+        multiplier_name="last_annual_vol",
+        multiplier_column=last_annual_vol,
+        suffix="_vol",
+    )
 
-    vol_slippage_data_as_list = [
-        vol_slippage_row(raw_slippage.iloc[irow], data)
-        for irow in range(len(raw_slippage))
-    ]
-    vol_slippage_df = pd.concat(vol_slippage_data_as_list, axis=1)
-    vol_slippage_df = vol_slippage_df.transpose()
-    vol_slippage_df.index = raw_slippage.index
-
-    return vol_slippage_df
-
-
-def vol_slippage_row(slippage_row, data):
-    # rewrite
-    (
-        vol_delay,
-        vol_bid_ask,
-        vol_execution,
-        vol_versus_limit,
-        vol_versus_parent_limit,
-        total_trading_vol,
-        last_annual_vol,
-    ) = vol_calculations_for_slippage_row(slippage_row, data)
-    new_slippage_row = copy(slippage_row)
-    new_slippage_row = new_slippage_row[
+
+def get_last_annual_vol_for_instruments(data, instrument_code_list):
+    last_annual_vol_by_instrument = dict(
         [
-            "instrument_code",
-            "strategy_name",
-            "trade",
+            (
+                instrument_code,
+                get_current_annualised_stdev_for_instrument(data, instrument_code),
+            )
+            for instrument_code in instrument_code_list
         ]
-    ]
-    new_slippage_row = new_slippage_row.append(
-        pd.Series(
-            [
-                last_annual_vol,
-                vol_delay,
-                vol_bid_ask,
-                vol_execution,
-                vol_versus_limit,
-                vol_versus_parent_limit,
-                total_trading_vol,
-            ],
-            index=[
-                "last_annual_vol",
-                "delay_vol",
-                "bid_ask_vol",
-                "execution_vol",
-                "versus_limit_vol",
-                "versus_parent_limit_vol",
-                "total_trading_vol",
-            ],
-        )
     )
 
-    return new_slippage_row
-
-
-def vol_calculations_for_slippage_row(slippage_row, data):
+    return last_annual_vol_by_instrument
 
-    last_annual_vol = get_last_annual_vol_for_slippage_row(slippage_row, data)
-
-    input_items = [
-        "delay",
-        "bid_ask",
-        "execution",
-        "versus_limit",
-        "versus_parent_limit",
-        "total_trading",
-    ]
-    output = [10000 * slippage_row[input_name] /
-              last_annual_vol for input_name in input_items]
 
-    return tuple(output + [last_annual_vol])
+def _slippage_df_scaled_by_instrument(
+    raw_slippage,
+    multiplier,
+    multiplier_name,
+    suffix,
+    multiplier_column=arg_not_supplied,
+):
+    """
+    :param raw_slippage: output of create_raw_slippage_df
+    :param multiplier: pd.Series, same index as raw_slippage; each slippage item is multiplied by this
+    :param multiplier_name: name of the column that shows the per instrument value
+    :param suffix: added to each slippage item name
+    :param multiplier_column: pd.Series to show; defaults to multiplier
+    :return: pd.DataFrame
+    """
+    if multiplier_column is arg_not_supplied:
+        multiplier_column = multiplier
 
+    scaled_slippage_df = raw_slippage[
+        [
+            "instrument_code",
+            "strategy_name",
+            "trade",
+        ]
+    ].copy()
+    scaled_slippage_df[multiplier_name] = multiplier_column
 
-def get_last_annual_vol_for_slippage_row(slippage_row, data):
-    instrument_code = slippage_row.instrument_code
-    last_annual_vol = get_current_annualised_stdev_for_instrument(data,
-        instrument_code)
+    for item_name in SLIPPAGE_ITEMS:
+        scaled_slippage_df[item_name + suffix] = (
+            raw_slippage[item_name].astype(float) * multiplier
+        )
 
-    return last_annual_vol
+    return scaled_slippage_df
 
 
 def get_stats_for_slippage_groups(df_to_process, item_list):
@@ -5,6 +5,7 @@ from syscore.genutils import (
     get_and_convert,
     print_menu_and_get_response,
 )
+from syscore.warm_start import warm_start_in_background
 from sysobjects.production.override import override_dict, Override
 
 from sysdata.data_blob import dataBlob
@@ -13,7 +14,8 @@ from sysproduction.data.controls import (
     updateOverrides,
     dataTradeLimits,
     dataPositionLimits,
-    dataBrokerClientIDs
+    dataBrokerClientIDs,
+    dataBrokerContractMetadataCache
 )
 from sysproduction.data.control_process import dataControlProcess, diagControlProcess
 from sysproduction.data.prices import get_valid_instrument_code_from_user
@@ -22,6 +24,7 @@ from sysproduction.data.positions import diagPositions
 from sysproduction.diagnostic.risk import get_risk_data_for_instrument
 
 def interactive_controls():
+    warm_start_in_background()
     with dataBlob(log_name="Interactive-Controls") as data:
         menu = run_interactive_menu(
             top_level_menu_of_options,
@@ -46,7 +49,7 @@ top_level_menu_of_options = {
     0: "Trade limits",
     1: "Position limits",
     2: "Trade control (override)",
-    3: "Broker client IDS",
+    3: "Broker client IDS and contract metadata",
     4: "Process control and monitoring",
 }
 
@@ -72,7 +75,8 @@ nested_menu_of_options = {
         23: "Update / add / remove override for strategy & instrument",
     },
     3: {
-        30: "Clear all unused client IDS"
+        30: "Clear all unused client IDS",
+        31: "Clear cached contract metadata (conIds, expiries, tick sizes, trading hours)",
     },
     4: {
         40: "View process controls and status",
@@ -370,6 +374,17 @@ def clear_used_client_ids(data):
         client_id_data.clear_all_clientids()
 
 
+def clear_cached_contract_metadata(data):
+    print("Cached contract metadata will be fetched from the broker again when next needed")
+    print("(Processes already running keep what they've already fetched until they finish)")
+    instrument_code = get_valid_instrument_code_from_user(data, allow_all=True)
+    cache_data = dataBrokerContractMetadataCache(data)
+    if instrument_code == "ALL":
+        cache_data.clear_cache()
+    else:
+        cache_data.clear_cache_for_instrument_code(instrument_code)
+
+
 def view_process_controls(data):
     dict_of_controls = get_dict_of_process_controls(data)
     print("\nControlled processes:\n")
@@ -477,6 +492,7 @@ dict_of_functions = {
     22: update_instrument_override,
     23: update_strategy_instrument_override,
     30: clear_used_client_ids,
+    31: clear_cached_contract_metadata,
     40: view_process_controls,
     41: change_process_control_status,
     42: change_global_process_control_status,
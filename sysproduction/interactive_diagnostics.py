@@ -5,6 +5,7 @@ from syscore.genutils import (
     get_and_convert,
     print_menu_and_get_response,
 )
+from syscore.warm_start import warm_start_in_background
 from syscore.pdutils import set_pd_print_options
 from syscore.objects import user_exit, arg_not_supplied
 from sysexecution.base_orders import listOfOrders
@@ -43,6 +44,7 @@ from sysproduction.diagnostic.report_configs import (
 def interactive_diagnostics():
     print("\n\n INTERACTIVE DIAGONSTICS\n\n")
     set_pd_print_options()
+    warm_start_in_background()
     with dataBlob(log_name="Interactive-Diagnostics") as data:
         menu = run_interactive_menu(
             top_level_menu_of_options,
@@ -8,16 +8,17 @@ from sysdata.data_blob import dataBlob
 def run_backups():
     process_name = "run_backups"
     data = dataBlob(log_name=process_name)
-    list_of_timer_names_and_functions = get_list_of_timer_functions_for_backup()
+    list_of_timer_names_and_functions = get_list_of_timer_functions_for_backup(data)
     backup_process = processToRun(
         process_name, data, list_of_timer_names_and_functions)
     backup_process.main_loop()
 
 
-def get_list_of_timer_functions_for_backup():
-    data_arctic_backups = dataBlob(log_name="backup_arctic_to_csv")
-    data_state_files = dataBlob(log_name="backup_files")
-    data_mongo_dump = dataBlob(log_name = "backup_mongo_data_as_dump")
+def get_list_of_timer_functions_for_backup(data):
+    # each of these shares the process's connections, which are closed when the process finishes
+    data_arctic_backups = data.child_blob(log_name="backup_arctic_to_csv")
+    data_state_files = data.child_blob(log_name="backup_files")
+    data_mongo_dump = data.child_blob(log_name="backup_mongo_data_as_dump")
 
     arctic_backup_object = backupArcticToCsv(data_arctic_backups)
     statefile_backup_object = backupStateFiles(data_state_files)
@@ -7,16 +7,17 @@ from sysdata.data_blob import dataBlob
 def run_capital_update():
     process_name = "run_capital_update"
     data = dataBlob(log_name=process_name)
-    list_of_timer_names_and_functions = get_list_of_timer_functions_for_capital_update()
+    list_of_timer_names_and_functions = get_list_of_timer_functions_for_capital_update(data)
     capital_process = processToRun(
         process_name, data, list_of_timer_names_and_functions
     )
     capital_process.main_loop()
 
 
-def get_list_of_timer_functions_for_capital_update():
-    data_total_capital = dataBlob(log_name="update_total_capital")
-    data_strategy_capital = dataBlob(log_name="strategy_allocation")
+def get_list_of_timer_functions_for_capital_update(data):
+    # each of these shares the process's connections, which are closed when the process finishes
+    data_total_capital = data.child_blob(log_name="update_total_capital")
+    data_strategy_capital = data.child_blob(log_name="strategy_allocation")
 
     total_capital_update_object = totalCapitalUpdate(data_total_capital)
     strategy_capital_update_object = updateStrategyCapital(
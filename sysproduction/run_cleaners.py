@@ -8,17 +8,18 @@ from sysdata.data_blob import dataBlob
 def run_cleaners():
     process_name = "run_cleaners"
     data = dataBlob(log_name=process_name)
-    list_of_timer_names_and_functions = get_list_of_timer_functions_for_cleaning()
+    list_of_timer_names_and_functions = get_list_of_timer_functions_for_cleaning(data)
     cleaning_process = processToRun(
         process_name, data, list_of_timer_names_and_functions
     )
     cleaning_process.main_loop()
 
 
-def get_list_of_timer_functions_for_cleaning():
-    data_backtests = dataBlob(log_name="clean_backtest_states")
-    data_echos = dataBlob(log_name="clean_echo_files")
-    data_logs = dataBlob(log_name="clean_log_files")
+def get_list_of_timer_functions_for_cleaning(data):
+    # each of these shares the process's connections, which are closed when the process finishes
+    data_backtests = data.child_blob(log_name="clean_backtest_states")
+    data_echos = data.child_blob(log_name="clean_echo_files")
+    data_logs = data.child_blob(log_name="clean_log_files")
 
     backtest_clean_object = cleanTruncateBacktestStates(data_backtests)
     log_clean_object = cleanTruncateLogFiles(data_logs)
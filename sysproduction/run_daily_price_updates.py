@@ -10,17 +10,18 @@ from sysdata.data_blob import dataBlob
 def run_daily_price_updates():
     process_name = "run_daily_prices_updates"
     data = dataBlob(log_name=process_name)
-    list_of_timer_names_and_functions = get_list_of_timer_functions_for_price_update()
+    list_of_timer_names_and_functions = get_list_of_timer_functions_for_price_update(data)
     price_process = processToRun(
         process_name, data, list_of_timer_names_and_functions)
     price_process.main_loop()
 
 
-def get_list_of_timer_functions_for_price_update():
-    data_fx = dataBlob(log_name="update_fx_prices")
-    data_contracts = dataBlob(log_name="update_sampled_contracts")
-    data_historical = dataBlob(log_name="update_historical_prices")
-    data_multiple = dataBlob(log_name="update_multiple_adjusted_prices")
+def get_list_of_timer_functions_for_price_update(data):
+    # each of these shares the process's connections, which are closed when the process finishes
+    data_fx = data.child_blob(log_name="update_fx_prices")
+    data_contracts = data.child_blob(log_name="update_sampled_contracts")
+    data_historical = data.child_blob(log_name="update_historical_prices")
+    data_multiple = data.child_blob(log_name="update_multiple_adjusted_prices")
 
     fx_update_object = updateFxPrices(data_fx)
     contracts_update_object = updateSampledContracts(data_contracts)
@@ -1,25 +1,42 @@
+"""
+Run the scheduled reports
+
+The reports share a read cache, so prices, positions and so on read by several of them are only read once.
+Normally each report is a separately scheduled method. With production_report_max_workers above 1 they instead
+run together under one method, run_all_reports, several at a time.
+"""
 from syscontrol.run_process import processToRun
 from sysproduction.diagnostic.report_configs import all_configs
+from sysproduction.diagnostic.reporting import run_report, run_list_of_reports
 
 from sysdata.data_blob import dataBlob
+from sysdata.private_config import get_private_then_default_key_value
 
-
-# JUST A COPY AND PAST JOB RIGHT NOW
+ALL_REPORTS_METHOD_NAME = "run_all_reports"
 
 
 def run_reports():
     process_name = "run_reports"
     data = dataBlob(log_name=process_name)
-    list_of_timer_names_and_functions = get_list_of_timer_functions_for_reports()
+    list_of_timer_names_and_functions = get_list_of_timer_functions_for_reports(data)
     price_process = processToRun(
         process_name, data, list_of_timer_names_and_functions)
     price_process.main_loop()
 
 
-def get_list_of_timer_functions_for_reports():
+def get_list_of_timer_functions_for_reports(data):
+    # The data shares the process's connections, which are closed when the process finishes
+    data_for_reports = data.child_blob(log_name="Reporting")
+    max_workers = get_private_then_default_key_value("production_report_max_workers")
+    if max_workers > 1:
+        return get_timer_function_for_all_reports(data_for_reports, max_workers)
+
+    data_for_reports.enable_read_cache()
+
     list_of_timer_names_and_functions = []
     for report_name, report_config in all_configs.items():
-        data_for_report = dataBlob(log_name=report_name)
+        data_for_report = data_for_reports.child_blob(
+            log_name=report_name, share_read_cache=True)
         email_report_config = report_config.new_config_with_modified_output(
             "email")
         report_object = runReport(
@@ -32,7 +49,18 @@ def get_list_of_timer_functions_for_reports():
     return list_of_timer_names_and_functions
 
 
-from sysproduction.diagnostic.reporting import run_report
+def get_timer_function_for_all_reports(data, max_workers: int):
+    # All the reports run together, so there is a single timer function
+    data.log.msg(
+        "Running all reports together under %s with %d workers: set production_report_max_workers to 1 to "
+        "schedule them separately" % (ALL_REPORTS_METHOD_NAME, max_workers))
+    list_of_email_report_configs = [
+        report_config.new_config_with_modified_output("email")
+        for report_config in all_configs.values()
+    ]
+    report_object = runAllReports(data, list_of_email_report_configs, max_workers=max_workers)
+
+    return [(ALL_REPORTS_METHOD_NAME, report_object)]
 
 
 class runReport(object):
@@ -44,5 +72,15 @@ class runReport(object):
         setattr(self, report_function, self.email_trades_report)
 
     def email_trades_report(self):
-
         run_report(self.config, data=self.data)
+
+
+class runAllReports(object):
+    def __init__(self, data, list_of_report_configs: list, max_workers: int):
+        self.data = data
+        self.list_of_report_configs = list_of_report_configs
+        self.max_workers = max_workers
+
+    def run_all_reports(self):
+        run_list_of_reports(
+            self.list_of_report_configs, data=self.data, max_workers=self.max_workers)
@@ -1,15 +1,33 @@
 """
 Run overnight backtest of systems to generate optimal positions
 
+With more than one strategy, and production_system_max_workers above 1, the strategies' backtests run at the
+same time in worker processes. These share a snapshot of the simulation data, read once before they start, which
+is passed to each strategy class as sim_data (so it must accept that, as runSystemClassic does).
+
 """
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor, as_completed
 
+from syscore.objects import success, failure
+from sysdata.arctic.arctic_connection import arctic_store_factory
 from sysdata.data_blob import dataBlob
+from sysdata.mongodb.mongo_connection import mongo_client_factory
+from sysdata.private_config import get_private_then_default_key_value
 
 from syscontrol.run_process import processToRun
 
 from sysproduction.update_system_backtests import process_name, backtest_function
 from syscontrol.strategy_tools import strategyRunner
-from sysproduction.data.control_process import get_list_of_strategies_for_process
+from sysproduction.data.control_process import get_list_of_strategies_for_process, dataControlProcess, \
+    diagControlProcess
+from sysproduction.data.sim_data import dataSimDataSnapshot
+
+ALL_STRATEGIES_METHOD_NAME = "run_all_strategy_backtests"
+
+# set in each worker process
+_worker_sim_data = None
 
 
 def run_systems():
@@ -28,6 +46,10 @@ def backtest_function_to_be_renamed(self):
 
 def get_list_of_backtest_timer_functions_for_strategies(data):
     list_of_strategy_names = get_list_of_strategies_for_process(data, process_name)
+    max_workers = get_private_then_default_key_value("production_system_max_workers")
+    if max_workers > 1 and len(list_of_strategy_names) > 1:
+        return get_timer_function_for_strategies_in_parallel(data, list_of_strategy_names, max_workers)
+
     list_of_timer_names_and_functions = []
     for strategy_name in list_of_strategy_names:
         # we add a method to the class with the strategy name, that just calls run_strategy_backtest with the current
@@ -41,5 +63,98 @@ def get_list_of_backtest_timer_functions_for_strategies(data):
     return list_of_timer_names_and_functions
 
 
+def get_timer_function_for_strategies_in_parallel(data, list_of_strategy_names: list, max_workers: int):
+    # All the backtests run together, so there is a single timer function
+    diag_process = diagControlProcess(data)
+    for strategy_name in list_of_strategy_names:
+        max_executions = diag_process.max_executions_for_process_and_method(process_name, strategy_name)
+        if max_executions != 1:
+            data.log.warn(
+                "Strategy %s has max_executions %d, but when running in parallel each backtest runs once: "
+                "set production_system_max_workers to 1 to run them one by one" % (strategy_name, max_executions))
+
+    runner = runAllStrategyBacktests(data, list_of_strategy_names, max_workers=max_workers)
+
+    return [(ALL_STRATEGIES_METHOD_NAME, runner)]
+
+
+class runAllStrategyBacktests(object):
+    def __init__(self, data, list_of_strategy_names: list, max_workers: int):
+        self.data = data
+        self.list_of_strategy_names = list_of_strategy_names
+        self.max_workers = max_workers
+
+    def run_all_strategy_backtests(self):
+        run_strategy_backtests_in_parallel(
+            self.data, self.list_of_strategy_names, max_workers=self.max_workers)
+
+
+def run_strategy_backtests_in_parallel(data, list_of_strategy_names: list, max_workers: int) -> dict:
+    """
+    Run each strategy's backtest in a pool of worker processes. The simulation data is read once, here, and
+    shared with the workers.
+
+    As when they run one by one, the start and end of each strategy's backtest is logged in process control
+    under the strategy name; a backtest that fails is logged as critical, and never marked as ended.
+
+    :return: dict, strategy name: success or failure
+    """
+    data_control = dataControlProcess(data)
+    start_time = time.perf_counter()
+    sim_data_snapshot = dataSimDataSnapshot(data)
+    data.log.msg("Snapshot of simulation data took %.1f seconds; running %d backtests with %d workers" % (
+        time.perf_counter() - start_time, len(list_of_strategy_names), max_workers))
+
+    results_by_strategy_name = {}
+    with ProcessPoolExecutor(max_workers=max_workers,
+                             initializer=_initialise_backtest_worker,
+                             initargs=(sim_data_snapshot,)) as executor:
+        list_of_futures = []
+        for strategy_name in list_of_strategy_names:
+            data_control.log_start_run_for_method(process_name, strategy_name)
+            list_of_futures.append(executor.submit(_run_strategy_backtest_in_worker, strategy_name))
+
+        for future in as_completed(list_of_futures):
+            strategy_name, succeeded, error_msg, seconds = future.result()
+            results_by_strategy_name[strategy_name] = success if succeeded else failure
+            if succeeded:
+                data_control.log_end_run_for_method(process_name, strategy_name)
+                data.log.msg("Backtest for %s finished in %.1f seconds" % (strategy_name, seconds))
+            else:
+                # critical log will send email
+                data.log.critical("Backtest for %s failed after %.1f seconds: %s" % (
+                    strategy_name, seconds, error_msg))
+
+    data.log.msg("Ran %d backtests in %.1f seconds" % (
+        len(list_of_strategy_names), time.perf_counter() - start_time))
+
+    # in the order we were given them
+    return dict([(strategy_name, results_by_strategy_name[strategy_name])
+                 for strategy_name in list_of_strategy_names])
+
+
+def _initialise_backtest_worker(sim_data_snapshot):
+    # connections inherited from the parent process can't be used here
+    mongo_client_factory.reset()
+    arctic_store_factory.reset()
+
+    global _worker_sim_data
+    _worker_sim_data = sim_data_snapshot
+
+
+def _run_strategy_backtest_in_worker(strategy_name: str) -> tuple:
+    """
+    Runs inside a worker process, so never raises: errors are returned
 
+    :return: tuple: strategy_name, bool (success and failure don't survive pickling), error message, seconds taken
+    """
+    start_time = time.perf_counter()
+    try:
+        with dataBlob(log_name=process_name) as data:
+            strategy_runner = strategyRunner(data, strategy_name, process_name, backtest_function,
+                                             strategy_kwargs=dict(sim_data=_worker_sim_data))
+            strategy_runner.run_strategy_method()
+    except Exception:
+        return strategy_name, False, traceback.format_exc(), time.perf_counter() - start_time
 
+    return strategy_name, True, "", time.perf_counter() - start_time
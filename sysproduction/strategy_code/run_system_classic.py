@@ -33,10 +33,16 @@ class runSystemClassic(object):
         data,
         strategy_name,
         backtest_config_filename=arg_not_supplied,
+        sim_data=arg_not_supplied,
     ):
+        """
+        :param sim_data: futuresSimData to run the backtest on, eg a snapshot shared by several backtests;
+           defaults to reading the database
+        """
         self.data = data
         self.strategy_name = strategy_name
         self.backtest_config_filename = backtest_config_filename
+        self.sim_data = sim_data
 
         if backtest_config_filename is arg_not_supplied:
             raise Exception("Need to supply config")
@@ -78,6 +84,7 @@ class runSystemClassic(object):
             log=data.log,
             notional_trading_capital=notional_trading_capital,
             base_currency=base_currency,
+            sim_data=self.sim_data,
         )
 
         return system
@@ -89,11 +96,13 @@ def production_classic_futures_system(
     log=logtoscreen("futures_system"),
     notional_trading_capital=None,
     base_currency=None,
+    sim_data=arg_not_supplied,
 ):
 
     log_level = "on"
 
-    sim_data = dataSimData(data)
+    if sim_data is arg_not_supplied:
+        sim_data = dataSimData(data)
     config = Config(config_filename)
 
     # Overwrite capital
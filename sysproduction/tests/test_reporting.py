@@ -0,0 +1,130 @@
+import threading
+import unittest as ut
+
+from syscore.objects import header, body_text, success, failure
+from sysdata.data_blob import dataBlob
+from sysdata.read_cache import cached_read
+from sysproduction.diagnostic.report_configs import reportConfig
+from sysproduction.diagnostic.reporting import run_report, run_list_of_reports
+from sysproduction.run_reports import runAllReports
+from syslogdiag.log import logtoscreen
+
+
+class logToList(logtoscreen):
+    """
+    Keeps what's logged, with the type it was logged as; copies made by setup() share the same list
+    """
+
+    def __init__(self, type, list_of_messages):
+        super().__init__(type)
+        self.list_of_messages = list_of_messages
+
+    def log_handle_caller(self, msglevel, text, use_attributes, log_id_NOT_USED):
+        self.list_of_messages.append((use_attributes["type"], text))
+
+
+class countedPrices(object):
+    number_of_reads = 0
+    threads_used = set()
+
+    def __init__(self, data):
+        self.data = data
+
+    @cached_read("adjusted_prices")
+    def get_prices(self, instrument_code):
+        countedPrices.number_of_reads += 1
+        countedPrices.threads_used.add(threading.current_thread().name)
+        return [1.0, 2.0]
+
+
+def prices_report(data, instrument_code="GOLD"):
+    prices = countedPrices(data).get_prices(instrument_code)
+    return [header("Prices for %s" % instrument_code), body_text(str(prices))]
+
+
+def main_thread_report(data):
+    return [header("Ran in %s" % threading.current_thread().name)]
+
+
+def failing_report(data):
+    raise Exception("Report went wrong")
+
+
+def _report_config(title, function, **kwargs):
+    return reportConfig(title=title, function=function, **kwargs)
+
+
+class Test(ut.TestCase):
+    def setUp(self):
+        countedPrices.number_of_reads = 0
+        countedPrices.threads_used = set()
+        self.list_of_messages = []
+        self.data = dataBlob(log=logToList("Reporting", self.list_of_messages), mongo_db=object())
+
+    def messages_for(self, log_type):
+        return [text for msg_log_type, text in self.list_of_messages if msg_log_type == log_type]
+
+    def test_reports_share_the_read_cache(self):
+        list_of_report_configs = [
+            _report_config("Gold", prices_report),
+            _report_config("Gold again", prices_report),
+            _report_config("Corn", prices_report, instrument_code="CORN"),
+            _report_config("Main thread", main_thread_report, can_run_concurrently=False),
+            _report_config("Broken", failing_report),
+        ]
+
+        # one worker, so the reports reading gold don't both miss at the same time (which the cache allows)
+        results = run_list_of_reports(list_of_report_configs, data=self.data, max_workers=1)
+
+        self.assertEqual(results, dict([("Gold", success), ("Gold again", success), ("Corn", success),
+                                        ("Main thread", success), ("Broken", failure)]))
+        # gold once, corn once
+        self.assertEqual(countedPrices.number_of_reads, 2)
+        self.assertNotIn(threading.main_thread().name, countedPrices.threads_used)
+
+        cache_stats = "\n".join(
+            [text for text in self.messages_for("Reporting") if text.startswith("Read cache statistics")])
+        self.assertIn("get_prices", cache_stats)
+        # and the cache is done with
+        self.assertFalse(self.data.read_cache.active)
+
+    def test_timings_logged_for_each_report(self):
+        list_of_report_configs = [
+            _report_config("Gold", prices_report),
+            _report_config("Main thread", main_thread_report, can_run_concurrently=False),
+            _report_config("Broken", failing_report),
+        ]
+        run_list_of_reports(list_of_report_configs, data=self.data, max_workers=2)
+
+        # each report logs with its own name
+        for report_config in list_of_report_configs:
+            messages = self.messages_for(report_config.title)
+            self.assertEqual(len([text for text in messages if text.startswith(
+                "Report %s took" % report_config.title)]), 1)
+
+        self.assertEqual(len([text for text in self.messages_for("Reporting")
+                              if text.startswith("Ran 3 reports in")]), 1)
+
+    def test_separately_scheduled_reports_share_the_read_cache(self):
+        self.data.enable_read_cache()
+        for title in ["Gold", "Gold again"]:
+            data_for_report = self.data.child_blob(log_name=title, share_read_cache=True)
+            self.assertIs(run_report(_report_config(title, prices_report), data=data_for_report), success)
+            self.assertEqual(len([text for text in self.messages_for(title)
+                                  if text.startswith("Report %s took" % title)]), 1)
+
+        self.assertEqual(countedPrices.number_of_reads, 1)
+        # whoever switched it on looks after it
+        self.assertTrue(self.data.read_cache.active)
+
+    def test_run_all_reports(self):
+        report_object = runAllReports(
+            self.data, [_report_config("Gold", prices_report), _report_config("Gold again", prices_report)],
+            max_workers=1)
+        report_object.run_all_reports()
+
+        self.assertEqual(countedPrices.number_of_reads, 1)
+
+
+if __name__ == "__main__":
+    ut.main()
@@ -0,0 +1,147 @@
+import json
+import os
+import shutil
+import tempfile
+import unittest as ut
+
+import syscontrol.strategy_tools as strategy_tools
+import sysproduction.run_systems as run_systems
+from syscore.objects import success, failure
+from sysdata.csv.csv_adjusted_prices import csvFuturesAdjustedPricesData
+from sysdata.csv.csv_instrument_data import csvFuturesInstrumentData
+from sysdata.csv.csv_multiple_prices import csvFuturesMultiplePricesData
+from sysdata.csv.csv_spot_fx import csvFxPricesData
+from sysdata.data_blob import dataBlob
+from sysproduction.data.control_process import dataControlProcess
+from sysproduction.data.sim_data import dataSimData
+from sysproduction.run_systems import run_strategy_backtests_in_parallel, process_name
+from syslogdiag.log import logtoscreen
+
+INSTRUMENT_LIST = ["CORN", "US10"]
+FAILING_STRATEGY_NAME = "broken"
+
+
+class logToList(logtoscreen):
+    """
+    Keeps what's logged, with the level it was logged at
+    """
+
+    def __init__(self, type, list_of_messages):
+        super().__init__(type)
+        self.list_of_messages = list_of_messages
+
+    def log_handle_caller(self, msglevel, text, use_attributes, log_id_NOT_USED):
+        self.list_of_messages.append((msglevel, text))
+
+
+class fakeControlProcessData(object):
+    def __init__(self):
+        self.list_of_runs = []
+
+    def log_start_run_for_method(self, process_name, method_name):
+        self.list_of_runs.append(("start", process_name, method_name))
+
+    def log_end_run_for_method(self, process_name, method_name):
+        self.list_of_runs.append(("end", process_name, method_name))
+
+
+class csvAdjustedPricesDataForSomeInstruments(csvFuturesAdjustedPricesData):
+    # so the snapshot is quick
+    def get_list_of_instruments(self):
+        return INSTRUMENT_LIST
+
+
+class stubStrategy(object):
+    """
+    Stands in for runSystemClassic; runs in a worker process, so writes what it was given to a file
+    """
+
+    def __init__(self, data, strategy_name, sim_data=None, output_directory=""):
+        self.strategy_name = strategy_name
+        self.sim_data = sim_data
+        self.output_directory = output_directory
+
+    def run_backtest(self):
+        if self.strategy_name == FAILING_STRATEGY_NAME:
+            raise Exception("Backtest went wrong")
+
+        output = dict(
+            sim_data_class=type(self.sim_data).__name__,
+            instrument_list=sorted(self.sim_data.get_instrument_list()))
+        with open(os.path.join(self.output_directory, self.strategy_name + ".json"), "w") as output_file:
+            json.dump(output, output_file)
+
+
+def _data_blob_without_database(log_name="", **kwargs):
+    return dataBlob(log=logtoscreen(log_name), mongo_db=object(), **kwargs)
+
+
+class Test(ut.TestCase):
+    def setUp(self):
+        self.output_directory = tempfile.mkdtemp()
+
+        def _stub_strategy_config(data, process_name, strategy_name):
+            return dict(object=stubStrategy, max_executions=1, output_directory=self.output_directory)
+
+        # worker processes are forked, so they see these too
+        self.original_run_systems_data_blob = run_systems.dataBlob
+        self.original_strategy_tools_data_blob = strategy_tools.dataBlob
+        self.original_get_strategy_class_object_config = strategy_tools.get_strategy_class_object_config
+        run_systems.dataBlob = _data_blob_without_database
+        strategy_tools.dataBlob = _data_blob_without_database
+        strategy_tools.get_strategy_class_object_config = _stub_strategy_config
+
+        self.list_of_messages = []
+        self.data = dataBlob(log=logToList("test", self.list_of_messages), mongo_db=object())
+        # the classes first, as they add their own
+        dataControlProcess(self.data)
+        dataSimData(self.data)
+        self.control_process_data = fakeControlProcessData()
+        self.data.db_control_process = self.control_process_data
+        self.data.db_futures_adjusted_prices = csvAdjustedPricesDataForSomeInstruments()
+        self.data.db_futures_multiple_prices = csvFuturesMultiplePricesData()
+        self.data.db_fx_prices = csvFxPricesData()
+        self.data.db_futures_instrument = csvFuturesInstrumentData()
+
+    def tearDown(self):
+        run_systems.dataBlob = self.original_run_systems_data_blob
+        strategy_tools.dataBlob = self.original_strategy_tools_data_blob
+        strategy_tools.get_strategy_class_object_config = self.original_get_strategy_class_object_config
+        shutil.rmtree(self.output_directory)
+
+    def output_for_strategy(self, strategy_name):
+        with open(os.path.join(self.output_directory, strategy_name + ".json")) as output_file:
+            return json.load(output_file)
+
+    def test_run_in_parallel(self):
+        list_of_strategy_names = ["first", FAILING_STRATEGY_NAME, "second"]
+        results = run_strategy_backtests_in_parallel(self.data, list_of_strategy_names, max_workers=2)
+
+        self.assertEqual(results, dict(first=success, broken=failure, second=success))
+        self.assertEqual(list(results.keys()), list_of_strategy_names)
+
+        # the snapshot reached each strategy as sim_data
+        for strategy_name in ["first", "second"]:
+            self.assertEqual(self.output_for_strategy(strategy_name),
+                             dict(sim_data_class="snapshotFuturesSimData", instrument_list=INSTRUMENT_LIST))
+
+        list_of_runs = self.control_process_data.list_of_runs
+        for strategy_name in list_of_strategy_names:
+            self.assertIn(("start", process_name, strategy_name), list_of_runs)
+        for strategy_name in ["first", "second"]:
+            self.assertIn(("end", process_name, strategy_name), list_of_runs)
+            self.assertLess(list_of_runs.index(("start", process_name, strategy_name)),
+                            list_of_runs.index(("end", process_name, strategy_name)))
+
+        # the failure is never marked as ended, and is logged as critical
+        self.assertNotIn(("end", process_name, FAILING_STRATEGY_NAME), list_of_runs)
+        self.assertFalse(os.path.exists(os.path.join(self.output_directory, FAILING_STRATEGY_NAME + ".json")))
+
+        critical_messages = [text for msglevel, text in self.list_of_messages if msglevel == 4]
+        self.assertEqual(len(critical_messages), 1)
+        self.assertTrue(critical_messages[0].startswith("Backtest for %s failed" % FAILING_STRATEGY_NAME))
+        self.assertIn("Backtest went wrong", critical_messages[0])
+
+
+if __name__ == "__main__":
+    ut.main()
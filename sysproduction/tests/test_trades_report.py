@@ -0,0 +1,265 @@
+import datetime
+import unittest as ut
+from copy import copy
+
+import numpy as np
+import pandas as pd
+
+from syscore.genutils import transfer_object_attributes
+from syscore.objects import missing_order
+from syscore.pdutils import make_df_from_list_of_named_tuple
+from sysdata.csv.csv_adjusted_prices import csvFuturesAdjustedPricesData
+from sysdata.csv.csv_instrument_data import csvFuturesInstrumentData
+from sysdata.csv.csv_spot_fx import csvFxPricesData
+from sysdata.data_blob import dataBlob
+from sysdata.production.historic_orders import genericOrdersData
+from sysexecution.broker_orders import brokerOrder
+from sysexecution.contract_orders import contractOrder
+from sysexecution.instrument_orders import instrumentOrder
+from sysproduction.data.currency_data import dataCurrency
+from sysproduction.data.instruments import diagInstruments
+from sysproduction.data.orders import dataOrders
+from sysproduction.data.prices import diagPrices
+from sysproduction.diagnostic.risk import get_current_annualised_stdev_for_instrument
+from sysproduction.diagnostic.trades import tradesData, create_delay_df, create_raw_slippage_df, \
+    create_cash_slippage_df, create_vol_norm_slippage_df, get_tuple_object_from_order_id
+from syslogdiag.log import logtoscreen
+
+SLIPPAGE_ITEMS = ["delay", "bid_ask", "execution", "versus_limit", "versus_parent_limit", "total_trading"]
+
+
+# The row by row versions the report used to use, which the vectorised versions must match
+
+
+def old_delay_row(order_row):
+    submit_minus_generated = old_delay_calc(order_row.parent_generated_datetime, order_row.submit_datetime)
+    filled_minus_submit = old_delay_calc(order_row.submit_datetime, order_row.fill_datetime)
+
+    new_order_row = copy(order_row)[
+        ["instrument_code", "strategy_name", "parent_generated_datetime", "submit_datetime", "fill_datetime"]]
+
+    return new_order_row.append(pd.Series(
+        [submit_minus_generated, filled_minus_submit], index=["submit_minus_generated", "filled_minus_submit"]))
+
+
+def old_delay_calc(first_time, second_time):
+    if first_time is None or second_time is None:
+        return np.nan
+
+    time_diff_seconds = (second_time - first_time).total_seconds()
+    if time_diff_seconds < 0:
+        return np.nan
+
+    return time_diff_seconds
+
+
+def old_raw_slippage_row(order_row):
+    buying_multiplier = order_row.buy_or_sell
+    delay = old_price_slippage(buying_multiplier, order_row.parent_reference_price, order_row.calculated_mid_price)
+    bid_ask = old_price_slippage(buying_multiplier, order_row.calculated_mid_price, order_row.calculated_side_price)
+    execution = old_price_slippage(
+        buying_multiplier, order_row.calculated_side_price, order_row.calculated_filled_price)
+    versus_limit = old_price_slippage(buying_multiplier, order_row.limit_price, order_row.calculated_filled_price)
+    versus_parent_limit = old_price_slippage(
+        buying_multiplier, order_row.parent_limit_price, order_row.calculated_filled_price)
+    total_trading = bid_ask + execution
+
+    new_order_row = copy(order_row)[
+        ["instrument_code", "strategy_name", "trade", "parent_reference_price", "parent_limit_price",
+         "calculated_mid_price", "calculated_side_price", "limit_price", "calculated_filled_price"]]
+
+    return new_order_row.append(pd.Series(
+        [delay, bid_ask, execution, versus_limit, versus_parent_limit, total_trading], index=SLIPPAGE_ITEMS))
+
+
+def old_price_slippage(buying_multiplier, first_price, second_price):
+    if first_price is None or second_price is None:
+        return np.nan
+
+    return buying_multiplier * (first_price - second_price)
+
+
+def old_cash_slippage_row(slippage_row, data):
+    value_of_price_point = diagInstruments(data).get_point_size_base_currency(slippage_row.instrument_code)
+    output = [value_of_price_point * slippage_row[item_name] for item_name in SLIPPAGE_ITEMS]
+
+    new_slippage_row = copy(slippage_row)[["instrument_code", "strategy_name", "trade"]]
+
+    return new_slippage_row.append(pd.Series(
+        [value_of_price_point] + output,
+        index=["value_of_price_point"] + [item_name + "_cash" for item_name in SLIPPAGE_ITEMS]))
+
+
+def old_vol_slippage_row(slippage_row, data):
+    last_annual_vol = get_current_annualised_stdev_for_instrument(data, slippage_row.instrument_code)
+    output = [10000 * slippage_row[item_name] / last_annual_vol for item_name in SLIPPAGE_ITEMS]
+
+    new_slippage_row = copy(slippage_row)[["instrument_code", "strategy_name", "trade"]]
+
+    return new_slippage_row.append(pd.Series(
+        [last_annual_vol] + output,
+        index=["last_annual_vol"] + [item_name + "_vol" for item_name in SLIPPAGE_ITEMS]))
+
+
+def old_df_from_rows(df, row_function, *args):
+    old_df = pd.concat([row_function(df.iloc[irow], *args) for irow in range(len(df))], axis=1).transpose()
+    old_df.index = df.index
+
+    return old_df
+
+
+def _time(minutes):
+    return datetime.datetime(2020, 11, 2, 14, 0) + datetime.timedelta(minutes=minutes)
+
+
+def _instrument_order(order_id, strategy_name, instrument_code, trade, generated_minutes, limit_price=None):
+    # generated_datetime is read back from reference_datetime, so set both
+    return instrumentOrder(
+        strategy_name, instrument_code, trade, order_id=order_id, limit_price=limit_price,
+        generated_datetime=_time(generated_minutes), reference_datetime=_time(generated_minutes))
+
+
+def _broker_order(order_id, key, trade, fill, filled_price, mid_price, side_price, limit_price=None,
+                  submit_minutes=0, fill_minutes=1, parent=1):
+    return brokerOrder(
+        key, trade, fill=fill, order_id=order_id, parent=parent, filled_price=filled_price,
+        mid_price=mid_price, side_price=side_price, limit_price=limit_price, submit_datetime=_time(submit_minutes),
+        fill_datetime=None if fill_minutes is None else _time(fill_minutes))
+
+
+def _synthetic_orders():
+    """
+    Instrument orders, contract orders and broker orders with all the awkward cases: sells, missing prices,
+    missing parents, fills before submission, more than one instrument and currency
+    """
+    instrument_orders = [
+        _instrument_order(1, "strategy", "GOLD", 2, -5, limit_price=1900.0),
+        _instrument_order(2, "strategy", "US10", -3, -2),
+        # generated after the broker order was submitted, so a negative delay
+        _instrument_order(3, "another", "V2X", 1, 10, limit_price=25.0),
+    ]
+    contract_orders = [
+        contractOrder("strategy", "GOLD", "20201200", 2, order_id=11, parent=1, reference_price=1901.5),
+        contractOrder("strategy", "US10", "20201200", -3, order_id=12, parent=2, reference_price=138.5),
+        contractOrder("another", "V2X", "20201200", 1, order_id=13, parent=3),
+        # its instrument order has gone
+        contractOrder("strategy", "GOLD", "20210200", 1, order_id=14, parent=4, reference_price=1910.0),
+    ]
+    broker_orders = [
+        _broker_order(21, "strategy/GOLD/20201200", 2, 2, 1902.1, 1901.9, 1902.0, limit_price=1902.5, parent=11),
+        _broker_order(22, "strategy/US10/20201200", -3, -3, 138.4375, 138.46875, 138.453125,
+                      submit_minutes=2, fill_minutes=3, parent=12),
+        # no mid price
+        _broker_order(23, "strategy/US10/20201200", -1, -1, 138.5, None, 138.453125,
+                      submit_minutes=3, fill_minutes=2, parent=12),
+        _broker_order(24, "another/V2X/20201200", 1, 1, 24.85, 24.8, 24.9, limit_price=25.0, parent=13),
+        _broker_order(25, "strategy/GOLD/20210200", 1, 1, 1911.0, 1910.5, 1911.0,
+                      fill_minutes=None, parent=14),
+        # no parent at all
+        _broker_order(26, "strategy/GOLD/20201200", -1, -1, 1899.0, 1899.5, 1899.2, parent=99),
+    ]
+
+    return instrument_orders, contract_orders, broker_orders
+
+
+def _orders_data(list_of_orders):
+    orders_data = genericOrdersData()
+    for order in list_of_orders:
+        orders_data.add_order_to_data(order)
+
+    return orders_data
+
+
+class Test(ut.TestCase):
+    def setUp(self):
+        self.data = dataBlob(log=logtoscreen("test"), mongo_db=object())
+
+        # the classes first, as they add their own
+        diagInstruments(self.data)
+        dataCurrency(self.data)
+        diagPrices(self.data)
+        self.data_orders = dataOrders(self.data)
+
+        self.data.db_futures_instrument = csvFuturesInstrumentData()
+        self.data.db_fx_prices = csvFxPricesData()
+        self.data.db_futures_adjusted_prices = csvFuturesAdjustedPricesData()
+
+        instrument_orders, contract_orders, broker_orders = _synthetic_orders()
+        self.data.db_strategy_historic_orders = _orders_data(instrument_orders)
+        self.data.db_contract_historic_orders = _orders_data(contract_orders)
+        self.data.db_broker_historic_orders = _orders_data(broker_orders)
+
+        self.list_of_order_ids = [order.order_id for order in broker_orders]
+
+    def broker_orders_df(self):
+        list_of_orders = self.data_orders.get_list_of_historic_broker_orders_with_execution_data(
+            self.list_of_order_ids)
+        orders_as_list = [transfer_object_attributes(tradesData, order) for order in list_of_orders]
+
+        return make_df_from_list_of_named_tuple(tradesData, orders_as_list)
+
+    def assert_same_as_old(self, new_df, old_df):
+        self.assertEqual(list(new_df.columns), list(old_df.columns))
+        self.assertEqual(list(new_df.index), list(old_df.index))
+
+        for column_name in old_df.columns:
+            old_values = old_df[column_name]
+            new_values = new_df[column_name]
+            try:
+                old_values = old_values.astype(float)
+            except (TypeError, ValueError):
+                # not a number; fill prices don't compare, so their string versions
+                self.assertEqual(list(new_values.astype(str)), list(old_values.astype(str)), column_name)
+                continue
+
+            np.testing.assert_allclose(new_values.astype(float).values, old_values.values,
+                                       rtol=1e-12, equal_nan=True, err_msg=column_name)
+
+    def test_bulk_read_same_as_order_by_order(self):
+        broker_orders = self.broker_orders_df()
+        orders_one_at_a_time = make_df_from_list_of_named_tuple(
+            tradesData, [get_tuple_object_from_order_id(self.data, order_id) for order_id in self.list_of_order_ids])
+
+        self.assertEqual(list(broker_orders.index), self.list_of_order_ids)
+        # fill prices don't compare, so their string versions
+        pd.testing.assert_frame_equal(broker_orders.astype(str), orders_one_at_a_time.astype(str))
+
+        # missing parents come through as missing values
+        self.assertTrue(pd.isnull(broker_orders.loc[25, "parent_generated_datetime"]))
+        self.assertTrue(pd.isnull(broker_orders.loc[26, "parent_reference_price"]))
+        self.assertTrue(pd.isnull(broker_orders.loc[26, "parent_limit_price"]))
+
+    def test_bulk_read_missing_order(self):
+        self.assertIs(self.data.db_broker_historic_orders.get_order_with_orderid(99), missing_order)
+        self.assertEqual(
+            list(self.data.db_broker_historic_orders.get_dict_of_orders_with_orderids([24, 99, 21]).keys()),
+            [24, 21])
+
+    def test_delays(self):
+        broker_orders = self.broker_orders_df()
+        delays = create_delay_df(broker_orders)
+        self.assert_same_as_old(delays, old_df_from_rows(broker_orders, old_delay_row))
+
+        # negative and missing delays
+        self.assertTrue(np.isnan(delays.loc[23, "filled_minus_submit"]))
+        self.assertTrue(np.isnan(delays.loc[24, "submit_minus_generated"]))
+        self.assertTrue(np.isnan(delays.loc[25, "filled_minus_submit"]))
+        self.assertEqual(delays.loc[21, "submit_minus_generated"], 300.0)
+
+    def test_slippage(self):
+        broker_orders = self.broker_orders_df()
+        raw_slippage = create_raw_slippage_df(broker_orders)
+        old_raw_slippage = old_df_from_rows(broker_orders, old_raw_slippage_row)
+        self.assert_same_as_old(raw_slippage, old_raw_slippage)
+
+        self.assert_same_as_old(
+            create_cash_slippage_df(raw_slippage, self.data),
+            old_df_from_rows(old_raw_slippage, old_cash_slippage_row, self.data))
+
+        self.assert_same_as_old(
+            create_vol_norm_slippage_df(raw_slippage, self.data),
+            old_df_from_rows(old_raw_slippage, old_vol_slippage_row, self.data))
+
+
+if __name__ == "__main__":
+    ut.main()
@@ -1,6 +1,7 @@
 from sysdata.configdata import Config
 from syslogdiag.log import logtoscreen
 from systems.system_cache import systemCache, base_system_cache
+from systems.profiler import systemProfiler
 
 NOT_PASSED = object()
 """
@@ -119,6 +120,9 @@ class System(object):
         """
 
         setattr(self, "cache", systemCache(self))
+        self._set_cache_memory_budget_from_config()
+        # off unless enable_profiling is called
+        setattr(self, "profiler", systemProfiler())
         self.name = "base_system"  # makes caching work and for general consistency
 
     def __repr__(self):
@@ -131,6 +135,17 @@ class System(object):
     def log(self):
         return self._log
 
+    def _set_cache_memory_budget_from_config(self):
+        max_mb = self.config.system_cache_max_mb
+        if max_mb == 0:
+            return
+
+        spill_directory = self.config.system_cache_spill_directory
+        if spill_directory == "":
+            spill_directory = None
+
+        self.cache.set_memory_budget(max_mb, spill_directory=spill_directory)
+
     def set_logging_level(self, new_log_level):
         """
 
@@ -147,6 +162,35 @@ class System(object):
             stage = getattr(self, stage_name)
             stage.log.set_logging_level(new_log_level)
 
+    def enable_profiling(self, clear: bool = True):
+        """
+        Record time, calls, cache hits and misses, and result sizes for every stage method from now on
+
+        :param clear: throw away anything profiled previously
+        """
+        if clear:
+            self.profiler.clear()
+        self.profiler.enable()
+
+    def disable_profiling(self):
+        self.profiler.disable()
+
+    def profile_report(self):
+        """
+        Profiling results, most expensive first; see systems.profiler
+
+        :returns: pd.DataFrame, one row per stage, method and instrument
+        """
+        return self.profiler.report()
+
+    def write_profile_flame_graph(self, filename):
+        """
+        Write profiling results as collapsed call stacks, for flamegraph.pl or speedscope
+
+        :param filename: full path
+        """
+        self.profiler.write_flame_graph(filename)
+
     @property
     def process_pool(self):
         # apply process pooling to get certain results in parallel
@@ -474,26 +474,73 @@ class _ForecastCombineCalculateWeights(_ForecastCombinePreCalculate):
 
         return matching_instruments
 
-    @diagnostic()
-    def calculation_of_raw_estimated_forecast_weights(self, instrument_code):
+    @dont_cache
+    def pool_signature(self, codes_to_use):
         """
-        Does an optimisation for a single instrument
+        Identifies a pool of instruments for estimation: the instruments, and the cheap rules they share
+
+        :param codes_to_use: list of str, eg from has_same_cheap_rules_as_code
+        :returns: str
+        """
+        rule_list = sorted(self.cheap_trading_rules(codes_to_use[0]))
+
+        return "%s/%s" % (",".join(sorted(codes_to_use)), ",".join(rule_list))
+
+    @dont_cache
+    def _forecast_weight_estimates_fully_pooled(self):
+        # if both gross returns and costs are pooled, the optimisation doesn't depend on which instrument
+        # in the pool we're estimating for
+        pool_gross_returns = self.parent.config.forecast_weight_estimate.get(
+            "pool_gross_returns", False
+        )
+        use_pooled_costs = self.parent.config.forecast_cost_estimates.get(
+            "use_pooled_costs", False
+        )
 
-        We do this if we can't do the special case of a fully pooled
-        optimisation (both costs and returns pooled)
+        return str2Bool(pool_gross_returns) and str2Bool(use_pooled_costs)
 
+    @diagnostic()
+    def calculation_of_raw_estimated_forecast_weights(self, instrument_code):
+        """
         Estimate the forecast weights for this instrument
 
+        In the special case of a fully pooled optimisation (both costs and returns pooled) every
+        instrument in the pool gets the same answer, so we do the optimisation once per pool and
+        share it. Otherwise we do an optimisation for each instrument.
+
         We store this intermediate step to expose the calculation object
 
         :param instrument_code:
         :type str:
 
-        :returns: TxK pd.DataFrame containing weights, columns are trading rule variation names, T covers all
+        :returns: optimiser object, .weights is a TxK pd.DataFrame
+        """
+        codes_to_use = self.has_same_cheap_rules_as_code(instrument_code)
+
+        if self._forecast_weight_estimates_fully_pooled():
+            identifier = codes_to_use[0]
+        else:
+            identifier = instrument_code
+
+        return self._calculation_of_raw_estimated_forecast_weights_for_pool(
+            identifier, self.pool_signature(codes_to_use)
+        )
+
+    @diagnostic()
+    def _calculation_of_raw_estimated_forecast_weights_for_pool(
+        self, identifier, pool_signature
+    ):
+        """
+        Does an optimisation for an instrument, pooling data as required
+
+        :param identifier: str, the instrument we're optimising for
+        :param pool_signature: str, from pool_signature; only used to key the cache
+
+        :returns: optimiser object
         """
         self.log.terse(
-            "Calculating raw forecast weights for %s" %
-            instrument_code)
+            "Calculating raw forecast weights for %s, pool %s" %
+            (identifier, pool_signature))
 
         # Get some useful stuff from the config
         weighting_params = copy(self.parent.config.forecast_weight_estimate)
@@ -504,7 +551,7 @@ class _ForecastCombineCalculateWeights(_ForecastCombinePreCalculate):
         weighting_func = resolve_function(weighting_params.pop("func"))
 
         # Because we might be pooling, we get a stack of p&l data
-        codes_to_use = self.has_same_cheap_rules_as_code(instrument_code)
+        codes_to_use = self.has_same_cheap_rules_as_code(identifier)
 
         # returns a dict of accountCurveGroups
         # Note that the config.forecast_cost_estimates parameters will affect
@@ -516,7 +563,7 @@ class _ForecastCombineCalculateWeights(_ForecastCombinePreCalculate):
 
         weight_func = weighting_func(
             pandl_forecasts,
-            identifier=instrument_code,
+            identifier=identifier,
             parent=self,
             **weighting_params)
 
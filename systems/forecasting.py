@@ -1,4 +1,5 @@
 import numpy as np
+import pandas as pd
 
 from copy import copy
 from concurrent.futures import ProcessPoolExecutor
@@ -16,6 +17,9 @@ from systems.system_cache import input, diagnostic, output, dont_cache
 
 DEFAULT_PRICE_SOURCE = "data.daily_prices"
 
+# Attribute set on trading rule functions which accept a date x instrument panel
+ACCEPTS_PANEL = "accepts_panel"
+
 
 class Rules(SystemStage):
     """
@@ -169,7 +173,19 @@ class Rules(SystemStage):
 
         trading_rule = self.trading_rules()[rule_variation_name]
 
-        result = trading_rule.call(system, instrument_code)
+        if trading_rule.accepts_panel and system.cache.are_we_caching():
+            result = self._get_raw_forecast_from_panel_and_cache_other_instruments(
+                instrument_code, rule_variation_name)
+        else:
+            result = trading_rule.call(system, instrument_code)
+
+        result = self._clean_raw_forecast(
+            result, instrument_code, rule_variation_name)
+
+        return result
+
+    @dont_cache
+    def _clean_raw_forecast(self, result, instrument_code, rule_variation_name):
         result.columns = [rule_variation_name]
 
         # Check for all zeros
@@ -184,6 +200,41 @@ class Rules(SystemStage):
 
         return result
 
+    @dont_cache
+    def _get_raw_forecast_from_panel_and_cache_other_instruments(
+        self, instrument_code, rule_variation_name
+    ):
+        """
+        Rules which accept a panel are called once for all instruments. We return the forecast for
+        instrument_code, and put the others in the cache so asking for them is a cache hit
+
+        :return: forecast for instrument_code
+        """
+        system = self.parent
+        trading_rule = self.trading_rules()[rule_variation_name]
+
+        instrument_list = system.get_instrument_list()
+        if instrument_code not in instrument_list:
+            instrument_list = instrument_list + [instrument_code]
+
+        self.log.msg(
+            "Calculating raw forecast %s for all instruments in one panel"
+            % rule_variation_name,
+            rule_variation_name=rule_variation_name,
+        )
+
+        forecasts = trading_rule.call_for_instruments(system, instrument_list)
+        for other_instrument_code, forecast in forecasts.items():
+            if other_instrument_code == instrument_code:
+                continue
+            forecast = self._clean_raw_forecast(
+                forecast, other_instrument_code, rule_variation_name)
+            cache_ref = system.cache.cache_ref(
+                self.get_raw_forecast, self, other_instrument_code, rule_variation_name)
+            system.cache.set_item_in_cache(forecast, cache_ref)
+
+        return forecasts[instrument_code]
+
     @dont_cache
     def _precalc_forecasts_for_rule_all_instruments_and_cache(
         self, rule_variation_name
@@ -249,6 +300,19 @@ class Rules(SystemStage):
             system.cache.set_item_in_cache(forecast_this_instrument, cache_ref)
 
 
+def panel_rule(rule_function):
+    """
+    Decorator for trading rule functions which work column by column, so can be passed a date x instrument
+    pd.DataFrame for each data item instead of a pd.Series, and return a pd.DataFrame of forecasts.
+
+    Rules will then call them once for all instruments (when the system is caching), rather than once for
+    each instrument.
+    """
+    setattr(rule_function, ACCEPTS_PANEL, True)
+
+    return rule_function
+
+
 def function_call_with_args(
         data_as_list,
         function=None,
@@ -442,6 +506,127 @@ class TradingRule(object):
 
         return self.function(*data, **other_args)
 
+    @property
+    def accepts_panel(self) -> bool:
+        return getattr(self.function, ACCEPTS_PANEL, False)
+
+    def call_for_instruments(self, system, instrument_list: list) -> dict:
+        """
+        Call a rule which accepts a panel once for all the instruments.
+
+        Each data item is lined up into a date x instrument panel. That only gives the same answer as calling
+        instrument by instrument if it doesn't put gaps into any of an instrument's data items (which would
+        change eg an ewm), so instruments whose data can't go in the panel are called one at a time.
+
+        :param system: A system
+        :param instrument_list: list of str
+        :return: dict, keys are instrument codes, values are forecasts
+        """
+        data_by_instrument = dict(
+            [
+                (instrument_code, self.get_data_from_system(system, instrument_code))
+                for instrument_code in instrument_list
+            ]
+        )
+
+        index_by_instrument = dict(
+            [
+                (instrument_code, _index_for_data_in_panel(data))
+                for instrument_code, data in data_by_instrument.items()
+            ]
+        )
+        index_by_instrument = dict(
+            [
+                (instrument_code, index)
+                for instrument_code, index in index_by_instrument.items()
+                if index is not None
+            ]
+        )
+        panel_index = _panel_index(list(index_by_instrument.values()))
+
+        panel_instruments = [
+            instrument_code
+            for instrument_code, index in index_by_instrument.items()
+            if _panel_adds_no_gaps(index, panel_index)
+        ]
+
+        forecasts = dict()
+        if len(panel_instruments) > 0:
+            number_of_data_items = len(data_by_instrument[panel_instruments[0]])
+            panel_data = [
+                pd.concat(
+                    dict(
+                        [
+                            (instrument_code, data_by_instrument[instrument_code][data_position])
+                            for instrument_code in panel_instruments
+                        ]
+                    ),
+                    axis=1,
+                ).reindex(panel_index)
+                for data_position in range(number_of_data_items)
+            ]
+
+            panel_forecasts = self.call_with_data(panel_data)
+
+            for instrument_code in panel_instruments:
+                forecasts[instrument_code] = panel_forecasts[instrument_code].reindex(
+                    index_by_instrument[instrument_code]
+                )
+
+        for instrument_code in instrument_list:
+            if instrument_code not in forecasts:
+                forecasts[instrument_code] = self.call_with_data(
+                    data_by_instrument[instrument_code]
+                )
+
+        return forecasts
+
+
+def _index_for_data_in_panel(data: list):
+    """
+    :return: index shared by all the data items, or None if they can't go in a panel
+
+    Data items with different indices (eg price dates that vol doesn't have) would have gaps put into
+    them by the panel, so they aren't allowed
+    """
+    if len(data) == 0:
+        return None
+
+    for data_item in data:
+        if not isinstance(data_item, pd.Series):
+            return None
+        if not isinstance(data_item.index, pd.DatetimeIndex):
+            return None
+        if not data_item.index.is_unique:
+            return None
+
+    index = data[0].index
+    if len(index) == 0:
+        return None
+
+    for data_item in data[1:]:
+        if not data_item.index.equals(index):
+            return None
+
+    return index
+
+
+def _panel_index(list_of_indices: list) -> pd.DatetimeIndex:
+    if len(list_of_indices) == 0:
+        return pd.DatetimeIndex([])
+
+    # np.unique sorts; much quicker than repeatedly doing index.union
+    return pd.DatetimeIndex(
+        np.unique(np.concatenate([index.values for index in list_of_indices]))
+    )
+
+
+def _panel_adds_no_gaps(index: pd.DatetimeIndex, panel_index: pd.DatetimeIndex) -> bool:
+    # True if every panel date between the first and last date of index is already in index
+    panel_slice = panel_index.slice_indexer(index[0], index[-1])
+
+    return (panel_slice.stop - panel_slice.start) == len(index)
+
 
 def separate_other_args(other_args, data):
     """
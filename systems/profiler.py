@@ -0,0 +1,193 @@
+"""
+Opt in profiling of a system
+
+Switch on with system.enable_profiling(), run the system as normal, then:
+
+    system.profile_report() # pd.DataFrame, one row per (stage, method, instrument)
+    system.write_profile_flame_graph("/tmp/profile.txt") # collapsed stack format
+
+Every call through the cache decorators (@output, @diagnostic, and the base system cache), and every
+@input / @dont_cache method, is recorded with its wall time, whether it came from the cache, and the
+in memory size of anything we had to calculate. Calls are nested, so we know both the total time of
+a method and its 'self' time, excluding the methods it called.
+
+The flame graph file is one line per call stack with the self time in microseconds, eg
+    portfolio.get_notional_position;positionSize.get_subsystem_position 1234
+which can be fed into flamegraph.pl or speedscope.
+
+When profiling is off the only overhead is checking a flag.
+"""
+
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+BYTES_IN_MB = 1024.0 * 1024.0
+MICROSECONDS_IN_SECOND = 1000000.0
+
+PROFILE_REPORT_COLUMNS = [
+    "stage",
+    "method",
+    "instrument_code",
+    "calls",
+    "cache_hits",
+    "cache_misses",
+    "total_seconds",
+    "self_seconds",
+    "result_mb",
+]
+
+
+class profileRecord(object):
+    def __init__(self):
+        self.calls = 0
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.total_seconds = 0.0
+        self.self_seconds = 0.0
+        self.result_mb = 0.0
+
+
+class profileFrame(object):
+    def __init__(self, profile_key: tuple):
+        self.profile_key = profile_key
+        self.start_time = time.perf_counter()
+        self.child_seconds = 0.0
+
+
+class systemProfiler(object):
+    def __init__(self):
+        self._active = False
+        self.clear()
+
+    def __repr__(self):
+        return "systemProfiler (%s) with %d records" % (
+            "active" if self.active else "inactive",
+            len(self._records),
+        )
+
+    @property
+    def active(self) -> bool:
+        return self._active
+
+    def enable(self):
+        self._active = True
+
+    def disable(self):
+        self._active = False
+
+    def clear(self):
+        self._records = {}
+        self._stack_seconds = {}
+        self._call_stack = []
+
+    def start_call(self, stage_name: str, method_name: str,
+                   instrument_code: str):
+        profile_key = (stage_name, method_name, instrument_code)
+        self._call_stack.append(profileFrame(profile_key))
+
+    def end_call(self, cache_hit: bool = False, cached: bool = True,
+                 value=None):
+        """
+        Pops the call started by the matching start_call
+
+        :param cache_hit: was the value already in the cache
+        :param cached: False for methods that don't go through the cache, so are neither hits nor misses
+        :param value: the calculated value; only measured if this wasn't a cache hit
+        """
+        frame = self._call_stack.pop()
+        elapsed_seconds = time.perf_counter() - frame.start_time
+        self_seconds = elapsed_seconds - frame.child_seconds
+
+        if len(self._call_stack) > 0:
+            self._call_stack[-1].child_seconds += elapsed_seconds
+
+        record = self._records.get(frame.profile_key, None)
+        if record is None:
+            record = self._records[frame.profile_key] = profileRecord()
+
+        record.calls += 1
+        record.total_seconds += elapsed_seconds
+        record.self_seconds += self_seconds
+        if cached:
+            if cache_hit:
+                record.cache_hits += 1
+            else:
+                record.cache_misses += 1
+                record.result_mb += size_of_result_mb(value)
+
+        stack_key = tuple(
+            [_frame_label(stack_frame.profile_key) for stack_frame in self._call_stack]
+            + [_frame_label(frame.profile_key)]
+        )
+        self._stack_seconds[stack_key] = (
+            self._stack_seconds.get(stack_key, 0.0) + self_seconds
+        )
+
+    def report(self) -> pd.DataFrame:
+        """
+        :return: pd.DataFrame, sorted by self time with the most expensive first
+        """
+        report_rows = [
+            (
+                stage_name,
+                method_name,
+                instrument_code,
+                record.calls,
+                record.cache_hits,
+                record.cache_misses,
+                record.total_seconds,
+                record.self_seconds,
+                record.result_mb,
+            )
+            for (stage_name, method_name, instrument_code), record in self._records.items()
+        ]
+        report_df = pd.DataFrame(report_rows, columns=PROFILE_REPORT_COLUMNS)
+        report_df = report_df.sort_values(
+            "self_seconds", ascending=False).reset_index(drop=True)
+
+        return report_df
+
+    def flame_graph_lines(self) -> list:
+        """
+        :return: list of str, 'frame;frame;frame microseconds'
+        """
+        return [
+            "%s %d"
+            % (";".join(stack_key), int(round(seconds * MICROSECONDS_IN_SECOND)))
+            for stack_key, seconds in self._stack_seconds.items()
+        ]
+
+    def write_flame_graph(self, filename: str):
+        with open(filename, "w") as output_file:
+            for line in self.flame_graph_lines():
+                output_file.write(line + "\n")
+
+
+def _frame_label(profile_key: tuple) -> str:
+    # instrument codes left out, otherwise a big system is too wide to read
+    stage_name, method_name, _not_used = profile_key
+    return "%s.%s" % (stage_name, method_name)
+
+
+def size_of_result_mb(value) -> float:
+    return _size_in_bytes(value) / BYTES_IN_MB
+
+
+def _size_in_bytes(value) -> float:
+    if isinstance(value, pd.DataFrame):
+        return value.memory_usage(index=True).sum()
+    elif isinstance(value, pd.Series):
+        return value.memory_usage(index=True)
+    elif isinstance(value, np.ndarray):
+        return value.nbytes
+    elif isinstance(value, (list, tuple)):
+        # eg lists of correlation estimates
+        return sys.getsizeof(value) + sum([_size_in_bytes(item) for item in value])
+    elif isinstance(value, dict):
+        return sys.getsizeof(value) + sum([_size_in_bytes(item) for item in value.values()])
+    else:
+        # shallow, so only a lower bound for other objects
+        return sys.getsizeof(value)
@@ -4,8 +4,10 @@ Trading rules for futures system
 from syscore.dateutils import ROOT_BDAYS_INYEAR
 import pandas as pd
 from syscore.algos import robust_vol_calc
+from systems.forecasting import panel_rule
 
 
+@panel_rule
 def ewmac(price, vol, Lfast, Lslow):
     """
     Calculate the ewmac trading fule forecast, given a price and EWMA speeds Lfast, Lslow and vol_lookback
@@ -15,10 +17,10 @@ def ewmac(price, vol, Lfast, Lslow):
     This version uses a precalculated price volatility, and does not do capping or scaling
 
     :param price: The price or other series to use (assumed Tx1)
-    :type price: pd.Series
+    :type price: pd.Series, or pd.DataFrame with a column per instrument
 
     :param vol: The daily price unit volatility (NOT % vol)
-    :type vol: pd.Series aligned to price
+    :type vol: pd.Series aligned to price, or pd.DataFrame with the same columns
 
     :param Lfast: Lookback for fast in days
     :type Lfast: int
@@ -108,6 +110,7 @@ def carry(daily_ann_roll, vol, smooth_days=90):
     raise Exception("DEPRECATED: USE carry2")
 
 
+@panel_rule
 def carry2(raw_carry, smooth_days=90):
     """
     Calculate carry forecast, given that there exists a raw_carry() in rawdata
@@ -115,7 +118,7 @@ def carry2(raw_carry, smooth_days=90):
     Assumes that everything is daily data
 
     :param raw_carry: The annualised sharpe ratio of rolldown
-    :type raw_carry: pd.DataFrame (assumed Tx1)
+    :type raw_carry: pd.Series, or pd.DataFrame with a column per instrument
 
     >>> from systems.tests.testdata import get_test_object_futures
     >>> from systems.basesystem import System
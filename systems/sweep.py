@@ -0,0 +1,372 @@
+"""
+Run one kind of system over lots of variations of its config, eg a grid of trading rule parameters
+
+    from systems.provided.futures_chapter15.basesystem import futures_system
+    results = run_parameter_sweep(
+        futures_system,
+        Config("systems.provided.futures_chapter15.futuresconfig.yaml"),
+        {"trading_rules.ewmac16_64.other_args.Lfast": [8, 16, 32],
+         "percentage_vol_target": [15.0, 20.0, 25.0]},
+        max_workers=4)
+
+returns a pd.DataFrame, one row per variation (every combination of the values in the grid), with a column for
+each parameter and for each statistic of the percentage account curve of the portfolio.
+
+Parameters are the names of config elements, with dots to go into nested dicts. Most variations only change a
+few outputs of a few stages: a new rule parameter doesn't change the raw data, and a new vol target doesn't
+change any forecasts. So we run the base config once, noting which cached items read each config element. An
+item is recalculated for a variation if it read one of the elements that variation changes (for
+trading_rules.<rule name>, only the items for that rule variation), or if it was calculated from one of those;
+every other item is copied from the base system. If an element is read outside a cached item, or by the base
+system (eg instrument_weights, which sets the instrument list), or wasn't read at all by the base config, then
+variations which change it are calculated from scratch. So are variations which add or replace trading rules.
+
+The data is read once, into a snapshotFuturesSimData, and with max_workers above 1 the variations run in worker
+processes. These are forked, so they share the data and the results of the base config without copying them.
+"""
+
+import copy
+import itertools
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+import pandas as pd
+
+from syscore.objects import arg_not_supplied
+from sysdata.configdata import Config
+from sysdata.sim.futures_sim_data import futuresSimData
+from sysdata.sim.snapshot_futures_sim_data import snapshotFuturesSimData
+from systems.system_cache import listOfCacheRefs
+
+SWEEP_STATISTICS = [
+    "ann_mean",
+    "ann_std",
+    "sharpe",
+    "sortino",
+    "avg_drawdown",
+    "worst_drawdown",
+    "time_in_drawdown",
+    "calmar",
+    "skew",
+    "hitrate",
+]
+
+# where we note config elements read outside any cached item
+OUTSIDE_CACHED_ITEMS = "outside_cached_items"
+BASE_SYSTEM_STAGE_NAME = "base_system"
+TRADING_RULES = "trading_rules"
+
+# set in each process running variations
+_sweep_state = None
+
+
+def run_parameter_sweep(
+    system_function,
+    base_config: Config,
+    parameter_grid: dict,
+    data=arg_not_supplied,
+    max_workers: int = 1,
+    list_of_statistics: list = SWEEP_STATISTICS,
+) -> pd.DataFrame:
+    """
+    :param system_function: called as system_function(data=data, config=config) to create a system, eg
+        futures_system; it must be importable from a module for max_workers above 1
+    :param base_config: config the variations are made from; isn't changed
+    :param parameter_grid: dict, parameter name eg "trading_rules.ewmac16_64.other_args.Lfast": list of values
+    :param data: defaults to whatever system_function uses
+    :param max_workers: number of worker processes; 1 runs every variation in this process
+    :param list_of_statistics: names of methods of the account curve
+
+    :return: pd.DataFrame, one row per variation. Columns are the parameters, the statistics, the number of
+        cached items reused from the base config, and the seconds taken. A variation which fails is logged, and
+        its statistics are nan.
+    """
+    list_of_variations = variations_from_parameter_grid(parameter_grid)
+
+    start_time = time.perf_counter()
+    sim_data = _snapshot_of_data_if_possible(system_function, base_config, data)
+    base_system, elements_read_by_cache_refs = run_base_config_recording_reads(
+        system_function, base_config, sim_data
+    )
+    log = base_system.log
+    log.msg("Base config took %.1f seconds; running %d variations with %d workers" % (
+        time.perf_counter() - start_time, len(list_of_variations), max_workers))
+
+    list_of_cache_refs_to_reuse = [
+        cache_refs_to_reuse_for_variation(base_system, elements_read_by_cache_refs, overrides)
+        for overrides in list_of_variations
+    ]
+    sweep_state = (system_function, base_config, sim_data,
+                   dict(base_system.cache), list_of_statistics)
+
+    results_by_index = {}
+    if max_workers > 1:
+        with ProcessPoolExecutor(max_workers=max_workers,
+                                 initializer=_initialise_sweep_worker,
+                                 initargs=(sweep_state,)) as executor:
+            list_of_futures = [
+                executor.submit(_run_variation, index, overrides, cache_refs_to_reuse)
+                for index, (overrides, cache_refs_to_reuse) in enumerate(
+                    zip(list_of_variations, list_of_cache_refs_to_reuse))
+            ]
+            for future in as_completed(list_of_futures):
+                index, statistics, error_msg = future.result()
+                results_by_index[index] = (statistics, error_msg)
+    else:
+        _initialise_sweep_worker(sweep_state)
+        try:
+            for index, (overrides, cache_refs_to_reuse) in enumerate(
+                    zip(list_of_variations, list_of_cache_refs_to_reuse)):
+                __, statistics, error_msg = _run_variation(index, overrides, cache_refs_to_reuse)
+                results_by_index[index] = (statistics, error_msg)
+        finally:
+            _initialise_sweep_worker(None)
+
+    list_of_rows = []
+    for index, overrides in enumerate(list_of_variations):
+        statistics, error_msg = results_by_index[index]
+        if len(error_msg) > 0:
+            log.warn("Variation %s failed: %s" % (str(overrides), error_msg))
+        row = dict(overrides)
+        row.update(statistics)
+        list_of_rows.append(row)
+
+    log.msg("Ran %d variations in %.1f seconds" % (
+        len(list_of_variations), time.perf_counter() - start_time))
+
+    columns = list(parameter_grid.keys()) + list(list_of_statistics) + ["items_reused", "seconds"]
+
+    return pd.DataFrame(list_of_rows, columns=columns)
+
+
+def variations_from_parameter_grid(parameter_grid: dict) -> list:
+    """
+    >>> variations_from_parameter_grid({"a": [1, 2], "b.c": [3]})
+    [{'a': 1, 'b.c': 3}, {'a': 2, 'b.c': 3}]
+    """
+    parameter_names = list(parameter_grid.keys())
+    list_of_variations = [
+        dict(zip(parameter_names, values))
+        for values in itertools.product(
+            *[parameter_grid[parameter_name] for parameter_name in parameter_names])
+    ]
+
+    return list_of_variations
+
+
+def config_with_overrides(base_config: Config, overrides: dict) -> Config:
+    """
+    A copy of base_config with some values replaced
+
+    >>> config = config_with_overrides(Config(dict(a=1, b=dict(c=2, d=3))), {"a": 4, "b.c": 5})
+    >>> (config.a, config.b)
+    (4, {'c': 5, 'd': 3})
+    """
+    config_dict = copy.deepcopy(base_config.as_dict())
+    for parameter_name, value in overrides.items():
+        path = parameter_name.split(".")
+        nested_dict = config_dict
+        for key in path[:-1]:
+            nested_dict = nested_dict.setdefault(key, dict())
+        nested_dict[path[-1]] = value
+
+    return Config(config_dict)
+
+
+class configRecordingReads(Config):
+    """
+    A config which, once start_recording is called, notes which cached item was being calculated whenever one
+    of its elements is read
+    """
+
+    def __init__(self, config_object=dict()):
+        super().__init__(config_object)
+        # object.__setattr__, so these aren't config elements
+        object.__setattr__(self, "_cache_to_record_with", None)
+        object.__setattr__(self, "_elements_read_by_cache_refs", {})
+
+    def start_recording(self, system_cache):
+        object.__setattr__(self, "_cache_to_record_with", system_cache)
+
+    def stop_recording(self):
+        object.__setattr__(self, "_cache_to_record_with", None)
+
+    def elements_read_by_cache_refs(self) -> dict:
+        """
+        :return: dict, element name: set of cache refs, which may include OUTSIDE_CACHED_ITEMS
+        """
+        return self._elements_read_by_cache_refs
+
+    def __getattribute__(self, element_name):
+        value = object.__getattribute__(self, element_name)
+        if not element_name.startswith("_"):
+            system_cache = object.__getattribute__(self, "_cache_to_record_with")
+            if system_cache is not None and element_name in object.__getattribute__(self, "_elements"):
+                object.__getattribute__(self, "_record_read")(system_cache, element_name)
+
+        return value
+
+    def _record_read(self, system_cache, element_name):
+        cache_ref = system_cache.cache_ref_being_calculated()
+        if cache_ref is None:
+            cache_ref = OUTSIDE_CACHED_ITEMS
+        self._elements_read_by_cache_refs.setdefault(element_name, set()).add(cache_ref)
+
+
+def run_base_config_recording_reads(system_function, base_config: Config, data) -> tuple:
+    """
+    :return: tuple: base system, with everything the portfolio account curve needs in its cache; dict, element
+        name: set of cache refs which read it
+    """
+    config = configRecordingReads(copy.deepcopy(base_config.as_dict()))
+    base_system = _create_system(system_function, data, config)
+
+    # don't record reads while the system is being created, eg when the config is filled with defaults
+    config.start_recording(base_system.cache)
+    try:
+        base_system.accounts.portfolio().percent()
+    finally:
+        config.stop_recording()
+
+    return base_system, config.elements_read_by_cache_refs()
+
+
+def cache_refs_to_reuse_for_variation(base_system, elements_read_by_cache_refs: dict, overrides: dict) -> list:
+    """
+    :return: list of cache refs in the base system cache that a variation with these overrides can copy
+    """
+    base_cache = base_system.cache
+    all_cache_refs = [
+        cache_ref for cache_ref, cache_element in base_cache.items()
+        if not cache_element.evicted()
+    ]
+    cache_refs_to_recalculate = set()
+    for parameter_name in overrides.keys():
+        path = parameter_name.split(".")
+        element_name = path[0]
+        cache_refs_reading_element = elements_read_by_cache_refs.get(element_name, set())
+        if _recalculate_everything_if_changed(cache_refs_reading_element):
+            return []
+
+        cache_refs_to_recalculate.update(cache_refs_reading_element)
+        if element_name == TRADING_RULES:
+            if not _changes_an_existing_trading_rule(base_system, path):
+                return []
+            cache_refs_to_recalculate.update(
+                _cache_refs_for_trading_rule(all_cache_refs, rule_variation_name=path[1]))
+
+    cache_refs_to_recalculate = listOfCacheRefs(cache_refs_to_recalculate)
+    cache_refs_to_recalculate = cache_refs_to_recalculate + base_cache.get_cache_refs_depending_on(
+        cache_refs_to_recalculate, include_protected=True)
+    cache_refs_to_recalculate = set(cache_refs_to_recalculate)
+
+    return [
+        cache_ref for cache_ref in all_cache_refs
+        if cache_ref not in cache_refs_to_recalculate
+    ]
+
+
+def _recalculate_everything_if_changed(cache_refs_reading_element: set) -> bool:
+    if len(cache_refs_reading_element) == 0:
+        # we can't tell what it affects
+        return True
+
+    if OUTSIDE_CACHED_ITEMS in cache_refs_reading_element:
+        return True
+
+    # base system items, like the instrument list, are used everywhere but aren't recorded as dependencies
+    read_by_base_system = [
+        cache_ref for cache_ref in cache_refs_reading_element
+        if cache_ref.stage_name == BASE_SYSTEM_STAGE_NAME
+    ]
+
+    return len(read_by_base_system) > 0
+
+
+def _changes_an_existing_trading_rule(base_system, path: list) -> bool:
+    # a new rule, or a new set of rules, changes the list of rules used everywhere
+    if len(path) == 1:
+        return False
+
+    return path[1] in base_system.rules.trading_rules().keys()
+
+
+def _cache_refs_for_trading_rule(all_cache_refs: list, rule_variation_name: str) -> list:
+    """
+    The parsed trading rules are kept by the rules stage, so only the first item to use them reads the config.
+    Instead, if trading_rules.<rule name> changes, we recalculate every item for that rule variation; everything
+    which uses all the rules is calculated from those.
+    """
+    return [
+        cache_ref for cache_ref in all_cache_refs
+        if cache_ref.keyname == rule_variation_name
+    ]
+
+
+def _snapshot_of_data_if_possible(system_function, base_config: Config, data):
+    if data is arg_not_supplied:
+        # the system function knows where its data comes from
+        data = _create_system(system_function, None, Config(copy.deepcopy(base_config.as_dict()))).data
+
+    if isinstance(data, snapshotFuturesSimData) or not isinstance(data, futuresSimData):
+        return data
+
+    # variations must trade the instruments in the base config
+    probe_system = _create_system(
+        system_function, data, Config(copy.deepcopy(base_config.as_dict())))
+
+    return snapshotFuturesSimData.from_sim_data(
+        data,
+        base_currency=probe_system.config.base_currency,
+        list_of_instrument_codes=probe_system.get_instrument_list(),
+    )
+
+
+def _create_system(system_function, data, config):
+    if data is None:
+        return system_function(config=config)
+
+    return system_function(data=data, config=config)
+
+
+def _initialise_sweep_worker(sweep_state):
+    global _sweep_state
+    _sweep_state = sweep_state
+
+
+def _run_variation(index: int, overrides: dict, cache_refs_to_reuse: list) -> tuple:
+    """
+    Runs inside a worker process, so never raises: errors are returned
+
+    :return: tuple: index, dict of statistic name: value, error message
+    """
+    system_function, base_config, sim_data, base_cache_elements, list_of_statistics = _sweep_state
+    start_time = time.perf_counter()
+    try:
+        system = _create_system(system_function, sim_data, config_with_overrides(base_config, overrides))
+        system.set_logging_level("off")
+        for cache_ref in cache_refs_to_reuse:
+            system.cache[cache_ref] = base_cache_elements[cache_ref]
+
+        account_curve = system.accounts.portfolio().percent()
+        statistics = dict([
+            (statistic_name, getattr(account_curve, statistic_name)())
+            for statistic_name in list_of_statistics
+        ])
+        error_msg = ""
+    except Exception:
+        statistics = dict([(statistic_name, np.nan) for statistic_name in list_of_statistics])
+        error_msg = traceback.format_exc()
+
+    statistics["items_reused"] = len(cache_refs_to_reuse)
+    statistics["seconds"] = time.perf_counter() - start_time
+
+    return index, statistics, error_msg
+
+
+if __name__ == "__main__":
+    import doctest
+
+    doctest.testmod()
@@ -8,10 +8,24 @@ There are 3 kinds of things in a cache with different levels of persistence:
   - things that have an 'all' key -
   - _protected - that wouldn't normally be deleted
 
+As items are calculated we record which other cached items they used, so when we delete the items for an
+instrument we also delete everything downstream which was derived from them (see delete_items_for_instrument)
+
+Optionally the cache can have a memory budget (see set_memory_budget), in which case the least recently used
+unprotected items are evicted when it's exceeded: either to be recalculated if needed again, or spilled to
+compressed files on disk and reloaded.
+
 """
 
 from syscore.fileutils import get_filename_for_package
+from systems.profiler import size_of_result_mb
+from collections import OrderedDict
+import gzip
+import os
 import pickle
+import shutil
+import tempfile
+import weakref
 from functools import wraps
 
 """
@@ -124,10 +138,13 @@ class cacheElement(object):
     Each cache element consists of a value, and some bool values telling us what we can do with it
     """
 
-    def __init__(self, value, protected=False, not_pickable=False):
+    def __init__(self, value, protected=False, not_pickable=False, depends_on=None):
         self._value = value
         self._protected = protected
         self._not_pickable = not_pickable
+        if depends_on is None:
+            depends_on = []
+        self._depends_on = listOfCacheRefs(depends_on)
 
     def __repr__(self):
         return str(self._value)
@@ -144,6 +161,93 @@ class cacheElement(object):
     def can_be_pickled(self):
         return not self._not_pickable
 
+    def depends_on(self):
+        """
+        Cached items that were used to calculate this one
+
+        :returns: listOfCacheRefs
+        """
+        # elements pickled before we recorded dependencies won't have any
+        return getattr(self, "_depends_on", listOfCacheRefs())
+
+    def evicted(self):
+        return False
+
+
+class evictedCacheElement(cacheElement):
+    """
+    Stands in for an element evicted to stay within the cache memory budget, keeping its flags and
+    dependencies. If the value was spilled to disk it is in spill_filename, otherwise it has to be
+    recalculated.
+    """
+
+    def __init__(self, cache_element, spill_filename=None):
+        super().__init__(
+            MISSING_FROM_CACHE,
+            protected=cache_element.protected(),
+            not_pickable=cache_element.not_pickable(),
+            depends_on=cache_element.depends_on(),
+        )
+        self._spill_filename = spill_filename
+
+    def __repr__(self):
+        if self.spilled():
+            return "spilled to %s" % self._spill_filename
+        return "evicted"
+
+    # pickling the cache saves spilled values, but not evicted items
+    def __reduce__(self):
+        return (
+            cacheElement,
+            (self.value(), self.protected(), self.not_pickable(), self.depends_on()),
+        )
+
+    def evicted(self):
+        return True
+
+    def spilled(self):
+        return self._spill_filename is not None
+
+    @property
+    def spill_filename(self):
+        return self._spill_filename
+
+    def can_be_pickled(self):
+        return self.spilled() and super().can_be_pickled()
+
+    def value(self):
+        if not self.spilled():
+            return MISSING_FROM_CACHE
+
+        with gzip.open(self._spill_filename, "rb") as fhandle:
+            return pickle.load(fhandle)
+
+    def delete_spill_file(self):
+        if self.spilled() and os.path.exists(self._spill_filename):
+            os.remove(self._spill_filename)
+
+
+class sizesInMemory(OrderedDict):
+    """
+    Sizes in MB of the cache items held in memory, least recently used first, with a running total
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.total_mb = 0.0
+
+    def set_size(self, cache_ref, size_mb):
+        self.remove(cache_ref)
+        self[cache_ref] = size_mb
+        self.total_mb += size_mb
+
+    def remove(self, cache_ref):
+        self.total_mb -= self.pop(cache_ref, 0.0)
+
+    def clear(self):
+        super().clear()
+        self.total_mb = 0.0
+
 
 class systemCache(dict):
     def __init__(self, parent_system):
@@ -152,6 +256,157 @@ class systemCache(dict):
         self.parent = parent_system  # so we can access the instrument list
         self.set_caching_on()
 
+        # stack of (cache_ref, set of cache refs it has used) for items being calculated right now
+        self._items_being_calculated = []
+
+        # no memory budget unless set_memory_budget is called
+        self._max_mb = None
+        self._spill_directory = None
+        self._sizes_mb = sizesInMemory()
+        self._memory_statistics = _empty_memory_statistics()
+
+    def __setitem__(self, cache_ref, cache_element):
+        self._delete_spill_file_for(cache_ref)
+        super().__setitem__(cache_ref, cache_element)
+        if self.has_memory_budget():
+            self._track_size_of_item(cache_ref, cache_element)
+            self._evict_items_over_budget(keep_cache_ref=cache_ref)
+
+    def __delitem__(self, cache_ref):
+        self._delete_spill_file_for(cache_ref)
+        super().__delitem__(cache_ref)
+        if self.has_memory_budget():
+            self._sizes_mb.remove(cache_ref)
+
+    def clear(self):
+        for cache_ref in list(self.keys()):
+            self._delete_spill_file_for(cache_ref)
+        super().clear()
+        if self.has_memory_budget():
+            self._sizes_mb.clear()
+
+    def has_memory_budget(self):
+        # when a cache is unpickled the items are set before the attributes
+        return getattr(self, "_max_mb", None) is not None
+
+    def set_memory_budget(self, max_mb, spill_directory=None):
+        """
+        Keep the in memory size of the cache below max_mb, by evicting the least recently used unprotected
+        items. The size of pandas and numpy values (and lists or dicts of them) is accurate, but other
+        objects only count their shallow size.
+
+        Evicted items are recalculated if they are needed again; unless spill_directory is given, in which
+        case picklable items are saved there (compressed) when evicted and reloaded when needed.
+
+        :param max_mb: float, or None for no budget
+        :param spill_directory: str, full path
+        """
+        self._max_mb = max_mb
+        self._spill_directory = None
+        if spill_directory is not None:
+            # each cache has its own directory, tidied up when it goes
+            self._spill_directory = tempfile.mkdtemp(
+                prefix="system_cache_", dir=spill_directory)
+            weakref.finalize(self, shutil.rmtree,
+                             self._spill_directory, ignore_errors=True)
+
+        self._sizes_mb.clear()
+        if self.has_memory_budget():
+            for cache_ref, cache_element in self.items():
+                self._track_size_of_item(cache_ref, cache_element)
+            self._evict_items_over_budget()
+
+    def memory_statistics(self):
+        """
+        :returns: dict: current and peak in memory size, and counts of evictions, spills, spilled items
+            reloaded and evicted items recalculated
+        """
+        memory_statistics = dict(self._memory_statistics)
+        memory_statistics["max_mb"] = self._max_mb
+        memory_statistics["current_mb"] = self._sizes_mb.total_mb
+        memory_statistics["spilled_items"] = len(
+            [
+                cache_element
+                for cache_element in self.values()
+                if cache_element.evicted() and cache_element.spilled()
+            ]
+        )
+
+        return memory_statistics
+
+    def _track_size_of_item(self, cache_ref, cache_element):
+        if cache_element.evicted():
+            self._sizes_mb.remove(cache_ref)
+            return
+
+        self._sizes_mb.set_size(cache_ref, size_of_result_mb(cache_element.value()))
+        self._memory_statistics["peak_mb"] = max(
+            self._memory_statistics["peak_mb"], self._sizes_mb.total_mb
+        )
+
+    def _evict_items_over_budget(self, keep_cache_ref=None):
+        if self._sizes_mb.total_mb <= self._max_mb:
+            return
+
+        # least recently used first
+        for cache_ref in list(self._sizes_mb.keys()):
+            if self._sizes_mb.total_mb <= self._max_mb:
+                break
+            if cache_ref == keep_cache_ref or self[cache_ref].protected():
+                continue
+            self._evict_item(cache_ref)
+
+    def _evict_item(self, cache_ref):
+        cache_element = self[cache_ref]
+        spill_filename = None
+        if self._spill_directory is not None and cache_element.can_be_pickled():
+            spill_filename = self._spill_value(cache_element.value())
+
+        # don't go through __setitem__, which would start tracking and evicting again
+        super().__setitem__(
+            cache_ref, evictedCacheElement(cache_element, spill_filename=spill_filename)
+        )
+        self._sizes_mb.remove(cache_ref)
+        self._memory_statistics["evictions"] += 1
+
+    def _spill_value(self, value):
+        self._memory_statistics["spills"] += 1
+        spill_filename = os.path.join(
+            self._spill_directory, "%d.pck.gz" % self._memory_statistics["spills"]
+        )
+        # favour speed over size
+        with gzip.open(spill_filename, "wb", compresslevel=1) as fhandle:
+            pickle.dump(value, fhandle, protocol=pickle.HIGHEST_PROTOCOL)
+
+        return spill_filename
+
+    def _delete_spill_file_for(self, cache_ref):
+        # only the cache that spilled an item deletes the file, not eg a partial_cache copy
+        if getattr(self, "_spill_directory", None) is None:
+            return
+        cache_element = self.get(cache_ref, MISSING_FROM_CACHE)
+        if cache_element is MISSING_FROM_CACHE:
+            return
+        if cache_element.evicted():
+            cache_element.delete_spill_file()
+
+    def _value_of_evicted_item(self, cache_ref, cache_element):
+        if not cache_element.spilled():
+            # it will be recalculated, and put back
+            self._memory_statistics["recalculated_after_eviction"] += 1
+            return MISSING_FROM_CACHE
+
+        value = cache_element.value()
+        self._memory_statistics["reloaded_from_spill"] += 1
+        self[cache_ref] = cacheElement(
+            value,
+            protected=cache_element.protected(),
+            not_pickable=cache_element.not_pickable(),
+            depends_on=cache_element.depends_on(),
+        )
+
+        return value
+
     def set_caching_on(self):
         self._caching_on = True
 
@@ -379,7 +634,8 @@ class systemCache(dict):
             instrument_code,
             delete_protected=False):
         """
-        Delete everything in the system relating to a particular instrument_code
+        Delete everything in the system relating to a particular instrument_code, and everything else
+        that was calculated from those items
 
         :param instrument_code: Instrument to delete
         :type instrument_code: str
@@ -394,8 +650,13 @@ class systemCache(dict):
         This means when we ask for self.optimal_positions(instrument_code) it
           has to recalc all intermediate steps as the cached
 
+        Cross sectional items (with the ALL_KEYNAME key) and items for other instruments are only
+        deleted if they were derived from this instrument's items, so recalculating only refreshes what
+        depends on the new price
+
         However we ignore anything in self._protected This is normally cross
-        sectional data which we only want to calculate periodically
+        sectional data which we only want to calculate periodically. Protected items are kept, and so are
+        the items derived from them (unless they also depend on this instrument some other way)
 
         if delete_protected is True then we delete that stuff as well
         (this is roughly equivalent to creating the systems object from scratch)
@@ -403,7 +664,7 @@ class systemCache(dict):
         """
 
         cache_ref_list = self.get_cache_refs_for_instrument(instrument_code)
-        self.delete_elements_in_cache_ref_list(
+        self.delete_items_and_dependents(
             cache_ref_list, delete_protected=delete_protected
         )
 
@@ -421,6 +682,69 @@ class systemCache(dict):
         self.delete_items_for_instrument(
             ALL_KEYNAME, delete_protected=delete_protected)
 
+    def delete_items_and_dependents(self, cache_ref_list, delete_protected=False):
+        """
+        Delete some items, and everything that was calculated from them
+
+        :param cache_ref_list: A list of cache refs
+        :param deleted_protected: Delete everything, even stuff in self.protected?
+        :type delete_protected: bool
+
+        :returns: nothing
+        """
+        if not delete_protected:
+            cache_ref_list = self.cache_ref_list_with_protected_removed(
+                cache_ref_list)
+
+        dependents = self.get_cache_refs_depending_on(
+            cache_ref_list, include_protected=delete_protected
+        )
+
+        self._delete_elements_in_cache_ref_list_dangerous(
+            list(cache_ref_list) + dependents)
+
+    def get_cache_refs_depending_on(self, cache_ref_list, include_protected=False):
+        """
+        Returns the items in the cache that were calculated, directly or indirectly, from any of these
+
+        :param cache_ref_list: A list of cache refs
+        :param include_protected: If False, protected items aren't included and we don't look
+            further downstream of them
+
+        :returns: list of cache refs, not including those in cache_ref_list
+        """
+        dependents_by_cache_ref = self._get_dependents_by_cache_ref()
+
+        cache_refs_to_check = list(cache_ref_list)
+        found_cache_refs = set(cache_ref_list)
+        dependents = []
+        while len(cache_refs_to_check) > 0:
+            cache_ref = cache_refs_to_check.pop()
+            for dependent_cache_ref in dependents_by_cache_ref.get(cache_ref, []):
+                if dependent_cache_ref in found_cache_refs:
+                    continue
+                found_cache_refs.add(dependent_cache_ref)
+                if not include_protected and self[dependent_cache_ref].protected():
+                    continue
+                dependents.append(dependent_cache_ref)
+                cache_refs_to_check.append(dependent_cache_ref)
+
+        return listOfCacheRefs(dependents)
+
+    def _get_dependents_by_cache_ref(self):
+        """
+        Invert the recorded dependencies
+
+        :returns: dict, keys are cache refs, values are lists of cache refs calculated using them
+        """
+        dependents_by_cache_ref = {}
+        for cache_ref, cache_element in self.items():
+            for depends_on_cache_ref in cache_element.depends_on():
+                dependents_by_cache_ref.setdefault(
+                    depends_on_cache_ref, []).append(cache_ref)
+
+        return dependents_by_cache_ref
+
     def delete_all_items(self, delete_protected=False):
         """
         Delete everything in the cache
@@ -487,7 +811,8 @@ class systemCache(dict):
             value,
             cache_ref,
             protected=False,
-            not_pickable=False):
+            not_pickable=False,
+            depends_on=None):
         """
         Set an item in a cache to a specific value.
 
@@ -496,6 +821,7 @@ class systemCache(dict):
 
         :param protected: is the item protected from deletion?
         :param nopickle: is the item not capable of pickling?
+        :param depends_on: cached items used to calculate the value
 
         :param cache_ref: The item to set
         :type cache_ref: cacheRef
@@ -505,7 +831,7 @@ class systemCache(dict):
         """
 
         self[cache_ref] = cacheElement(
-            value, protected=protected, not_pickable=not_pickable
+            value, protected=protected, not_pickable=not_pickable, depends_on=depends_on
         )
 
     def _get_item_from_cache(self, cache_ref):
@@ -523,6 +849,13 @@ class systemCache(dict):
         if cache_element is MISSING_FROM_CACHE:
             return MISSING_FROM_CACHE
 
+        if cache_element.evicted():
+            return self._value_of_evicted_item(cache_ref, cache_element)
+
+        if self.has_memory_budget():
+            # most recently used
+            self._sizes_mb.move_to_end(cache_ref)
+
         return cache_element.value()
 
     def get_instrument_list(self):
@@ -561,6 +894,17 @@ class systemCache(dict):
 
 
         """
+        if self.parent.profiler.active:
+            return self._profiled_calc_or_cache(
+                func,
+                this_stage,
+                *args,
+                protected=protected,
+                not_pickable=not_pickable,
+                instrument_classify=instrument_classify,
+                **kwargs
+            )
+
         if not self.are_we_caching():
             # not caching, just return the value
             value = func(this_stage, *args, **kwargs)
@@ -575,17 +919,111 @@ class systemCache(dict):
             instrument_classify=instrument_classify,
             **kwargs)
 
+        # Base system items (ie the instrument list) are looked up whenever we make a cache ref, and only
+        # change with the config, so we don't record them as being used
+        if instrument_classify:
+            self._record_use_by_item_being_calculated(cache_ref)
+
         value = self._get_item_from_cache(cache_ref)
 
         if value is MISSING_FROM_CACHE:
             # call the function. Note in the original function 'this_stage' was
             # 'self'
-            value = func(this_stage, *args, **kwargs)
+            value, depends_on = self._calc_recording_dependencies(
+                func, this_stage, cache_ref, *args, **kwargs
+            )
             self.set_item_in_cache(
                 value,
                 cache_ref,
                 protected=protected,
-                not_pickable=not_pickable)
+                not_pickable=not_pickable,
+                depends_on=depends_on)
+
+        return value
+
+    def cache_ref_being_calculated(self):
+        """
+        The innermost item being calculated right now, or None if we aren't inside a cached calculation
+        """
+        if len(self._items_being_calculated) == 0:
+            return None
+        cache_ref, __ = self._items_being_calculated[-1]
+
+        return cache_ref
+
+    def _record_use_by_item_being_calculated(self, cache_ref):
+        if len(self._items_being_calculated) == 0:
+            return
+        __, used_cache_refs = self._items_being_calculated[-1]
+        used_cache_refs.add(cache_ref)
+
+    def _calc_recording_dependencies(self, func, this_stage, cache_ref, *args, **kwargs):
+        """
+        Call func, noting any cached items it uses along the way
+
+        :returns: tuple: value, list of cache refs used
+        """
+        used_cache_refs = set()
+        self._items_being_calculated.append((cache_ref, used_cache_refs))
+        try:
+            value = func(this_stage, *args, **kwargs)
+        finally:
+            self._items_being_calculated.pop()
+
+        return value, list(used_cache_refs)
+
+    def _profiled_calc_or_cache(
+        self,
+        func,
+        this_stage,
+        *args,
+        protected=False,
+        not_pickable=False,
+        instrument_classify=True,
+        **kwargs
+    ):
+        """
+        As calc_or_cache, but records the call with the system profiler
+        """
+        profiler = self.parent.profiler
+
+        # we need the cache ref to label the call, even if we're not caching
+        cache_ref = self.cache_ref(
+            func,
+            this_stage,
+            *args,
+            instrument_classify=instrument_classify,
+            **kwargs)
+
+        if self.are_we_caching():
+            if instrument_classify:
+                self._record_use_by_item_being_calculated(cache_ref)
+            value = self._get_item_from_cache(cache_ref)
+        else:
+            value = MISSING_FROM_CACHE
+        cache_hit = value is not MISSING_FROM_CACHE
+
+        profiler.start_call(
+            cache_ref.stage_name, cache_ref.itemname, cache_ref.instrument_code
+        )
+        try:
+            if not cache_hit:
+                if self.are_we_caching():
+                    value, depends_on = self._calc_recording_dependencies(
+                        func, this_stage, cache_ref, *args, **kwargs
+                    )
+                    self.set_item_in_cache(
+                        value,
+                        cache_ref,
+                        protected=protected,
+                        not_pickable=not_pickable,
+                        depends_on=depends_on)
+                else:
+                    value = func(this_stage, *args, **kwargs)
+        finally:
+            profiler.end_call(
+                cache_hit=cache_hit,
+                value=None if value is MISSING_FROM_CACHE else value)
 
         return value
 
@@ -635,6 +1073,16 @@ class systemCache(dict):
         return cache_ref
 
 
+def _empty_memory_statistics():
+    return dict(
+        peak_mb=0.0,
+        evictions=0,
+        spills=0,
+        reloaded_from_spill=0,
+        recalculated_after_eviction=0,
+    )
+
+
 def resolve_args_to_code_and_key(args, list_of_codes):
     """
     Resolves a list of placed args for a function
@@ -704,6 +1152,29 @@ def null_decorator(func):
     return wrapper
 
 
+# doesn't cache, but shows up in the system profile if that is switched on
+def stage_profile_decorator(func):
+    # not the docstring, as doctests in input methods were never written to be run
+    @wraps(func, assigned=("__module__", "__name__", "__qualname__"))
+    # note 'self' as always called from inside stage class
+    def wrapper(self, *args, **kwargs):
+        system = self.parent
+        profiler = system.profiler
+        if not profiler.active:
+            return func(self, *args, **kwargs)
+
+        (instrument_code, _not_used) = resolve_args_to_code_and_key(
+            args, system.get_instrument_list()
+        )
+        profiler.start_call(self.name, func.__name__, instrument_code)
+        try:
+            return func(self, *args, **kwargs)
+        finally:
+            profiler.end_call(cached=False)
+
+    return wrapper
+
+
 # generic decorator for caching
 def stage_access_cache_decorator(protected=False, not_pickable=False):
     """
@@ -775,7 +1246,7 @@ def base_system_cache(protected=False, not_pickable=False):
 
 
 # actual decoraters used, snappier names for 'stage wiring'
-input = null_decorator
-dont_cache = null_decorator
+input = stage_profile_decorator
+dont_cache = stage_profile_decorator
 diagnostic = stage_access_cache_decorator
 output = stage_access_cache_decorator
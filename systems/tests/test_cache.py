@@ -1,5 +1,8 @@
+import tempfile
 import unittest
 
+import numpy as np
+
 from systems.stage import SystemStage
 from systems.basesystem import System
 from systems.system_cache import input, diagnostic, output, ALL_KEYNAME
@@ -60,11 +63,55 @@ class testStage2(SystemStage):
         return 15
 
 
+class testStage3(SystemStage):
+    def _name(self):
+        return "test_stage3"
+
+    @diagnostic()
+    def derived_from_single_instrument(self, instrument_code):
+        return self.parent.test_stage1.single_instrument_no_keywords(instrument_code) + 1
+
+    @output()
+    def derived_across_markets(self):
+        return sum(
+            [
+                self.derived_from_single_instrument(instrument_code)
+                for instrument_code in self.parent.get_instrument_list()
+            ]
+        )
+
+    @output(protected=True)
+    def derived_protected(self):
+        return self.parent.test_stage1.single_instrument_no_keywords("code")
+
+    @diagnostic()
+    def derived_from_protected(self):
+        return self.derived_protected() + 1
+
+
+class testStage4(SystemStage):
+    def _name(self):
+        return "test_stage4"
+
+    # each of these is 1MB
+    @diagnostic()
+    def big_item(self, instrument_code):
+        return np.ones(131072)
+
+    @diagnostic(not_pickable=True)
+    def big_item_not_pickable(self, instrument_code):
+        return np.ones(131072)
+
+    @output(protected=True)
+    def big_item_protected(self, instrument_code):
+        return np.ones(131072)
+
+
 class TestCache(unittest.TestCase):
     def setUp(self):
 
         system = System(
-            [testStage1(), testStage2()],
+            [testStage1(), testStage2(), testStage3(), testStage4()],
             simData(),
             Config(dict(instruments=["code", "another_code"])),
         )
@@ -254,6 +301,88 @@ class TestCache(unittest.TestCase):
         cache_refs = self.system.cache.get_cacherefs_for_stage("test_stage1")
         self.assertEqual(len(cache_refs), 0)  # all gone
 
+    def test_deletion_of_dependents_for_code(self):
+        self.system.test_stage3.derived_across_markets()
+        self.system.test_stage3.derived_from_protected()
+        self.system.test_stage2.single2_instrument_no_keywords("code")
+
+        cache_refs = self.system.cache.get_cacherefs_for_stage("test_stage3")
+        self.assertEqual(len(cache_refs), 5)
+
+        self.system.cache.delete_items_for_instrument("code")
+
+        # derived from 'code', including across markets, has gone; but not from 'another_code'
+        # and not the protected item or anything derived only from it
+        cache_refs = self.system.cache.get_cacherefs_for_stage("test_stage3")
+        self.assertEqual(
+            sorted([(cache_ref.itemname, cache_ref.instrument_code) for cache_ref in cache_refs]),
+            [
+                ("derived_from_protected", ALL_KEYNAME),
+                ("derived_from_single_instrument", "another_code"),
+                ("derived_protected", ALL_KEYNAME),
+            ],
+        )
+        cache_refs = self.system.cache.get_cache_refs_for_instrument("code")
+        self.assertEqual(len(cache_refs), 0)
+
+        # recalculating only refreshes what was deleted
+        self.assertEqual(self.system.test_stage3.derived_across_markets(), 12)
+        cache_refs = self.system.cache.get_cacherefs_for_stage("test_stage3")
+        self.assertEqual(len(cache_refs), 5)
+
+        self.system.cache.delete_items_for_instrument("code", delete_protected=True)
+        cache_refs = self.system.cache.get_cacherefs_for_stage("test_stage3")
+        self.assertEqual(len(cache_refs), 1)
+
+    def test_memory_budget_evicts_least_recently_used(self):
+        cache = self.system.cache
+        cache.set_memory_budget(2.5)
+        stage = self.system.test_stage4
+
+        stage.big_item_protected("code")
+        stage.big_item("code")
+        stage.big_item("another_code")
+        # protected items are never evicted, so the least recently used unprotected item goes
+        self.assertEqual(cache.memory_statistics()["evictions"], 1)
+        self.assertLessEqual(cache.memory_statistics()["current_mb"], 2.5)
+
+        cache_refs = cache.get_cacherefs_for_stage("test_stage4")
+        evicted = [cache_ref for cache_ref in cache_refs if cache[cache_ref].evicted()]
+        self.assertEqual(len(evicted), 1)
+        self.assertEqual(evicted[0].itemname, "big_item")
+        self.assertEqual(evicted[0].instrument_code, "code")
+
+        # evicted items are recalculated when needed
+        self.assertEqual(stage.big_item("code").sum(), 131072)
+        self.assertEqual(cache.memory_statistics()["recalculated_after_eviction"], 1)
+        self.assertEqual(cache.memory_statistics()["evictions"], 2)
+
+    def test_memory_budget_spills_to_disk(self):
+        cache = self.system.cache
+        cache.set_memory_budget(1.5, spill_directory=tempfile.mkdtemp())
+        stage = self.system.test_stage4
+
+        stage.big_item("code")
+        stage.big_item_not_pickable("code")
+        stage.big_item("another_code")
+
+        memory_statistics = cache.memory_statistics()
+        self.assertEqual(memory_statistics["evictions"], 2)
+        # the not pickable item can't be spilled
+        self.assertEqual(memory_statistics["spills"], 1)
+        self.assertEqual(memory_statistics["spilled_items"], 1)
+
+        # reloaded transparently
+        self.assertEqual(stage.big_item("code").sum(), 131072)
+        memory_statistics = cache.memory_statistics()
+        self.assertEqual(memory_statistics["reloaded_from_spill"], 1)
+        self.assertEqual(memory_statistics["recalculated_after_eviction"], 0)
+
+        # spilled items are deleted like any others
+        cache.delete_items_for_instrument("another_code")
+        self.assertEqual(cache.memory_statistics()["spilled_items"], 0)
+        self.assertEqual(len(cache.get_cache_refs_for_instrument("another_code")), 0)
+
     def test_across_stages(self):
         self.system.test_stage1.single_instrument_no_keywords("code")
         self.system.test_stage1.single_instrument_no_keywords("another_code")
@@ -4,6 +4,8 @@ Created on 30 Nov 2015
 @author: rob
 """
 import unittest
+import numpy as np
+import pandas as pd
 from systems.provided.example.rules import ewmac_forecast_with_defaults
 from systems.forecasting import (
     TradingRule,
@@ -13,7 +15,7 @@ from systems.forecasting import (
 from systems.basesystem import System
 from systems.rawdata import RawData
 from systems.futures.rawdata import FuturesRawData
-from systems.provided.futures_chapter15.rules import carry2
+from systems.provided.futures_chapter15.rules import carry2, ewmac
 from sysdata.configdata import Config
 from systems.tests.testdata import get_test_object
 
@@ -194,6 +196,47 @@ class Test(unittest.TestCase):
         ans = rule.call(system, "EDOLLAR")
         self.assertAlmostEqual(ans.tail(1).values[0], 0.138302, 5)
 
+    def testPanelRule(self):
+        np.random.seed(0)
+        dates = pd.date_range(pd.Timestamp(2010, 1, 1), periods=500, freq="B")
+
+        class fakeData(object):
+            pass
+
+        class fakeSystem(object):
+            pass
+
+        prices = dict(
+            A=pd.Series(np.random.randn(500).cumsum(), dates),
+            # late starter, finishes early
+            B=pd.Series(np.random.randn(300).cumsum(), dates[100:400]),
+            # weekly, so can't go in a daily panel without adding gaps
+            C=pd.Series(np.random.randn(100).cumsum(), dates[::5]),
+            D=pd.Series(np.random.randn(500).cumsum(), dates),
+        )
+        vols = dict(
+            [(instrument_code, price.diff().abs().ewm(span=35).mean())
+             for instrument_code, price in prices.items()])
+        # price has dates that vol doesn't
+        vols["D"] = vols["D"].drop(dates[200:210])
+
+        data = fakeData()
+        data.daily_prices = lambda instrument_code: prices[instrument_code]
+        data.vol = lambda instrument_code: vols[instrument_code]
+        system = fakeSystem()
+        system.data = data
+
+        rule = TradingRule(
+            ewmac, ["data.daily_prices", "data.vol"], dict(Lfast=16, Lslow=64))
+        assert rule.accepts_panel
+
+        forecasts = rule.call_for_instruments(system, ["A", "B", "C", "D"])
+        for instrument_code in ["A", "B", "C", "D"]:
+            expected = rule.call(system, instrument_code)
+            assert forecasts[instrument_code].index.equals(expected.index)
+            np.testing.assert_array_almost_equal(
+                forecasts[instrument_code].values, expected.values)
+
     def testProcessTradingRuleSpec(self):
 
         ruleA = TradingRule(ewmac_forecast_with_defaults)
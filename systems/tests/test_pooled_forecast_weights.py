@@ -0,0 +1,84 @@
+import unittest
+
+import numpy as np
+
+from sysdata.configdata import Config
+from sysdata.sim.csv_futures_sim_data import csvFuturesSimData
+from systems.account import Account
+from systems.basesystem import System
+from systems.forecast_combine import ForecastCombine
+from systems.forecast_scale_cap import ForecastScaleCap
+from systems.forecasting import Rules
+from systems.futures.rawdata import FuturesRawData
+
+# all have the same cheap rules, so they make one pool
+INSTRUMENT_LIST = ["CORN", "EDOLLAR", "US10"]
+POOL_ITEM_NAME = "_calculation_of_raw_estimated_forecast_weights_for_pool"
+
+
+def get_system_with_estimated_forecast_weights(use_pooled_costs):
+    config = Config("systems.provided.example.estimateexampleconfig.yaml")
+    config.use_forecast_scale_estimates = False
+    config.trading_rules.pop("carry")
+    config.instruments = INSTRUMENT_LIST
+    config.rule_variations = dict(
+        [(instrument_code, ["ewmac8", "ewmac16"]) for instrument_code in INSTRUMENT_LIST])
+    config.forecast_cost_estimates = dict(
+        use_pooled_costs=use_pooled_costs, use_pooled_turnover=True)
+    # quickest method; pool_gross_returns is True by default
+    config.forecast_weight_estimate = dict(method="one_period")
+
+    system = System(
+        [Account(), FuturesRawData(), Rules(), ForecastScaleCap(), ForecastCombine()],
+        csvFuturesSimData(),
+        config,
+    )
+    system.set_logging_level("off")
+
+    return system
+
+
+def optimisations_in_cache(system):
+    return system.cache.get_items_with_data().filter_by_itemname(POOL_ITEM_NAME)
+
+
+class Test(unittest.TestCase):
+    def test_fully_pooled_estimate_shared(self):
+        system = get_system_with_estimated_forecast_weights(use_pooled_costs=True)
+        list_of_estimates = [
+            system.combForecast.calculation_of_raw_estimated_forecast_weights(instrument_code)
+            for instrument_code in INSTRUMENT_LIST]
+
+        self.assertEqual(len(optimisations_in_cache(system)), 1)
+        for estimate in list_of_estimates[1:]:
+            self.assertIs(estimate, list_of_estimates[0])
+
+        # as if each instrument had done its own optimisation
+        unshared_system = get_system_with_estimated_forecast_weights(use_pooled_costs=True)
+        pool_signature = unshared_system.combForecast.pool_signature(INSTRUMENT_LIST)
+        for instrument_code in INSTRUMENT_LIST:
+            unshared_estimate = unshared_system.combForecast._calculation_of_raw_estimated_forecast_weights_for_pool(
+                instrument_code, pool_signature)
+            np.testing.assert_array_almost_equal(
+                system.combForecast.get_raw_forecast_weights(instrument_code).values,
+                unshared_estimate.weights.values)
+
+    def test_unpooled_costs_estimated_for_each_instrument(self):
+        system = get_system_with_estimated_forecast_weights(use_pooled_costs=False)
+        list_of_estimates = [
+            system.combForecast.calculation_of_raw_estimated_forecast_weights(instrument_code)
+            for instrument_code in INSTRUMENT_LIST]
+
+        self.assertEqual(len(optimisations_in_cache(system)), len(INSTRUMENT_LIST))
+        self.assertEqual(len(set([id(estimate) for estimate in list_of_estimates])), len(INSTRUMENT_LIST))
+        self.assertEqual(
+            sorted(optimisations_in_cache(system).unique_list_of_instrument_codes()), INSTRUMENT_LIST)
+
+        # costs differ, and so can the weights
+        list_of_final_weights = [
+            tuple(estimate.weights.iloc[-1].round(6)) for estimate in list_of_estimates]
+        self.assertGreater(len(set(list_of_final_weights)), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,72 @@
+import os
+import tempfile
+import unittest
+
+from systems.basesystem import System
+from systems.tests.test_cache import testStage1, testStage2
+from sysdata.sim.sim_data import simData
+from sysdata.configdata import Config
+
+
+class TestProfiler(unittest.TestCase):
+    def setUp(self):
+
+        system = System(
+            [testStage1(), testStage2()],
+            simData(),
+            Config(dict(instruments=["code", "another_code"])),
+        )
+        self.system = system
+
+    def test_profiling_off_by_default(self):
+        self.system.test_stage1.single_instrument_no_keywords("code")
+        self.assertEqual(len(self.system.profile_report()), 0)
+
+    def test_hits_and_misses(self):
+        self.system.enable_profiling()
+        self.system.test_stage1.single_instrument_no_keywords("code")
+        self.system.test_stage1.single_instrument_no_keywords("code")
+        self.system.test_stage1.single_instrument_no_keywords("another_code")
+
+        report = self.system.profile_report().set_index(
+            ["stage", "method", "instrument_code"]
+        )
+        row = report.loc[("test_stage1", "single_instrument_no_keywords", "code")]
+        self.assertEqual(row.calls, 2)
+        self.assertEqual(row.cache_hits, 1)
+        self.assertEqual(row.cache_misses, 1)
+
+        row = report.loc[
+            ("test_stage1", "single_instrument_no_keywords", "another_code")
+        ]
+        self.assertEqual(row.calls, 1)
+        self.assertEqual(row.cache_misses, 1)
+
+    def test_input_methods_are_not_cached(self):
+        self.system.enable_profiling()
+        self.system.test_stage2.input2_stage_no_caching("code")
+
+        report = self.system.profile_report().set_index(["stage", "method"])
+        row = report.loc[("test_stage2", "input2_stage_no_caching")]
+        self.assertEqual(row.calls, 1)
+        self.assertEqual(row.cache_hits + row.cache_misses, 0)
+        self.assertEqual(len(self.system.cache.get_items_with_data()), 1)
+
+    def test_flame_graph(self):
+        self.system.enable_profiling()
+        self.system.test_stage1.across_markets_no_keywords()
+        self.system.disable_profiling()
+        self.system.test_stage1.single_instrument_no_keywords("code")
+
+        filename = os.path.join(tempfile.mkdtemp(), "profile.txt")
+        self.system.write_profile_flame_graph(filename)
+        with open(filename, "r") as input_file:
+            lines = input_file.read().splitlines()
+
+        stacks = [line.rsplit(" ", 1)[0] for line in lines]
+        self.assertIn("test_stage1.across_markets_no_keywords", stacks)
+        self.assertNotIn("test_stage1.single_instrument_no_keywords", stacks)
+
+
+if __name__ == "__main__":
+    unittest.main()
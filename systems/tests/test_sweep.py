@@ -0,0 +1,80 @@
+import unittest
+
+from systems.stage import SystemStage
+from systems.basesystem import System
+from systems.system_cache import diagnostic, output
+from systems.sweep import configRecordingReads, cache_refs_to_reuse_for_variation, config_with_overrides
+from sysdata.sim.sim_data import simData
+from sysdata.configdata import Config
+
+
+class testSweepStage(SystemStage):
+    def _name(self):
+        return "test_sweep_stage"
+
+    @diagnostic()
+    def raw_value(self, instrument_code):
+        return self.parent.config.raw_values[instrument_code]
+
+    @diagnostic()
+    def scaled_value(self, instrument_code):
+        return self.raw_value(instrument_code) * self.parent.config.scale
+
+    @output()
+    def total(self):
+        return sum([self.scaled_value(instrument_code) + self.parent.config.offset
+                    for instrument_code in self.parent.get_instrument_list()])
+
+
+class TestSweep(unittest.TestCase):
+    def setUp(self):
+        config = configRecordingReads(
+            dict(instruments=["code", "another_code"], raw_values=dict(code=1, another_code=2),
+                 scale=10, offset=0)
+        )
+        system = System([testSweepStage()], simData(), config)
+        config.start_recording(system.cache)
+        system.test_sweep_stage.total()
+        config.stop_recording()
+
+        self.system = system
+        self.elements_read_by_cache_refs = config.elements_read_by_cache_refs()
+
+    def reused_item_names(self, overrides):
+        cache_refs = cache_refs_to_reuse_for_variation(
+            self.system, self.elements_read_by_cache_refs, overrides)
+
+        return sorted([
+            "%s %s" % (cache_ref.itemname, cache_ref.instrument_code)
+            for cache_ref in cache_refs
+            if cache_ref.stage_name == "test_sweep_stage"
+        ])
+
+    def test_reads_are_recorded_by_item(self):
+        self.assertEqual(
+            sorted([cache_ref.itemname for cache_ref in self.elements_read_by_cache_refs["scale"]]),
+            ["scaled_value", "scaled_value"])
+        self.assertEqual(
+            [cache_ref.itemname for cache_ref in self.elements_read_by_cache_refs["offset"]], ["total"])
+
+    def test_items_reused(self):
+        self.assertEqual(self.reused_item_names({"offset": 1}), [
+            "raw_value another_code", "raw_value code",
+            "scaled_value another_code", "scaled_value code"])
+        self.assertEqual(self.reused_item_names({"scale": 5}), [
+            "raw_value another_code", "raw_value code"])
+        self.assertEqual(self.reused_item_names({"raw_values.code": 5}), [])
+
+        # decides the instrument list, and elements that weren't read could affect anything
+        self.assertEqual(self.reused_item_names({"instruments": ["code"]}), [])
+        self.assertEqual(self.reused_item_names({"not_read": 1}), [])
+
+    def test_config_with_overrides(self):
+        config = config_with_overrides(
+            Config(dict(scale=1, raw_values=dict(code=1, another_code=2))), {"scale": 3, "raw_values.code": 4})
+        self.assertEqual(config.scale, 3)
+        self.assertEqual(config.raw_values, dict(code=4, another_code=2))
+
+
+if __name__ == "__main__":
+    unittest.main()